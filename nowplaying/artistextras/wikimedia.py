@@ -10,6 +10,51 @@ import nowplaying.wikiclient
 from nowplaying.artistextras import ArtistExtrasPlugin
 
 
+class _PageBatch:  # pylint: disable=too-few-public-methods
+    """one batched Wikimedia lookup shared by every artist on a track
+
+    The first entity that misses the datacache fetches itself and every
+    entity after it with a single get_pages_async, so the rest are
+    answered from that result instead of going back to the network.
+    """
+
+    def __init__(self, entities: list[str], lang: str, need_bio: bool, need_images: bool):
+        self.entities = entities
+        self.lang = lang
+        self.need_bio = need_bio
+        self.need_images = need_images
+        self._pages: dict[str, nowplaying.wikiclient.WikiPage] | None = None
+        self._error: Exception | None = None
+
+    async def get(self, entity: str) -> nowplaying.wikiclient.WikiPage | None:
+        """the page for entity, fetching the batch on first use"""
+        if self._pages is None and self._error is None:
+            remaining = self.entities[self.entities.index(entity) :]
+            try:
+                self._pages = await nowplaying.wikiclient.get_pages_async(
+                    remaining,
+                    lang=self.lang,
+                    timeout=5,
+                    need_bio=self.need_bio,
+                    need_images=self.need_images,
+                    max_images=5,
+                )
+            except (aiohttp.ClientError, TimeoutError) as err:
+                self._error = err
+        if self._error:
+            raise self._error
+        if entity in self._pages:
+            return self._pages[entity]
+        return await nowplaying.wikiclient.get_page_async(
+            entity=entity,
+            lang=self.lang,
+            timeout=5,
+            need_bio=self.need_bio,
+            need_images=self.need_images,
+            max_images=5,
+        )
+
+
 class Plugin(ArtistExtrasPlugin):
     """handler for discogs"""
 
@@ -34,24 +79,36 @@ class Plugin(ArtistExtrasPlugin):
             return True
         return False
 
-    async def _get_page_cached(self, entity, lang, artist_name):
-        """Cached version of _get_page_async for better performance."""
-        # Check what features are enabled to optimize API calls
+    def _needs(self):
+        """which of bio and images the settings ask for"""
         need_bio = self.config.cparser.value("wikimedia/bio", type=bool)
         need_images = self.config.cparser.value(
             "wikimedia/fanart", type=bool
         ) or self.config.cparser.value("wikimedia/thumbnails", type=bool)
+        return need_bio, need_images
+
+    async def _get_page_cached(self, entity, lang, artist_name, batch=None):
+        """Cached version of _get_page_async for better performance.
+
+        With a batch, a cache miss is answered from the track's shared
+        batched lookup rather than fetching this entity on its own.
+        """
+        # Check what features are enabled to optimize API calls
+        need_bio, need_images = self._needs()
 
         async def fetch_func():
             try:
-                page = await nowplaying.wikiclient.get_page_async(
-                    entity=entity,
-                    lang=lang,
-                    timeout=5,
-                    need_bio=need_bio,
-                    need_images=need_images,
-                    max_images=5,  # Limit for performance during live shows
-                )
+                if batch:
+                    page = await batch.get(entity)
+                else:
+                    page = await nowplaying.wikiclient.get_page_async(
+                        entity=entity,
+                        lang=lang,
+                        timeout=5,
+                        need_bio=need_bio,
+                        need_images=need_images,
+                        max_images=5,  # Limit for performance during live shows
+                    )
             except (aiohttp.ClientError, TimeoutError) as err:
                 # Returning None tells cached_fetch to skip caching, so a transient
                 # wikidata failure (e.g. 429) does not poison the entry.  Only
@@ -181,12 +238,14 @@ class Plugin(ArtistExtrasPlugin):
                 return {}
 
             lang = self.config.cparser.value("wikimedia/bio_iso", type=str) or "en"
-            for website in wikidata_websites:
-                entity = website.split("/")[-1]
+            entities = list(dict.fromkeys(website.split("/")[-1] for website in wikidata_websites))
+            # Multi-artist tracks share one batched lookup for all their entities
+            batch = _PageBatch(entities, lang, *self._needs()) if len(entities) > 1 else None
+            for entity in entities:
                 artist_name = metadata.get(
                     "artist", entity
                 )  # Use entity as fallback for cache key
-                page = await self._get_page_cached(entity, lang, artist_name)
+                page = await self._get_page_cached(entity, lang, artist_name, batch=batch)
                 if not page or not page.data:
                     continue
 
@@ -15,8 +15,14 @@ import orjson
 # Core components
 from .client import DataCacheClient, FetchRequest, get_client, reset_client
 from .utils import get_datacache_path, redact_url, run_datacache_maintenance
-from .pending import RequestQueue
-from .queue import RateLimiter, RateLimiterManager
+from .pending import (
+    CLASS_BACKGROUND,
+    CLASS_NEXT_UP,
+    CLASS_NOW_PLAYING,
+    RequestQueue,
+    schedule_as,
+)
+from .queue import RateLimiter, RateLimiterManager, SharedRateLimiter
 from .storage import CachedEntry, DataStorage
 
 # Public API
@@ -27,8 +33,13 @@ __all__ = [
     "CachedEntry",  # Result dataclass from retrieve methods
     "DataStorage",  # Direct storage layer access
     "RequestQueue",  # Database-backed pending request queue
+    "schedule_as",  # Context manager: scheduling class for requests queued inside it
+    "CLASS_NOW_PLAYING",  # Scheduling class: the track on air
+    "CLASS_NEXT_UP",  # Scheduling class: tracks loaded on other decks
+    "CLASS_BACKGROUND",  # Scheduling class: warming the cache ahead of need
     "RateLimiter",  # Rate limiting primitives
     "RateLimiterManager",  # Rate limiter management
+    "SharedRateLimiter",  # Rate limiting across processes (MusicBrainz, AcoustID)
     "get_datacache_path",  # Get database path
     "run_datacache_maintenance",  # Cleanup function for system startup
     "cached_fetch",  # Drop-in replacement for apicache.cached_fetch
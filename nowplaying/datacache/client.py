@@ -25,7 +25,13 @@ from httpx import Headers as CacheHeaders
 import nowplaying.exceptions
 import nowplaying.version  # pylint: disable=no-name-in-module,import-error
 
-from .pending import RequestQueue
+from .pending import (
+    CLASS_BACKGROUND,
+    CLASS_NOW_PLAYING,
+    LATENCY_BUDGETS,
+    RequestQueue,
+    current_schedule_class,
+)
 from .queue import RateLimiterManager
 from .storage import IMAGE_DATA_TYPES, CachedEntry, DataStorage
 from .utils import redact_url
@@ -41,6 +47,14 @@ _PROVIDER_TTL_DEFAULTS: dict[str, int] = {
 _IMAGE_DATA_TYPES = IMAGE_DATA_TYPES  # re-exported from storage for TTL doubling logic
 _DEFAULT_TTL = 7 * 24 * 3600
 
+# Most requests one provider may have in flight in process_queue().  The rate
+# limiters pace request starts; this stops one slow host from holding every slot.
+_PROVIDER_CONCURRENCY: dict[str, int] = {
+    "cdn": 4,
+    "wikimedia": 3,
+}
+_DEFAULT_PROVIDER_CONCURRENCY = 2
+
 
 @dataclasses.dataclass
 class FetchRequest:  # pylint: disable=too-many-instance-attributes
@@ -58,6 +72,7 @@ class FetchRequest:  # pylint: disable=too-many-instance-attributes
     headers: CacheHeaders | None = None
     negative_ttl: int | None = None
     queue_priority: int = 2
+    schedule_class: int | None = None  # None: the class set by pending.schedule_as()
     expected_checksum: str | None = None
     on_complete: Callable[[str, "CachedEntry | None"], Coroutine[Any, Any, None]] | None = None
 
@@ -99,12 +114,15 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
     def __init__(self, cache_dir: Path | None = None):
         self.storage = DataStorage(cache_dir)
         self.queue = RequestQueue(cache_dir)
-        self.rate_limiters = RateLimiterManager()
+        self.rate_limiters = RateLimiterManager(cache_dir=cache_dir)
         self._initialized = False
         self._session: httpx.AsyncClient | None = None
         self._init_lock = asyncio.Lock()
         self._retry_after_until: dict[str, float] = {}
         self._callbacks: dict[str, Callable] = {}
+        # Requests answered from the cache, fetched or queued; playlist
+        # enrichment uses it to tell whether a track produced anything
+        self.served = 0
 
     async def initialize(self) -> None:
         """Initialize the client and underlying storage (concurrency-safe)."""
@@ -160,6 +178,7 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
                 or cached_result.checksum == request.expected_checksum
             ):
                 logging.debug("Cache hit for URL: %s", self._redact_url(request.url))
+                self.served += 1
                 if request.on_complete:
                     asyncio.create_task(request.on_complete(request.url, cached_result))
                 return cached_result
@@ -168,7 +187,15 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
                 self._redact_url(request.url),
             )
 
-        if not request.immediate:
+        schedule_class = (
+            current_schedule_class() if request.schedule_class is None else request.schedule_class
+        )
+        background = schedule_class == CLASS_BACKGROUND
+        # Background images are never fetched in-line: the queue is where the
+        # datacache worker paces them against the track on air.  API lookups
+        # still are, since what they return is what decides which images to
+        # queue; the cross-process limiter holds them to the provider's rate.
+        if not request.immediate or (background and request.data_type in IMAGE_DATA_TYPES):
             params = {
                 "url": request.url,
                 "identifier": request.identifier,
@@ -189,11 +216,20 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
                 request_key="fetch_url",
                 params=params,
                 priority=request.queue_priority,
+                schedule_class=schedule_class,
             )
             logging.debug("Queued background fetch for URL: %s", self._redact_url(request.url))
+            self.served += 1
+            return None
+
+        if (
+            background
+            and not await self.rate_limiters.get_shared_limiter(request.provider).acquire()
+        ):
+            logging.warning("Shared rate limit timed out for provider %s", request.provider)
             return None
 
-        return await self._fetch_and_store(
+        result = await self._fetch_and_store(
             url=request.url,
             identifier=request.identifier,
             data_type=request.data_type,
@@ -205,6 +241,9 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
             headers=request.headers,
             negative_ttl=request.negative_ttl,
         )
+        if result:
+            self.served += 1
+        return result
 
     async def _cache_negative(  # pylint: disable=too-many-arguments
         self,
@@ -441,6 +480,7 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
         identifier: str,
         data_type: str,
         provider: str | None = None,
+        shuffle: bool = False,
     ) -> CachedEntry | None:
         """
         Get a random image for an identifier and type.
@@ -451,13 +491,19 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
             identifier: Artist identifier (e.g., "daft_punk")
             data_type: Image type ("thumbnail", "logo", "banner", "fanart")
             provider: Optional provider filter
+            shuffle: Cycle through all images in a shuffled order without
+                     repeating one back to back
 
         Returns:
             CachedEntry if found, None otherwise
         """
         await self.initialize()
         return await self.storage.retrieve_by_identifier(
-            identifier=identifier, data_type=data_type, provider=provider, random=True
+            identifier=identifier,
+            data_type=data_type,
+            provider=provider,
+            random=True,
+            shuffle=shuffle,
         )
 
     async def get_cache_keys_for_identifier(
@@ -501,15 +547,18 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
         await self.initialize()
         return await self.storage.retrieve_by_cachekey(cachekey)
 
-    async def process_queue(
+    async def process_queue(  # pylint: disable=too-many-locals
         self, provider: str | None = None, max_concurrent: int = 10
     ) -> dict[str, Any]:
         """
         Process pending requests from the queue concurrently.
 
-        Drains the queue first (marking each item as 'processing'), then runs
-        all fetches concurrently under a semaphore. Per-provider rate limiters
-        in _fetch_and_store handle provider-level throttling automatically.
+        Keeps up to max_concurrent fetches running, claiming the most urgent
+        pending request whenever a slot frees up or a new request is queued, and
+        returns once the queue is empty and every fetch has finished.  One slot is
+        held back for now-playing requests so on-air art never waits for a bulk
+        download to finish, and each provider is capped by _PROVIDER_CONCURRENCY.
+        Per-provider rate limiters in _fetch_and_store pace the fetches themselves.
 
         Args:
             provider: Optional provider filter
@@ -555,30 +604,65 @@ class DataCacheClient:  # pylint: disable=too-many-instance-attributes
                 await self.queue.complete_request(request_id, success=False)
                 return False
 
-        stats: dict[str, Any] = {"processed": 0, "succeeded": 0, "failed": 0}
-
-        # Pull round-robin batches (one per data_type at the current priority tier,
-        # then fill remaining slots) so banners/logos/thumbnails all get one
-        # download before any type gets its second.
-        while True:
-            if provider:
-                # Provider-filtered path uses the old single-item query.
-                chunk: list[dict[str, Any]] = []
-                for _ in range(max_concurrent):
-                    request = await self.queue.get_next_request(provider)
-                    if not request:
-                        break
-                    chunk.append(request)
-            else:
-                chunk = await self.queue.get_next_batch(max_concurrent)
-
-            if not chunk:
-                break
-
-            results = await asyncio.gather(*(_process_one(r) for r in chunk))
-            stats["processed"] += len(chunk)
-            stats["succeeded"] += sum(1 for r in results if r)
-            stats["failed"] += sum(1 for r in results if not r)
+        stats: dict[str, Any] = {"processed": 0, "succeeded": 0, "failed": 0, "late": 0}
+        running: dict[asyncio.Task, dict[str, Any]] = {}
+
+        async def _fill_slots() -> None:
+            while len(running) < max_concurrent:
+                in_flight: dict[str, int] = {}
+                for active in running.values():
+                    in_flight[active["provider"]] = in_flight.get(active["provider"], 0) + 1
+                request = await self.queue.claim_next(
+                    provider=provider,
+                    exclude_providers=[
+                        name
+                        for name, count in in_flight.items()
+                        if count >= _PROVIDER_CONCURRENCY.get(name, _DEFAULT_PROVIDER_CONCURRENCY)
+                    ],
+                    max_class=(
+                        CLASS_NOW_PLAYING
+                        if max_concurrent > 1 and len(running) >= max_concurrent - 1
+                        else None
+                    ),
+                )
+                if not request:
+                    return
+                if (deadline := request.get("deadline")) and time.time() > deadline:
+                    stats["late"] += 1
+                    logging.debug(
+                        "Request %s started %.1fs after its %.0fs latency budget",
+                        request["request_id"],
+                        time.time() - deadline,
+                        LATENCY_BUDGETS.get(request["schedule_class"], 0.0),
+                    )
+                running[asyncio.create_task(_process_one(request))] = request
+
+        wakeup: asyncio.Task | None = None
+        try:
+            while True:
+                await _fill_slots()
+                if not running:
+                    break
+                # Wake on a new request as well as a finished fetch, so an on-air
+                # request can take the reserved slot straight away.
+                if wakeup is None:
+                    wakeup = asyncio.create_task(self.queue.wait_for_work())
+                done, _ = await asyncio.wait(
+                    {*running, wakeup}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if wakeup in done:
+                    wakeup = None
+                for task in done:
+                    if task in running:
+                        del running[task]
+                        stats["processed"] += 1
+                        stats["succeeded" if task.result() else "failed"] += 1
+        finally:
+            if wakeup is not None:
+                wakeup.cancel()
+            # Only non-empty when cancelled: take the fetches down too, as gather would.
+            for task in running:
+                task.cancel()
 
         return stats
 
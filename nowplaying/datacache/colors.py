@@ -2,9 +2,17 @@
 
 import asyncio
 import colorsys
+import concurrent.futures
+import concurrent.futures.process
+import dataclasses
+import hashlib
 import io
 import logging
-from collections import Counter
+import multiprocessing
+import os
+import threading
+import weakref
+from collections import OrderedDict
 
 from PIL import Image
 
@@ -16,6 +24,63 @@ HUE_SEP = 20 / 360
 # data_types where color extraction is meaningful
 COLOR_EXTRACT_TYPES = frozenset({"front_cover", "artistthumbnail", "artistfanart", "artistbanner"})
 
+# Quantizing a large image holds the GIL for most of its run, so it happens in a
+# small process pool rather than on a thread of the caller's event loop.  Two
+# workers keep a burst of fanart from taking every core away from playback.
+_POOL_WORKERS = max(1, min(2, (os.cpu_count() or 2) // 2))
+# Extractions allowed in flight per event loop.  Later callers wait for a slot
+# instead of queueing their image bytes inside the executor.
+_MAX_IN_FLIGHT = _POOL_WORKERS * 2
+# Palettes remembered by content checksum, for images stored more than once.
+_PALETTE_CACHE_SIZE = 256
+
+_pool: concurrent.futures.ProcessPoolExecutor | None = None  # pylint: disable=invalid-name
+_pool_lock = threading.Lock()
+_palette_cache: OrderedDict[tuple[str, int], dict[str, str]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclasses.dataclass
+class _LoopState:
+    """Backpressure and de-duplication state for one event loop."""
+
+    slots: asyncio.Semaphore
+    in_flight: dict[tuple[str, int], asyncio.Future] = dataclasses.field(default_factory=dict)
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is None:
+            # spawn everywhere: forking a process that already runs aiosqlite and
+            # watchdog threads can leave a child holding one of their locks.
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_palette_pool() -> None:
+    """Stop the extraction worker processes; the next extraction starts new ones."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool:
+        pool.shutdown(wait=True, cancel_futures=True)
+
 
 def _load_rgb(data: bytes) -> Image.Image:
     img = Image.open(io.BytesIO(data)).convert("RGBA")
@@ -30,9 +95,10 @@ def _quantize_candidates(img: Image.Image) -> list[tuple]:
     """Return (count, h, s, v, r, g, b) tuples sorted by count descending."""
     quantized = img.quantize(colors=24, method=Image.Quantize.MEDIANCUT)
     palette_flat = quantized.getpalette()[:72]
-    counts = Counter(quantized.get_flattened_data())
+    # getcolors() counts the palette indices in C; iterating the pixels here took
+    # longer than the quantize itself.
     candidates = []
-    for idx, count in counts.items():
+    for count, idx in quantized.getcolors(256) or []:
         r, g, b = palette_flat[idx * 3], palette_flat[idx * 3 + 1], palette_flat[idx * 3 + 2]
         h, s, v = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
         candidates.append((count, h, s, v, r, g, b))
@@ -57,41 +123,52 @@ def _hue_diverse(candidates: list[tuple], max_colors: int) -> list[tuple]:
 
 
 def _extract_palettes_sync(data: bytes, max_colors: int = 6) -> dict[str, str]:
+    """Compute the palettes; runs in a worker process and raises on failure."""
+    img = _load_rgb(data)
+    candidates = _quantize_candidates(img)
+
+    # ── display palette: minimal filter, just strip near-black and near-white ──
+    display = [c for c in candidates if not (c[3] < 0.05) and not (c[3] > 0.97 and c[2] < 0.05)]
+    display_colors = [f"#{r:02x}{g:02x}{b:02x}" for _, _, _, _, r, g, b in display[:max_colors]]
+
+    # ── lighting palette: tiered vibrant filter ──
+    vibrant = [
+        c for c in candidates if c[2] >= SAT_MIN and c[3] >= VAL_MIN and c[2] * c[3] >= SV_MIN
+    ]
+    selected = _hue_diverse(vibrant, max_colors)
+    if selected:
+        palette_type = "vibrant"
+    else:
+        less_strict = [c for c in candidates if c[3] > 0.15]
+        selected = _hue_diverse(less_strict, max_colors)[:4]
+        palette_type = "desaturated" if selected else "monochrome"
+        if not selected:
+            selected = candidates[:4]
+
+    # Most vibrant first so consumers can take [0] without scanning.
+    selected.sort(key=lambda c: c[2] * c[3], reverse=True)
+    lighting_colors = [f"#{r:02x}{g:02x}{b:02x}" for _, _, _, _, r, g, b in selected]
+
+    return {
+        "cover_palette": ",".join(display_colors),
+        "cover_palette_lighting": ",".join(lighting_colors),
+        "cover_palette_type": palette_type,
+    }
+
+
+async def _run_extraction(data: bytes, max_colors: int) -> dict[str, str]:
+    """Run one extraction in the pool, logging failures here since workers have no log."""
+    pool = _get_pool()
     try:
-        img = _load_rgb(data)
-        candidates = _quantize_candidates(img)
-
-        # ── display palette: minimal filter, just strip near-black and near-white ──
-        display = [
-            c for c in candidates if not (c[3] < 0.05) and not (c[3] > 0.97 and c[2] < 0.05)
-        ]
-        display_colors = [
-            f"#{r:02x}{g:02x}{b:02x}" for _, _, _, _, r, g, b in display[:max_colors]
-        ]
-
-        # ── lighting palette: tiered vibrant filter ──
-        vibrant = [
-            c for c in candidates if c[2] >= SAT_MIN and c[3] >= VAL_MIN and c[2] * c[3] >= SV_MIN
-        ]
-        selected = _hue_diverse(vibrant, max_colors)
-        if selected:
-            palette_type = "vibrant"
-        else:
-            less_strict = [c for c in candidates if c[3] > 0.15]
-            selected = _hue_diverse(less_strict, max_colors)[:4]
-            palette_type = "desaturated" if selected else "monochrome"
-            if not selected:
-                selected = candidates[:4]
-
-        # Most vibrant first so consumers can take [0] without scanning.
-        selected.sort(key=lambda c: c[2] * c[3], reverse=True)
-        lighting_colors = [f"#{r:02x}{g:02x}{b:02x}" for _, _, _, _, r, g, b in selected]
-
-        return {
-            "cover_palette": ",".join(display_colors),
-            "cover_palette_lighting": ",".join(lighting_colors),
-            "cover_palette_type": palette_type,
-        }
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, _extract_palettes_sync, data, max_colors
+        )
+    except concurrent.futures.process.BrokenProcessPool:
+        # A worker died (OOM on a huge image, killed externally).  Start over with
+        # a fresh pool next time rather than failing every later extraction.
+        logging.error("Palette worker process exited unexpectedly; restarting pool")
+        _discard_pool(pool)
+        return {}
     except OSError:
         # Not a bug, so not an ERROR: UnidentifiedImageError and "image file is
         # truncated" both subclass OSError, and bytes in that state reach here
@@ -105,7 +182,9 @@ def _extract_palettes_sync(data: bytes, max_colors: int = 6) -> dict[str, str]:
         return {}
 
 
-async def extract_palettes(data: bytes, max_colors: int = 6) -> dict[str, str]:
+async def extract_palettes(
+    data: bytes, max_colors: int = 6, checksum: str | None = None
+) -> dict[str, str]:
     """Return display palette, lighting palette, and palette type for image bytes.
 
     Returns a dict with keys:
@@ -114,6 +193,44 @@ async def extract_palettes(data: bytes, max_colors: int = 6) -> dict[str, str]:
       cover_palette_type     — 'vibrant' | 'desaturated' | 'monochrome'
 
     Empty when there is no palette to report, so callers can test the result rather
-    than inspect three fields for empty strings.
+    than inspect three fields for empty strings.  Results are remembered by content
+    checksum, and concurrent requests for the same image share one extraction.
+
+    Args:
+        data: Image bytes
+        max_colors: Most colors to report in each palette
+        checksum: SHA-256 hex digest of data, if the caller already has it
     """
-    return await asyncio.to_thread(_extract_palettes_sync, data, max_colors)
+    key = (checksum or hashlib.sha256(data).hexdigest(), max_colors)
+    with _cache_lock:
+        if (cached := _palette_cache.get(key)) is not None:
+            _palette_cache.move_to_end(key)
+            return dict(cached)
+
+    loop = asyncio.get_running_loop()
+    if (state := _loop_states.get(loop)) is None:
+        state = _loop_states[loop] = _LoopState(slots=asyncio.Semaphore(_MAX_IN_FLIGHT))
+    while (pending := state.in_flight.get(key)) is not None:
+        # wait() rather than awaiting the future: if the extraction it belongs to is
+        # cancelled, this caller runs its own instead of inheriting the cancel.
+        await asyncio.wait({pending})
+        if not pending.cancelled():
+            return dict(pending.result())
+
+    future: asyncio.Future = loop.create_future()
+    state.in_flight[key] = future
+    try:
+        async with state.slots:
+            result = await _run_extraction(data, max_colors)
+        if result:
+            with _cache_lock:
+                _palette_cache[key] = result
+                while len(_palette_cache) > _PALETTE_CACHE_SIZE:
+                    _palette_cache.popitem(last=False)
+        future.set_result(result)
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        state.in_flight.pop(key, None)
+    return dict(result)
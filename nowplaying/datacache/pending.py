@@ -1,9 +1,12 @@
 """Pending request queue for background datacache operations."""
 
 import asyncio
+import contextlib
+import contextvars
 import hashlib
 import logging
 import time
+from collections.abc import Collection, Iterator
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +17,47 @@ import nowplaying.utils.sqlite
 from .utils import ensure_datacache_schema, get_datacache_path
 
 
+# Scheduling classes, most urgent first.  The class outranks priority: every
+# request for the track on air is claimed before any prefetch, whatever its
+# data_type priority says.
+CLASS_NOW_PLAYING = 0
+CLASS_NEXT_UP = 1
+CLASS_BACKGROUND = 2
+
+# Seconds a request of each class may wait before it counts as late.
+LATENCY_BUDGETS: dict[int, float] = {
+    CLASS_NOW_PLAYING: 5.0,
+    CLASS_NEXT_UP: 60.0,
+    CLASS_BACKGROUND: 3600.0,
+}
+
+# Requests are queued from deep inside metadata plugins, so the class travels with
+# the task rather than through every plugin signature.  The default is the track
+# being processed, which is what the metadata pipeline works on.
+_schedule_class: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "datacache_schedule_class", default=CLASS_NOW_PLAYING
+)
+
+_CLAIM_COLUMNS = (
+    "request_id, provider, request_key, params, priority, created_at, sched_class, deadline"
+)
+
+
+@contextlib.contextmanager
+def schedule_as(schedule_class: int) -> Iterator[None]:
+    """Queue every request made inside the block under schedule_class."""
+    token = _schedule_class.set(schedule_class)
+    try:
+        yield
+    finally:
+        _schedule_class.reset(token)
+
+
+def current_schedule_class() -> int:
+    """Return the scheduling class requests made here are queued under."""
+    return _schedule_class.get()
+
+
 class RequestQueue:
     """Database-backed queue for pending datacache fetch requests."""
 
@@ -21,6 +65,7 @@ class RequestQueue:
         self.database_path = get_datacache_path(database_path)
         self._initialized = False
         self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
 
     async def initialize(self) -> None:
         """Initialize the database schema without blocking the event loop."""
@@ -30,12 +75,34 @@ class RequestQueue:
                 await asyncio.to_thread(ensure_datacache_schema, self.database_path)
                 self._initialized = True
 
-    async def queue_request(
+    def notify(self) -> None:
+        """Wake anything waiting in wait_for_work().
+
+        Not thread-safe; a watcher thread must hand this to the loop with
+        call_soon_threadsafe().
+        """
+        self._wakeup.set()
+
+    async def wait_for_work(self, timeout: float | None = None) -> bool:
+        """Wait until a request may have been queued, or timeout seconds pass.
+
+        Returns:
+            True if woken by notify(), False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            return False
+        self._wakeup.clear()
+        return True
+
+    async def queue_request(  # pylint: disable=too-many-arguments
         self,
         provider: str,
         request_key: str,
         params: dict[str, Any],
         priority: int = 2,  # 1=immediate, 2=batch
+        schedule_class: int | None = None,
     ) -> bool:
         """
         Add a request to the database-backed queue.
@@ -45,12 +112,18 @@ class RequestQueue:
             request_key: Type of request (artist_lookup, image_fetch, etc.)
             params: Request parameters
             priority: Request priority (1=immediate, 2=batch)
+            schedule_class: CLASS_NOW_PLAYING, CLASS_NEXT_UP or CLASS_BACKGROUND;
+                            defaults to the class set by schedule_as()
 
         Returns:
-            True if queued successfully, False otherwise
+            True if queued successfully, False otherwise.  A request already
+            pending under a less urgent class is promoted and also returns True.
         """
         await self.initialize()
 
+        if schedule_class is None:
+            schedule_class = current_schedule_class()
+
         try:
             # Generate unique request ID
             params_str = orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
@@ -58,6 +131,7 @@ class RequestQueue:
                 f"{provider}:{request_key}:{hashlib.sha256(params_str.encode()).hexdigest()[:16]}"
             )
             now = time.time()
+            deadline = now + LATENCY_BUDGETS.get(schedule_class, LATENCY_BUDGETS[CLASS_BACKGROUND])
             queued = False
 
             async def _do_queue() -> None:
@@ -65,11 +139,26 @@ class RequestQueue:
                 async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
                     # Skip if already active; re-queue if previously failed
                     cursor = await connection.execute(
-                        "SELECT status FROM pending_requests WHERE request_id = ?",
+                        "SELECT status, sched_class FROM pending_requests WHERE request_id = ?",
                         (request_id,),
                     )
                     row = await cursor.fetchone()
                     if row:
+                        if row[0] == "pending" and schedule_class < row[1]:
+                            # A prefetched track went on air before its art arrived.
+                            await connection.execute(
+                                """
+                                UPDATE pending_requests
+                                SET sched_class = ?, deadline = MIN(deadline, ?),
+                                    priority = MIN(priority, ?)
+                                WHERE request_id = ? AND status = 'pending'
+                                """,
+                                (schedule_class, deadline, priority, request_id),
+                            )
+                            await connection.commit()
+                            queued = True
+                            logging.debug("Request promoted: %s", request_id)
+                            return
                         if row[0] in ("pending", "processing", "completed"):
                             logging.debug("Request already queued: %s", request_id)
                             return
@@ -84,16 +173,29 @@ class RequestQueue:
                     await connection.execute(
                         """
                         INSERT INTO pending_requests
-                        (request_id, provider, request_key, data_type, params, priority, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        (request_id, provider, request_key, data_type, params, priority,
+                         created_at, sched_class, deadline)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                         """,
-                        (request_id, provider, request_key, data_type, params_str, priority, now),
+                        (
+                            request_id,
+                            provider,
+                            request_key,
+                            data_type,
+                            params_str,
+                            priority,
+                            now,
+                            schedule_class,
+                            deadline,
+                        ),
                     )
                     await connection.commit()
                     queued = True
                     logging.debug("Request queued: %s", request_id)
 
             await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_queue)
+            if queued:
+                self.notify()
             return queued
 
         except Exception as error:  # pylint: disable=broad-exception-caught
@@ -110,180 +212,87 @@ class RequestQueue:
         Returns:
             Request dictionary or None if no requests available
         """
+        return await self.claim_next(provider=provider)
+
+    async def claim_next(
+        self,
+        provider: str | None = None,
+        exclude_providers: Collection[str] = (),
+        max_class: int | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Claim the most urgent pending request and mark it as processing.
+
+        Requests are taken by scheduling class, then priority, then newest first:
+        within a tier the newest request is the one for the most recent track.
+
+        Args:
+            provider: Only consider this provider
+            exclude_providers: Skip these providers, e.g. ones already at their
+                               concurrency limit
+            max_class: Only consider classes at least this urgent
+
+        Returns:
+            Request dictionary, including its schedule_class and deadline, or None
+            if nothing matching is pending
+        """
         await self.initialize()
 
+        where = ["status = 'pending'"]
+        args: list[Any] = []
+        if provider:
+            where.append("provider = ?")
+            args.append(provider)
+        if exclude_providers:
+            where.append(f"provider NOT IN ({','.join('?' * len(exclude_providers))})")
+            args.extend(exclude_providers)
+        if max_class is not None:
+            where.append("sched_class <= ?")
+            args.append(max_class)
+        query = (
+            f"SELECT {_CLAIM_COLUMNS} FROM pending_requests WHERE {' AND '.join(where)}"
+            " ORDER BY sched_class ASC, priority ASC, created_at DESC LIMIT 1"
+        )
+
         try:
             result: dict[str, Any] | None = None
 
-            async def _do_get_next() -> None:
+            async def _do_claim() -> None:
                 nonlocal result
                 async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
-                    if provider:
-                        query = """
-                            SELECT request_id, provider, request_key, params, priority, created_at
-                            FROM pending_requests
-                            WHERE status = 'pending' AND provider = ?
-                            ORDER BY priority ASC, created_at DESC
-                            LIMIT 1
-                        """
-                        cursor = await connection.execute(query, (provider,))
-                    else:
-                        query = """
-                            SELECT request_id, provider, request_key, params, priority, created_at
-                            FROM pending_requests
-                            WHERE status = 'pending'
-                            ORDER BY priority ASC, created_at DESC
-                            LIMIT 1
-                        """
-                        cursor = await connection.execute(query)
-
+                    cursor = await connection.execute(query, args)
                     row = await cursor.fetchone()
                     if not row:
                         return
 
-                    req_id, req_provider, req_key, params_str, req_priority, created_at = row
-
-                    # Mark as processing
                     await connection.execute(
                         """
                         UPDATE pending_requests
                         SET status = 'processing', attempts = attempts + 1, last_attempt = ?
                         WHERE request_id = ?
                         """,
-                        (time.time(), req_id),
+                        (time.time(), row[0]),
                     )
                     await connection.commit()
 
                     result = {
-                        "request_id": req_id,
-                        "provider": req_provider,
-                        "request_key": req_key,
-                        "params": orjson.loads(params_str),
-                        "priority": req_priority,
-                        "created_at": created_at,
+                        "request_id": row[0],
+                        "provider": row[1],
+                        "request_key": row[2],
+                        "params": orjson.loads(row[3]),
+                        "priority": row[4],
+                        "created_at": row[5],
+                        "schedule_class": row[6],
+                        "deadline": row[7],
                     }
 
-            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_get_next)
+            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_claim)
             return result
 
         except Exception as error:  # pylint: disable=broad-exception-caught
             logging.error("Failed to get next request: %s", error)
             return None
 
-    async def get_next_batch(self, limit: int = 10) -> list[dict[str, Any]]:
-        """Return one pending request per data_type at the lowest priority tier,
-        then fill remaining slots with any other pending items up to limit.
-
-        This round-robin approach ensures one thumbnail, one logo, and one banner
-        are all downloaded before a second of any type starts — preventing a pile
-        of thumbnails from starving banners.
-        """
-        await self.initialize()
-        results: list[dict[str, Any]] = []
-
-        try:
-            now = time.time()
-
-            async def _do_get_batch() -> None:
-                nonlocal results
-                async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
-                    # One item per data_type at the current minimum priority.
-                    # Explicit subquery picks the latest row per data_type unambiguously.
-                    cursor = await connection.execute(
-                        """
-                        SELECT pr.request_id, pr.provider, pr.request_key,
-                               pr.params, pr.priority, pr.created_at
-                        FROM pending_requests pr
-                        INNER JOIN (
-                            SELECT data_type, MAX(created_at) AS max_created_at
-                            FROM pending_requests
-                            WHERE status = 'pending'
-                              AND priority = (
-                                  SELECT MIN(priority)
-                                  FROM pending_requests
-                                  WHERE status = 'pending'
-                              )
-                            GROUP BY data_type
-                        ) latest
-                          ON pr.data_type = latest.data_type
-                         AND pr.created_at = latest.max_created_at
-                        WHERE pr.status = 'pending'
-                          AND pr.priority = (
-                              SELECT MIN(priority)
-                              FROM pending_requests
-                              WHERE status = 'pending'
-                          )
-                        ORDER BY pr.created_at DESC
-                        LIMIT ?
-                        """,
-                        (limit,),
-                    )
-                    rows: list = list(await cursor.fetchall())
-                    ids = [r[0] for r in rows]
-
-                    # If we have room, fill with remaining items at any priority.
-                    if len(rows) < limit:
-                        if ids:
-                            placeholders = ",".join("?" * len(ids))
-                            extra_cursor = await connection.execute(
-                                f"""
-                                SELECT request_id, provider, request_key, params, priority, created_at
-                                FROM pending_requests
-                                WHERE status = 'pending'
-                                  AND request_id NOT IN ({placeholders})
-                                ORDER BY priority ASC, created_at DESC
-                                LIMIT ?
-                                """,
-                                (*ids, limit - len(rows)),
-                            )
-                        else:
-                            extra_cursor = await connection.execute(
-                                """
-                                SELECT request_id, provider, request_key,
-                                       params, priority, created_at
-                                FROM pending_requests
-                                WHERE status = 'pending'
-                                ORDER BY priority ASC, created_at DESC
-                                LIMIT ?
-                                """,
-                                (limit,),
-                            )
-                        rows = list(rows) + list(await extra_cursor.fetchall())
-                        ids = [r[0] for r in rows]
-
-                    if not ids:
-                        return
-
-                    placeholders = ",".join("?" * len(ids))
-                    await connection.execute(
-                        f"""
-                        UPDATE pending_requests
-                        SET status = 'processing', attempts = attempts + 1, last_attempt = ?
-                        WHERE request_id IN ({placeholders})
-                        """,
-                        (now, *ids),
-                    )
-                    await connection.commit()
-
-                    results = [
-                        {
-                            "request_id": r[0],
-                            "provider": r[1],
-                            "request_key": r[2],
-                            "params": orjson.loads(r[3]),
-                            "priority": r[4],
-                            "created_at": r[5],
-                        }
-                        for r in rows
-                    ]
-
-            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_get_batch)
-            return results
-
-        except Exception as error:  # pylint: disable=broad-exception-caught
-            logging.error("Failed to get next batch: %s", error)
-            return []
-
     async def complete_request(self, request_id: str, success: bool = True) -> bool:
         """
         Mark a request as completed or failed.
@@ -7,8 +7,14 @@ This module now only contains rate limiting utilities.
 
 import asyncio
 import logging
+import sqlite3
 import time
 from dataclasses import dataclass, field
+from pathlib import Path
+
+import nowplaying.utils.sqlite
+
+from .utils import ensure_datacache_schema, get_datacache_path
 
 
 class RateLimiter:
@@ -79,11 +85,81 @@ class RateLimiter:
         return (1.0 - self.tokens) / self.rate
 
 
+class SharedRateLimiter:  # pylint: disable=too-few-public-methods
+    """
+    Per-provider rate limiting that holds across processes.
+
+    A RateLimiter's bucket lives in one process, so trackpoll, the datacache
+    worker and a playlist enrichment job would each get the provider's full
+    rate.  This one keeps the next free request slot in the datacache
+    database: each caller reserves the slot after the last one handed out,
+    under a write lock, then sleeps until it comes round.
+    """
+
+    def __init__(
+        self, provider: str, requests_per_second: float = 1.0, cache_dir: Path | None = None
+    ):
+        self.provider = provider
+        self.rate = requests_per_second
+        self.database_path = get_datacache_path(cache_dir)
+        self._initialized = False
+        # Used if the database cannot be reached, so lookups are still paced
+        self._fallback = RateLimiter(provider, requests_per_second)
+
+    def _reserve(self, timeout: float) -> float | None:
+        """Claim the next free slot; None if it is more than timeout away"""
+        if not self._initialized:
+            ensure_datacache_schema(self.database_path)
+            self._initialized = True
+        with nowplaying.utils.sqlite.sqlite_connection(str(self.database_path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT next_slot FROM rate_slots WHERE provider = ?", (self.provider,)
+            ).fetchone()
+            now = time.time()
+            slot = max(now, row[0]) if row else now
+            if slot - now > timeout:
+                return None
+            conn.execute(
+                "INSERT INTO rate_slots (provider, next_slot) VALUES (?, ?) "
+                "ON CONFLICT(provider) DO UPDATE SET next_slot = excluded.next_slot",
+                (self.provider, slot + 1.0 / self.rate),
+            )
+            return slot
+
+    async def acquire(self, timeout: float = 30.0) -> bool:
+        """
+        Acquire a request slot shared with every other process.
+
+        Args:
+            timeout: Maximum time to wait for a slot
+
+        Returns:
+            True if a slot was acquired, False if timeout
+        """
+        try:
+            slot = await asyncio.to_thread(
+                nowplaying.utils.sqlite.retry_sqlite_operation, lambda: self._reserve(timeout)
+            )
+        except sqlite3.Error as error:
+            logging.warning("Shared rate limit for %s unavailable: %s", self.provider, error)
+            return await self._fallback.acquire(timeout)
+
+        if slot is None:
+            logging.warning("Rate limit timeout for provider %s", self.provider)
+            return False
+        if (delay := slot - time.time()) > 0:
+            await asyncio.sleep(delay)
+        return True
+
+
 @dataclass
 class RateLimiterManager:
     """Manages rate limiters for different providers"""
 
     rate_limiters: dict[str, RateLimiter] = field(default_factory=dict)
+    shared_limiters: dict[str, SharedRateLimiter] = field(default_factory=dict)
+    cache_dir: Path | None = None
     _default_rates: dict[str, float] = field(
         default_factory=lambda: {
             "musicbrainz": 1.0,  # MusicBrainz: 1 req/sec
@@ -94,6 +170,7 @@ class RateLimiterManager:
             "cdn": 10.0,  # CDN image downloads: no meaningful limit
             "wikimedia": 10.0,  # Wikimedia: generous
             "images": 5.0,  # Image fetches: internal
+            "acoustid": 3.0,  # AcoustID: 3 req/sec per client
         }
     )
 
@@ -104,6 +181,13 @@ class RateLimiterManager:
             self.rate_limiters[provider] = RateLimiter(provider, rate)
         return self.rate_limiters[provider]
 
+    def get_shared_limiter(self, provider: str) -> SharedRateLimiter:
+        """Get or create the cross-process rate limiter for provider"""
+        if provider not in self.shared_limiters:
+            rate = self._default_rates.get(provider, 1.0)
+            self.shared_limiters[provider] = SharedRateLimiter(provider, rate, self.cache_dir)
+        return self.shared_limiters[provider]
+
 
 # Global rate limiter manager instance
 _rate_limiter_manager: RateLimiterManager | None = None  # pylint: disable=invalid-name
@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """Generic async storage layer for datacache: JSON, binary blobs, and metadata with TTL."""
 
 import asyncio
@@ -6,8 +7,10 @@ import dataclasses
 import hashlib
 import io
 import logging
+import random as random_module
 import time
 import uuid
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Literal, overload
 
@@ -16,12 +19,18 @@ import PIL.Image
 import puremagic
 
 import aiofiles
+import aiofiles.os
 import aiosqlite
 
 import nowplaying.exceptions
 import nowplaying.utils.sqlite
 from .colors import COLOR_EXTRACT_TYPES, extract_palettes
-from .utils import ensure_datacache_schema, get_datacache_path, redact_url
+from .utils import (
+    ensure_datacache_schema,
+    get_datacache_path,
+    redact_url,
+    sweep_unreferenced_blobs,
+)
 
 
 @dataclasses.dataclass
@@ -43,6 +52,44 @@ class CachedEntry:  # pylint: disable=too-many-instance-attributes
     color_palette: dict | None = None  # cover_palette/lighting/type extracted by colors.py
 
 
+@dataclasses.dataclass
+class _RandomCandidates:
+    """Rowids eligible for a random pick of one (identifier, data_type, provider).
+
+    Valid while identifier_generations still reports the generation it was loaded
+    at.  last_rowid survives a reload so shuffle order does not repeat an image
+    across the boundary.
+    """
+
+    generation: int | None
+    rowids: list[int]
+    last_rowid: int | None = None
+    _order: list[int] = dataclasses.field(default_factory=list)
+
+    def pick(self, shuffle: bool) -> int | None:
+        """Next rowid: uniformly random, or the next of a shuffled pass when shuffle."""
+        if not self.rowids:
+            return None
+        if not shuffle:
+            rowid = random_module.choice(self.rowids)
+        else:
+            if not self._order:
+                self._order = random_module.sample(self.rowids, len(self.rowids))
+                # Drawn from the end, so keep the previous pick away from the end
+                if len(self._order) > 1 and self._order[-1] == self.last_rowid:
+                    self._order[0], self._order[-1] = self._order[-1], self._order[0]
+            rowid = self._order.pop()
+        self.last_rowid = rowid
+        return rowid
+
+    def discard(self, rowid: int) -> None:
+        """Forget a rowid that no longer resolves to a live row."""
+        with contextlib.suppress(ValueError):
+            self.rowids.remove(rowid)
+        with contextlib.suppress(ValueError):
+            self._order.remove(rowid)
+
+
 # Module-level lock for schema operations
 _schema_lock = asyncio.Lock()
 
@@ -50,6 +97,15 @@ _schema_lock = asyncio.Lock()
 # Production data shows API responses are consistently < 30 KB, images consistently > 16 KB.
 _INLINE_THRESHOLD = 16 * 1024
 
+# (identifier, data_type, provider) candidate lists kept per DataStorage instance
+_RANDOM_CACHE_SIZE = 512
+
+# Stale rowids tried per random pick before giving up on the cached candidate list
+_RANDOM_ATTEMPTS = 4
+
+# Rows read and deleted per transaction by evict_lfu()
+_EVICT_BATCH = 500
+
 # Canonical set of image data_types — shared between evict_lfu(), client._IMAGE_DATA_TYPES,
 # and queue priority logic so all three stay in sync as types evolve.
 IMAGE_DATA_TYPES: frozenset[str] = frozenset(
@@ -138,17 +194,59 @@ def _mime_for_storage(url: str, data_value: bytes, data_type: str, status_code:
         return None
 
 
-def _get_blob_path(cache_dir: Path, url: str) -> Path:
+async def _sum_cache_sizes(
+    connection: aiosqlite.Connection, data_types: Iterable[str] | None = None
+) -> int:
+    """Total of the cache_sizes counters for data_types (all types when None)."""
+    if data_types is None:
+        cursor = await connection.execute("SELECT SUM(total_size) FROM cache_sizes")
+    else:
+        types = tuple(data_types)
+        placeholders = ",".join("?" * len(types))
+        cursor = await connection.execute(
+            f"SELECT SUM(total_size) FROM cache_sizes WHERE data_type IN ({placeholders})",
+            types,
+        )
+    row = await cursor.fetchone()
+    return row[0] if row and row[0] else 0
+
+
+def _get_blob_path(cache_dir: Path, content_checksum: str) -> Path:
     """
     Get the filesystem path for storing a binary blob.
 
     Uses a 4-char prefix across two directory levels (65,536 leaf dirs) to keep
     per-directory file counts low on NTFS where Windows Defender and directory
     performance degrade past a few hundred files per directory.
-    Content-addressed by URL hash so the same URL always maps to the same file.
+    Content-addressed by SHA-256 so the same bytes reached through different URLs
+    (mirrors, CDN variants, one cover shared by several releases) share a file;
+    the blob_files table counts the rows pointing at it.
     """
-    url_hash = hashlib.sha256(url.encode()).hexdigest()
-    return cache_dir / "blobs" / url_hash[:2] / url_hash[2:4] / f"{url_hash[4:]}.bin"
+    return (
+        cache_dir
+        / "blobs"
+        / content_checksum[:2]
+        / content_checksum[2:4]
+        / f"{content_checksum[4:]}.bin"
+    )
+
+
+async def _write_blob(blob_path: Path, data_value: bytes) -> None:
+    """Write a blob via a temp file and rename so a reader never sees a partial file.
+
+    Two processes storing the same content race for the same path; the rename makes
+    whichever finishes last win with identical bytes rather than interleaving writes.
+    """
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = blob_path.with_name(f"{blob_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        async with aiofiles.open(temp_path, "wb") as fh:
+            await fh.write(data_value)
+        await aiofiles.os.replace(temp_path, blob_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            temp_path.unlink()
+        raise
 
 
 class DataStorage:
@@ -158,6 +256,8 @@ class DataStorage:
         self.database_path = get_datacache_path(database_path)
         self._initialized = False
         self._lock = asyncio.Lock()
+        # Insertion-ordered for LRU eviction; see _retrieve_random()
+        self._random_candidates: dict[tuple[str, str, str | None], _RandomCandidates] = {}
 
     async def initialize(self) -> None:
         """Initialize the database schema"""
@@ -196,7 +296,7 @@ class DataStorage:
         await self.initialize()
 
         blob_path: Path | None = None
-        blob_written = False
+        blob_created = False
 
         try:
             now = time.time()
@@ -214,11 +314,12 @@ class DataStorage:
                 inline_data: bytes | None = data_value
                 file_path_str: str | None = None
             else:
-                blob_path = _get_blob_path(self.database_path.parent, url)
-                blob_path.parent.mkdir(parents=True, exist_ok=True)
-                async with aiofiles.open(blob_path, "wb") as fh:
-                    await fh.write(data_value)
-                blob_written = True
+                blob_path = _get_blob_path(self.database_path.parent, content_checksum)
+                # Identical bytes are already on disk when another URL stored them;
+                # only the row's reference is new.
+                if not blob_path.exists():
+                    await _write_blob(blob_path, data_value)
+                    blob_created = True
                 inline_data = None
                 file_path_str = str(blob_path.relative_to(self.database_path.parent))
 
@@ -249,6 +350,11 @@ class DataStorage:
                           data_size = excluded.data_size,
                           status_code = excluded.status_code,
                           mime_type = excluded.mime_type,
+                          -- a palette describes the bytes, so new content drops it
+                          color_palette = CASE
+                            WHEN cached_data.content_checksum = excluded.content_checksum
+                            THEN cached_data.color_palette
+                          END,
                           content_checksum = excluded.content_checksum
                         """,
                         (
@@ -291,6 +397,11 @@ class DataStorage:
 
             await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_store)
 
+            if blob_path and not blob_path.exists():
+                # A sweep saw the file at refcount 0 and unlinked it after the
+                # existence check above but before this row's reference landed.
+                await _write_blob(blob_path, data_value)
+
             if not stored_cachekey:
                 # The row must exist after a successful upsert, so this means the SQL
                 # above stopped doing what it is assumed to do.  Fail rather than
@@ -306,7 +417,7 @@ class DataStorage:
             # been confirmed to be an image by the check above.
             if status_code == 200 and data_type in COLOR_EXTRACT_TYPES:
                 asyncio.create_task(
-                    self._extract_and_store_colors(url, data_value),
+                    self._extract_and_store_colors(url, data_value, content_checksum),
                     name=f"colors:{url[:60]}",
                 )
 
@@ -326,23 +437,49 @@ class DataStorage:
             raise
         except Exception as error:  # pylint: disable=broad-exception-caught
             logging.error("Failed to store cached data for URL %s: %s", redact_url(url), error)
-            if blob_written and blob_path:
+            # Only a file this call created: an existing one belongs to other rows.
+            if blob_created and blob_path:
                 with contextlib.suppress(OSError):
                     blob_path.unlink()
             return None
 
-    async def _extract_and_store_colors(self, url: str, data_value: bytes) -> None:
-        """Run color extraction and write result to the dedicated color_palette column."""
+    async def _extract_and_store_colors(
+        self, url: str, data_value: bytes, content_checksum: str
+    ) -> None:
+        """Run color extraction and write result to the dedicated color_palette column.
+
+        Another row holding the same bytes already has the answer, so its palette is
+        copied rather than extracted again.
+        """
         try:
-            if not (colors := await extract_palettes(data_value)):
+
+            async def _do_lookup() -> str | None:
+                async with aiosqlite.connect(str(self.database_path), timeout=30.0) as conn:
+                    cursor = await conn.execute(
+                        "SELECT color_palette FROM cached_data"
+                        " WHERE content_checksum = ? AND color_palette IS NOT NULL LIMIT 1",
+                        (content_checksum,),
+                    )
+                    row = await cursor.fetchone()
+                    return row[0] if row else None
+
+            if palette_json := await nowplaying.utils.sqlite.retry_sqlite_operation_async(
+                _do_lookup
+            ):
+                colors = orjson.loads(palette_json)
+            elif not (colors := await extract_palettes(data_value, checksum=content_checksum)):
                 return
 
             async def _do_update() -> None:
                 async with aiosqlite.connect(str(self.database_path), timeout=30.0) as conn:
+                    # Take the write lock before reading anything, so the busy timeout
+                    # waits out a store or eviction in progress instead of the update
+                    # failing to upgrade a read snapshot that writer has moved past.
+                    await conn.execute("BEGIN IMMEDIATE")
                     await conn.execute(
                         "UPDATE cached_data SET color_palette = ?"
-                        " WHERE url = ? AND color_palette IS NULL",
-                        (orjson.dumps(colors).decode(), url),
+                        " WHERE url = ? AND content_checksum = ? AND color_palette IS NULL",
+                        (orjson.dumps(colors).decode(), url, content_checksum),
                     )
                     await conn.commit()
 
@@ -608,6 +745,7 @@ class DataStorage:
         data_type: str,
         provider: str | None = ...,
         random: Literal[True] = ...,
+        shuffle: bool = ...,
     ) -> "CachedEntry | None": ...
 
     @overload
@@ -617,10 +755,16 @@ class DataStorage:
         data_type: str,
         provider: str | None = ...,
         random: Literal[False] = ...,
+        shuffle: bool = ...,
     ) -> "list[CachedEntry]": ...
 
-    async def retrieve_by_identifier(  # pylint: disable=too-many-locals
-        self, identifier: str, data_type: str, provider: str | None = None, random: bool = False
+    async def retrieve_by_identifier(  # pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments
+        self,
+        identifier: str,
+        data_type: str,
+        provider: str | None = None,
+        random: bool = False,
+        shuffle: bool = False,
     ) -> "list[CachedEntry] | CachedEntry | None":
         """
         Retrieve data from cache by identifier and data type.
@@ -634,6 +778,9 @@ class DataStorage:
             random: If True, fetch one random item including its blob data;
                     if False, return CachedEntry list without loading blobs
                     (call retrieve_by_url for the specific blob you need)
+            shuffle: With random=True, walk the candidates in a shuffled order
+                     instead of drawing independently, so no image repeats until
+                     all have been shown and never twice in a row
 
         Returns:
             If random=True: Single CachedEntry or None
@@ -641,6 +788,9 @@ class DataStorage:
         """
         await self.initialize()
 
+        if random:
+            return await self._retrieve_random(identifier, data_type, provider, shuffle)
+
         try:
             now = time.time()
             rows: list[Any] = []
@@ -648,18 +798,8 @@ class DataStorage:
             async def _do_retrieve() -> None:
                 nonlocal rows
                 async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
-                    if random:
-                        select_cols = (
-                            "data_value, file_path, metadata, url,"
-                            " status_code, mime_type, color_palette, cachekey"
-                        )
-                        order_limit = " ORDER BY RANDOM() LIMIT 1"
-                    else:
-                        # Only fetch metadata and url — caller uses retrieve_by_url for blobs
-                        select_cols = (
-                            "metadata, url, status_code, mime_type, color_palette, cachekey"
-                        )
-                        order_limit = ""
+                    # Only fetch metadata and url — caller uses retrieve_by_url for blobs
+                    select_cols = "metadata, url, status_code, mime_type, color_palette, cachekey"
 
                     if provider:
                         query = f"""
@@ -679,24 +819,13 @@ class DataStorage:
                         """
                         params = (identifier, data_type, now)
 
-                    query += order_limit
                     cursor = await connection.execute(query, params)
-
-                    if random:
-                        row = await cursor.fetchone()
-                        rows = [tuple(row)] if row else []
-                    else:
-                        rows = [tuple(r) for r in await cursor.fetchall()]
+                    rows = [tuple(r) for r in await cursor.fetchall()]
 
                     if not rows:
                         return
 
                     # Update access statistics for all returned rows
-                    # random row: (data_value, file_path, metadata, url, status_code,
-                    #              mime_type, color_palette, cachekey)
-                    # non-random row: (metadata, url, status_code, mime_type,
-                    #                   color_palette, cachekey)
-                    url_col = 3 if random else 1
                     for row in rows:
                         await connection.execute(
                             """
@@ -704,17 +833,14 @@ class DataStorage:
                             SET access_count = access_count + 1, last_accessed = ?
                             WHERE url = ? AND last_accessed < ?
                             """,
-                            (now, row[url_col], now - 300),
+                            (now, row[1], now - 300),
                         )
                     await connection.commit()
 
             await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_retrieve)
 
             if not rows:
-                return None if random else []
-
-            if random:
-                return await self._load_random_blob(rows[0], identifier, data_type)
+                return []
 
             return [
                 CachedEntry(
@@ -740,7 +866,102 @@ class DataStorage:
             logging.error(
                 "Failed to retrieve cached data for %s/%s: %s", identifier, data_type, error
             )
-            return None if random else []
+            return []
+
+    async def _retrieve_random(  # pylint: disable=too-many-locals
+        self, identifier: str, data_type: str, provider: str | None, shuffle: bool
+    ) -> "CachedEntry | None":
+        """Pick one live row for identifier/data_type without sorting the candidates.
+
+        ORDER BY RANDOM() materialised and sorted every matching row per call, and the
+        fanart streamer and trackpoll call this constantly.  Instead the candidate
+        rowids are cached here and revalidated against identifier_generations, which
+        triggers bump on any insert, delete or relevant update -- from any process --
+        so a pick costs two primary-key lookups.  A picked rowid is re-checked against
+        identifier, data_type and expiry because rows can expire in place and VACUUM
+        may renumber rowids without firing triggers.
+        """
+        key = (identifier, data_type, provider)
+        try:
+            now = time.time()
+            rows: list[tuple] = []
+
+            async def _do_pick() -> None:
+                async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
+                    cursor = await connection.execute(
+                        "SELECT generation FROM identifier_generations"
+                        " WHERE identifier = ? AND data_type = ?",
+                        (identifier, data_type),
+                    )
+                    row = await cursor.fetchone()
+                    generation = row[0] if row else None
+
+                    candidates = self._random_candidates.pop(key, None)
+                    if candidates is None or candidates.generation != generation:
+                        provider_clause = " AND provider = ?" if provider else ""
+                        cursor = await connection.execute(
+                            f"""
+                            SELECT rowid FROM cached_data
+                            WHERE identifier = ? AND data_type = ?{provider_clause}
+                              AND expires_at > ? AND status_code = 200
+                            """,
+                            (identifier, data_type, *((provider,) if provider else ()), now),
+                        )
+                        candidates = _RandomCandidates(
+                            generation=generation,
+                            rowids=[r[0] for r in await cursor.fetchall()],
+                            last_rowid=candidates.last_rowid if candidates else None,
+                        )
+                    # Re-inserted at the end: the dict doubles as an LRU
+                    self._random_candidates[key] = candidates
+                    while len(self._random_candidates) > _RANDOM_CACHE_SIZE:
+                        del self._random_candidates[next(iter(self._random_candidates))]
+
+                    for _ in range(_RANDOM_ATTEMPTS):
+                        if (rowid := candidates.pick(shuffle)) is None:
+                            return
+                        cursor = await connection.execute(
+                            """
+                            SELECT data_value, file_path, metadata, url,
+                                   status_code, mime_type, color_palette, cachekey, provider
+                            FROM cached_data
+                            WHERE rowid = ? AND identifier = ? AND data_type = ?
+                              AND expires_at > ? AND status_code = 200
+                            """,
+                            (rowid, identifier, data_type, now),
+                        )
+                        if (row := await cursor.fetchone()) and (
+                            not provider or row[8] == provider
+                        ):
+                            rows.append(tuple(row[:8]))
+                            break
+                        candidates.discard(rowid)
+                    else:
+                        # Too many misses to trust the list; reload it next time
+                        self._random_candidates.pop(key, None)
+                        return
+
+                    await connection.execute(
+                        """
+                        UPDATE cached_data
+                        SET access_count = access_count + 1, last_accessed = ?
+                        WHERE url = ? AND last_accessed < ?
+                        """,
+                        (now, rows[0][3], now - 300),
+                    )
+                    await connection.commit()
+
+            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_pick)
+
+            if not rows:
+                return None
+            return await self._load_random_blob(rows[0], identifier, data_type)
+
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logging.error(
+                "Failed to retrieve cached data for %s/%s: %s", identifier, data_type, error
+            )
+            return None
 
     async def get_cache_keys_for_identifier(
         self, identifier: str, data_type: str, provider: str | None = None
@@ -804,65 +1025,62 @@ class DataStorage:
 
         try:
             now = time.time()
-            expired_rows: list[tuple[str, str | None]] = []
-
-            async def _do_fetch() -> None:
-                async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
-                    cursor = await connection.execute(
-                        "SELECT url, file_path FROM cached_data WHERE expires_at <= ?",
-                        (now,),
-                    )
-                    expired_rows.extend((row[0], row[1]) for row in await cursor.fetchall())
-
-            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_fetch)
-
-            # Unlink blobs before deleting rows: a failed unlink leaves the row
-            # intact so the next maintenance cycle can retry. FileNotFoundError
-            # is safe — the file is already gone so the row can be deleted.
-            urls_to_delete: list[str] = []
-            for url, file_path in expired_rows:
-                if file_path:
-                    try:
-                        (self.database_path.parent / file_path).unlink()
-                        urls_to_delete.append(url)
-                    except FileNotFoundError:
-                        urls_to_delete.append(url)
-                    except OSError:
-                        logging.warning(
-                            "Failed to unlink blob %s; row kept for next cleanup", file_path
-                        )
-                else:
-                    urls_to_delete.append(url)
-
-            if not urls_to_delete:
-                return 0
-
             count = 0
-            placeholders = ",".join("?" * len(urls_to_delete))
 
             async def _do_delete() -> None:
                 nonlocal count
                 async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
                     cursor = await connection.execute(
-                        f"DELETE FROM cached_data WHERE url IN ({placeholders})",
-                        urls_to_delete,
+                        "DELETE FROM cached_data WHERE expires_at <= ?", (now,)
                     )
                     await connection.commit()
                     count = cursor.rowcount
 
             await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_delete)
+            # Blob files may still be shared with live rows, so they are removed by
+            # reference count rather than alongside the rows that pointed at them.
+            await self.sweep_blobs()
             return count
 
         except Exception as error:  # pylint: disable=broad-exception-caught
             logging.error("Failed to cleanup expired cache entries: %s", error)
             return 0
 
-    async def evict_lfu(self, size_limit_bytes: int = 2 * 1024 * 1024 * 1024) -> int:  # pylint: disable=too-many-locals
+    async def sweep_blobs(self) -> int:
+        """Unlink blob files no longer referenced by any entry. Returns files removed."""
+        await self.initialize()
+        return await asyncio.to_thread(sweep_unreferenced_blobs, self.database_path)
+
+    async def get_cache_size(self, data_types: Iterable[str] | None = None) -> int:
+        """Bytes on disk for the given data_types (all types when None).
+
+        Reads the trigger-maintained cache_sizes counters rather than summing rows,
+        so this stays cheap however large the cache grows.
+        """
+        await self.initialize()
+
+        total_size = 0
+
+        async def _do_size() -> None:
+            nonlocal total_size
+            async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
+                total_size = await _sum_cache_sizes(connection, data_types)
+
+        try:
+            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_size)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logging.error("Failed to read datacache size: %s", error)
+        return total_size
+
+    async def evict_lfu(self, size_limit_bytes: int = 2 * 1024 * 1024 * 1024) -> int:
         """Evict image entries by Least Frequently Used until total size is under the limit.
 
         Only image data_types are considered for eviction; API response entries (tiny,
-        infrequently re-fetched) are left alone. Blob files are deleted before their
-        DB rows to avoid orphaned files on partial failure.
+        infrequently re-fetched) are left alone.  The size comes from the cache_sizes
+        counters and victims are read off idx_lfu _EVICT_BATCH rows at a time, each
+        batch deleted in its own short transaction, so memory and lock time stay flat
+        whatever the cache size.  A blob file shared by several entries only counts as
+        freed once its last reference goes; the files are unlinked by sweep_blobs().
 
         Args:
             size_limit_bytes: Maximum total size for image entries (default 2 GB).
@@ -874,70 +1092,52 @@ class DataStorage:
 
         image_types = tuple(sorted(IMAGE_DATA_TYPES))
         placeholders = ",".join("?" * len(image_types))
-
-        total_size: int = 0
-        evict_candidates: list[tuple[str, str | None, int]] = []  # (url, file_path, data_size)
         evicted = 0
 
-        async def _do_check() -> None:
-            nonlocal total_size, evict_candidates
+        async def _do_evict_batch() -> int:
             async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
-                cursor = await connection.execute(
-                    f"SELECT SUM(data_size) FROM cached_data WHERE data_type IN ({placeholders})",
-                    image_types,
-                )
-                row = await cursor.fetchone()
-                total_size = row[0] if row and row[0] else 0
-                if total_size <= size_limit_bytes:
-                    return
+                remaining = await _sum_cache_sizes(connection, image_types)
+                if remaining <= size_limit_bytes:
+                    return 0
                 cursor = await connection.execute(
                     f"""
-                    SELECT url, file_path, data_size FROM cached_data
-                    WHERE data_type IN ({placeholders})
-                    ORDER BY access_count ASC, last_accessed ASC
+                    SELECT c.url, c.file_path, COALESCE(b.data_size, c.data_size),
+                           COALESCE(b.refcount, 1)
+                    FROM cached_data c LEFT JOIN blob_files b ON b.file_path = c.file_path
+                    WHERE c.data_type IN ({placeholders})
+                    ORDER BY c.access_count ASC, c.last_accessed ASC
+                    LIMIT ?
                     """,
-                    image_types,
+                    (*image_types, _EVICT_BATCH),
                 )
-                evict_candidates = [(r[0], r[1], r[2] or 0) for r in await cursor.fetchall()]
-
-        await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_check)
-
-        if total_size <= size_limit_bytes:
-            return 0
-
-        urls_to_delete: list[str] = []
-        remaining = total_size
-        for url, file_path, entry_size in evict_candidates:
-            if remaining <= size_limit_bytes:
-                break
-            if file_path:
-                try:
-                    (self.database_path.parent / file_path).unlink()
-                except FileNotFoundError:
-                    pass  # blob already gone; still remove the orphaned DB row
-                except OSError as err:
-                    logging.warning("LFU evict: could not delete blob %s: %s", file_path, err)
-                    continue  # keep both blob and row; retry next maintenance cycle
-            urls_to_delete.append(url)
-            remaining -= entry_size
-
-        if not urls_to_delete:
-            return 0
-
-        batch_placeholders = ",".join("?" * len(urls_to_delete))
-
-        async def _do_evict() -> None:
-            nonlocal evicted
-            async with aiosqlite.connect(str(self.database_path), timeout=30.0) as connection:
-                cursor = await connection.execute(
-                    f"DELETE FROM cached_data WHERE url IN ({batch_placeholders})",
-                    urls_to_delete,
+                urls_to_delete: list[str] = []
+                references: dict[str, int] = {}
+                for url, file_path, entry_size, refcount in await cursor.fetchall():
+                    if remaining <= size_limit_bytes:
+                        break
+                    urls_to_delete.append(url)
+                    if file_path:
+                        references[file_path] = references.get(file_path, refcount or 1) - 1
+                        if references[file_path] > 0:
+                            continue  # another entry still holds the blob
+                    remaining -= entry_size or 0
+
+                if not urls_to_delete:
+                    return 0
+                await connection.executemany(
+                    "DELETE FROM cached_data WHERE url = ?",
+                    [(url,) for url in urls_to_delete],
                 )
                 await connection.commit()
-                evicted = cursor.rowcount
+                return len(urls_to_delete)
+
+        while batch_evicted := await nowplaying.utils.sqlite.retry_sqlite_operation_async(
+            _do_evict_batch
+        ):
+            evicted += batch_evicted
 
-        await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_evict)
         if evicted:
+            await self.sweep_blobs()
             logging.info(
                 "LFU eviction: removed %d image entries to stay under size limit", evicted
             )
@@ -79,14 +79,160 @@ def ensure_datacache_schema(database_path: Path) -> None:
                 created_at INTEGER NOT NULL,
                 attempts INTEGER DEFAULT 0,
                 last_attempt INTEGER DEFAULT 0,
-                status TEXT DEFAULT 'pending'  -- pending, processing, completed, failed
+                status TEXT DEFAULT 'pending',  -- pending, processing, completed, failed
+                sched_class INTEGER NOT NULL DEFAULT 2,  -- 0=now playing, 1=next up, 2=background
+                deadline REAL  -- created_at plus the class's latency budget
             );
 
+            -- Next free request slot per provider, shared by every process that
+            -- calls a rate-limited service (see queue.SharedRateLimiter).
+            CREATE TABLE IF NOT EXISTS rate_slots (
+                provider TEXT PRIMARY KEY,
+                next_slot REAL NOT NULL  -- Unix time the next request may go out
+            );
+
+            -- One row per blob file on disk.  Blob paths are derived from the content
+            -- checksum, so identical bytes fetched from different URLs share a file;
+            -- refcount is the number of cached_data rows pointing at it and is kept
+            -- by the triggers below, so every DELETE path stays correct without
+            -- knowing about sharing.  Files at refcount 0 are unlinked by
+            -- sweep_unreferenced_blobs().  The triggers use INSERT ... WHERE NOT
+            -- EXISTS rather than INSERT OR IGNORE because store()'s upsert imposes
+            -- its own conflict policy on every statement a trigger runs.
+            CREATE TABLE IF NOT EXISTS blob_files (
+                file_path TEXT PRIMARY KEY,  -- Relative to the datacache directory
+                refcount INTEGER NOT NULL DEFAULT 0,
+                data_size INTEGER NOT NULL DEFAULT 0,
+                data_type TEXT NOT NULL DEFAULT ''  -- cache_sizes bucket the file counts in
+            );
+
+            CREATE TRIGGER IF NOT EXISTS blob_ref_insert AFTER INSERT ON cached_data
+            WHEN NEW.file_path IS NOT NULL
+            BEGIN
+                INSERT INTO blob_files (file_path, refcount, data_size, data_type)
+                    SELECT NEW.file_path, 0, NEW.data_size, NEW.data_type
+                    WHERE NOT EXISTS (SELECT 1 FROM blob_files WHERE file_path = NEW.file_path);
+                UPDATE blob_files SET refcount = refcount + 1 WHERE file_path = NEW.file_path;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS blob_ref_delete AFTER DELETE ON cached_data
+            WHEN OLD.file_path IS NOT NULL
+            BEGIN
+                UPDATE blob_files SET refcount = refcount - 1 WHERE file_path = OLD.file_path;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS blob_ref_update AFTER UPDATE OF file_path ON cached_data
+            WHEN OLD.file_path IS NOT NEW.file_path
+            BEGIN
+                UPDATE blob_files SET refcount = refcount - 1 WHERE file_path = OLD.file_path;
+                INSERT INTO blob_files (file_path, refcount, data_size, data_type)
+                    SELECT NEW.file_path, 0, NEW.data_size, NEW.data_type
+                    WHERE NEW.file_path IS NOT NULL
+                      AND NOT EXISTS (SELECT 1 FROM blob_files WHERE file_path = NEW.file_path);
+                UPDATE blob_files SET refcount = refcount + 1 WHERE file_path = NEW.file_path;
+            END;
+
+            -- Bytes on disk per data_type, kept current by triggers so size checks
+            -- read a handful of rows instead of summing the whole cache.  Inline
+            -- content counts against its own row's type; a blob file counts once,
+            -- against the type of the row that first stored it, from the moment it
+            -- gains its first reference until it loses its last.
+            CREATE TABLE IF NOT EXISTS cache_sizes (
+                data_type TEXT PRIMARY KEY,
+                total_size INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cached_data
+            WHEN NEW.file_path IS NULL
+            BEGIN
+                INSERT INTO cache_sizes (data_type) SELECT NEW.data_type
+                    WHERE NOT EXISTS (SELECT 1 FROM cache_sizes WHERE data_type = NEW.data_type);
+                UPDATE cache_sizes SET total_size = total_size + NEW.data_size
+                    WHERE data_type = NEW.data_type;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cached_data
+            WHEN OLD.file_path IS NULL
+            BEGIN
+                UPDATE cache_sizes SET total_size = total_size - OLD.data_size
+                    WHERE data_type = OLD.data_type;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cache_size_update
+            AFTER UPDATE OF file_path, data_size, data_type ON cached_data
+            BEGIN
+                UPDATE cache_sizes SET total_size = total_size - OLD.data_size
+                    WHERE data_type = OLD.data_type AND OLD.file_path IS NULL;
+                INSERT INTO cache_sizes (data_type) SELECT NEW.data_type
+                    WHERE NEW.file_path IS NULL
+                      AND NOT EXISTS (SELECT 1 FROM cache_sizes WHERE data_type = NEW.data_type);
+                UPDATE cache_sizes SET total_size = total_size + NEW.data_size
+                    WHERE data_type = NEW.data_type AND NEW.file_path IS NULL;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cache_size_blob AFTER UPDATE OF refcount ON blob_files
+            WHEN (OLD.refcount > 0) != (NEW.refcount > 0)
+            BEGIN
+                INSERT INTO cache_sizes (data_type) SELECT NEW.data_type
+                    WHERE NOT EXISTS (SELECT 1 FROM cache_sizes WHERE data_type = NEW.data_type);
+                UPDATE cache_sizes
+                    SET total_size = total_size
+                        + CASE WHEN NEW.refcount > 0 THEN NEW.data_size ELSE -NEW.data_size END
+                    WHERE data_type = NEW.data_type;
+            END;
+
+            -- Bumped whenever the set of rows for an (identifier, data_type) can have
+            -- changed, so DataStorage can keep its random-pick candidate lists in
+            -- memory and revalidate them with one primary-key lookup -- including
+            -- against rows stored or evicted by another process.
+            CREATE TABLE IF NOT EXISTS identifier_generations (
+                identifier TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                generation INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (identifier, data_type)
+            );
+
+            CREATE TRIGGER IF NOT EXISTS generation_insert AFTER INSERT ON cached_data
+            BEGIN
+                INSERT INTO identifier_generations (identifier, data_type)
+                    SELECT NEW.identifier, NEW.data_type
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM identifier_generations
+                        WHERE identifier = NEW.identifier AND data_type = NEW.data_type);
+                UPDATE identifier_generations SET generation = generation + 1
+                    WHERE identifier = NEW.identifier AND data_type = NEW.data_type;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS generation_delete AFTER DELETE ON cached_data
+            BEGIN
+                UPDATE identifier_generations SET generation = generation + 1
+                    WHERE identifier = OLD.identifier AND data_type = OLD.data_type;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS generation_update
+            AFTER UPDATE OF identifier, data_type, provider, status_code, expires_at
+            ON cached_data
+            BEGIN
+                UPDATE identifier_generations SET generation = generation + 1
+                    WHERE identifier = OLD.identifier AND data_type = OLD.data_type;
+                INSERT INTO identifier_generations (identifier, data_type)
+                    SELECT NEW.identifier, NEW.data_type
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM identifier_generations
+                        WHERE identifier = NEW.identifier AND data_type = NEW.data_type);
+                UPDATE identifier_generations SET generation = generation + 1
+                    WHERE identifier = NEW.identifier AND data_type = NEW.data_type;
+            END;
+
             CREATE INDEX IF NOT EXISTS idx_identifier_type ON cached_data(identifier, data_type);
+            CREATE INDEX IF NOT EXISTS idx_file_path ON cached_data(file_path);
+            CREATE INDEX IF NOT EXISTS idx_blob_refcount ON blob_files(refcount);
             CREATE INDEX IF NOT EXISTS idx_cachekey ON cached_data(cachekey);
+            CREATE INDEX IF NOT EXISTS idx_content_checksum ON cached_data(content_checksum);
             CREATE INDEX IF NOT EXISTS idx_provider ON cached_data(provider);
             CREATE INDEX IF NOT EXISTS idx_expires_at ON cached_data(expires_at);
             CREATE INDEX IF NOT EXISTS idx_last_accessed ON cached_data(last_accessed);
+            CREATE INDEX IF NOT EXISTS idx_lfu ON cached_data(access_count, last_accessed);
             CREATE INDEX IF NOT EXISTS idx_status_code ON cached_data(status_code);
 
             CREATE INDEX IF NOT EXISTS idx_pending_provider ON pending_requests(provider);
@@ -94,13 +240,114 @@ def ensure_datacache_schema(database_path: Path) -> None:
             CREATE INDEX IF NOT EXISTS idx_pending_status ON pending_requests(status);
             CREATE INDEX IF NOT EXISTS idx_pending_created ON pending_requests(created_at);
             CREATE INDEX IF NOT EXISTS idx_pending_type ON pending_requests(priority, data_type, status);
+            CREATE INDEX IF NOT EXISTS idx_pending_sched
+                ON pending_requests(status, sched_class, priority, created_at);
             """
 
+            # Caches written before the bookkeeping tables existed have rows the
+            # triggers never saw; count them once, when the triggers are first created.
+            def _missing_trigger(name: str) -> bool:
+                return (
+                    conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                        (name,),
+                    ).fetchone()
+                    is None
+                )
+
+            needs_blob_backfill = _missing_trigger("blob_ref_insert")
+            needs_size_backfill = _missing_trigger("cache_size_insert")
+
+            def _columns(table: str) -> set[str]:
+                return {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+            # Columns added after their table first shipped.  They go in before the
+            # script below creates the triggers and indexes that read them.
+            pending_columns = _columns("pending_requests")
+            if pending_columns and "sched_class" not in pending_columns:
+                conn.execute(
+                    "ALTER TABLE pending_requests ADD COLUMN sched_class INTEGER NOT NULL DEFAULT 2"
+                )
+                conn.execute("ALTER TABLE pending_requests ADD COLUMN deadline REAL")
+
             conn.executescript(schema_sql)
 
+            if needs_blob_backfill:
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO blob_files (file_path, refcount, data_size, data_type)
+                    SELECT file_path, COUNT(*), MAX(data_size), MIN(data_type) FROM cached_data
+                    WHERE file_path IS NOT NULL GROUP BY file_path
+                    """
+                )
+            if needs_size_backfill:
+                # Recomputed from scratch in one statement, so rows another process
+                # stored through the new triggers in the meantime are not counted twice.
+                conn.execute("DELETE FROM cache_sizes")
+                conn.execute(
+                    """
+                    INSERT INTO cache_sizes (data_type, total_size)
+                    SELECT data_type, SUM(data_size) FROM (
+                        SELECT data_type, data_size FROM cached_data WHERE file_path IS NULL
+                        UNION ALL
+                        SELECT data_type, data_size FROM blob_files WHERE refcount > 0
+                    ) GROUP BY data_type
+                    """
+                )
+
     nowplaying.utils.sqlite.retry_sqlite_operation(_do_schema)
 
 
+# Blob files unlinked per write transaction by sweep_unreferenced_blobs()
+_SWEEP_BATCH = 500
+
+
+def sweep_unreferenced_blobs(database_path: Path) -> int:
+    """Unlink blob files that no cached_data row refers to any more (sync version).
+
+    Runs under a write lock so a concurrent store() cannot add a reference to a
+    file between the refcount check and the unlink; store() re-checks the file
+    after its own commit to cover the case where it wrote the file first.  A
+    failed unlink keeps the blob_files row so the next sweep retries it.
+
+    Returns:
+        Number of blob files removed
+    """
+
+    def _do_sweep() -> tuple[int, bool]:
+        with nowplaying.utils.sqlite.sqlite_connection(str(database_path), timeout=30) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT file_path FROM blob_files WHERE refcount <= 0 LIMIT ?",
+                (_SWEEP_BATCH,),
+            ).fetchall()
+            removed: list[str] = []
+            for (file_path,) in rows:
+                try:
+                    (database_path.parent / file_path).unlink()
+                except FileNotFoundError:
+                    pass  # already gone; still drop the bookkeeping row
+                except OSError:
+                    logging.warning("Failed to unlink blob %s; kept for next sweep", file_path)
+                    continue
+                removed.append(file_path)
+            conn.executemany(
+                "DELETE FROM blob_files WHERE file_path = ? AND refcount <= 0",
+                [(file_path,) for file_path in removed],
+            )
+            # A full batch may have more behind it; a batch where every unlink
+            # failed would only select the same rows again.
+            return len(removed), len(rows) == _SWEEP_BATCH and bool(removed)
+
+    # Batched so the write lock is only held for one slice of unlinks at a time
+    total = 0
+    more = True
+    while more:
+        removed, more = nowplaying.utils.sqlite.retry_sqlite_operation(_do_sweep)
+        total += removed
+    return total
+
+
 def run_datacache_maintenance(cache_dir: Path | None = None) -> dict[str, int]:
     """Run datacache maintenance at system startup (sync version)."""
     database_path = get_datacache_path(cache_dir)
@@ -122,37 +369,11 @@ def run_datacache_maintenance(cache_dir: Path | None = None) -> dict[str, int]:
 
         def _do_maintenance() -> tuple[int, int, int]:
             with nowplaying.utils.sqlite.sqlite_connection(str(database_path)) as conn:
-                rows = conn.execute(
-                    "SELECT url, file_path FROM cached_data"
-                    " WHERE expires_at <= ? AND file_path IS NOT NULL",
-                    (now,),
-                ).fetchall()
-
-                # Unlink blobs before deleting rows so a failed unlink leaves the
-                # row intact for the next maintenance cycle to retry.
-                urls_to_delete: list[str] = []
-                for url, fp in rows:
-                    try:
-                        (database_path.parent / fp).unlink()
-                        urls_to_delete.append(url)
-                    except FileNotFoundError:
-                        urls_to_delete.append(url)
-                    except OSError:
-                        logging.warning("Failed to unlink blob %s; row kept for next cleanup", fp)
-
-                if urls_to_delete:
-                    placeholders = ",".join("?" * len(urls_to_delete))
-                    conn.execute(
-                        f"DELETE FROM cached_data WHERE url IN ({placeholders})",
-                        urls_to_delete,
-                    )
-
-                # Also delete rows with no blob that are expired
-                cursor = conn.execute(
-                    "DELETE FROM cached_data WHERE expires_at <= ? AND file_path IS NULL",
-                    (now,),
-                )
-                expired = len(urls_to_delete) + cursor.rowcount
+                # Blob files are shared between rows with identical content, so
+                # they are not unlinked here: the blob_files triggers drop the
+                # references and sweep_unreferenced_blobs() removes what is left.
+                cursor = conn.execute("DELETE FROM cached_data WHERE expires_at <= ?", (now,))
+                expired = cursor.rowcount
 
                 cursor = conn.execute(
                     "DELETE FROM pending_requests WHERE status IN ('completed', 'failed') "
@@ -180,6 +401,7 @@ def run_datacache_maintenance(cache_dir: Path | None = None) -> dict[str, int]:
         expired_count, requests_count, recovered_count = (
             nowplaying.utils.sqlite.retry_sqlite_operation(_do_maintenance)
         )
+        sweep_unreferenced_blobs(database_path)
         nowplaying.utils.sqlite.retry_sqlite_operation(_do_vacuum)
         stats["expired_cleaned"] = expired_count
         stats["requests_cleaned"] = requests_count
@@ -186,22 +186,19 @@ class MetadataDB:
         watcher._set_callback(self.watchers.discard)  # pylint: disable=protected-access
         return watcher
 
-    async def write_to_metadb(self, metadata: "TrackMetadata | None" = None) -> None:
-        """update metadb"""
+    @staticmethod
+    def _metadb_row(metadata: "TrackMetadata | None") -> dict[str, Any] | None:
+        """the columns and values to store for metadata, or None if it cannot be stored"""
 
         def filterkeys(mydict: dict[str, Any]) -> dict[str, Any]:
             return {key: mydict[key] for key in METADATALIST + METADATABLOBLIST if key in mydict}
 
-        logging.debug("Called (async) write_to_metadb")
         if metadata is None:
             logging.debug("metadata is None")
-            return
+            return None
         if not metadata or not METADATALIST or "title" not in metadata or "artist" not in metadata:
             logging.debug("metadata is either empty or too incomplete")
-            return
-
-        if not self.databasefile.exists():
-            self.setupsql()
+            return None
 
         # do not want to modify the original dictionary
         # otherwise Bad Things(tm) will happen
@@ -211,8 +208,6 @@ class MetadataDB:
         # toss any keys we do not care about
         mdcopy = filterkeys(mdcopy)
 
-        logging.debug("Adding record with %s/%s", mdcopy["artist"], mdcopy["title"])
-
         for key in METADATABLOBLIST:
             if key not in mdcopy:
                 mdcopy[key] = None
@@ -224,6 +219,19 @@ class MetadataDB:
                 mdcopy[data] = "true" if mdcopy[data] else "false"
             elif isinstance(mdcopy[data], str) and len(mdcopy[data]) == 0:
                 mdcopy[data] = None
+        return mdcopy
+
+    async def write_to_metadb(self, metadata: "TrackMetadata | None" = None) -> None:
+        """update metadb"""
+
+        logging.debug("Called (async) write_to_metadb")
+        if not (mdcopy := self._metadb_row(metadata)):
+            return
+
+        if not self.databasefile.exists():
+            self.setupsql()
+
+        logging.debug("Adding record with %s/%s", mdcopy["artist"], mdcopy["title"])
 
         sql = "INSERT INTO currentmeta ("
         sql += ", ".join(mdcopy.keys()) + ") VALUES ("
@@ -238,6 +246,28 @@ class MetadataDB:
 
         await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_write)
 
+    async def update_last_meta_async(self, metadata: "TrackMetadata") -> None:
+        """rewrite the newest record in place with details that arrived after it was written
+
+        Nothing happens unless the newest record is still the same artist and title,
+        so a late update can never land on the track after it.
+        """
+        if not (mdcopy := self._metadb_row(metadata)) or not self.databasefile.exists():
+            return
+
+        logging.debug("Updating record with %s/%s", mdcopy["artist"], mdcopy["title"])
+
+        sql = "UPDATE currentmeta SET " + ", ".join(f"{key} = ?" for key in mdcopy)
+        sql += " WHERE id = (SELECT MAX(id) FROM currentmeta) AND artist IS ? AND title IS ?"
+        datatuple = (*mdcopy.values(), mdcopy["artist"], mdcopy["title"])
+
+        async def _do_update() -> None:
+            async with aiosqlite.connect(self.databasefile, timeout=10) as connection:
+                await connection.execute(sql, datatuple)
+                await connection.commit()
+
+        await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_update)
+
     def make_previoustracklist(self) -> list[dict[str, str]] | None:
         """create a reversed list of the tracks played"""
 
@@ -122,6 +122,32 @@ class MetadataProcessor:
                 decks.append(deck_info)
         return decks
 
+    def get_upcoming_tracks(self) -> list[TrackMetadata]:
+        """Tracks loaded on decks that are not (yet) playing and audible.
+
+        These are what the DJ has cued up next; deckskip applies, since
+        the result feeds the now-playing pipeline rather than a display.
+        """
+        deckskip = self._get_deck_skip_list()
+        upcoming: list[TrackMetadata] = []
+        for deck_info in self.get_all_decks():
+            if str(deck_info["deck"]) in deckskip:
+                continue
+            if deck_info["playing"] and deck_info["effective_volume"] > AUDIBLE_VOLUME_THRESHOLD:
+                continue
+            if not deck_info["artist"] and not deck_info["title"]:
+                continue
+            metadata: TrackMetadata = {
+                "artist": deck_info["artist"],
+                "title": deck_info["title"],
+                "deck": deck_info["label"],
+            }
+            for key in ("album", "bpm", "genre"):
+                if deck_info.get(key):
+                    metadata[key] = deck_info[key]
+            upcoming.append(metadata)
+        return upcoming
+
     def _deck_snapshot(self, logical_deck: int, token: bytes, deck_idx: int) -> dict | None:
         """Build one deck's display snapshot, or None if nothing is loaded"""
         states = self._devices.get(token, {})
@@ -351,3 +351,7 @@ class DenonPlugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
     async def getplayingtrack(self) -> TrackMetadata | None:
         """Get the currently playing track metadata"""
         return self.metadata_processor.get_playing_track()
+
+    async def getupcomingtracks(self) -> list[TrackMetadata]:
+        """Get the tracks cued on decks that are not playing"""
+        return self.metadata_processor.get_upcoming_tracks()
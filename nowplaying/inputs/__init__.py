@@ -79,10 +79,26 @@ class InputPlugin(WNPBasePlugin):
         """Get the currently playing track"""
         raise NotImplementedError
 
+    async def getupcomingtracks(self) -> list[TrackMetadata]:  # pylint: disable=no-self-use
+        """Tracks loaded but not yet live (e.g., cued on another deck)
+
+        TrackPoll warms the caches for these so that the metadata
+        lookups are already done when one of them goes live.
+        """
+        return []
+
     async def getrandomtrack(self, playlist: str) -> str | None:  # pylint: disable=no-self-use, unused-argument
         """Get a file associated with a playlist, crate, whatever"""
         return None
 
+    async def getplaylisttracks(self, playlist: str) -> list[TrackMetadata]:  # pylint: disable=no-self-use, unused-argument
+        """Every track in a playlist, crate, whatever
+
+        Used by the library pre-enrichment job.  Entries need either a
+        filename or an artist and title.
+        """
+        return []
+
     async def has_tracks_by_artist(self, artist_name: str) -> bool:  # pylint: disable=no-self-use, unused-argument
         """Check if DJ has any tracks by the specified artist"""
         # Default implementation - can be overridden by plugins with database access
@@ -466,6 +466,29 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
             await connection.commit()
             return None
 
+    async def getplaylisttracks(self, playlist: str) -> list[TrackMetadata]:
+        """Every track in a playlist (static or smart)"""
+        dbfile = pathlib.Path(self.djuceddir).joinpath("DJUCED.db")
+
+        async with aiosqlite.connect(dbfile, timeout=30) as connection:
+            connection.row_factory = sqlite3.Row
+            cursor = await connection.cursor()
+
+            await cursor.execute(
+                "SELECT data FROM playlists2 WHERE name=? and type=3", (playlist,)
+            )
+            tracks = [row["data"] for row in await cursor.fetchall()]
+
+            if not tracks:
+                await cursor.execute(
+                    "SELECT data FROM playlists2 WHERE name=? and type=2", (playlist,)
+                )
+                if row := await cursor.fetchone():
+                    tracks = await self._get_smart_playlist_tracks(cursor, row["data"])
+
+            await connection.commit()
+            return [{"filename": track} for track in tracks]
+
     async def stop(self):
         """stop the djuced plugin"""
         if self.observer:
@@ -2,11 +2,8 @@
 """driver for Icecast SOURCE Protocol, as used by Traktor and Mixxx and others?"""
 
 import asyncio
-import codecs
-import io
 import logging
 import logging.config
-import os
 import struct
 import time
 import urllib.parse
@@ -43,13 +40,133 @@ METADATALIST: list[str] = ["artist", "title", "album", "key", "filename", "bpm"]
 
 PLAYLIST: list[str] = ["name", "filename"]
 
+# capture pattern, version, flags, granule position, serial, sequence, crc, segments
+OGG_PAGE_HEADER = struct.Struct("<4sBBqIIiB")
+OGG_CONTINUED_PACKET = 0x01
+# packets that carry metadata; nothing else is ever copied out of the stream
+COMMENT_HEADERS = (b"\x03vorbis", b"OpusTags")
+# drop comment headers bigger than this (e.g. with huge embedded artwork)
+MAX_COMMENT_SIZE = 16 * 1024 * 1024
+
+_UINT32 = struct.Struct("<I")
+
+
+class OggCommentParser:
+    """
+    Split an Ogg stream into pages and pick out the Vorbis/Opus comment headers
+
+    Pages are framed in place, straight out of the received data, so audio
+    pages are stepped over without being copied.  Only the start of a page
+    that has not fully arrived is kept back, in one reused bytearray that
+    later data is appended to; consumed bytes are dropped from its front,
+    which CPython does without moving the rest.
+
+    Both Vorbis and Opus start the comment header on a fresh page, so only a
+    page whose first packet starts with one of COMMENT_HEADERS is looked
+    into.  That packet is copied out through a memoryview, across however
+    many pages it spans.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._packet: bytearray | None = None
+
+    @property
+    def buffered(self) -> int:
+        """bytes received that do not make up a whole page yet"""
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        """forget everything, e.g. for a new connection"""
+        self._buffer.clear()
+        self._packet = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """add data from the stream; return the comment header packets it completed"""
+        buffer = self._buffer
+        if buffer:
+            buffer += data
+            data = buffer
+        comments: list[bytes] = []
+        pos = self._frame(data, comments)
+        if data is buffer:
+            del buffer[:pos]
+        elif pos < len(data):
+            # only the start of a page that has not fully arrived is kept
+            with memoryview(data) as view:
+                buffer += view[pos:]
+        return comments
+
+    def _frame(self, data: bytes | bytearray, comments: list[bytes]) -> int:
+        """step through the whole pages in data; return the bytes they take up"""
+        size = len(data)
+        pos = 0
+        while size - pos >= OGG_PAGE_HEADER.size:
+            if not data.startswith(b"OggS", pos):
+                # not on a page boundary; skip to the next capture pattern
+                found = data.find(b"OggS", pos + 1)
+                pos = found if found >= 0 else max(pos + 1, size - 3)
+                logging.debug("Not a valid ogg stream!")
+                continue
+            lacing = pos + OGG_PAGE_HEADER.size
+            body = lacing + data[pos + 26]
+            if body > size:
+                break
+            end = body + sum(data[lacing:body])
+            if end > size:
+                break
+            continued = bool(data[pos + 5] & OGG_CONTINUED_PACKET)
+            if (self._packet is not None and continued) or (
+                not continued and data.startswith(COMMENT_HEADERS, body)
+            ):
+                comments.extend(self._collect(data, data[lacing:body], body, continued))
+            else:
+                self._packet = None
+            pos = end
+        return pos
+
+    @staticmethod
+    def _spans(lacing: bytes | bytearray, offset: int, continued: bool):
+        """(start, end, continues a packet, packet ends here) for each packet piece in a page"""
+        start = offset
+        for length in lacing:
+            offset += length
+            if length < 255:
+                yield start, offset, continued, True
+                start, continued = offset, False
+        if start < offset:
+            yield start, offset, continued, False
+
+    def _collect(
+        self, data: bytes | bytearray, lacing: bytes | bytearray, body: int, continued: bool
+    ) -> list[bytes]:
+        """gather the comment header pieces of one page"""
+        comments = []
+        with memoryview(data) as view:
+            for start, end, continues, complete in self._spans(lacing, body, continued):
+                if not continues:
+                    if start != body:
+                        # only the first packet on a page can be a comment header
+                        break
+                    self._packet = bytearray(view[start:end])
+                else:
+                    self._packet += view[start:end]
+                if len(self._packet) > MAX_COMMENT_SIZE:
+                    logging.debug("Skipping oversized comment header")
+                    self._packet = None
+                    break
+                if complete:
+                    comments.append(bytes(self._packet))
+                    self._packet = None
+        return comments
+
 
 class IcecastProtocol(asyncio.Protocol):
     """a terrible implementation of the Icecast SOURCE protocol"""
 
     def __init__(self, metadata_callback: Callable[[dict[str, str]], None] | None = None) -> None:
         self.streaming: bool = False
-        self.previous_page: bytes = b""
+        self.oggparser = OggCommentParser()
         self.metadata_callback: Callable[[dict[str, str]], None] | None = metadata_callback
         self._current_metadata: dict[str, str] = {}
 
@@ -64,48 +181,18 @@ class IcecastProtocol(asyncio.Protocol):
             # if 200 gets set, new page. data content here is irrelevant
 
             self.streaming = True
-            self.previous_page = b""
+            self.oggparser.reset()
             if data[:19] == b"GET /admin/metadata":
                 self._query_parse(data)
             logging.debug("Sending initial 200")
             self.transport.write(b"HTTP/1.0 200 OK\r\n\r\n")  # type: ignore
         else:
-            # data block. convert to bytes and process it,
-            # adding each block to the previously received block as necessary
-            dataio = io.BytesIO(data)
-            for page in self._parse_page(dataio):
-                pageio = io.BytesIO(page)
-                if page[:7] == b"\x03vorbis":
-                    pageio.seek(7, os.SEEK_CUR)  # jump over header name
-                    self._parse_vorbis_comment(pageio)
-                elif page[:8] == b"OpusTags":  # parse opus metadata:
-                    pageio.seek(8, os.SEEK_CUR)  # jump over header name
-                    self._parse_vorbis_comment(pageio)
-
-    def _parse_page(self, dataio: io.BytesIO):
-        """modified from tinytag, modified for here"""
-        header_data = dataio.read(27)  # read ogg page header
-        while len(header_data) != 0:
-            header = struct.unpack("<4sBBqIIiB", header_data)
-            oggs, version, flags, pos, serial, pageseq, crc, segments = header  # pylint: disable=unused-variable
-            # self._max_samplenum = max(self._max_samplenum, pos)
-            if oggs != b"OggS" or version != 0:
-                logging.debug("Not a valid ogg stream!")
-            segsizes = struct.unpack("B" * segments, dataio.read(segments))
-            total = 0
-            for segsize in segsizes:  # read all segments
-                total += segsize
-                if total < 255:  # less than 255 bytes means end of page
-                    yield self.previous_page + dataio.read(total)
-                    self.previous_page = b""
-                    total = 0
-            if total != 0:
-                if total % 255 == 0:
-                    self.previous_page += dataio.read(total)
-                else:
-                    yield self.previous_page + dataio.read(total)
-                    self.previous_page = b""
-            header_data = dataio.read(27)
+            # data block. only comment headers come back out of the parser
+            for packet in self.oggparser.feed(data):
+                with memoryview(packet) as comment:
+                    # jump over header name
+                    magic = next(magic for magic in COMMENT_HEADERS if packet.startswith(magic))
+                    self._parse_vorbis_comment(comment[len(magic) :])
 
     def _query_parse(self, data: bytes) -> None:
         """try to parse the query"""
@@ -171,7 +258,7 @@ class IcecastProtocol(asyncio.Protocol):
 
         return metadata
 
-    def _parse_vorbis_comment(self, fh: io.BytesIO) -> None:  # pylint: disable=invalid-name
+    def _parse_vorbis_comment(self, comment: bytes | memoryview) -> None:
         """from tinytag, with slight modifications, pull out metadata"""
         comment_type_to_attr_mapping: dict[str, str] = {
             "album": "album",
@@ -190,19 +277,25 @@ class IcecastProtocol(asyncio.Protocol):
         logging.debug("Processing vorbis comment")
         metadata: dict[str, str] = {}
 
-        vendor_length = struct.unpack("I", fh.read(4))[0]
-        fh.seek(vendor_length, os.SEEK_CUR)  # jump over vendor
-        elements = struct.unpack("I", fh.read(4))[0]
-        for _ in range(elements):
-            length = struct.unpack("I", fh.read(4))[0]
-            try:
-                keyvalpair = codecs.decode(fh.read(length), "UTF-8")
-            except UnicodeDecodeError:
-                continue
-            if "=" in keyvalpair:
-                key, value = keyvalpair.split("=", 1)
-                if fieldname := comment_type_to_attr_mapping.get(key.lower()):
-                    metadata[fieldname] = value
+        try:
+            offset = 4 + _UINT32.unpack_from(comment, 0)[0]  # jump over vendor
+            elements = _UINT32.unpack_from(comment, offset)[0]
+            offset += 4
+            for _ in range(elements):
+                length = _UINT32.unpack_from(comment, offset)[0]
+                offset += 4
+                keyvalbytes = comment[offset : offset + length]
+                offset += length
+                try:
+                    keyvalpair = str(keyvalbytes, "utf-8")
+                except UnicodeDecodeError:
+                    continue
+                if "=" in keyvalpair:
+                    key, value = keyvalpair.split("=", 1)
+                    if fieldname := comment_type_to_attr_mapping.get(key.lower()):
+                        metadata[fieldname] = value
+        except struct.error:
+            logging.debug("Vorbis comment is truncated")
 
         # Fallback: If artist is empty but title contains " - ", try splitting the title
         artist_value = metadata.get("artist")
@@ -2,10 +2,12 @@
 """Read m3u files"""
 
 import contextlib
+import functools
 import logging
 import os
 import pathlib
 import re
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget  # pylint: disable=no-name-in-module
@@ -29,6 +31,18 @@ EXTVDJ_REMIX_RE = re.compile(r".*<remix>(.+)</remix>.*")
 # https://datatracker.ietf.org/doc/html/rfc8216
 
 
+@dataclass
+class _M3UTail:
+    """how far _read_track has read into one M3U file and what it found there"""
+
+    inode: int
+    offset: int = 0
+    # the last complete line before offset, to notice a file rewritten in place
+    lastline: bytes = b""
+    trackfile: bytes | None = None
+    trackextvdj: str | None = None
+
+
 class _M3UWizardPage(nowplaying.wizard.WizardPage):  # pylint: disable=too-few-public-methods
     """First-run wizard page for M3U directory configuration."""
 
@@ -75,6 +89,7 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
         self.event_handler = None
         self.metadata: dict[str, str | None] = {"artist": None, "title": None, "filename": None}
         self.observer = None
+        self._tails: dict[str, _M3UTail] = {}
         self._reset_meta()
 
     @classmethod
@@ -129,7 +144,14 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
         self.observer.schedule(self.event_handler, self.m3udir, recursive=False)
         self.observer.start()
 
-    def _verify_file(self, m3ufilename, filestring):
+    def _verify_file(self, m3ufilename, filestring, subst=None):
+        """the audio file filestring names, if it exists
+
+        subst changes the pathing of a location; it defaults to songpathsubst
+        with this plugin's config.
+        """
+        if not subst:
+            subst = functools.partial(nowplaying.utils.songpathsubst, self.config)
         found = None
         if b"netsearch://" in filestring or b"http://" in filestring or b"https://" in filestring:
             logging.debug("Remote resource; returning URL as-is")
@@ -148,14 +170,14 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
             if location[0] == "#":
                 break
             location = location.replace("file://", "")
-            location = nowplaying.utils.songpathsubst(self.config, location)
+            location = subst(location)
             if os.path.exists(location):
                 found = location
                 break
 
             dirpath = os.path.dirname(m3ufilename)
             attempt2 = os.path.join(dirpath, location)
-            attempt2 = nowplaying.utils.songpathsubst(self.config, attempt2)
+            attempt2 = subst(attempt2)
             if os.path.exists(attempt2):
                 found = attempt2
                 break
@@ -179,7 +201,7 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
                     metadata["title"] += f" ({remix})"
         return metadata
 
-    def _read_full_file(self, filename):
+    def _read_full_file(self, filename, subst=None):
         """read the entire content of a file"""
         content = []
         with open(filename, "rb") as m3ufh:
@@ -190,7 +212,7 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
                 newline = newline.rstrip()
                 if not newline:
                     continue
-                if audiofilename := self._verify_file(filename, newline):
+                if audiofilename := self._verify_file(filename, newline, subst):
                     content.append(audiofilename)
         return content
 
@@ -204,26 +226,14 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
         )
 
         # file is empty so ignore it
-        if os.stat(filename).st_size == 0:
+        stat = os.stat(filename)
+        if stat.st_size == 0:
             logging.debug("%s is empty, ignoring for now.", filename)
+            self._tails.pop(filename, None)
             self._reset_meta()
             return
 
-        trackfile = None
-        trackextvdj = None
-        with open(filename, "rb") as m3ufh:
-            while True:
-                newline = m3ufh.readline()
-                if not newline:
-                    break
-                newline = newline.rstrip()
-                with contextlib.suppress(Exception):
-                    if "#EXTVDJ" in newline.decode("utf-8"):
-                        trackextvdj = newline.decode("utf-8")
-                        continue
-                if not newline or newline[0] == "#":
-                    continue
-                trackfile = newline
+        trackfile, trackextvdj = self._tail_m3u(filename, stat)
 
         logging.debug("attempting to parse '%s' with various encodings", trackfile)
 
@@ -243,6 +253,54 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
 
         self.metadata = newmeta
 
+    @staticmethod
+    def _scan_lines(
+        lines: list[bytes], trackfile: bytes | None, trackextvdj: str | None
+    ) -> tuple[bytes | None, str | None]:
+        """the last track line and last #EXTVDJ line, carrying on from earlier ones"""
+        for line in lines:
+            newline = line.rstrip()
+            with contextlib.suppress(Exception):
+                if "#EXTVDJ" in newline.decode("utf-8"):
+                    trackextvdj = newline.decode("utf-8")
+                    continue
+            if not newline or newline[0] == "#":
+                continue
+            trackfile = newline
+        return trackfile, trackextvdj
+
+    def _tail_m3u(self, filename: str, stat: os.stat_result) -> tuple[bytes | None, str | None]:
+        """
+        read only what was appended to filename since the last event
+
+        A file that was replaced, truncated, or rewritten in place is read
+        from the top again.  An unterminated last line may still be being
+        written, so it is looked at but read again next time.
+        """
+        tail = self._tails.get(filename)
+        with open(filename, "rb") as m3ufh:
+            if tail and tail.inode == stat.st_ino and tail.offset <= stat.st_size:
+                m3ufh.seek(tail.offset - len(tail.lastline))
+                if m3ufh.read(len(tail.lastline)) != tail.lastline:
+                    tail = None
+            else:
+                tail = None
+            if not tail:
+                tail = _M3UTail(inode=stat.st_ino)
+                m3ufh.seek(0)
+            data = m3ufh.read()
+        self._tails[filename] = tail
+
+        complete, newline, partial = data.rpartition(b"\n")
+        if newline:
+            lines = complete.split(b"\n")
+            tail.trackfile, tail.trackextvdj = self._scan_lines(
+                lines, tail.trackfile, tail.trackextvdj
+            )
+            tail.offset += len(complete) + 1
+            tail.lastline = lines[-1] + b"\n"
+        return self._scan_lines([partial], tail.trackfile, tail.trackextvdj)
+
     async def start(self):
         """setup the watcher to run in a separate thread"""
         await self.setup_watcher("m3u/directory")
@@ -264,6 +322,7 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes
     async def stop(self):
         """stop the m3u plugin"""
         self._reset_meta()
+        self._tails.clear()
         if self.observer:
             self.observer.stop()
             self.observer.join()
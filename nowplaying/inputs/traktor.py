@@ -27,6 +27,7 @@ logging.config.dictConfig(
 
 # pylint: disable=wrong-import-position
 
+import nowplaying.utils.sqlite
 import nowplaying.utils.xml
 import nowplaying.wizard
 from nowplaying.db import LISTFIELDS
@@ -41,6 +42,12 @@ METADATALIST = ["artist", "title", "album", "filename"]
 
 PLAYLIST = ["name", "filename"]
 
+SONGS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS songs_artist_title ON songs (artist, title, id)",
+    "CREATE INDEX IF NOT EXISTS songs_filename ON songs (filename)",
+    "CREATE INDEX IF NOT EXISTS songs_artist_lower ON songs (LOWER(artist))",
+]
+
 
 class TraktorSAXHandler(xml.sax.ContentHandler):
     """SAX handler for streaming Traktor XML parsing"""
@@ -361,22 +368,29 @@ class Plugin(IcecastPlugin):  # pylint: disable=too-many-instance-attributes
 
     async def getrandomtrack(self, playlist: str):
         """return the contents of a playlist"""
+        async with aiosqlite.connect(self.databasefile) as connection:
+            cursor = await connection.cursor()
+            try:
+                filename = await nowplaying.utils.sqlite.random_playlist_filename(cursor, playlist)
+            except sqlite3.OperationalError:
+                return None
+
+        return None if filename is None else str(filename)
+
+    async def getplaylisttracks(self, playlist: str):
+        """every file in a playlist"""
         async with aiosqlite.connect(self.databasefile) as connection:
             connection.row_factory = sqlite3.Row
             cursor = await connection.cursor()
             try:
                 await cursor.execute(
-                    """SELECT filename FROM playlists WHERE name=? ORDER BY random() LIMIT 1""",
+                    """SELECT filename FROM playlists WHERE name=? ORDER BY id""",
                     (playlist,),
                 )
             except sqlite3.OperationalError:
-                return None
-
-            row = await cursor.fetchone()
-            if not row:
-                return None
+                return []
 
-            return str(row["filename"])
+            return [{"filename": str(row["filename"])} for row in await cursor.fetchall()]
 
     #### Control methods
 
@@ -408,6 +422,8 @@ class Plugin(IcecastPlugin):  # pylint: disable=too-many-instance-attributes
             table_schemas,
             "traktor",
             self.config,
+            fingerprint_table="songs",
+            index_schemas=SONGS_INDEXES + nowplaying.utils.sqlite.PLAYLIST_PICKS_SCHEMAS,
         )
 
         # Reset shutdown event if it was set from a previous instance
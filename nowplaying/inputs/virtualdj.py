@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """Virtual DJ support"""
+# pylint: disable=too-many-lines
 
 import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
 import logging
 import os
 import pathlib
@@ -56,6 +61,20 @@ METADATALIST = [
     "tracknumber",
 ]
 
+# size and mtime of each playlist file as of the last scan, and a digest of
+# the path substitution settings it was read with
+PLAYLIST_FILES_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS playlistfiles"
+    " (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+    " settings TEXT NOT NULL)"
+)
+
+SONGS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS songs_artist_title ON songs (artist, title, id)",
+    "CREATE INDEX IF NOT EXISTS songs_filename ON songs (filename, id)",
+    "CREATE INDEX IF NOT EXISTS songs_artist_lower ON songs (LOWER(artist))",
+]
+
 
 class VirtualDJSAXHandler(xml.sax.ContentHandler):
     """SAX handler for streaming VirtualDJ XML parsing"""
@@ -134,9 +153,11 @@ class VirtualDJSAXHandler(xml.sax.ContentHandler):
 class VirtualDJFolderSAXHandler(xml.sax.ContentHandler):
     """SAX handler for streaming VirtualDJ .vdjfolder XML parsing"""
 
-    def __init__(self, config):
+    def __init__(self, config, subst=None):
         super().__init__()
         self.config = config
+        # changes the pathing of a song; defaults to songpathsubst with config
+        self.subst = subst or functools.partial(nowplaying.utils.songpathsubst, config)
         self.content = []
 
     def startElement(self, name: str, attrs: dict[str, str]) -> None:
@@ -147,7 +168,7 @@ class VirtualDJFolderSAXHandler(xml.sax.ContentHandler):
 
             if song_path and artist and title:
                 # Apply song path substitution like M3U processing
-                song_path = nowplaying.utils.songpathsubst(self.config, song_path)
+                song_path = self.subst(song_path)
 
                 # Extract all available metadata from vdjfolder
                 entry = {
@@ -244,6 +265,8 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
             songs_table_schema,
             "virtualdj",
             config,
+            fingerprint_table="songs",
+            index_schemas=SONGS_INDEXES,
         )
         self.tasks = set()
 
@@ -295,13 +318,18 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
                     "virtualdj/max_age_days", type=int, defaultValue=7
                 )
 
+                # An explicit rebuild re-reads every playlist; an aged-out
+                # database only re-reads the playlist files that changed
+                incremental = not rebuild_requested
                 if self.playlists_needs_refresh(max_age_days):
                     rebuild_requested = True
 
                 if rebuild_requested:
                     if playlistdir := self.config.cparser.value("virtualdj/playlists", type=str):
                         playlistdirpath = pathlib.Path(playlistdir)
-                        success = await self.background_playlists_refresh(playlistdirpath)
+                        success = await self.background_playlists_refresh(
+                            playlistdirpath, incremental=incremental
+                        )
                         if success:
                             self.config.cparser.setValue("virtualdj/rebuild_playlists_db", False)
 
@@ -316,12 +344,32 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
             logging.info("Background playlists refresh loop cancelled")
             raise  # Re-raise to properly handle cancellation
 
-    async def background_playlists_refresh(self, playlistdirpath: pathlib.Path) -> bool:
-        """Background playlists refresh with temp database and atomic swap"""
+    async def background_playlists_refresh(
+        self, playlistdirpath: pathlib.Path, incremental: bool = False
+    ) -> bool:
+        """Background playlists refresh with temp database and atomic swap
+
+        An incremental refresh updates the live database in place instead,
+        re-reading only the playlist files that changed since the last scan.
+        """
         logging.info(
             "Starting VirtualDJ playlists database refresh: %s", self.playlists_databasefile
         )
 
+        if incremental and await asyncio.to_thread(
+            self._playlists_db_reusable, self.playlists_databasefile
+        ):
+            try:
+                await asyncio.to_thread(
+                    self.rewrite_db, str(playlistdirpath), self.playlists_databasefile, True
+                )
+            except (OSError, sqlite3.Error) as err:
+                logging.error("Incremental VirtualDJ playlists refresh failed: %s", err)
+                return False
+            # restart the age clock
+            self.playlists_databasefile.touch()
+            return True
+
         # Create temp database
         temp_playlists_db = self.playlists_databasefile.with_suffix(".db.tmp")
         backup_playlists_db = self.playlists_databasefile.with_suffix(".db.backup")
@@ -414,10 +462,10 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
         return metadata
 
     @staticmethod
-    def _write_playlist(sqlcursor, playlist, filelist):
+    def _write_playlist(sqlcursor, playlist, filelist, source=None):
         """take the collections XML and save the playlists off"""
-        columns = ", ".join(PLAYLIST)
-        placeholders = ", ".join("?" * len(PLAYLIST))
+        columns = ", ".join([*PLAYLIST, "source"])
+        placeholders = ", ".join("?" * (len(PLAYLIST) + 1))
         sql = f"INSERT INTO playlists ({columns}) VALUES ({placeholders})"
         for entry in filelist:
             if isinstance(entry, dict):
@@ -445,11 +493,12 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
                     playlist if field == "name" else (entry if field == "filename" else None)
                     for field in PLAYLIST
                 ]
-            datatuple = tuple(values)
+            datatuple = (*values, source)
             sqlcursor.execute(sql, datatuple)
 
-    def _scan_and_populate_playlists(self, cursor, playlistdirpath: pathlib.Path) -> None:
-        """Scan and populate playlists from .m3u and .vdjfolder files"""
+    @staticmethod
+    def _playlist_files(playlistdirpath: pathlib.Path) -> list[pathlib.Path]:
+        """the .m3u and .vdjfolder files that make up the playlists, in scan order"""
         # Get VirtualDJ root directory (parent of Playlists)
         vdj_root_dir = playlistdirpath.parent
         mylists_dir = vdj_root_dir / "MyLists"
@@ -457,34 +506,119 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
         if mylists_dir.exists():
             # VirtualDJ 2024+ unified format - scan only MyLists directory
             logging.debug("Found VirtualDJ 2024+ MyLists directory, scanning unified playlists")
-            for filepath in list(mylists_dir.rglob("*.vdjfolder")):
-                logging.debug("Reading vdjfolder file %s", filepath)
-                content = self._read_vdjfolder_file(filepath)
-                playlist_name = filepath.stem
-                self._write_playlist(cursor, playlist_name, content)
-        else:
-            # VirtualDJ 2023 and earlier - scan legacy locations
-            logging.debug(
-                "Using VirtualDJ 2023 legacy format, scanning Playlists and scattered files"
-            )
+            return list(mylists_dir.rglob("*.vdjfolder"))
+
+        # VirtualDJ 2023 and earlier - legacy .m3u files from the Playlists
+        # directory and .vdjfolder files scattered throughout VDJ directory
+        logging.debug("Using VirtualDJ 2023 legacy format, scanning Playlists and scattered files")
+        return list(playlistdirpath.rglob("*.m3u")) + list(vdj_root_dir.rglob("*.vdjfolder"))
 
-            # Process legacy .m3u files from Playlists directory
-            for filepath in list(playlistdirpath.rglob("*.m3u")):
-                logging.debug("Reading M3U file %s", filepath)
-                content = self._read_full_file(filepath)
-                self._write_playlist(cursor, filepath.stem, content)
+    @classmethod
+    def _playlist_signatures(
+        cls, playlistdirpath: pathlib.Path, pathsubst
+    ) -> dict[str, tuple[int, int, str]]:
+        """path -> (size, mtime_ns, settings digest) of every playlist file"""
+        settings = hashlib.sha256(repr(pathsubst).encode("utf-8")).hexdigest()
+        signatures = {}
+        for filepath in cls._playlist_files(playlistdirpath):
+            with contextlib.suppress(OSError):
+                stat = filepath.stat()
+                signatures[str(filepath)] = (stat.st_size, stat.st_mtime_ns, settings)
+        return signatures
+
+    def _read_playlist_file(self, filepath: pathlib.Path, subst=None) -> list:
+        """the entries of one .m3u or .vdjfolder file"""
+        if filepath.suffix == ".vdjfolder":
+            logging.debug("Reading vdjfolder file %s", filepath)
+            return self._read_vdjfolder_file(filepath, subst)
+        logging.debug("Reading M3U file %s", filepath)
+        try:
+            return self._read_full_file(filepath, subst)
+        except OSError as err:
+            logging.error("Error reading M3U file %s: %s", filepath, err)
+            return []
 
-            # Process legacy .vdjfolder files scattered throughout VDJ directory
-            for filepath in list(vdj_root_dir.rglob("*.vdjfolder")):
-                logging.debug("Reading vdjfolder file %s", filepath)
-                content = self._read_vdjfolder_file(filepath)
-                playlist_name = filepath.stem
-                self._write_playlist(cursor, playlist_name, content)
+    def _scan_and_populate_playlists(self, cursor, playlistdirpath: pathlib.Path) -> bool:
+        """Bring the playlists table up to date with the .m3u and .vdjfolder files
 
-    def _read_vdjfolder_file(self, filepath):
+        Only files that are new, whose size or mtime differs from the last
+        scan, or that were read with other path substitution settings are
+        read, several at a time.  Each one's rows are replaced and the rows
+        of files that went away are deleted.  .m3u files are re-read every
+        time, since which of their lines make it in depends on which songs
+        exist, but their rows are only replaced if that changed.  Returns
+        True if anything changed.
+        """
+        # the workers must not touch QSettings, so read the quirks once here
+        pathsubst = nowplaying.utils.songpathsubst_settings(self.config)
+
+        cursor.execute("SELECT path, size, mtime_ns, settings FROM playlistfiles")
+        known = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+        current = self._playlist_signatures(playlistdirpath, pathsubst)
+
+        changed = [path for path, signature in current.items() if known.get(path) != signature]
+        reverify = [
+            path
+            for path, signature in current.items()
+            if known.get(path) == signature and pathlib.Path(path).suffix == ".m3u"
+        ]
+        removed = [(path,) for path in known.keys() - current.keys()]
+        cursor.executemany("DELETE FROM playlists WHERE source = ?", removed)
+        cursor.executemany("DELETE FROM playlistfiles WHERE path = ?", removed)
+
+        # reading is mostly waiting on stat() calls for every track, so threads
+        # overlap it fine; map() keeps the results in scan order
+        rewritten = 0
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            readlist = changed + reverify
+            contents = pool.map(
+                functools.partial(
+                    self._read_playlist_file,
+                    subst=functools.partial(nowplaying.utils.songpathsubst_apply, pathsubst),
+                ),
+                map(pathlib.Path, readlist),
+            )
+            for path, content in zip(readlist, contents, strict=True):
+                if known.get(path) == current[path]:
+                    cursor.execute(
+                        "SELECT filename FROM playlists WHERE source = ? ORDER BY id", (path,)
+                    )
+                    if [row[0] for row in cursor.fetchall()] == content:
+                        continue
+                cursor.execute("DELETE FROM playlists WHERE source = ?", (path,))
+                self._write_playlist(cursor, pathlib.Path(path).stem, content, source=path)
+                cursor.execute(
+                    "INSERT OR REPLACE INTO playlistfiles VALUES (?, ?, ?, ?)",
+                    (path, *current[path]),
+                )
+                rewritten += 1
+
+        logging.debug(
+            "VirtualDJ playlists: %d files, %d re-read, %d rewritten, %d removed",
+            len(current),
+            len(readlist),
+            rewritten,
+            len(removed),
+        )
+        return bool(rewritten or removed)
+
+    @staticmethod
+    def _playlists_db_reusable(database_path: pathlib.Path) -> bool:
+        """True if database_path can be updated in place by an incremental scan"""
+        if not database_path.exists():
+            return False
+        try:
+            with nowplaying.utils.sqlite.sqlite_connection(database_path) as connection:
+                connection.execute("SELECT source FROM playlists LIMIT 1")
+                connection.execute("SELECT path, settings FROM playlistfiles LIMIT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _read_vdjfolder_file(self, filepath, subst=None):
         """read VirtualDJ .vdjfolder XML file and extract song metadata using SAX parser"""
         try:
-            handler = VirtualDJFolderSAXHandler(self.config)
+            handler = VirtualDJFolderSAXHandler(self.config, subst)
             with open(filepath, encoding="utf-8") as xml_file:
                 xml.sax.parse(xml_file, handler)
             return handler.content
@@ -493,8 +627,8 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
             logging.error("Error parsing vdjfolder file %s: %s", filepath, err)
             return []
 
-    def rewrite_db(self, playlistdir=None, db_path=None):
-        """erase and update the old db"""
+    def rewrite_db(self, playlistdir=None, db_path=None, incremental=False):
+        """erase and update the old db, or with incremental update it in place"""
         if not playlistdir:
             playlistdir = self.config.cparser.value("virtualdj/playlists")
 
@@ -511,20 +645,24 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
         database_path = pathlib.Path(db_path) if db_path else self.playlists_databasefile
 
         database_path.parent.mkdir(parents=True, exist_ok=True)
-        if database_path.exists():
+        fresh = not (incremental and self._playlists_db_reusable(database_path))
+        if fresh and database_path.exists():
             database_path.unlink()
 
         with nowplaying.utils.sqlite.sqlite_connection(database_path) as connection:
             cursor = connection.cursor()
             sql = "CREATE TABLE IF NOT EXISTS playlists ("
             sql += " TEXT, ".join(PLAYLIST) + " TEXT, "
-            sql += "id INTEGER PRIMARY KEY AUTOINCREMENT)"
+            sql += "source TEXT, id INTEGER PRIMARY KEY AUTOINCREMENT)"
             cursor.execute(sql)
+            cursor.execute("CREATE INDEX IF NOT EXISTS playlists_source ON playlists (source)")
+            cursor.execute(PLAYLIST_FILES_SCHEMA)
             connection.commit()
 
             # Scan playlists with VirtualDJ 2024+ MyLists support
-            self._scan_and_populate_playlists(cursor, playlistdirpath)
-
+            if self._scan_and_populate_playlists(cursor, playlistdirpath) or fresh:
+                for schema in nowplaying.utils.sqlite.PLAYLIST_PICKS_SCHEMAS:
+                    cursor.execute(schema)
             connection.commit()
 
     @classmethod
@@ -605,23 +743,33 @@ class Plugin(M3UPlugin):  # pylint: disable=too-many-instance-attributes,too-man
 
     async def getrandomtrack(self, playlist):
         """return the contents of a playlist"""
+        async with aiosqlite.connect(self.playlists_databasefile) as connection:
+            cursor = await connection.cursor()
+            try:
+                filename = await nowplaying.utils.sqlite.random_playlist_filename(cursor, playlist)
+            except sqlite3.OperationalError as error:
+                logging.error(error)
+                return None
+
+        if filename is None:
+            logging.debug("no match")
+        return filename
+
+    async def getplaylisttracks(self, playlist):
+        """every file in a playlist"""
         async with aiosqlite.connect(self.playlists_databasefile) as connection:
             connection.row_factory = sqlite3.Row
             cursor = await connection.cursor()
             try:
                 await cursor.execute(
-                    """SELECT filename FROM playlists WHERE name=? ORDER BY random() LIMIT 1""",
+                    """SELECT filename FROM playlists WHERE name=? ORDER BY id""",
                     (playlist,),
                 )
             except sqlite3.OperationalError as error:
                 logging.error(error)
-                return None
+                return []
 
-            row = await cursor.fetchone()
-            if not row:
-                logging.debug("no match")
-                return None
-            return row["filename"]
+            return [{"filename": row["filename"]} for row in await cursor.fetchall()]
 
     async def stop(self):  # pylint: disable=duplicate-code
         """stop the virtual dj plugin"""
@@ -6,7 +6,12 @@
 #   nowplaying.metadata.MetadataProcessors(...)
 #   nowplaying.metadata.TinyTagRunner(...)
 #   nowplaying.metadata.AUDIO_EXTENSIONS
-from nowplaying.metadata.processors import MetadataProcessors, main, recognition_replacement
+from nowplaying.metadata.processors import (
+    LATE_EXTRAS_FIELDS,
+    MetadataProcessors,
+    main,
+    recognition_replacement,
+)
 from nowplaying.metadata.tinytag_runner import (
     AUDIO_CONTAINER_EXCLUSIONS,
     AUDIO_EXTENSIONS,
@@ -17,6 +22,7 @@ from nowplaying.metadata.tinytag_runner import (
 __all__ = [
     "AUDIO_CONTAINER_EXCLUSIONS",
     "AUDIO_EXTENSIONS",
+    "LATE_EXTRAS_FIELDS",
     "MetadataProcessors",
     "TinyTagRunner",
     "VIDEO_EXTENSIONS",
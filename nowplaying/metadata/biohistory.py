@@ -26,6 +26,10 @@ class ArtistBioHistory:
     was shown, so double-detection (same track firing twice via filesystem events)
     does not suppress the bio.  ``has_been_shown`` returns True only when the bio
     was shown for a *different* track earlier in the session.
+
+    The session's entries are loaded once and kept in memory, so checks on
+    a track change never wait on SQLite; new entries are written back in
+    the background.
     """
 
     @staticmethod
@@ -37,6 +41,14 @@ class ArtistBioHistory:
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.dbpath = self._get_database_path()
+        # In-memory copy of this session's history: (lowercased name, track)
+        # -> mbid, plus the two ways it gets looked up
+        self._entries: dict[tuple[str, tuple[str, str]], str | None] = {}
+        self._by_name: dict[str, set[tuple[str, str]]] = {}
+        self._by_mbid: dict[str, set[tuple[str, tuple[str, str]]]] = {}
+        self._writer = nowplaying.utils.sqlite.BackgroundWriter(
+            self.dbpath, self._write_rows, "artist bio history"
+        )
         self._ensure_database()
 
     def _ensure_database(self) -> None:
@@ -68,10 +80,31 @@ class ArtistBioHistory:
                 if cursor.fetchone()[0] == 0:
                     cursor.execute("INSERT INTO schema_version VALUES (?)", (SCHEMA_VERSION,))
                 conn.commit()
+                self._load_session(conn)
                 logging.debug("Artist bio history database initialised at %s", self.dbpath)
         except sqlite3.Error as error:
             logging.error("Failed to initialise artist bio history database: %s", error)
 
+    def _load_session(self, conn: sqlite3.Connection) -> None:
+        """Pull anything already recorded for this session into memory."""
+        cursor = conn.execute(
+            """SELECT artist_name, mbid, track_artist, track_title
+               FROM bio_history WHERE session_id = ? ORDER BY id""",
+            (self.session_id,),
+        )
+        for artist_name, mbid, track_artist, track_title in cursor.fetchall():
+            self._remember(artist_name, mbid, (track_artist, track_title))
+
+    def _remember(self, artist_name: str, mbid: str | None, track: tuple[str, str]) -> None:
+        """Add one entry to the in-memory index, mirroring INSERT OR REPLACE."""
+        key = (artist_name.lower(), track)
+        if (oldmbid := self._entries.get(key)) and oldmbid != mbid:
+            self._by_mbid[oldmbid].discard(key)
+        self._entries[key] = mbid
+        self._by_name.setdefault(key[0], set()).add(track)
+        if mbid:
+            self._by_mbid.setdefault(mbid, set()).add(key)
+
     async def has_been_shown(
         self,
         artist_name: str,
@@ -80,52 +113,21 @@ class ArtistBioHistory:
     ) -> bool:
         """Return True if this artist's bio was shown in the session for a *different* track.
 
-        When ``track`` (artist, title) is supplied the query excludes any entry that was
-        recorded for the same track.  This lets a second pipeline run triggered by the
-        same filesystem event (double-detection) pass through without being suppressed.
+        When ``track`` (artist, title) is supplied any entry that was recorded
+        for the same track is ignored.  This lets a second pipeline run triggered
+        by the same filesystem event (double-detection) pass through without
+        being suppressed.
 
-        Checks by MBID first (globally unique), then falls back to artist name.
-        When an MBID is provided both are checked so a name-only entry recorded on
-        a previous track still counts as seen.
+        Matches by MBID (globally unique) or by artist name, so a name-only
+        entry recorded on a previous track still counts as seen.  Answered
+        from memory; nothing here touches the database.
         """
-        norm_artist = track[0] if track else ""
-        norm_title = track[1] if track else ""
-        use_track_filter = bool(norm_artist and norm_title)
-        try:
-            async with aiosqlite.connect(str(self.dbpath)) as conn:
-                if use_track_filter:
-                    if mbid:
-                        cursor = await conn.execute(
-                            """SELECT id FROM bio_history
-                               WHERE (mbid = ? OR artist_name = ?) AND session_id = ?
-                                 AND NOT (track_artist = ? AND track_title = ?)""",
-                            (mbid, artist_name, self.session_id, norm_artist, norm_title),
-                        )
-                    else:
-                        cursor = await conn.execute(
-                            """SELECT id FROM bio_history
-                               WHERE artist_name = ? AND session_id = ?
-                                 AND NOT (track_artist = ? AND track_title = ?)""",
-                            (artist_name, self.session_id, norm_artist, norm_title),
-                        )
-                else:
-                    if mbid:
-                        cursor = await conn.execute(
-                            """SELECT id FROM bio_history
-                               WHERE (mbid = ? OR artist_name = ?) AND session_id = ?""",
-                            (mbid, artist_name, self.session_id),
-                        )
-                    else:
-                        cursor = await conn.execute(
-                            """SELECT id FROM bio_history
-                               WHERE artist_name = ? AND session_id = ?""",
-                            (artist_name, self.session_id),
-                        )
-                row = await cursor.fetchone()
-                return row is not None
-        except Exception as error:  # pylint: disable=broad-exception-caught
-            logging.error("Error checking artist bio history: %s", error)
-            return False
+        tracks = set(self._by_name.get(artist_name.lower(), ()))
+        if mbid:
+            tracks.update(key[1] for key in self._by_mbid.get(mbid, ()))
+        if track and track[0] and track[1]:
+            tracks.discard(track)
+        return bool(tracks)
 
     async def record_shown(
         self,
@@ -134,27 +136,30 @@ class ArtistBioHistory:
         bio_text: str | None,
         track: tuple[str, str] | None = None,
     ) -> None:
-        """Record that this artist's bio was shown in the current session."""
-        norm_artist = track[0] if track else ""
-        norm_title = track[1] if track else ""
-        try:
-            async with aiosqlite.connect(str(self.dbpath)) as conn:
-                await conn.execute(
-                    """INSERT OR REPLACE INTO bio_history
-                       (artist_name, mbid, session_id, bio_text, shown_at,
-                        track_artist, track_title)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        artist_name,
-                        mbid,
-                        self.session_id,
-                        bio_text,
-                        int(time.time()),
-                        norm_artist,
-                        norm_title,
-                    ),
-                )
-                await conn.commit()
-                logging.debug("Recorded bio shown for %s (mbid=%s)", artist_name, mbid)
-        except Exception as error:  # pylint: disable=broad-exception-caught
-            logging.error("Error recording artist bio history: %s", error)
+        """Record that this artist's bio was shown in the current session.
+
+        Takes effect for has_been_shown immediately; the row itself is
+        written to the database in the background, batched with any
+        others that arrive before the write gets going.
+        """
+        norm_track = (track[0], track[1]) if track else ("", "")
+        self._remember(artist_name, mbid, norm_track)
+        self._writer.add(
+            (artist_name, mbid, self.session_id, bio_text, int(time.time()), *norm_track)
+        )
+        logging.debug("Recorded bio shown for %s (mbid=%s)", artist_name, mbid)
+
+    @staticmethod
+    async def _write_rows(conn: aiosqlite.Connection, rows: list[tuple]) -> None:
+        """Insert a batch of bio history rows"""
+        await conn.executemany(
+            """INSERT OR REPLACE INTO bio_history
+               (artist_name, mbid, session_id, bio_text, shown_at,
+                track_artist, track_title)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+
+    async def flush(self) -> None:
+        """Wait for any background writes to reach the database."""
+        await self._writer.flush()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Warm the metadata caches for a whole playlist before it is played"""
+
+import asyncio
+import logging
+import multiprocessing.synchronize
+import os
+import pathlib
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+import aiosqlite
+from PySide6.QtCore import QStandardPaths  # pylint: disable=no-name-in-module
+
+import nowplaying.bootstrap
+import nowplaying.config
+import nowplaying.datacache
+import nowplaying.metadata
+import nowplaying.utils.sqlite
+from nowplaying.types import TrackMetadata
+
+SCHEMA_VERSION = 1
+
+
+class EnrichmentProgress:
+    """
+    Which tracks of which playlists have already been enriched.
+
+    Kept on disk so a job that is stopped (or that WNP is quit in the
+    middle of) picks up where it left off next time.
+    """
+
+    @staticmethod
+    def _get_database_path() -> pathlib.Path:
+        return pathlib.Path(
+            QStandardPaths.standardLocations(QStandardPaths.AppDataLocation)[0]
+        ).joinpath("enrichment", "enrichment.db")
+
+    def __init__(self, dbpath: pathlib.Path | None = None):
+        self.dbpath = dbpath or self._get_database_path()
+        self._setup()
+
+    def _setup(self) -> None:
+        self.dbpath.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with nowplaying.utils.sqlite.sqlite_connection(str(self.dbpath), timeout=30) as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS enriched (
+                        playlist TEXT NOT NULL,
+                        trackkey TEXT NOT NULL,
+                        at       REAL NOT NULL,
+                        PRIMARY KEY (playlist, trackkey)
+                    );
+                """)
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM schema_version")
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute("INSERT INTO schema_version VALUES (?)", (SCHEMA_VERSION,))
+                conn.commit()
+        except sqlite3.Error as error:
+            logging.error("Failed to set up enrichment progress: %s", error)
+
+    async def done(self, playlist: str) -> set[str]:
+        """Keys of the tracks in playlist that were already enriched."""
+
+        async def _do_done() -> set[str]:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                cursor = await conn.execute(
+                    "SELECT trackkey FROM enriched WHERE playlist = ?", (playlist,)
+                )
+                return {row[0] for row in await cursor.fetchall()}
+
+        try:
+            return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_done)
+        except sqlite3.Error as error:
+            logging.error("Failed to read enrichment progress for %s: %s", playlist, error)
+            return set()
+
+    async def mark(self, playlist: str, trackkey: str) -> None:
+        """Record that one track of playlist has been enriched."""
+
+        async def _do_mark() -> None:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                await conn.execute(
+                    "INSERT OR REPLACE INTO enriched (playlist, trackkey, at) VALUES (?, ?, ?)",
+                    (playlist, trackkey, time.time()),
+                )
+                await conn.commit()
+
+        try:
+            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_mark)
+        except sqlite3.Error as error:
+            logging.error("Failed to record enrichment progress for %s: %s", playlist, error)
+
+    async def reset(self, playlist: str) -> None:
+        """Forget the progress for playlist so the next run starts over."""
+
+        async def _do_reset() -> None:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                await conn.execute("DELETE FROM enriched WHERE playlist = ?", (playlist,))
+                await conn.commit()
+
+        try:
+            await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_reset)
+        except sqlite3.Error as error:
+            logging.error("Failed to reset enrichment progress for %s: %s", playlist, error)
+
+
+def _trackkey(metadata: TrackMetadata) -> str | None:
+    """What identifies a track within its playlist"""
+    if filename := metadata.get("filename"):
+        return filename
+    if metadata.get("artist") and metadata.get("title"):
+        return f"{metadata['artist']} - {metadata['title']}".lower()
+    return None
+
+
+async def enrich_playlist(  # pylint: disable=too-many-locals
+    config: nowplaying.config.ConfigFile,
+    playlist: str,
+    *,
+    progress: EnrichmentProgress | None = None,
+    stopevent: threading.Event | multiprocessing.synchronize.Event | None = None,
+    callback: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """
+    Run every track of playlist through the metadata processors.
+
+    Nothing is kept from the results; the point is what the processors
+    look up along the way (MusicBrainz IDs, bios, art, covers), which all
+    land in their caches.  Requests run as background work so they never
+    compete with the track on air: images are queued for the datacache
+    worker, API lookups are paced by the cross-process rate limiter.
+    A track whose lookups left nothing cached or queued is not marked
+    done, so the next run tries it again.
+
+    Returns (tracks enriched this run, tracks in the playlist).
+    """
+    inputname = config.cparser.value("settings/input")
+    inputplugin = config.pluginobjs["inputs"].get(f"nowplaying.inputs.{inputname}")
+    if not inputplugin:
+        logging.error("No input plugin configured; cannot read playlist %s", playlist)
+        return 0, 0
+
+    tracks = await inputplugin.getplaylisttracks(playlist)
+    if not tracks:
+        logging.info("Playlist %s is empty or unknown to %s", playlist, inputname)
+        return 0, 0
+
+    progress = progress or EnrichmentProgress()
+    done = await progress.done(playlist)
+    processors = nowplaying.metadata.MetadataProcessors(config=config, prefetch=True)
+    client = nowplaying.datacache.get_client()
+    enriched = 0
+
+    logging.info("Enriching %s: %d tracks, %d already done", playlist, len(tracks), len(done))
+    with nowplaying.datacache.schedule_as(nowplaying.datacache.CLASS_BACKGROUND):
+        for count, track in enumerate(tracks, start=1):
+            if stopevent and stopevent.is_set():
+                logging.info("Enrichment of %s stopped at %d/%d", playlist, count, len(tracks))
+                break
+            trackkey = _trackkey(track)
+            if not trackkey or trackkey in done:
+                continue
+            served = client.served
+            try:
+                await processors.getmoremetadata(metadata=dict(track))
+            except Exception as err:  # pylint: disable=broad-except
+                logging.error("Could not enrich %s: %s", trackkey, err)
+                continue
+            if client.served == served:
+                logging.info("Nothing cached or queued for %s; leaving it for next run", trackkey)
+                continue
+            await progress.mark(playlist, trackkey)
+            done.add(trackkey)
+            enriched += 1
+            if callback:
+                callback(count, len(tracks))
+    await processors.close()
+
+    return enriched, len(tracks)
+
+
+async def run_job(
+    config: nowplaying.config.ConfigFile,
+    playlist: str,
+    *,
+    restart: bool = False,
+    stopevent: threading.Event | multiprocessing.synchronize.Event | None = None,
+    callback: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """
+    Enrich playlist as a job of its own, for the enrichment process and main().
+
+    The datacache client is process-wide and bound to the loop that first
+    used it, so it is closed and dropped before this loop goes away.
+    """
+    progress = EnrichmentProgress()
+    if restart:
+        await progress.reset(playlist)
+    try:
+        return await enrich_playlist(
+            config, playlist, progress=progress, stopevent=stopevent, callback=callback
+        )
+    finally:
+        await nowplaying.datacache.get_client().close()
+        nowplaying.datacache.reset_client()
+
+
+def main():
+    """enrich a playlist from the command line, without the tray"""
+    if len(sys.argv) < 2:
+        print(f"usage: {sys.argv[0]} <playlist> [--restart]")
+        sys.exit(1)
+    playlist = sys.argv[1]
+
+    bundledir = os.path.abspath(os.path.dirname(__file__))
+    logging.basicConfig(level=logging.INFO)
+    nowplaying.bootstrap.set_qt_names()
+    config = nowplaying.config.ConfigFile(bundledir=bundledir)
+
+    enriched, total = asyncio.run(
+        run_job(
+            config,
+            playlist,
+            restart="--restart" in sys.argv[2:],
+            callback=lambda count, total: print(f"{count}/{total}"),
+        )
+    )
+    print(f"Enriched {enriched} of {total} tracks in {playlist}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
+# pylint: disable=too-many-lines
 """MetadataProcessors: orchestrate all metadata sources for a track"""
 
 import asyncio
 import copy
+import dataclasses
 import datetime
 import logging
 import os
@@ -11,6 +13,8 @@ import re
 import string
 import sys
 import textwrap
+import time
+from typing import TYPE_CHECKING, Any
 
 import url_normalize
 import wnpmb.artist_resolution
@@ -21,16 +25,21 @@ import nowplaying.config
 import nowplaying.exceptions
 import nowplaying.hostmeta
 import nowplaying.metadata.biohistory
+import nowplaying.metadata.providerstats
 import nowplaying.metadata.tinytag_runner
 import nowplaying.musicbrainz
 import nowplaying.utils
 import nowplaying.utils.filters
+from nowplaying.metadata.stages import COVER, EXTRAS, HOST, PALETTE, TAGS, Stage, run_stages
 from nowplaying.types import TrackMetadata
 
 import nowplaying.datacache
 import nowplaying.datacache.colors
 import nowplaying.datacache.storage
 
+if TYPE_CHECKING:
+    import nowplaying.artistextras
+
 # All cover art is one data_type: a track's embedded art is still a front cover,
 # and data_type drives eviction, TTL, and color extraction (see IMAGE_DATA_TYPES
 # and COLOR_EXTRACT_TYPES in datacache), so splitting it would need registering
@@ -50,6 +59,8 @@ _TRACK_COVER_PREFIX = "track_"
 NOTE_RE = re.compile("N(?i:ote):")
 YOUTUBE_COMMENT_MATCH_RE = re.compile(r"^https?://(?:www\.)?youtube\.com/watch\?v=")
 YOUTUBE_TITLE_MATCH_RE = re.compile(r"^[^\s]+_-_[^\s]+")
+# What artist extras that finish after an early return can still fill in
+LATE_EXTRAS_FIELDS = ("artistlongbio", "artistshortbio", "artistwebsites")
 
 
 def cover_cache_key(metadata: TrackMetadata) -> str | None:
@@ -85,11 +96,36 @@ def split_youtube_title(title: str) -> tuple[str, str]:
     return artist.replace("_", " ").strip(), track.replace("_", " ").strip()
 
 
-class MetadataProcessors:  # pylint: disable=too-few-public-methods
+@dataclasses.dataclass
+class _LateExtras:
+    """Artist extras still running when getmoremetadata() returned early"""
+
+    tasks: list[tuple[str, asyncio.Task]]
+    bio_state: tuple
+    track: tuple[str, str]
+    seen: dict[str, Any]
+
+
+def _late_fields(metadata: TrackMetadata) -> dict[str, Any]:
+    return {key: metadata.get(key) for key in LATE_EXTRAS_FIELDS}
+
+
+async def _cancel_extras(tasks: list[tuple[str, asyncio.Task]]) -> None:
+    """Cancel whichever of the extras tasks are still running and wait for them"""
+    if remaining_tasks := [task for _, task in tasks if not task.done()]:
+        for task in remaining_tasks:
+            task.cancel()
+        await asyncio.gather(*remaining_tasks, return_exceptions=True)
+
+
+class MetadataProcessors:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
     """Run through a bunch of different metadata processors"""
 
     def __init__(
-        self, config: nowplaying.config.ConfigFile | None = None, test_mode: bool = False
+        self,
+        config: nowplaying.config.ConfigFile | None = None,
+        test_mode: bool = False,
+        prefetch: bool = False,
     ):
         self.metadata: TrackMetadata = {}
         self.test_mode = test_mode
@@ -100,12 +136,28 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
 
         self.extraslist: dict[int, list[str]] = self._sortextras()
         self._bio_session_id: str = datetime.datetime.now().isoformat()
-        if self.config.cparser.value("artistextras/bio_dedup", type=bool):
+        # A prefetched track may never go live, so it must not mark any bio as shown
+        if not prefetch and self.config.cparser.value("artistextras/bio_dedup", type=bool):
             self._biohistory: nowplaying.metadata.biohistory.ArtistBioHistory | None = (
                 nowplaying.metadata.biohistory.ArtistBioHistory(self._bio_session_id)
             )
         else:
             self._biohistory = None
+        self._providerstats = nowplaying.metadata.providerstats.ProviderStats.shared()
+        self._early_extras = False
+        self._late_extras: _LateExtras | None = None
+        # One helper for the life of the processors so the MB client, its user
+        # agent and its session setup are reused from track to track
+        self._mbhelper = nowplaying.musicbrainz.MusicBrainzHelper(
+            config=self.config, test_mode=self.test_mode
+        )
+
+    async def close(self) -> None:
+        """Write out the bio history and provider stats still waiting in memory"""
+        await self._drop_late_extras()
+        if self._biohistory:
+            await self._biohistory.flush()
+        await self._providerstats.flush()
 
     def _sortextras(self) -> dict[int, list[str]]:
         extras = {}
@@ -116,12 +168,19 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
             extras[priority].append(plugin)
         return dict(reversed(list(extras.items())))
 
-    async def getmoremetadata(  # pylint: disable=too-many-branches
+    async def getmoremetadata(  # pylint: disable=too-many-statements
         self,
         metadata: TrackMetadata | None = None,
         skipplugins: bool = False,
+        early_extras: bool = False,
     ) -> TrackMetadata:
-        """take metadata and process it"""
+        """take metadata and process it
+
+        With early_extras the artist extras stage stops waiting once the first
+        provider has delivered; see merge_late_extras() for the rest.
+        """
+        await self._drop_late_extras()
+        self._early_extras = early_extras
         if metadata:
             self.metadata = metadata
         else:
@@ -134,25 +193,17 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
             if raw:
                 self.metadata["musicbrainzalbumid"] = raw[0]
 
-        try:
-            for processor in "hostmeta", "tinytag", "coverimagetype":
-                logging.debug("running %s", processor)
-                func = getattr(self, f"_process_{processor}")
-                func()
-        except Exception:  # pylint: disable=broad-except
-            logging.exception("Ignoring sub-metaproc failure.")
-
         prioritize_network: bool = self.config.cparser.value(
             "artistextras/prioritizenetworkart", type=bool
         )
-        embedded_art_backup: bytes | None = None
-        embedded_type_backup: str | None = None
-        if prioritize_network:
+        embedded_backup: dict[str, Any] = {}
+
+        def _stash_embedded_art() -> None:
             logging.debug("prioritizenetworkart: stashing embedded cover art as fallback")
-            embedded_art_backup = self.metadata.pop("coverimageraw", None)
+            embedded_backup["art"] = self.metadata.pop("coverimageraw", None)
             # Stash the type with the bytes so restoring the art restores its label
             # rather than leaving a network image's type attached to it.
-            embedded_type_backup = self.metadata.pop("coverimagetype", None)
+            embedded_backup["type"] = self.metadata.pop("coverimagetype", None)
             for key in (
                 "coverurl",
                 "cover_palette",
@@ -162,33 +213,106 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
                 self.metadata.pop(key, None)
             self.metadata.pop("_embedded_extra_covers", None)
 
-        try:
-            logging.debug("running cover_colors")
-            await self._process_cover_colors()
-        except Exception:  # pylint: disable=broad-except
-            logging.exception("Ignoring sub-metaproc failure.")
-
-        # Cover caching keys on title, so run it after the title fixups: otherwise an
-        # input plugin reporting "Artist - Title" keys under the raw string while a
-        # cleaner one keys under the stripped title, splitting one track across two
-        # entries.  _strip_identifiers() in _finalize_metadata() edits the title again
-        # later, so the key still is not the final title — but it cannot move past
-        # _process_plugins(), which expects cover art resolved before plugins run.
-        self._fix_filename_stem()
-        self._fix_artist_in_title()
-
-        await self._process_cover_images()
+        # Listed in the order they would run one at a time; run_stages() overlaps
+        # whatever the declared reads and writes allow, chiefly palette extraction
+        # with the network lookups.  Cover caching keys on title, so it comes after
+        # the title fixups: otherwise an input plugin reporting "Artist - Title" keys
+        # under the raw string while a cleaner one keys under the stripped title,
+        # splitting one track across two entries.  _strip_identifiers() in
+        # _finalize_metadata() edits the title again later, so the key still is not
+        # the final title — but it cannot move past the plugins, which expect cover
+        # art resolved before they run.
+        stages = [
+            Stage("hostmeta", self._process_hostmeta, writes=frozenset({HOST})),
+            Stage(
+                "tinytag",
+                self._process_tinytag,
+                reads=frozenset({TAGS, COVER}),
+                writes=frozenset({TAGS, COVER}),
+            ),
+            Stage(
+                "coverimagetype",
+                self._process_coverimagetype,
+                reads=frozenset({COVER}),
+                writes=frozenset({COVER}),
+            ),
+        ]
+        if prioritize_network:
+            stages.append(
+                Stage(
+                    "stash_embedded_art",
+                    _stash_embedded_art,
+                    reads=frozenset({COVER, PALETTE}),
+                    writes=frozenset({COVER, PALETTE}),
+                )
+            )
+        stages.extend(
+            [
+                Stage(
+                    "title_fixups",
+                    self._fix_titles,
+                    reads=frozenset({TAGS}),
+                    writes=frozenset({TAGS}),
+                ),
+                Stage(
+                    "cover_images",
+                    self._process_cover_images,
+                    reads=frozenset({TAGS, COVER}),
+                    writes=frozenset({COVER, PALETTE}),
+                ),
+                Stage(
+                    "cover_colors",
+                    self._process_cover_colors,
+                    reads=frozenset({COVER, PALETTE}),
+                    writes=frozenset({PALETTE}),
+                    snapshot=True,
+                ),
+                Stage(
+                    "musicbrainz",
+                    self._musicbrainz,
+                    reads=frozenset({TAGS, COVER}),
+                    writes=frozenset({TAGS, COVER}),
+                ),
+                Stage(
+                    "recognition",
+                    self._process_recognition,
+                    reads=frozenset({TAGS, COVER}),
+                    writes=frozenset({TAGS, COVER}),
+                ),
+                Stage(
+                    "mb_fallback",
+                    self._mb_fallback,
+                    reads=frozenset({TAGS}),
+                    writes=frozenset({TAGS, COVER}),
+                ),
+                Stage(
+                    "imagecacheartist",
+                    self._set_imagecacheartist,
+                    reads=frozenset({TAGS}),
+                    writes=frozenset({TAGS}),
+                ),
+            ]
+        )
+        if not skipplugins and self.config.cparser.value("artistextras/enabled", type=bool):
+            stages.append(
+                Stage(
+                    "artist_extras",
+                    self._artist_extras,
+                    reads=frozenset({TAGS, COVER}),
+                    writes=frozenset({TAGS, COVER, PALETTE, EXTRAS}),
+                )
+            )
 
-        await self._process_plugins(skipplugins)
+        await run_stages(stages, deadline=self._processing_deadline())
 
-        if embedded_art_backup and not self.metadata.get("coverimageraw"):
+        if embedded_backup.get("art") and not self.metadata.get("coverimageraw"):
             logging.debug("prioritizenetworkart: no network art found, restoring embedded cover")
-            self.metadata["coverimageraw"] = embedded_art_backup
+            self.metadata["coverimageraw"] = embedded_backup["art"]
             # This art never reached datacache on this pass, so there is no cachekey to
             # address it by; the singleton route is the honest answer.  The stashed type
             # is always present when the art is: _process_coverimagetype ran before the
             # stash and either labelled the bytes or discarded them.
-            self._set_cover_pointers(None, mime_type=embedded_type_backup)
+            self._set_cover_pointers(None, mime_type=embedded_backup["type"])
 
         if prioritize_network:
             # If palette wasn't already supplied by the datacache hit, extract it now
@@ -202,6 +326,11 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
         self._finalize_metadata()
         return self.metadata
 
+    def _processing_deadline(self) -> float:
+        """How long getmoremetadata may spend on one track, scaled from settings/delay."""
+        base_delay = self.config.cparser.value("settings/delay", type=float, defaultValue=10.0)
+        return min(max(base_delay * 3.0, 20.0), 60.0)
+
     def _set_cover_pointers(self, cachekey: str | None, mime_type: str | None = None) -> None:
         """Record how consumers should fetch and interpret the current cover art.
 
@@ -304,15 +433,22 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
 
         self._fix_dates()
 
+        self._finalize_bio()
+        self._uniqlists()
+        self._strip_identifiers()
+        self._fix_duration()
+
+    def _finalize_bio(self) -> None:
+        """Fill whichever of the long and short bio is missing from the other"""
         if self.metadata.get("artistlongbio") and not self.metadata.get("artistshortbio"):
             self._generate_short_bio()
 
         if not self.metadata.get("artistlongbio") and self.metadata.get("artistshortbio"):
             self.metadata["artistlongbio"] = self.metadata["artistshortbio"]
 
-        self._uniqlists()
-        self._strip_identifiers()
-        self._fix_duration()
+    def _fix_titles(self) -> None:
+        self._fix_filename_stem()
+        self._fix_artist_in_title()
 
     def _fix_filename_stem(self) -> None:
         """if no title, derive it (and possibly artist) from the filename stem"""
@@ -467,10 +603,16 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
         if discordguild := self.config.cparser.value("discord/guild"):
             self.metadata["discordguild"] = discordguild
 
-    def _process_tinytag(self) -> None:
+    async def _process_tinytag(self) -> None:
+        if not self.metadata.get("filename"):
+            return
         try:
-            tempdata = nowplaying.metadata.tinytag_runner.TinyTagRunner().process(
-                metadata=copy.copy(self.metadata)
+            # File I/O happens in a worker thread, or not at all on a tag cache hit
+            filetags = await nowplaying.metadata.tinytag_runner.load_file_tags(
+                self.metadata["filename"]
+            )
+            tempdata = nowplaying.metadata.tinytag_runner.TinyTagRunner().apply(
+                copy.copy(self.metadata), filetags
             )
             self.metadata = recognition_replacement(
                 config=self.config, metadata=self.metadata, addmeta=tempdata
@@ -554,10 +696,7 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
             return
 
         try:
-            musicbrainz = nowplaying.musicbrainz.MusicBrainzHelper(
-                config=self.config, test_mode=self.test_mode
-            )
-            addmeta = await musicbrainz.recognize(copy.copy(self.metadata))
+            addmeta = await self._mbhelper.recognize(copy.copy(self.metadata))
             self.metadata = recognition_replacement(
                 config=self.config, metadata=self.metadata, addmeta=addmeta
             )
@@ -589,10 +728,7 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
 
         logging.debug("Attempting musicbrainz fallback")
 
-        musicbrainz = nowplaying.musicbrainz.MusicBrainzHelper(
-            config=self.config, test_mode=self.test_mode
-        )
-        addmeta = await musicbrainz.lastditcheffort(copy.copy(self.metadata))
+        addmeta = await self._mbhelper.lastditcheffort(copy.copy(self.metadata))
         self.metadata = recognition_replacement(
             config=self.config, metadata=self.metadata, addmeta=addmeta
         )
@@ -602,9 +738,9 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
             title = self.metadata.get("title", "")
             if comments := self.metadata.get("comments"):
                 if YOUTUBE_COMMENT_MATCH_RE.match(comments) and " - " in title:
-                    await self._mb_youtube_fallback(musicbrainz, title)
+                    await self._mb_youtube_fallback(self._mbhelper, title)
             elif YOUTUBE_TITLE_MATCH_RE.match(title):
-                await self._mb_youtube_fallback(musicbrainz, title)
+                await self._mb_youtube_fallback(self._mbhelper, title)
 
     async def _mb_youtube_fallback(
         self,
@@ -645,36 +781,45 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
         except Exception:  # pylint: disable=broad-except
             logging.error("Ignoring fallback failure.")
 
-    async def _process_plugins(self, skipplugins: bool) -> None:
-        await self._musicbrainz()
+    async def _process_recognition(self) -> None:
+        """Run the recognition plugins concurrently, merging in priority order.
 
-        for plugin in self.config.plugins["recognition"]:
-            metalist = self.config.pluginobjs["recognition"][plugin].providerinfo()
-            provider = any(meta not in self.metadata for meta in metalist)
-            if provider:
+        Each plugin that provides something the track is missing starts
+        right away from a copy of the metadata.  A plugin used to be skipped
+        when the ones before it had already filled in everything it
+        provides, so that check is made again before its answer is merged.
+        """
+        tasks: list[tuple[str, Any, asyncio.Task]] = []
+        try:
+            for plugin in self.config.plugins["recognition"]:
+                plugin_obj = self.config.pluginobjs["recognition"][plugin]
+                metalist = plugin_obj.providerinfo()
+                if any(meta not in self.metadata for meta in metalist):
+                    task = asyncio.create_task(plugin_obj.recognize(metadata=dict(self.metadata)))
+                    tasks.append((plugin, metalist, task))
+
+            for plugin, metalist, task in tasks:
                 try:
-                    if addmeta := await self.config.pluginobjs["recognition"][plugin].recognize(
-                        metadata=self.metadata
-                    ):
-                        self.metadata = recognition_replacement(
-                            config=self.config, metadata=self.metadata, addmeta=addmeta
-                        )
+                    addmeta = await task
                 except Exception as error:  # pylint: disable=broad-except
                     logging.error("%s threw exception %s", plugin, error, exc_info=True)
+                    continue
+                if addmeta and any(meta not in self.metadata for meta in metalist):
+                    self.metadata = recognition_replacement(
+                        config=self.config, metadata=self.metadata, addmeta=addmeta
+                    )
+        finally:
+            if remaining_tasks := [task for _, _, task in tasks if not task.done()]:
+                for task in remaining_tasks:
+                    task.cancel()
+                await asyncio.gather(*remaining_tasks, return_exceptions=True)
 
-        await self._mb_fallback()
-
+    def _set_imagecacheartist(self) -> None:
         if self.metadata and self.metadata.get("artist"):
             self.metadata["imagecacheartist"] = nowplaying.utils.normalize_text(
                 self.metadata["artist"]
             )
 
-        if skipplugins:
-            return
-
-        if self.config.cparser.value("artistextras/enabled", type=bool):
-            await self._artist_extras()
-
     async def _select_bio_artist(self) -> tuple[str | None, str | None]:
         """Return (artist_name, mbid) for the first artist whose bio has not yet been shown.
 
@@ -763,21 +908,25 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
         suppress_bio: bool,
         original_artist: str | None,
         original_mbids: list[str] | str | None,
+        *,
+        record: bool = True,
     ) -> None:
-        """Record bio as shown and restore original artist metadata fields."""
+        """Record bio as shown and restore original artist metadata fields.
+
+        With record=False the bio is left unrecorded, for when more of it may
+        still arrive; _bio_dedup_record() does that part later.
+        """
         if not self._biohistory:
             return
 
-        track = (original_artist or "", self.metadata.get("title") or "")
-        if not suppress_bio and bio_artist:
-            bio_text = self.metadata.get("artistlongbio")
-            await self._biohistory.record_shown(bio_artist, bio_mbid, bio_text, track)
-            logging.debug("Bio dedup: recorded bio shown for %s", bio_artist)
-        elif not suppress_bio and bio_mbid:
-            # Extra MBID (featured artist) mode: record by MBID as identifier
-            bio_text = self.metadata.get("artistlongbio")
-            await self._biohistory.record_shown(bio_mbid, bio_mbid, bio_text, track)
-            logging.debug("Bio dedup: recorded extra MBID bio shown for %s", bio_mbid)
+        if record:
+            await self._bio_dedup_record(
+                bio_artist,
+                bio_mbid,
+                suppress_bio,
+                (original_artist or "", self.metadata.get("title") or ""),
+                self.metadata.get("artistlongbio"),
+            )
 
         if original_artist != self.metadata.get("artist"):
             if original_artist is not None:
@@ -791,78 +940,171 @@ class MetadataProcessors:  # pylint: disable=too-few-public-methods
             self.metadata.pop("artistlongbio", None)
             self.metadata.pop("artistshortbio", None)
 
-    async def _artist_extras(self) -> None:  # pylint: disable=too-many-branches,too-many-nested-blocks
-        """Efficiently process artist extras plugins using native async calls"""
+    async def _bio_dedup_record(  # pylint: disable=too-many-arguments
+        self,
+        bio_artist: str | None,
+        bio_mbid: str | None,
+        suppress_bio: bool,
+        track: tuple[str, str],
+        bio_text: str | None,
+    ) -> None:
+        """Record the bio as shown for the artist _bio_dedup_setup() picked."""
+        if not self._biohistory or suppress_bio:
+            return
+        if bio_artist:
+            await self._biohistory.record_shown(bio_artist, bio_mbid, bio_text, track)
+            logging.debug("Bio dedup: recorded bio shown for %s", bio_artist)
+        elif bio_mbid:
+            # Extra MBID (featured artist) mode: record by MBID as identifier
+            await self._biohistory.record_shown(bio_mbid, bio_mbid, bio_text, track)
+            logging.debug("Bio dedup: recorded extra MBID bio shown for %s", bio_mbid)
+
+    async def _artist_extras(self) -> None:  # pylint: disable=too-many-branches
+        """Run the artistextras plugins concurrently, each against its own deadline.
+
+        Results are merged in priority order as soon as every higher priority
+        plugin has finished, so a slow provider only holds up the ones below it
+        and whatever was merged survives the overall processing deadline.
+        """
         bio_state = await self._bio_dedup_setup()
         tasks: list[tuple[str, asyncio.Task]] = []
         try:
             # Calculate dynamic timeout based on delay setting
             base_delay = self.config.cparser.value("settings/delay", type=float, defaultValue=10.0)
-            timeout = min(max(base_delay * 1.2, 5.0), 15.0)  # 5-15 second range
+            cap = min(max(base_delay * 1.2, 5.0), 15.0)  # 5-15 second range
 
             # Start all plugin tasks concurrently using native async methods
             for _, plugins in self.extraslist.items():
                 for plugin in plugins:
+                    if not self._providerstats.allow(plugin):
+                        logging.debug("%s keeps failing; skipping it for now", plugin)
+                        continue
                     try:
                         plugin_obj = self.config.pluginobjs["artistextras"][plugin]
-                        task = asyncio.create_task(plugin_obj.download_async(self.metadata))
+                        timeout = self._providerstats.timeout_for(plugin, cap)
+                        task = asyncio.create_task(self._timed_extra(plugin, plugin_obj, timeout))
                         tasks.append((plugin, task))
-                        logging.debug("Started %s plugin task", plugin)
+                        logging.debug("Started %s plugin task (%.1fs)", plugin, timeout)
                     except Exception as error:  # pylint: disable=broad-except
                         logging.error(
                             "%s threw exception during setup: %s", plugin, error, exc_info=True
                         )
 
-            if not tasks:
-                return
-
-            # Wait for tasks with dynamic timeout and early completion detection
+            merged = 0
+            pending = {task for _, task in tasks}
             try:
-                done, pending = await asyncio.wait(
-                    [task for _, task in tasks],
-                    timeout=timeout,
-                    return_when=asyncio.ALL_COMPLETED,
-                )
-
-                for plugin, task in tasks:
-                    if task in done:
-                        try:
-                            addmeta = await task
-                        except Exception as error:  # pylint: disable=broad-except
-                            logging.error("%s plugin failed: %s", plugin, error, exc_info=True)
-                            continue
-                        if addmeta:
+                while merged < len(tasks):
+                    while merged < len(tasks) and tasks[merged][1].done():
+                        plugin, task = tasks[merged]
+                        merged += 1
+                        if addmeta := task.result():
                             self.metadata = recognition_replacement(
                                 config=self.config, metadata=self.metadata, addmeta=addmeta
                             )
                             logging.debug("%s plugin completed successfully", plugin)
                         else:
                             logging.debug("%s plugin returned no data", plugin)
-                    elif task in pending:
-                        logging.debug("%s plugin timed out after %ss", plugin, timeout)
-                        task.cancel()
+                    if merged == len(tasks):
+                        break
+                    if self._early_extras and any(
+                        task.done() and task.result() for _, task in tasks
+                    ):
+                        late = self._merge_finished(self.metadata, tasks[merged:])
+                        self._late_extras = _LateExtras(
+                            tasks=late,
+                            bio_state=bio_state,
+                            track=(bio_state[3] or "", self.metadata.get("title") or ""),
+                            seen=_late_fields(self.metadata),
+                        )
+                        logging.debug("Returning early; %d extras still running", len(late))
+                        break
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not self._late_extras:
+                    await _cancel_extras(tasks)
+        finally:
+            await self._bio_dedup_restore(*bio_state, record=not self._late_extras)
+
+    def _merge_finished(
+        self, metadata: TrackMetadata, tasks: list[tuple[str, asyncio.Task]]
+    ) -> list[tuple[str, asyncio.Task]]:
+        """Merge the finished tasks into metadata in priority order; return the rest"""
+        remaining = []
+        for plugin, task in tasks:
+            if not task.done():
+                remaining.append((plugin, task))
+            elif addmeta := task.result():
+                recognition_replacement(config=self.config, metadata=metadata, addmeta=addmeta)
+                logging.debug("%s plugin completed successfully", plugin)
+        return remaining
+
+    async def merge_late_extras(self, metadata: TrackMetadata, wait: bool = False) -> bool:
+        """Fold artist extras that finished after an early return into metadata.
+
+        getmoremetadata(early_extras=True) hands back a track as soon as its
+        first artist extras provider has delivered; the slower ones keep going
+        and land here.  They only fill in what is still empty, so nothing that
+        has already been shown changes under the audience.  With wait, this
+        waits out the rest of them (each is bounded by its own deadline) and
+        records the bio as shown.  Returns True if metadata changed.
+        """
+        if not (late := self._late_extras):
+            return False
+        if wait:
+            # From here on this call owns them, so the next track cannot cancel them
+            self._late_extras = None
+            if pending := [task for _, task in late.tasks]:
+                try:
+                    await asyncio.wait(pending)
+                except asyncio.CancelledError:
+                    await _cancel_extras(late.tasks)
+                    raise
 
-                if pending:
-                    try:
-                        await asyncio.gather(*pending, return_exceptions=True)
-                    except Exception as cleanup_error:  # pylint: disable=broad-except
-                        logging.error("Exception during task cleanup: %s", cleanup_error)
+        late.tasks = self._merge_finished(metadata, late.tasks)
+        if late.bio_state[2]:
+            metadata.pop("artistlongbio", None)
+            metadata.pop("artistshortbio", None)
 
-            except Exception as error:  # pylint: disable=broad-except
-                logging.error("Artist extras processing failed: %s", error)
-                remaining_tasks = [task for _, task in tasks if not task.done()]
-                for task in remaining_tasks:
-                    task.cancel()
-                if remaining_tasks:
-                    try:
-                        await asyncio.gather(*remaining_tasks, return_exceptions=True)
-                    except Exception as cleanup_error:  # pylint: disable=broad-except
-                        logging.error(
-                            "Exception during task cleanup in exception handler: %s",
-                            cleanup_error,
-                        )
+        current, self.metadata = self.metadata, metadata
+        try:
+            self._finalize_bio()
+            self._uniqlists()
         finally:
-            await self._bio_dedup_restore(*bio_state)
+            self.metadata = current
+
+        if wait:
+            await self._bio_dedup_record(
+                *late.bio_state[:3], late.track, metadata.get("artistlongbio")
+            )
+        seen, late.seen = late.seen, _late_fields(metadata)
+        return late.seen != seen
+
+    async def _drop_late_extras(self) -> None:
+        """Cancel extras left over from a track that never got published"""
+        if late := self._late_extras:
+            self._late_extras = None
+            await _cancel_extras(late.tasks)
+
+    async def _timed_extra(
+        self,
+        plugin: str,
+        plugin_obj: "nowplaying.artistextras.ArtistExtrasPlugin",
+        timeout: float,
+    ) -> TrackMetadata | None:
+        """Run one plugin within its deadline and record how it went"""
+        start = time.monotonic()
+        try:
+            addmeta = await asyncio.wait_for(plugin_obj.download_async(self.metadata), timeout)
+        except TimeoutError:
+            logging.debug("%s plugin timed out after %.1fs", plugin, timeout)
+            await self._providerstats.record(plugin, timeout, ok=False, timedout=True)
+            return None
+        except Exception as error:  # pylint: disable=broad-except
+            logging.error("%s plugin failed: %s", plugin, error, exc_info=True)
+            await self._providerstats.record(plugin, time.monotonic() - start, ok=False)
+            return None
+        await self._providerstats.record(plugin, time.monotonic() - start, ok=True)
+        return addmeta
 
     def _generate_short_bio(self) -> None:
         if not self.metadata:
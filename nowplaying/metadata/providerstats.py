@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Latency and success history for metadata providers, used to size their deadlines"""
+
+import collections
+import logging
+import pathlib
+import sqlite3
+import statistics
+import time
+
+import aiosqlite
+from PySide6.QtCore import QStandardPaths  # pylint: disable=no-name-in-module
+
+import nowplaying.utils.sqlite
+
+SCHEMA_VERSION = 1
+
+# Samples kept per provider; enough for a stable p95 without remembering last year
+WINDOW = 50
+# Fewer successful samples than this and the provider gets the full cap
+MIN_SAMPLES = 5
+# Deadline = p95 * headroom, never below the floor
+TIMEOUT_HEADROOM = 1.5
+MIN_TIMEOUT = 2.0
+# This many failures in a row opens the breaker; after the cooldown a single
+# call is let through to see if the provider has recovered, and the rest are
+# turned away until it reports back
+FAILURE_STREAK = 5
+BREAKER_COOLDOWN = 300.0
+
+
+class ProviderStats:
+    """
+    Rolling latency/success history per provider, stored across restarts.
+
+    Each call is recorded as (elapsed, ok, when, timedout).  p50/p95 come
+    from the successful calls plus the timeouts, the latter counted at the
+    deadline they ran into: leaving them out would let p95 see only the fast
+    calls, shrinking the deadline until even normal calls miss it.  Errors
+    say nothing about latency and are left out.  A trailing run of failures
+    trips a circuit breaker so a provider that is down stops costing every
+    track a timeout.
+
+    Samples are kept in memory and written back in the background, so
+    recording a call never waits on SQLite.  Use shared() so that every
+    pipeline in the process sees the same breakers.
+    """
+
+    _instances: dict[pathlib.Path, "ProviderStats"] = {}
+
+    @staticmethod
+    def _get_database_path() -> pathlib.Path:
+        return pathlib.Path(
+            QStandardPaths.standardLocations(QStandardPaths.AppDataLocation)[0]
+        ).joinpath("providerstats", "providerstats.db")
+
+    def __init__(self, dbpath: pathlib.Path | None = None):
+        self.dbpath = dbpath or self._get_database_path()
+        self._samples: dict[str, collections.deque[tuple[float, bool, float, bool]]] = (
+            collections.defaultdict(lambda: collections.deque(maxlen=WINDOW))
+        )
+        # provider -> when its half-open probe was let through
+        self._probes: dict[str, float] = {}
+        self._writer = nowplaying.utils.sqlite.BackgroundWriter(
+            self.dbpath, self._write_rows, "provider stats"
+        )
+        self._load()
+
+    @classmethod
+    def shared(cls) -> "ProviderStats":
+        """The instance for the default database, created on first use"""
+        dbpath = cls._get_database_path()
+        if dbpath not in cls._instances:
+            cls._instances[dbpath] = cls(dbpath)
+        return cls._instances[dbpath]
+
+    def _load(self) -> None:
+        """Create the database if needed and read back what earlier runs recorded."""
+        self.dbpath.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with nowplaying.utils.sqlite.sqlite_connection(str(self.dbpath), timeout=30) as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS samples (
+                        id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                        provider TEXT NOT NULL,
+                        elapsed  REAL NOT NULL,
+                        ok       INTEGER NOT NULL,
+                        at       REAL NOT NULL,
+                        timedout INTEGER NOT NULL DEFAULT 0
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_samples_provider
+                        ON samples(provider, id);
+                """)
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM schema_version")
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute("INSERT INTO schema_version VALUES (?)", (SCHEMA_VERSION,))
+                cursor.execute(
+                    "SELECT provider, elapsed, ok, at, timedout FROM samples ORDER BY id"
+                )
+                for provider, elapsed, ok, at, timedout in cursor.fetchall():
+                    self._samples[provider].append((elapsed, bool(ok), at, bool(timedout)))
+                conn.commit()
+        except sqlite3.Error as error:
+            logging.error("Failed to load provider stats: %s", error)
+
+    def percentiles(self, provider: str) -> tuple[float, float] | None:
+        """(p50, p95) of the provider's successful and timed out calls, or None if too few."""
+        latencies = [
+            elapsed
+            for elapsed, ok, _, timedout in self._samples.get(provider, ())
+            if ok or timedout
+        ]
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        cuts = statistics.quantiles(latencies, n=20, method="inclusive")
+        return cuts[9], cuts[18]
+
+    def timeout_for(self, provider: str, cap: float) -> float:
+        """How long to give this provider: its p95 plus headroom, within [floor, cap]."""
+        if not (stats := self.percentiles(provider)):
+            return cap
+        return min(cap, max(MIN_TIMEOUT, stats[1] * TIMEOUT_HEADROOM))
+
+    def failure_streak(self, provider: str) -> int:
+        """Number of failures since the provider last succeeded."""
+        streak = 0
+        for _, ok, _, _ in reversed(self._samples.get(provider, ())):
+            if ok:
+                break
+            streak += 1
+        return streak
+
+    def allow(self, provider: str) -> bool:
+        """False while the provider's breaker is open.
+
+        Once the cooldown has passed a single call is let through as a probe.
+        Everything else is turned away until that call is recorded, or until
+        another cooldown passes without it reporting back.
+        """
+        if self.failure_streak(provider) < FAILURE_STREAK:
+            return True
+        now = time.time()
+        last = max(self._samples[provider][-1][2], self._probes.get(provider, 0.0))
+        if now - last < BREAKER_COOLDOWN:
+            return False
+        self._probes[provider] = now
+        return True
+
+    async def record(
+        self, provider: str, elapsed: float, ok: bool, timedout: bool = False
+    ) -> None:
+        """Add one call's outcome; it is persisted in the background.
+
+        A timed out call should pass the deadline it hit as elapsed.
+        """
+        now = time.time()
+        self._samples[provider].append((elapsed, ok, now, timedout))
+        self._probes.pop(provider, None)
+        self._writer.add((provider, elapsed, int(ok), now, int(timedout)))
+
+    @staticmethod
+    async def _write_rows(conn: aiosqlite.Connection, rows: list[tuple]) -> None:
+        """Insert a batch of samples, trimming each provider to WINDOW rows"""
+        await conn.executemany(
+            "INSERT INTO samples (provider, elapsed, ok, at, timedout) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        await conn.executemany(
+            """DELETE FROM samples WHERE provider = ? AND id NOT IN (
+                   SELECT id FROM samples WHERE provider = ?
+                   ORDER BY id DESC LIMIT ?)""",
+            [(provider, provider, WINDOW) for provider in {row[0] for row in rows}],
+        )
+
+    async def flush(self) -> None:
+        """Wait for any background writes to reach the database."""
+        await self._writer.flush()
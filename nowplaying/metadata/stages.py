@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Run metadata stages concurrently, ordered by what each one reads and writes"""
+
+import asyncio
+import dataclasses
+import inspect
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+
+# Groups of metadata fields the stages declare against.  They are coarse on
+# purpose: the point is to keep stages that touch the same data in their listed
+# order, not to track every key.
+HOST = "host"  # host/port/channel details for templates
+TAGS = "tags"  # artist, title, album, identifiers and the rest of the track's text
+COVER = "cover"  # coverimageraw and the fields describing it
+PALETTE = "palette"  # cover_palette*
+EXTRAS = "extras"  # bios, artist images and websites from the artistextras plugins
+
+
+@dataclasses.dataclass(frozen=True)
+class Stage:
+    """One step of metadata processing.
+
+    snapshot marks a stage that reads everything it needs before its first await,
+    so a later stage that overwrites those inputs only has to wait for it to start
+    rather than finish.
+    """
+
+    name: str
+    func: Callable[[], Awaitable[None] | None]
+    reads: frozenset[str] = frozenset()
+    writes: frozenset[str] = frozenset()
+    snapshot: bool = False
+
+
+def dependencies(stages: Sequence[Stage]) -> dict[str, tuple[set[str], set[str]]]:
+    """Map each stage to the earlier stages it must wait to finish, and to start.
+
+    Listing order is the order the stages would run in one after another; an edge
+    is only added where running them out of that order could change the result.
+    """
+    graph: dict[str, tuple[set[str], set[str]]] = {}
+    for index, later in enumerate(stages):
+        after_finish: set[str] = set()
+        after_start: set[str] = set()
+        for earlier in stages[:index]:
+            if earlier.writes & (later.reads | later.writes):
+                after_finish.add(earlier.name)
+            elif earlier.reads & later.writes:
+                (after_start if earlier.snapshot else after_finish).add(earlier.name)
+        graph[later.name] = (after_finish, after_start)
+    return graph
+
+
+async def _run_stage(stage: Stage) -> None:
+    try:
+        result = stage.func()
+        if inspect.isawaitable(result):
+            await result
+    except Exception:  # pylint: disable=broad-except
+        logging.exception("Ignoring %s failure.", stage.name)
+
+
+async def run_stages(stages: Sequence[Stage], deadline: float) -> list[str]:  # pylint: disable=too-many-locals
+    """Run stages as soon as their dependencies allow, for at most deadline seconds.
+
+    Stages still running at the deadline are cancelled and ones not yet started
+    are skipped; their names are returned so the caller can say what is missing.
+    """
+    graph = dependencies(stages)
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + deadline
+    waiting = list(stages)
+    started: set[str] = set()
+    finished: set[str] = set()
+    running: dict[asyncio.Task, Stage] = {}
+
+    try:
+        while waiting or running:
+            # Tasks run their first step in creation order, which is what makes an
+            # after_start edge safe: the snapshot stage has read its inputs before the
+            # stage that overwrites them gets going.
+            for stage in list(waiting):
+                after_finish, after_start = graph[stage.name]
+                if after_finish <= finished and after_start <= started:
+                    waiting.remove(stage)
+                    started.add(stage.name)
+                    logging.debug("running %s", stage.name)
+                    running[asyncio.create_task(_run_stage(stage))] = stage
+
+            remaining = give_up_at - loop.time()
+            if not running or remaining <= 0:
+                break
+            done, _ = await asyncio.wait(
+                running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                finished.add(running.pop(task).name)
+    finally:
+        for task in running:
+            task.cancel()
+
+    unfinished = [stage.name for stage in running.values()]
+    unfinished.extend(stage.name for stage in waiting)
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    if unfinished:
+        logging.warning(
+            "Metadata processing hit its %.1fs deadline; gave up on %s",
+            deadline,
+            ", ".join(unfinished),
+        )
+    return unfinished
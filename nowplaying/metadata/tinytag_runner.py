@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 """TinyTag-based audio file metadata extraction"""
 
+import asyncio
 import base64
 import binascii
 import contextlib
+import dataclasses
+import hashlib
 import json
 import logging
 import pathlib
+from typing import Any
 
 import puremagic
 
+import nowplaying.datacache
+import nowplaying.datacache.storage
+import nowplaying.exceptions
+import nowplaying.utils
 from nowplaying.types import TrackMetadata
 from nowplaying.vendor import tinytag  # pylint: disable=no-name-in-module
 
@@ -20,6 +28,43 @@ VIDEO_EXTENSIONS = frozenset(
 )
 AUDIO_CONTAINER_EXCLUSIONS = frozenset([".m4a", ".f4a"])
 
+# Every TinyTag attribute that _got_tag() and tt_date_calc() look at.  A FileTags
+# snapshot keeps just these, so replaying one gives the same answer as the file.
+_SNAPSHOT_FIELDS = (
+    "album",
+    "albumartist",
+    "artist",
+    "bitrate",
+    "bpm",
+    "comment",
+    "comments",
+    "composer",
+    "date",
+    "disc",
+    "disc_total",
+    "duration",
+    "genre",
+    "key",
+    "label",
+    "lang",
+    "lyricist",
+    "originaldate",
+    "originalyear",
+    "publisher",
+    "tdor",
+    "title",
+    "tory",
+    "track",
+    "track_total",
+    "year",
+)
+
+# Tag cache entries are keyed by path, size and mtime, so an edited file misses
+# on its own; the TTL only bounds how long entries for deleted files linger.
+_TAG_CACHE_TTL = 90 * 24 * 3600
+_TAG_CACHE_PREFIX = "tagcache://"
+_COVER_DATA_TYPE = "front_cover"
+
 
 def _date_calc(datedata: dict[str, str]) -> str | None:
     if (
@@ -50,6 +95,44 @@ def _date_calc(datedata: dict[str, str]) -> str | None:
     return None
 
 
+@dataclasses.dataclass
+class FileTags:
+    """Everything TinyTagRunner reads from a file, detached from the file itself."""
+
+    has_video: bool = False
+    tagged: bool = False
+    fields: dict[str, Any] = dataclasses.field(default_factory=dict)
+    other: dict[str, Any] = dataclasses.field(default_factory=dict)
+    front_cover: bytes | None = None
+    extra_covers: list[bytes] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_tag(cls, has_video: bool, tag: tinytag.TinyTag) -> "FileTags":
+        """Snapshot a parsed tag."""
+        fields = {}
+        for name in _SNAPSHOT_FIELDS:
+            if (value := getattr(tag, name, None)) is not None:
+                fields[name] = value
+        images = tag.images
+        all_covers = images.as_dict().get("cover") or images.as_dict().get("front_cover", [])
+        return cls(
+            has_video=has_video,
+            tagged=True,
+            fields=fields,
+            other=dict(getattr(tag, "other", None) or {}),
+            front_cover=images.front_cover.data if images.front_cover else None,
+            extra_covers=[cover.data for cover in all_covers[1:]],
+        )
+
+    def to_tag(self) -> tinytag.TinyTag:
+        """Rebuild a TinyTag carrying the snapshotted fields, minus the images."""
+        tag = tinytag.TinyTag()
+        for name, value in self.fields.items():
+            setattr(tag, name, value)
+        tag.other = self.other
+        return tag
+
+
 class TinyTagRunner:  # pylint: disable=too-few-public-methods
     """tinytag manager"""
 
@@ -74,36 +157,52 @@ class TinyTagRunner:  # pylint: disable=too-few-public-methods
                     datedata[datetype] = value
         return _date_calc(datedata)
 
-    def process(self, metadata: TrackMetadata) -> TrackMetadata:  # pylint: disable=too-many-branches
+    def process(self, metadata: TrackMetadata) -> TrackMetadata:
         """given a chunk of metadata, try to fill in more"""
-        self.metadata = metadata
-
         if not metadata or not metadata.get("filename"):
             return metadata
+        return self.apply(metadata, self.read(metadata["filename"]))
+
+    @classmethod
+    def read(cls, filename: str) -> FileTags | None:
+        """Do all of process()'s file I/O; safe to call from a worker thread.
 
-        # Create pathlib Path object for tinytag processing
+        Returns None when filename is not a usable path.  A file tinytag cannot
+        parse still yields FileTags, since has_video was worked out regardless.
+        """
         try:
-            file_path = pathlib.Path(self.metadata["filename"])
-        except (ValueError, OSError) as error:
-            logging.debug("Cannot create Path object for %s: %s", self.metadata["filename"], error)
-            return metadata
+            file_path = pathlib.Path(filename)
+        except (ValueError, OSError, TypeError) as error:
+            logging.debug("Cannot create Path object for %s: %s", filename, error)
+            return None
 
         # Detect if file contains video content
-        self.metadata["has_video"] = self._detect_video_content(file_path)
+        has_video = cls._detect_video_content(file_path)
 
         try:
             # Pass pathlib Path directly to tinytag - it will handle the path conversion
             tag = tinytag.TinyTag.get(file_path, image=True)
         except tinytag.TinyTagException as error:
             logging.error("tinytag could not process %s: %s", file_path, error)
-            return metadata
+            return FileTags(has_video=has_video)
         except OSError as error:
             logging.debug("Cannot access file for tinytag processing %s: %s", file_path, error)
-            return metadata
+            return FileTags(has_video=has_video)
 
-        if tag:
-            self._got_tag(tag)
+        if not tag:
+            return FileTags(has_video=has_video)
+        return FileTags.from_tag(has_video, tag)
 
+    def apply(self, metadata: TrackMetadata, filetags: FileTags | None) -> TrackMetadata:
+        """Fill in metadata from tags already read by read()"""
+        self.metadata = metadata
+        if not metadata or filetags is None:
+            return metadata
+
+        self.metadata["has_video"] = filetags.has_video
+        if filetags.tagged:
+            self._got_tag(filetags.to_tag())
+            self._covers(filetags.front_cover, filetags.extra_covers)
         return self.metadata
 
     def _ufid(self, extra: dict[str, object]) -> None:
@@ -389,16 +488,147 @@ class TinyTagRunner:  # pylint: disable=too-few-public-methods
         self._images(tag.images)
 
     def _images(self, images: tinytag.Images) -> None:
-        if "coverimageraw" not in self.metadata and images.front_cover:
-            self.metadata["coverimageraw"] = images.front_cover.data
+        # "cover" holds all embedded images; fall back to "front_cover" if absent.
+        images_dict = images.as_dict()
+        all_covers = images_dict.get("cover") or images_dict.get("front_cover", [])
+        self._covers(
+            images.front_cover.data if images.front_cover else None,
+            [cover.data for cover in all_covers[1:]],
+        )
+
+    def _covers(self, front_cover: bytes | None, extra_covers: list[bytes]) -> None:
+        if "coverimageraw" not in self.metadata and front_cover:
+            self.metadata["coverimageraw"] = front_cover
             # Deliberately not carrying front_cover.mime_type: the tag is content from
             # a file we did not create, and the value ends up as a response
             # Content-Type.  processors.py derives it from the bytes instead.
 
         # Collect all embedded covers; processors.py stores them all to datacache
         # so random_image retrieval can cycle through embedded art variations.
-        # "cover" holds all embedded images; fall back to "front_cover" if absent.
-        images_dict = images.as_dict()
-        all_covers = images_dict.get("cover") or images_dict.get("front_cover", [])
-        if len(all_covers) > 1:
-            self.metadata["_embedded_extra_covers"] = [c.data for c in all_covers[1:]]
+        if extra_covers:
+            self.metadata["_embedded_extra_covers"] = extra_covers
+
+
+async def _store_cover(
+    storage: nowplaying.datacache.storage.DataStorage, data: bytes
+) -> str | None:
+    """Keep one embedded cover in datacache under its checksum; None if refused."""
+    checksum = hashlib.sha256(data).hexdigest()
+    try:
+        await storage.store(
+            url=f"{_TAG_CACHE_PREFIX}cover/{checksum}",
+            identifier="tagcache",
+            data_type=_COVER_DATA_TYPE,
+            provider="tinytag",
+            data_value=data,
+            ttl_seconds=_TAG_CACHE_TTL,
+            status_code=200,
+            checksum=checksum,
+        )
+    except nowplaying.exceptions.ToxicContentError:
+        # processors.py throws these bytes away too, so a cached read leaving
+        # them out ends up with the same metadata.
+        return None
+    return checksum
+
+
+async def _load_cover(
+    storage: nowplaying.datacache.storage.DataStorage, checksum: str
+) -> bytes | None:
+    entry = await storage.retrieve_by_url(f"{_TAG_CACHE_PREFIX}cover/{checksum}")
+    return entry.data if entry and entry.status_code == 200 else None
+
+
+async def _file_tags_record(
+    storage: nowplaying.datacache.storage.DataStorage, filetags: FileTags
+) -> dict[str, Any] | None:
+    """Store the covers and return the JSON-able record that names them by checksum.
+
+    None (which cached_fetch will not cache) if the art could not be stored.
+    """
+    try:
+        front = await _store_cover(storage, filetags.front_cover) if filetags.front_cover else None
+        extras = [
+            checksum
+            for cover in filetags.extra_covers
+            if cover and (checksum := await _store_cover(storage, cover))
+        ]
+    except Exception:  # pylint: disable=broad-exception-caught
+        logging.exception("could not cache embedded cover art")
+        return None
+    return {
+        "has_video": filetags.has_video,
+        "tagged": filetags.tagged,
+        "fields": filetags.fields,
+        "other": filetags.other,
+        "front_cover": front,
+        "extra_covers": extras,
+    }
+
+
+async def _file_tags_from_record(
+    storage: nowplaying.datacache.storage.DataStorage, record: dict[str, Any]
+) -> FileTags | None:
+    """Rebuild FileTags from a cached record, or None when a cover has been evicted."""
+    front_cover = None
+    if (checksum := record.get("front_cover")) and not (
+        front_cover := await _load_cover(storage, checksum)
+    ):
+        return None
+    extra_covers = []
+    for checksum in record.get("extra_covers", []):
+        if not (cover := await _load_cover(storage, checksum)):
+            return None
+        extra_covers.append(cover)
+
+    return FileTags(
+        has_video=record.get("has_video", False),
+        tagged=record.get("tagged", False),
+        fields=record.get("fields", {}),
+        other=record.get("other", {}),
+        front_cover=front_cover,
+        extra_covers=extra_covers,
+    )
+
+
+async def load_file_tags(filename: str) -> FileTags | None:
+    """Read filename's tags off the event loop, via a persistent cache.
+
+    Replaying a track, or loading it on a second deck, is answered from datacache
+    without touching the file: entries are keyed by path, size and mtime, and the
+    embedded art is kept content-addressed and referenced by checksum.
+    """
+    filekey = await asyncio.to_thread(nowplaying.utils.file_identity_key, filename)
+    if not filekey:
+        return await asyncio.to_thread(TinyTagRunner.read, filename)
+
+    storage = nowplaying.datacache.get_client().storage
+    fresh: FileTags | None = None
+
+    async def _read() -> dict[str, Any] | None:
+        nonlocal fresh
+        if not (fresh := await asyncio.to_thread(TinyTagRunner.read, filename)):
+            return None
+        # tinytag failing is often a share or USB drive hiccup; caching that
+        # would hide the file's tags until it is next modified
+        if not fresh.tagged:
+            return None
+        return await _file_tags_record(storage, fresh)
+
+    record = await nowplaying.datacache.cached_fetch(
+        provider="tinytag",
+        artist_name=filekey,
+        endpoint="tags",
+        fetch_func=_read,
+        ttl_seconds=_TAG_CACHE_TTL,
+    )
+    if fresh or not record:
+        return fresh
+    if filetags := await _file_tags_from_record(storage, record):
+        return filetags
+
+    # The record outlived its cover art; read the file again and put the art back.
+    logging.debug("tag cache for %s lost its cover art, rereading", filename)
+    if fresh := await asyncio.to_thread(TinyTagRunner.read, filename):
+        await _file_tags_record(storage, fresh)
+    return fresh
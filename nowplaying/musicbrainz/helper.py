@@ -3,6 +3,7 @@
 """support for musicbrainz"""
 
 import asyncio
+import hashlib
 import logging
 import os
 import sys
@@ -21,12 +22,16 @@ from wnpmb.normalization import normalize
 
 import nowplaying.bootstrap
 import nowplaying.datacache
+import nowplaying.datacache.queue
 import nowplaying.config
 import nowplaying.utils.metadata
 
 logger = logging.getLogger(__name__)
 
 _MB_TTL = 7 * 24 * 3600
+# A search or ISRC that found nothing is remembered for a day, so a track MB does
+# not know only costs one request per day rather than one per play
+_MISS_TTL = 24 * 3600
 
 
 class _WNPDatacacheAdapter:
@@ -109,6 +114,11 @@ class MusicBrainzHelper:
         the default immediately so the DJ is never blocked waiting for retries.
         """
         max_attempts = 3 if self.test_mode else 1
+        # Shared with every other process so playlist enrichment cannot eat
+        # into the budget trackpoll needs for the track on air
+        limiter = nowplaying.datacache.queue.get_rate_limiter_manager().get_shared_limiter(
+            "musicbrainz"
+        )
         for attempt in range(max_attempts):
             if attempt > 0:
                 sleep_time = 10 * attempt
@@ -119,6 +129,9 @@ class MusicBrainzHelper:
                     max_attempts - 1,
                 )
                 await asyncio.sleep(sleep_time)
+            if not await limiter.acquire():
+                logger.warning("MusicBrainz rate limiter timed out: %s", error_msg)
+                return default
             try:
                 return await operation()
             except RateLimitError:
@@ -143,6 +156,17 @@ class MusicBrainzHelper:
             self.mb_client.cache_service = _WNPDatacacheAdapter()
             self.emailaddressset = True
 
+    @staticmethod
+    def _resolution_key(artist: str, title: str, album: str | None, year: str | None) -> str:
+        """Cache key for a find_recording search.
+
+        Built from the normalized search inputs so that case, spacing and smart
+        quote differences between DJ software all land on the same entry.
+        """
+        fields = [normalize(value) if value else "" for value in (artist, title, album)]
+        fields.append(str(year or ""))
+        return hashlib.sha256("\0".join(fields).encode()).hexdigest()
+
     async def _lastditchrid(self, metadata) -> _RecordingLookup:
         """extract fields and run search
 
@@ -171,10 +195,30 @@ class MusicBrainzHelper:
                     artist=artist,
                     album=album,
                     year=year,
-                )
-
-        result = await self._mb_op_with_retry(_find, "find_recording", (None, None))
-        exact_mbid, fallback_mbid = result if result else (None, None)
+                ) or (None, None)
+
+        async def _resolve() -> dict | None:
+            result = await self._mb_op_with_retry(_find, "find_recording", None)
+            if result is None:
+                return None
+            exact_mbid, fallback_mbid = result
+            if not exact_mbid and not fallback_mbid:
+                return {}
+            return {"exact": exact_mbid, "fallback": fallback_mbid}
+
+        resolved = (
+            await nowplaying.datacache.cached_fetch(
+                provider="musicbrainz",
+                artist_name="resolution",
+                endpoint=f"find/{self._resolution_key(artist, title, album, year)}",
+                fetch_func=_resolve,
+                ttl_seconds=_MB_TTL,
+                negative_ttl=_MISS_TTL,
+            )
+            or {}
+        )
+        exact_mbid = resolved.get("exact")
+        fallback_mbid = resolved.get("fallback")
         if exact_mbid:
             return _RecordingLookup(
                 data=await self.recordingid(exact_mbid, track_data=metadata),
@@ -285,8 +329,22 @@ class MusicBrainzHelper:
             async with self.mb_client:
                 return await self.mb_client.resolve_recording_by_isrc(isrclist)
 
-        mbid = await self._mb_op_with_retry(_resolve, "resolve_recording_by_isrc", None)
-        if mbid:
+        async def _fetch() -> dict | None:
+            mbid = await self._mb_op_with_retry(_resolve, "resolve_recording_by_isrc", False)
+            if mbid is False:
+                return None
+            return {"musicbrainzrecordingid": mbid} if mbid else {}
+
+        isrcs = [isrclist] if isinstance(isrclist, str) else isrclist
+        resolved = await nowplaying.datacache.cached_fetch(
+            provider="musicbrainz",
+            artist_name="isrc",
+            endpoint=f"isrc/{','.join(sorted(isrc.upper() for isrc in isrcs))}",
+            fetch_func=_fetch,
+            ttl_seconds=_MB_TTL,
+            negative_ttl=_MISS_TTL,
+        )
+        if mbid := (resolved or {}).get("musicbrainzrecordingid"):
             return await self.recordingid(mbid, track_data=track_data)
         return None
 
@@ -450,53 +508,72 @@ class MusicBrainzHelper:
         if not idlist:
             return None
 
+        self._setemail()
         sitelist = []
-        async with self.mb_client:
-            for artistid in idlist:
-                if self.config.cparser.value("musicbrainz/musicbrainz", type=bool):
-                    sitelist.append(f"https://musicbrainz.org/artist/{artistid}")
-
-                webdata = None
-                try:
-                    webdata = await self.mb_client.get_artist_by_id(
-                        artistid, includes=["url-rels"]
-                    )
-                except Exception:  # pylint: disable=broad-exception-caught
-                    logger.exception("MusicBrainz does not know artistid %s", artistid)
+        for artistid in idlist:
+            if self.config.cparser.value("musicbrainz/musicbrainz", type=bool):
+                sitelist.append(f"https://musicbrainz.org/artist/{artistid}")
+
+            if not (urls := await self._artist_urls(artistid)):
+                continue
+
+            convdict = {
+                "bandcamp": "bandcamp",
+                "official homepage": "homepage",
+                "last.fm": "lastfm",
+                "discogs": "discogs",
+                "wikidata": "wikidata",
+            }
+
+            for src, dest in convdict.items():
+                if src not in urls:
                     continue
+                # inject Discogs URL from MB relations if either the full
+                # Discogs plugin is enabled OR the MB-level discogs toggle
+                # is on (allows MB→Discogs URL without the full plugin)
+                if src == "discogs" and (
+                    self.config.cparser.value("discogs/enabled", type=bool)
+                    or self.config.cparser.value("musicbrainz/discogs", type=bool)
+                ):
+                    sitelist.append(urls[src])
+                    logger.debug("placed %s", dest)
+                elif src == "wikidata":
+                    sitelist.append(urls[src])
+                elif self.config.cparser.value(f"musicbrainz/{dest}", type=bool):
+                    sitelist.append(urls[src])
+                    logger.debug("placed %s", dest)
 
-                if not webdata:
-                    continue
-
-                urls = extract_artist_urls(webdata)
+        return list(dict.fromkeys(sitelist))
 
-                convdict = {
-                    "bandcamp": "bandcamp",
-                    "official homepage": "homepage",
-                    "last.fm": "lastfm",
-                    "discogs": "discogs",
-                    "wikidata": "wikidata",
-                }
+    async def _artist_urls(self, artistid: str) -> dict | None:
+        """url relations for one artist, cached per artist id.
 
-                for src, dest in convdict.items():
-                    if src not in urls:
-                        continue
-                    # inject Discogs URL from MB relations if either the full
-                    # Discogs plugin is enabled OR the MB-level discogs toggle
-                    # is on (allows MB→Discogs URL without the full plugin)
-                    if src == "discogs" and (
-                        self.config.cparser.value("discogs/enabled", type=bool)
-                        or self.config.cparser.value("musicbrainz/discogs", type=bool)
-                    ):
-                        sitelist.append(urls[src])
-                        logger.debug("placed %s", dest)
-                    elif src == "wikidata":
-                        sitelist.append(urls[src])
-                    elif self.config.cparser.value(f"musicbrainz/{dest}", type=bool):
-                        sitelist.append(urls[src])
-                        logger.debug("placed %s", dest)
+        Only the raw relations are cached; which of them end up in
+        artistwebsites depends on the user's settings and is decided by the
+        caller on every call.
+        """
 
-        return list(dict.fromkeys(sitelist))
+        async def _fetch() -> dict | None:
+            try:
+                async with self.mb_client:
+                    webdata = await self.mb_client.get_artist_by_id(
+                        artistid, includes=["url-rels"]
+                    )
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("MusicBrainz does not know artistid %s", artistid)
+                return None
+            if not webdata:
+                return {}
+            return extract_artist_urls(webdata)
+
+        return await nowplaying.datacache.cached_fetch(
+            provider="musicbrainz",
+            artist_name="artist",
+            endpoint=f"urls/{artistid}",
+            fetch_func=_fetch,
+            ttl_seconds=_MB_TTL,
+            negative_ttl=_MISS_TTL,
+        )
 
     def providerinfo(self):  # pylint: disable=no-self-use
         """return list of what is provided by this recognition system"""
@@ -6,9 +6,9 @@ Drains the pending_requests queue: fetches URLs, stores blobs, retries
 on failure.  Runs as a peer subprocess alongside trackpoll and webserver,
 managed by SubprocessManager.  Shutdown is signalled via stopevent.
 
-Uses a watchdog DBWatcher on the pending_requests database file so new
-queue entries wake the worker immediately rather than waiting up to 30 s.
-Falls back to 1-second polling when the watcher sees no activity.
+Uses a watchdog DBWatcher on the database's WAL file so new queue entries
+from other processes wake the worker immediately; requests queued in this
+process wake it directly.  Falls back to a 1-second check for stopevent.
 """
 
 import asyncio
@@ -20,6 +20,7 @@ from pathlib import Path
 import nowplaying.bootstrap
 import nowplaying.config
 import nowplaying.datacache.client
+import nowplaying.datacache.colors
 import nowplaying.db
 import nowplaying.frozen
 import nowplaying.processes.template_sync
@@ -53,38 +54,33 @@ async def _run(
         synctask.add_done_callback(background_tasks.discard)
         synctask.add_done_callback(_log_task_exception)
 
-    # Watch the pending_requests database for writes so new image downloads
-    # queued by trackpoll wake the worker immediately instead of sleeping up to 30 s.
-    db_path = str(client.queue.database_path)
-    watcher = nowplaying.db.DBWatcher(db_path)
-    watcher.start()
-    last_watcher_time = watcher.updatetime
+    # Watch the database for writes so new image downloads queued by trackpoll
+    # wake the worker immediately.  The database runs in WAL mode, so writers touch
+    # the -wal file; the main file only changes at checkpoints.
+    loop = asyncio.get_running_loop()
+    watcher = nowplaying.db.DBWatcher(f"{client.queue.database_path}-wal")
+    watcher.start(customhandler=lambda _event: loop.call_soon_threadsafe(client.queue.notify))
 
     try:
         while not nowplaying.utils.safe_stopevent_check(stopevent):
             stats = await client.process_queue(max_concurrent=max_concurrent)
 
             if stats["processed"] == 0:
-                # Poll in 0.1 s slices up to 1 s, breaking early on DB write.
-                for _ in range(10):
-                    await asyncio.sleep(0.1)
-                    if watcher.updatetime != last_watcher_time:
-                        break
-                    if nowplaying.utils.safe_stopevent_check(stopevent):
-                        break
-                last_watcher_time = watcher.updatetime
+                # Requests queued in this process notify directly; the watcher covers
+                # other processes.  The timeout is only for noticing stopevent.
+                await client.queue.wait_for_work(timeout=1.0)
             else:
                 logging.debug(
-                    "DataCache processed batch: %d processed, %d succeeded, %d failed",
+                    "DataCache processed batch: %d processed, %d succeeded, %d failed, %d late",
                     stats["processed"],
                     stats["succeeded"],
                     stats["failed"],
+                    stats["late"],
                 )
-                last_watcher_time = watcher.updatetime
-                await asyncio.sleep(0.1)
     finally:
         watcher.stop()
         await client.close()
+        await asyncio.to_thread(nowplaying.datacache.colors.shutdown_palette_pool)
         logging.info("DataCache worker stopped")
 
 
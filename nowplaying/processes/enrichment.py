@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Playlist enrichment process.
+
+Runs one "Enrich Playlist" job from the tray.  It gets a process of its own
+so the job's event loop, datacache client and HTTP sessions never share
+state with anything else, and are gone when it finishes.  Shutdown is
+signalled via stopevent; the result goes back through the results queue.
+"""
+
+import asyncio
+import logging
+import multiprocessing.queues
+import multiprocessing.synchronize
+import sys
+import threading
+
+import nowplaying.bootstrap
+import nowplaying.config
+import nowplaying.frozen
+import nowplaying.metadata.enrichment
+
+
+def start(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    stopevent: multiprocessing.synchronize.Event,
+    bundledir: str,
+    testmode: bool,
+    playlist: str,
+    results: multiprocessing.queues.Queue,
+) -> None:
+    """multiprocessing start hook"""
+    threading.current_thread().name = "Enrichment"
+
+    bundledir = nowplaying.frozen.frozen_init(bundledir)
+
+    if testmode:
+        nowplaying.bootstrap.set_qt_names(appname="testsuite")
+    else:
+        nowplaying.bootstrap.set_qt_names()
+    logpath = nowplaying.bootstrap.setuplogging(logname="debug.log", rotate=False)
+    config = nowplaying.config.ConfigFile(bundledir=bundledir, logpath=logpath, testmode=testmode)
+    logging.info("boot up")
+
+    try:
+        results.put(
+            asyncio.run(
+                nowplaying.metadata.enrichment.run_job(config, playlist, stopevent=stopevent)
+            )
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        logging.error("Enrichment of %s failed: %s", playlist, error, exc_info=True)
+        sys.exit(1)
+    logging.info("shutting down enrichment v%s", config.version)
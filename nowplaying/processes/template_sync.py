@@ -119,6 +119,7 @@ async def sync_from_charts(  # pylint: disable=too-many-locals
                 provider="charts",
                 ttl_seconds=_TTL,
                 immediate=False,
+                schedule_class=nowplaying.datacache.CLASS_BACKGROUND,
                 expected_checksum=checksum,
                 on_complete=on_base_ready,
             )
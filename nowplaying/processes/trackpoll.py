@@ -2,6 +2,7 @@
 """thread to poll music player"""
 
 import asyncio
+import collections
 import contextlib
 import datetime
 import logging
@@ -31,6 +32,9 @@ from nowplaying.types import TrackMetadata
 
 COREMETA = ["artist", "filename", "title"]
 
+# How many prefetched tracks to remember; a few sets' worth of cued decks
+PREFETCH_MEMORY = 32
+
 
 def compute_final_sleep(fill_duration: float, configured_delay: float) -> float:
     """Compute grace-period sleep before checkagain.
@@ -92,6 +96,15 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
         # so its stale data does not immediately win back.
         self.main_source_suppressed_meta: TrackMetadata = {}
 
+        # Speculative prefetch of tracks cued on the other decks.  It gets its own
+        # processors since MetadataProcessors keeps the track it is working on.
+        self.prefetchprocessors: nowplaying.metadata.MetadataProcessors | None = None
+        self._prefetch_task: asyncio.Task[None] | None = None
+        self._prefetching: tuple[tuple, asyncio.Task[None]] | None = None
+        self._warmed: collections.OrderedDict[tuple, None] = collections.OrderedDict()
+        # Artist extras still arriving for the track that just went out
+        self._late_extras_task: asyncio.Task[None] | None = None
+
     @classmethod
     def create_with_plugins(
         cls,
@@ -266,11 +279,18 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
             await self._publish(self._pending_meta)
             self._pending_meta = None
         self.stopevent.set()
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+        if self._late_extras_task:
+            self._late_extras_task.cancel()
         if self.earshot_plugin:
             await self.earshot_plugin.stop()
             self.earshot_plugin = None
         if self.input:
             await self.input.stop()
+        await self.metadataprocessors.close()
+        if self.prefetchprocessors:
+            await self.prefetchprocessors.close()
         self.plugins = None
         loop = asyncio.get_running_loop()
         if not self.testmode:
@@ -432,18 +452,71 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
                 return True
         return False
 
-    async def _fill_inmetadata(self, metadata: TrackMetadata) -> TrackMetadata:  # pylint: disable=too-many-branches
-        """keep a copy of our fetched data"""
+    @staticmethod
+    def _inputkey(metadata: TrackMetadata) -> tuple:
+        """identify a track by what the input reported, same as the fetched* keys"""
+        return tuple(
+            value.strip() if isinstance(value := metadata.get(key), str) else value
+            for key in COREMETA
+        )
+
+    def _start_prefetch(self) -> None:
+        """start warming the caches for cued tracks unless that is already underway"""
+        if self._prefetch_task and not self._prefetch_task.done():
+            return
+        self._prefetch_task = asyncio.create_task(self._prefetch_upcoming())
+        self.tasks.add(self._prefetch_task)
+        self._prefetch_task.add_done_callback(self.tasks.discard)
+
+    async def _prefetch_upcoming(self) -> None:
+        """run the metadata pipeline over what the input says is cued up next"""
+        try:
+            upcoming = await self.input.getupcomingtracks()
+        except Exception as err:  # pylint: disable=broad-except
+            logging.debug("getupcomingtracks() failed: %s", err)
+            return
+
+        current = tuple(self.currentmeta.get(f"fetched{key}") for key in COREMETA)
+        for track in upcoming:
+            if nowplaying.utils.safe_stopevent_check(self.stopevent):
+                return
+            inputkey = self._inputkey(track)
+            if self._ismetaempty(track) or inputkey == current or inputkey in self._warmed:
+                continue
+            task = asyncio.create_task(self._prefetch_track(dict(track), inputkey))
+            self._prefetching = (inputkey, task)
+            try:
+                await task
+            finally:
+                self._prefetching = None
+
+    async def _prefetch_track(self, metadata: TrackMetadata, inputkey: tuple) -> None:
+        """fill in one cued track, purely for the side effect of caching what it looks up"""
+        logging.debug("Prefetching %s / %s", metadata.get("artist", ""), metadata.get("title", ""))
+        if not self.prefetchprocessors:
+            self.prefetchprocessors = nowplaying.metadata.MetadataProcessors(
+                config=self.config, prefetch=True
+            )
+        metadata = self._prepare_inmetadata(metadata)
+        # Downloads queued from here wait behind anything for the track on air
+        with nowplaying.datacache.schedule_as(nowplaying.datacache.CLASS_NEXT_UP):
+            try:
+                await self.prefetchprocessors.getmoremetadata(metadata=metadata)
+            except Exception as err:  # pylint: disable=broad-except
+                logging.debug("Ignoring prefetch failure (%s).", err)
+                return
+        self._warmed[inputkey] = None
+        while len(self._warmed) > PREFETCH_MEMORY:
+            self._warmed.popitem(last=False)
+
+    def _prepare_inmetadata(self, metadata: TrackMetadata) -> TrackMetadata:
+        """record what the input gave us and tidy it up before processing"""
 
-        # Fill in as much metadata as possible. everything
-        # after this expects artist, filename, and title are expected to exist
-        # so if they don't, make them at least an empty string, keeping what
+        # everything after this expects artist, filename, and title are expected to
+        # exist so if they don't, make them at least an empty string, keeping what
         # the input actually gave as 'fetched' to compare with what
         # was given before to shortcut all of this work in the future
 
-        if not metadata:
-            return {}
-
         for key in COREMETA:
             fetched = f"fetched{key}"
             if key in metadata:
@@ -465,14 +538,37 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
         for key in COREMETA:
             if key in metadata and not metadata[key]:
                 del metadata[key]
+        return metadata
+
+    async def _fill_inmetadata(self, metadata: TrackMetadata) -> TrackMetadata:
+        """keep a copy of our fetched data"""
+
+        # Fill in as much metadata as possible.
+
+        if not metadata:
+            return {}
+
+        inputkey = self._inputkey(metadata)
+        if self._prefetching and self._prefetching[0] == inputkey:
+            # Went live mid-prefetch: letting that finish beats starting over
+            with contextlib.suppress(Exception):
+                await asyncio.shield(self._prefetching[1])
+
+        metadata = self._prepare_inmetadata(metadata)
 
         try:
-            metadata = await self.metadataprocessors.getmoremetadata(metadata=metadata)
+            # Slower artist extras keep going through the delay; see _publish_late_extras()
+            metadata = await self.metadataprocessors.getmoremetadata(
+                metadata=metadata, early_extras=True
+            )
             if duration := metadata.get("duration"):
                 metadata["duration_hhmmss"] = nowplaying.utils.humanize_time(duration)
         except Exception as err:  # pylint: disable=broad-except
             logging.exception("Ignoring metadataprocessor failure (%s).", err)
 
+        if inputkey in self._warmed:
+            metadata["cache_warmed"] = True
+
         for key in COREMETA:
             if key not in metadata:
                 logging.info("Track missing %s data, setting it to blank.", key)
@@ -501,6 +597,8 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
             await asyncio.sleep(1)
             return
 
+        self._start_prefetch()
+
         nextmeta, _ = await self._check_earshot_override(nextmeta)
 
         if self._ismetaempty(nextmeta) or self._isignored(nextmeta):
@@ -587,6 +685,8 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
             if data := await self.trackrequests.get_request(self.currentmeta):
                 self.currentmeta.update(data)
 
+        # Whatever artist extras landed during the delay goes out with the track
+        await self.metadataprocessors.merge_late_extras(self.currentmeta)
         await self._artfallbacks()
 
         # If a previous game was active, reveal its track before starting the new one.
@@ -625,6 +725,40 @@ class TrackPoll:  # pylint: disable=too-many-instance-attributes
         else:
             await self._publish(self.currentmeta)
 
+        self._late_extras_task = asyncio.create_task(self._publish_late_extras(self.currentmeta))
+        self.tasks.add(self._late_extras_task)
+        self._late_extras_task.add_done_callback(self.tasks.discard)
+
+    async def _publish_late_extras(self, metadata: TrackMetadata) -> None:
+        """Add the artist extras that were still running when the track went out"""
+        try:
+            if not await self.metadataprocessors.merge_late_extras(metadata, wait=True):
+                return
+        except Exception as err:  # pylint: disable=broad-except
+            logging.exception("Ignoring late artist extras failure (%s).", err)
+            return
+
+        if metadata is not self.currentmeta:
+            logging.debug("Track changed before its late artist extras arrived")
+            return
+        late = {key: metadata.get(key) for key in nowplaying.metadata.LATE_EXTRAS_FIELDS}
+        if self._pending_meta and self._pending_meta.get("track_received") == metadata.get(
+            "track_received"
+        ):
+            # Still held back by the guess game, so it goes out with the rest later
+            self._pending_meta.update(late)
+            return
+        logging.debug(
+            "Updating %s / %s with late artist extras",
+            metadata.get("artist"),
+            metadata.get("title"),
+        )
+        if not self.testmode:
+            try:
+                await nowplaying.db.MetadataDB().update_last_meta_async(metadata)
+            except Exception as err:  # pylint: disable=broad-except
+                logging.exception("update_last_meta_async failed: %s", err)
+
     def _setup_notifications(self):
         """Initialize notification plugins"""
         self.notification_plugins = nowplaying.pluginimporter.import_plugins(
@@ -380,6 +380,8 @@ class WebHandler:  # pylint: disable=too-many-public-methods,too-many-instance-a
                     ),
                     "artistfanart",
                     random=True,
+                    # a slideshow: cycle through every image before repeating one
+                    shuffle=True,
                 )
                 if result:
                     imagedata = result.data
@@ -904,6 +906,7 @@ class WebHandler:  # pylint: disable=too-many-public-methods,too-many-instance-a
         await self._unregister_mdns_service()
 
         await app["statedb"].close()
+        await app[METADATA_KEY].close()
         await app[HTTP_SESSION_KEY].close()
         app[WATCHER_KEY].stop()
         await app[DC_STORAGE_KEY].close()
@@ -4,6 +4,7 @@
 
 import asyncio
 import copy
+import hashlib
 import json
 import logging
 import logging.config
@@ -12,19 +13,33 @@ import os
 import pathlib
 import subprocess
 import sys
-import time
 
 import acoustid
+import aiohttp
 from PySide6.QtCore import QDir  # pylint: disable=no-name-in-module
 from PySide6.QtWidgets import QFileDialog  # pylint: disable=no-name-in-module
 
 import nowplaying.bootstrap
 import nowplaying.config
+import nowplaying.datacache
+import nowplaying.datacache.queue
 import nowplaying.musicbrainz
 import nowplaying.utils
+import nowplaying.utils.filters
 from nowplaying.exceptions import PluginVerifyError
 from nowplaying.recognition import RecognitionPlugin
 
+_LOOKUP_META = "recordings recordingids releases tracks usermeta"
+# fpcalc decodes two minutes of audio; more than two at once just competes for
+# the CPU the DJ software needs.
+_FPCALC_CONCURRENCY = 2
+_FPCALC_TIMEOUT = 60.0
+# Cache entries are keyed by path, size and mtime, so an edited file gets a new
+# key rather than a stale answer; the TTLs only bound how long dead keys linger.
+_FINGERPRINT_TTL = 90 * 24 * 3600
+_LOOKUP_TTL = 30 * 24 * 3600
+_NO_MATCH_TTL = 24 * 3600  # AcoustID may learn the track once someone submits it
+
 
 class Plugin(RecognitionPlugin):
     """handler for acoustidmb"""
@@ -35,71 +50,99 @@ class Plugin(RecognitionPlugin):
         self.acoustidmd = {}
         self.fpcalcexe = None
         self.displayname = "AcoustID"
+        self._fpcalc_slots = asyncio.Semaphore(_FPCALC_CONCURRENCY)
 
     @classmethod
     def get_path_keys(cls) -> frozenset[str]:
         return frozenset({"acoustidmb/fpcalcexe"})
 
-    @staticmethod
-    def _fpcalc(filename):
+    async def _fpcalc(self, filename):
         """run fpcalc against the given filename"""
-        completedprocess = None
         fpcalc = os.environ.get("FPCALC", "fpcalc")
         command = [fpcalc, "-json", "-length", "120", filename]
-        completedprocess = None
-        try:
-            if sys.platform == "win32":
-                completedprocess = subprocess.run(
-                    command,
-                    stdin=subprocess.DEVNULL,
-                    capture_output=True,
-                    check=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW,
-                )
-            else:
-                completedprocess = subprocess.run(
-                    command, stdin=subprocess.DEVNULL, capture_output=True, check=True
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        async with self._fpcalc_slots:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    **kwargs,
                 )
-        except Exception as error:  # pylint: disable=broad-except
-            if completedprocess:
-                logging.error("Exception: %s stderr: %s", error, completedprocess.stderr)
-            else:
+            except OSError as error:
                 logging.error("Exception: %s", error)
+                return None
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=_FPCALC_TIMEOUT
+                )
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+                logging.error("fpcalc took longer than %ds on %s", _FPCALC_TIMEOUT, filename)
+                return None
+
+        if process.returncode:
+            logging.error("Exception: fpcalc exited %s stderr: %s", process.returncode, stderr)
             return None
 
-        if not completedprocess or not completedprocess.stdout:
+        if not stdout:
             return None
 
-        return json.loads(completedprocess.stdout.decode("utf-8"))
+        return json.loads(stdout.decode("utf-8"))
 
-    def _fetch_from_acoustid(self, apikey, fingerprint, duration):
+    @staticmethod
+    async def _lookup(params: dict, timeout: float) -> dict | None:
+        """POST one lookup to the AcoustID web service and return the decoded reply."""
+        limiter = nowplaying.datacache.queue.get_rate_limiter_manager().get_shared_limiter(
+            "acoustid"
+        )
+        if not await limiter.acquire():
+            logging.warning("acoustid rate limiter timed out")
+            return None
+        connector = nowplaying.utils.create_http_connector()
+        async with (
+            aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as session,
+            session.post(f"{acoustid.API_BASE_URL}lookup", data=params) as response,
+        ):
+            return await response.json(content_type=None)
+
+    async def _fetch_from_acoustid(self, apikey, fingerprint, duration):
         if isinstance(duration, str):
             duration = float(duration)
         results = None
+        params = {
+            "format": "json",
+            "client": apikey,
+            "duration": str(int(duration)),
+            "fingerprint": fingerprint,
+            "meta": _LOOKUP_META,
+        }
 
         delay = self.calculate_delay()
         try:
             counter = 0
             while counter < 3:
                 logging.debug("Performing acoustid lookup")
-                results = acoustid.lookup(
-                    apikey,
-                    fingerprint,
-                    duration,
-                    meta=["recordings", "recordingids", "releases", "tracks", "usermeta"],
-                    timeout=delay,
-                )
-                if "error" not in results or "rate limit" not in results["error"]["message"]:
+                results = await self._lookup(params, timeout=delay)
+                if (
+                    not results
+                    or "error" not in results
+                    or "rate limit" not in results["error"]["message"]
+                ):
                     break
                 logging.info(
                     "acoustid complaining about rate limiting. Sleeping then rying again."
                 )
-                time.sleep(0.5)
+                await asyncio.sleep(0.5)
                 counter += 1
-        except acoustid.NoBackendError:
-            results = None
-            logging.error("chromaprint library/tool not found")
-        except acoustid.WebServiceError as error:
+        except (aiohttp.ClientError, TimeoutError, ValueError) as error:
             results = None
             logging.error("web service request failed: %s", error)
         except Exception as error:  # pylint: disable=broad-except
@@ -309,6 +352,27 @@ class Plugin(RecognitionPlugin):
         self.fpcalcexe = fpcalcexe
         return True
 
+    async def _fingerprint(self, filename: str, filekey: str | None) -> dict | None:
+        """Return fpcalc's fingerprint and duration, from the cache when the file is unchanged."""
+
+        async def _run_fpcalc():
+            if not self._configure_fpcalc(
+                fpcalcexe=self.config.cparser.value("acoustidmb/fpcalcexe")
+            ):
+                logging.error("fpcalc is not configured")
+                return None
+            return await self._fpcalc(filename)
+
+        if not filekey:
+            return await _run_fpcalc()
+        return await nowplaying.datacache.cached_fetch(
+            provider="acoustid",
+            artist_name=filekey,
+            endpoint="fingerprint",
+            fetch_func=_run_fpcalc,
+            ttl_seconds=_FINGERPRINT_TTL,
+        )
+
     async def recognize(self, metadata=None):  # pylint: disable=too-many-statements, too-many-return-statements, too-many-branches
         # we need to make sure we don't modify the passed
         # structure so do a deep copy here
@@ -318,18 +382,16 @@ class Plugin(RecognitionPlugin):
 
         if not self.acoustidmd.get("musicbrainzrecordingid"):
             logging.debug("No musicbrainzrecordingid in metadata, so use acoustid")
+            filekey = None
             if not metadata.get("fpcalcduration") and not metadata.get("fpcalcfingerprint"):
                 if not metadata.get("filename"):
                     logging.warning("No filename in metadata")
                     return None
 
-                if not self._configure_fpcalc(
-                    fpcalcexe=self.config.cparser.value("acoustidmb/fpcalcexe")
-                ):
-                    logging.error("fpcalc is not configured")
-                    return None
-
-                data = self._fpcalc(metadata["filename"])
+                filekey = await asyncio.to_thread(
+                    nowplaying.utils.file_identity_key, metadata["filename"]
+                )
+                data = await self._fingerprint(metadata["filename"], filekey)
             else:
                 data = {
                     "fingerprint": metadata["fpcalcfingerprint"],
@@ -340,10 +402,24 @@ class Plugin(RecognitionPlugin):
                 return None
 
             apikey = self.config.cparser.value("acoustidmb/acoustidapikey")
-            results = self._fetch_from_acoustid(
-                apikey,
-                data["fingerprint"],
-                data["duration"],
+
+            async def _fetch_lookup():
+                return await self._fetch_from_acoustid(
+                    apikey,
+                    data["fingerprint"],
+                    data["duration"],
+                )
+
+            results = await nowplaying.datacache.cached_fetch(
+                provider="acoustid",
+                artist_name=filekey
+                or hashlib.sha256(
+                    f"{data['fingerprint']}\0{data['duration']}".encode()
+                ).hexdigest(),
+                endpoint="lookup",
+                fetch_func=_fetch_lookup,
+                ttl_seconds=_LOOKUP_TTL,
+                negative_ttl=_NO_MATCH_TTL,
             )
             if not results:
                 if metadata.get("filename"):
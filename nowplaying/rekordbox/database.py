@@ -337,6 +337,51 @@ class DatabaseReader:
 
         return nowplaying.utils.sqlite.retry_sqlite_operation(_query)
 
+    async def get_playlist_tracks(self, playlist_name: str) -> list[RekordboxTrack]:
+        """
+        Get every track in the specified playlist, in playlist order
+
+        Args:
+            playlist_name: Name of the playlist
+
+        Returns:
+            Tracks in the playlist, empty if the playlist is not found
+        """
+        if not self.database_path or not self.encryption_key:
+            raise RekordboxError("Database reader not initialized")
+
+        try:
+            return await asyncio.to_thread(self._get_playlist_tracks_sync, playlist_name)
+        except Exception as err:
+            raise RekordboxError(f"Failed to get tracks from playlist: {err}") from err
+
+    def _get_playlist_tracks_sync(self, playlist_name: str) -> list[RekordboxTrack]:
+        """Synchronous playlist contents query"""
+
+        def _query() -> list[RekordboxTrack]:
+            with sqlite.connect(str(self.database_path)) as conn:  # pylint: disable=no-member
+                self._open_conn(conn)
+
+                query = f"""
+                    SELECT
+                        c.ID,
+{_CONTENT_COLUMNS}
+                    FROM djmdSongPlaylist sp
+                    JOIN djmdPlaylist p ON sp.PlaylistID = p.ID
+                    JOIN djmdContent c ON sp.ContentID = c.ID
+{_CONTENT_JOINS}
+                    WHERE p.Name = ?
+                    ORDER BY sp.TrackNo
+                """
+
+                cursor = conn.execute(query, (playlist_name,))
+                return [
+                    self._build_track(str(content_id), tuple(content_row))
+                    for content_id, *content_row in cursor.fetchall()
+                ]
+
+        return nowplaying.utils.sqlite.retry_sqlite_operation(_query)
+
     async def has_artist_in_library(self, artist_name: str) -> bool:
         """
         Check if artist exists in entire library
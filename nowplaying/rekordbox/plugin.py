@@ -22,6 +22,7 @@ from watchdog.observers.polling import PollingObserver
 
 import nowplaying.wizard
 from nowplaying.inputs import InputPlugin
+from nowplaying.types import TrackMetadata
 
 from .config import ConfigReader
 from .database import DatabaseReader
@@ -280,6 +281,18 @@ class RekordboxPlugin(InputPlugin):  # pylint: disable=too-many-instance-attribu
             logging.error("Failed to get random track from playlist %s: %s", playlist, err)
             return None
 
+    async def getplaylisttracks(self, playlist: str) -> list[TrackMetadata]:
+        """Every track in a playlist"""
+        try:
+            if not self.database_reader.database_path:
+                custom_key = self.config.cparser.value("rekordbox/custom_key", defaultValue="")
+                await self.database_reader.initialize(custom_key=custom_key)
+            tracks = await self.database_reader.get_playlist_tracks(playlist)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logging.error("Failed to get tracks from playlist %s: %s", playlist, err)
+            return []
+        return [track.to_metadata() for track in tracks]
+
     def validmixmodes(self) -> list[str]:
         """Valid mix modes - Rekordbox only shows latest track"""
         return ["newest"]
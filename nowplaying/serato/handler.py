@@ -47,7 +47,6 @@ class Serato4Handler:  # pylint: disable=too-many-instance-attributes
         self._db_change_debounce_delay: float = 0.5  # 500ms debounce
         self._db_needs_refresh: bool = True  # Flag set by watchdog, checked by async methods
         self._cached_deck_tracks: list[dict[str, t.Any]] = []  # Cache all deck data
-        self._cached_location_mappings: dict[int, pathlib.Path] | None = None  # Cache locations
 
     async def start(self):
         """perform any startup tasks"""
@@ -101,6 +100,7 @@ class Serato4Handler:  # pylint: disable=too-many-instance-attributes
             await asyncio.gather(*self.tasks, return_exceptions=True)
 
         self.tasks.clear()
+        await self.sqlite_reader.close()
 
     def process_sessions(self, event):  # pylint: disable=unused-argument
         """handle incoming session file updates"""
@@ -158,14 +158,7 @@ class Serato4Handler:  # pylint: disable=too-many-instance-attributes
                 return None
 
         # Apply deck skip filter in Python (fast, uses cached data)
-        if deckskip:
-            deck_tracks = [
-                track
-                for track in self._cached_deck_tracks
-                if str(track.get("deck")) not in deckskip
-            ]
-        else:
-            deck_tracks = self._cached_deck_tracks
+        deck_tracks = self._skip_decks(deckskip)
 
         if not deck_tracks:
             return None
@@ -180,14 +173,27 @@ class Serato4Handler:  # pylint: disable=too-many-instance-attributes
 
         return selected_track
 
+    async def get_upcoming_tracks(
+        self, mixmode: str = "newest", deckskip: list[str] | None = None
+    ) -> list[dict[str, t.Any]]:
+        """Get the tracks on the decks that get_current_track_by_mixmode did not pick"""
+        current = await self.get_current_track_by_mixmode(mixmode=mixmode, deckskip=deckskip)
+        return [track for track in self._skip_decks(deckskip) if track is not current]
+
+    def _skip_decks(self, deckskip: list[str] | None) -> list[dict[str, t.Any]]:
+        """Cached deck tracks minus the ones on skipped decks"""
+        if not deckskip:
+            return self._cached_deck_tracks
+        return [
+            track for track in self._cached_deck_tracks if str(track.get("deck")) not in deckskip
+        ]
+
     async def get_location_mappings(self) -> dict[int, pathlib.Path]:
         """Get mapping of location_id to base file path from the SQLite reader
 
-        Results are cached to avoid repeated database queries.
+        The reader caches these until the database changes.
         """
-        if self._cached_location_mappings is None:
-            self._cached_location_mappings = await self.sqlite_reader.get_location_mappings()
-        return self._cached_location_mappings
+        return await self.sqlite_reader.get_location_mappings()
 
     async def get_library_database_paths(self) -> list[pathlib.Path]:
         """Get all library database paths for artist filtering"""
@@ -324,17 +324,9 @@ class Plugin(nowplaying.inputs.InputPlugin):  # pylint: disable=too-many-instanc
         if not self.handler:
             return None
 
-        # Get configuration
-        mixmode = self.getmixmode()
-        deckskip = None
-        if self.config:
-            deckskip = self.config.cparser.value("serato4/deckskip")
-            if deckskip and not isinstance(deckskip, list):
-                deckskip = list(deckskip)
-
         # Get track using mixmode and deck skip logic
         track_data = await self.handler.get_current_track_by_mixmode(
-            mixmode=mixmode, deckskip=deckskip
+            mixmode=self.getmixmode(), deckskip=self._get_deckskip()
         )
         if not track_data:
             return None
@@ -355,6 +347,35 @@ class Plugin(nowplaying.inputs.InputPlugin):  # pylint: disable=too-many-instanc
 
         return track_metadata
 
+    async def getupcomingtracks(self) -> list[TrackMetadata]:
+        """Get the tracks on the other decks (local mode only)"""
+        if self.mode != "local" or not self.handler:
+            return []
+
+        deck_tracks = await self.handler.get_upcoming_tracks(
+            mixmode=self.getmixmode(), deckskip=self._get_deckskip()
+        )
+        if not deck_tracks:
+            return []
+
+        location_mappings = await self.handler.get_location_mappings()
+        upcoming = []
+        for track_data in deck_tracks:
+            track_metadata = self._convert_local_track_data(track_data, location_mappings)
+            # Streaming artwork is only worth downloading once the track is live
+            track_metadata.pop("_streaming_artwork_url", None)
+            upcoming.append(track_metadata)
+        return upcoming
+
+    def _get_deckskip(self) -> list[str] | None:
+        """Decks the user asked to ignore"""
+        if not self.config:
+            return None
+        deckskip = self.config.cparser.value("serato4/deckskip")
+        if deckskip and not isinstance(deckskip, list):
+            deckskip = list(deckskip)
+        return deckskip or None
+
     @staticmethod
     async def _download_artwork(session: aiohttp.ClientSession, url: str) -> bytes | None:
         """Download artwork from a URL using the provided session"""
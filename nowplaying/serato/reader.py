@@ -5,6 +5,7 @@ Serato 4+ SQLite Reader
 SQLite database reader for Serato DJ 4.0+ master.sqlite files.
 """
 
+import asyncio
 import logging
 import pathlib
 import sqlite3
@@ -16,11 +17,61 @@ import nowplaying.utils.sqlite
 
 
 class Serato4SQLiteReader:
-    """SQLite database reader for Serato 4+ master.sqlite files"""
+    """SQLite database reader for Serato 4+ master.sqlite files
+
+    Keeps one read-only connection open for as long as the reader is in
+    use.  Location mappings and deck tracks are only re-queried once
+    ``PRAGMA data_version`` or the WAL file's mtime says Serato has
+    written something since they were last read.
+    """
 
     def __init__(self, db_path: str | pathlib.Path, require_played: bool = True):
         self.db_path = pathlib.Path(db_path)
         self.require_played = require_played
+        self._connection: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        # (data version, result) of the last query of each kind
+        self._location_mappings: tuple[tuple[int, int], dict[int, pathlib.Path]] | None = None
+        self._deck_tracks: tuple[tuple[int, int], list[dict[str, t.Any]]] | None = None
+
+    async def _get_connection(self) -> aiosqlite.Connection:
+        async with self._connect_lock:
+            if not self._connection:
+                self._connection = await aiosqlite.connect(
+                    f"{self.db_path.absolute().as_uri()}?mode=ro", uri=True
+                )
+                self._connection.row_factory = aiosqlite.Row
+            return self._connection
+
+    async def close(self) -> None:
+        """Close the connection and forget cached results"""
+        self._location_mappings = None
+        self._deck_tracks = None
+        if self._connection:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+    async def _data_version(self) -> tuple[int, int]:
+        """Changes whenever another connection commits to the database"""
+        connection = await self._get_connection()
+        cursor = await connection.execute("PRAGMA data_version")
+        row = await cursor.fetchone()
+        try:
+            walmtime = self.db_path.with_name(f"{self.db_path.name}-wal").stat().st_mtime_ns
+        except OSError:
+            walmtime = 0
+        return row[0], walmtime
+
+    async def _query_if_changed(
+        self,
+        cached: tuple[tuple[int, int], t.Any] | None,
+        query: t.Callable[[aiosqlite.Connection], t.Awaitable[t.Any]],
+    ) -> tuple[tuple[int, int], t.Any]:
+        """(data version, result), re-running query only if the database changed"""
+        version = await self._data_version()
+        if cached and cached[0] == version:
+            return cached
+        return version, await query(await self._get_connection())
 
     async def get_location_mappings(self) -> dict[int, pathlib.Path]:
         """Get mapping of location_id to base file path
@@ -33,52 +84,53 @@ class Serato4SQLiteReader:
             logging.error("Serato master.sqlite not found at %s", self.db_path)
             return {}
 
-        async def _query_locations() -> dict[int, pathlib.Path]:
-            async with aiosqlite.connect(self.db_path) as connection:
-                connection.row_factory = aiosqlite.Row
-
-                # Query location_connections view to get database paths for each location
-                query = """
-                    SELECT location_id, database_uri
-                    FROM location_connections
-                    WHERE database_uri IS NOT NULL
-                """
-
-                cursor = await connection.execute(query)
-                rows = await cursor.fetchall()
-
-                location_map = {}
-                for row in rows:
-                    location_id = row["location_id"]
-                    database_uri = row["database_uri"]
-
-                    # For external libraries: database_uri is like
-                    # "/Volumes/Music/_Serato_/Library/location.sqlite"
-                    # Base path is parent of "_Serato_": "/Volumes/Music/"
-                    #
-                    # For local library: database_uri is like
-                    # "/Users/aw/Library/Application Support/Serato/Library/root.sqlite"
-                    # Base path is root "/"
-                    db_path = pathlib.Path(database_uri)
-
-                    if "_Serato_" in db_path.parts:
-                        # External library - find parent of _Serato_
-                        parts = list(db_path.parts)
-                        serato_idx = parts.index("_Serato_")
-                        base_path = pathlib.Path(*parts[:serato_idx])
-                    else:
-                        # Local library - portable_id is absolute path without leading /
-                        base_path = pathlib.Path("/")
-
-                    location_map[location_id] = base_path
-
-                return location_map
+        async def _query_locations(connection: aiosqlite.Connection) -> dict[int, pathlib.Path]:
+            # Query location_connections view to get database paths for each location
+            query = """
+                SELECT location_id, database_uri
+                FROM location_connections
+                WHERE database_uri IS NOT NULL
+            """
+
+            cursor = await connection.execute(query)
+            rows = await cursor.fetchall()
+
+            location_map = {}
+            for row in rows:
+                location_id = row["location_id"]
+                database_uri = row["database_uri"]
+
+                # For external libraries: database_uri is like
+                # "/Volumes/Music/_Serato_/Library/location.sqlite"
+                # Base path is parent of "_Serato_": "/Volumes/Music/"
+                #
+                # For local library: database_uri is like
+                # "/Users/aw/Library/Application Support/Serato/Library/root.sqlite"
+                # Base path is root "/"
+                db_path = pathlib.Path(database_uri)
+
+                if "_Serato_" in db_path.parts:
+                    # External library - find parent of _Serato_
+                    parts = list(db_path.parts)
+                    serato_idx = parts.index("_Serato_")
+                    base_path = pathlib.Path(*parts[:serato_idx])
+                else:
+                    # Local library - portable_id is absolute path without leading /
+                    base_path = pathlib.Path("/")
+
+                location_map[location_id] = base_path
+
+            return location_map
 
         try:
-            return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_query_locations)
+            self._location_mappings = await nowplaying.utils.sqlite.retry_sqlite_operation_async(
+                lambda: self._query_if_changed(self._location_mappings, _query_locations)
+            )
         except sqlite3.Error as exc:
             logging.error("Failed to query location mappings: %s", exc)
+            await self.close()
             return {}
+        return self._location_mappings[1]
 
     async def get_library_database_paths(self) -> list[pathlib.Path]:
         """Get all library database paths for artist filtering
@@ -91,33 +143,33 @@ class Serato4SQLiteReader:
             return []
 
         async def _query_db_paths() -> list[pathlib.Path]:
-            async with aiosqlite.connect(self.db_path) as connection:
-                connection.row_factory = aiosqlite.Row
+            connection = await self._get_connection()
 
-                # Query location_connections view to get all database paths
-                query = """
-                    SELECT database_uri
-                    FROM location_connections
-                    WHERE database_uri IS NOT NULL
-                """
+            # Query location_connections view to get all database paths
+            query = """
+                SELECT database_uri
+                FROM location_connections
+                WHERE database_uri IS NOT NULL
+            """
 
-                cursor = await connection.execute(query)
-                rows = await cursor.fetchall()
+            cursor = await connection.execute(query)
+            rows = await cursor.fetchall()
 
-                db_paths = []
-                for row in rows:
-                    db_path = pathlib.Path(row["database_uri"])
-                    if db_path.exists():
-                        db_paths.append(db_path)
-                    else:
-                        logging.debug("Library database not found: %s", db_path)
+            db_paths = []
+            for row in rows:
+                db_path = pathlib.Path(row["database_uri"])
+                if db_path.exists():
+                    db_paths.append(db_path)
+                else:
+                    logging.debug("Library database not found: %s", db_path)
 
-                return db_paths
+            return db_paths
 
         try:
             return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_query_db_paths)
         except sqlite3.Error as exc:
             logging.error("Failed to query library database paths: %s", exc)
+            await self.close()
             return []
 
     async def get_latest_tracks_per_deck(self) -> list[dict[str, t.Any]]:
@@ -132,87 +184,87 @@ class Serato4SQLiteReader:
 
         played_filter = "AND played = 1" if self.require_played else ""
 
-        async def _query_tracks() -> list[dict[str, t.Any]]:
-            async with aiosqlite.connect(self.db_path) as connection:
-                # Let Serato manage its own journal mode - we're just a read-only client
-                connection.row_factory = aiosqlite.Row  # Enable column access by name
-
-                # Get the latest track loaded on each deck from current session
-                # Optimized query using window functions instead of correlated subqueries
-                # Use portable_id which contains the full relative path
-                query = f"""
-                    WITH current_session AS (
-                        SELECT id FROM history_session
-                        WHERE end_time = -1
-                        ORDER BY start_time DESC
-                        LIMIT 1
-                    ),
-                    ranked_tracks AS (
-                        SELECT
-                            h.file_name,
-                            h.portable_id,
-                            h.location_id,
-                            h.artist,
-                            h.name as title,
-                            h.album,
-                            h.genre,
-                            h.bpm,
-                            h.key,
-                            h.year,
-                            h.length_sec as duration,
-                            h.start_time,
-                            h.played,
-                            h.deck,
-                            h.file_size as file_bytes,
-                            h.file_sample_rate as sample_rate,
-                            h.file_bit_rate as bitrate,
-                            a.type_specific_data,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY h.deck
-                                ORDER BY h.start_time DESC
-                            ) as rn
-                        FROM history_entry h
-                        LEFT JOIN asset a ON h.asset_id = a.id
-                        WHERE h.session_id = (SELECT id FROM current_session)
-                        {played_filter}
-                    )
+        async def _query_tracks(connection: aiosqlite.Connection) -> list[dict[str, t.Any]]:
+            # Get the latest track loaded on each deck from current session
+            # Optimized query using window functions instead of correlated subqueries
+            # Use portable_id which contains the full relative path
+            query = f"""
+                WITH current_session AS (
+                    SELECT id FROM history_session
+                    WHERE end_time = -1
+                    ORDER BY start_time DESC
+                    LIMIT 1
+                ),
+                ranked_tracks AS (
                     SELECT
-                        file_name,
-                        portable_id,
-                        location_id,
-                        artist,
-                        title,
-                        album,
-                        genre,
-                        bpm,
-                        key,
-                        year,
-                        duration,
-                        start_time,
-                        played,
-                        deck,
-                        file_bytes,
-                        sample_rate,
-                        bitrate,
-                        type_specific_data
-                    FROM ranked_tracks
-                    WHERE rn = 1
-                """
-
-                cursor = await connection.execute(query)
-
-                rows = await cursor.fetchall()
-                if not rows:
-                    return []
-
-                # Convert aiosqlite.Row to dict for easier handling
-                return [dict(row) for row in rows]
+                        h.file_name,
+                        h.portable_id,
+                        h.location_id,
+                        h.artist,
+                        h.name as title,
+                        h.album,
+                        h.genre,
+                        h.bpm,
+                        h.key,
+                        h.year,
+                        h.length_sec as duration,
+                        h.start_time,
+                        h.played,
+                        h.deck,
+                        h.file_size as file_bytes,
+                        h.file_sample_rate as sample_rate,
+                        h.file_bit_rate as bitrate,
+                        a.type_specific_data,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY h.deck
+                            ORDER BY h.start_time DESC
+                        ) as rn
+                    FROM history_entry h
+                    LEFT JOIN asset a ON h.asset_id = a.id
+                    WHERE h.session_id = (SELECT id FROM current_session)
+                    {played_filter}
+                )
+                SELECT
+                    file_name,
+                    portable_id,
+                    location_id,
+                    artist,
+                    title,
+                    album,
+                    genre,
+                    bpm,
+                    key,
+                    year,
+                    duration,
+                    start_time,
+                    played,
+                    deck,
+                    file_bytes,
+                    sample_rate,
+                    bitrate,
+                    type_specific_data
+                FROM ranked_tracks
+                WHERE rn = 1
+            """
+
+            cursor = await connection.execute(query)
+
+            rows = await cursor.fetchall()
+            if not rows:
+                return []
+
+            # Convert aiosqlite.Row to dict for easier handling
+            return [dict(row) for row in rows]
 
         try:
-            return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_query_tracks)
+            self._deck_tracks = await nowplaying.utils.sqlite.retry_sqlite_operation_async(
+                lambda: self._query_if_changed(self._deck_tracks, _query_tracks)
+            )
         except sqlite3.Error as exc:
             logging.error("Failed to query latest tracks per deck: %s", exc)
+            await self.close()
             return []
+        return self._deck_tracks[1]
 
 
 class Serato4RootReader:  # pylint: disable=too-few-public-methods
@@ -17,8 +17,9 @@ from .base import SeratoBaseReader, SeratoRuleMatchingMixin
 from .crate import SeratoCrateReader
 from .database import SeratoDatabaseV2Reader
 from .handler import SeratoHandler
+from .index import SeratoLibraryIndex
 from .plugin import Plugin
-from .session import SeratoSessionReader
+from .session import SeratoSessionReader, SeratoSessionTailReader
 from .smart_crate import SeratoSmartCrateReader
 
 __all__ = [
@@ -27,7 +28,9 @@ __all__ = [
     "SeratoDatabaseV2Reader",
     "SeratoCrateReader",
     "SeratoSmartCrateReader",
+    "SeratoLibraryIndex",
     "SeratoSessionReader",
+    "SeratoSessionTailReader",
     "SeratoHandler",
     "Plugin",
 ]
@@ -15,6 +15,15 @@ from collections.abc import Callable
 
 import aiofiles
 
+# Precompiled layouts for the Serato binary format: every record is a
+# four byte ASCII tag and a big-endian length, followed by the value
+HEADER = struct.Struct(">4sI")
+UINT16 = struct.Struct(">H")
+UINT32 = struct.Struct(">I")
+UINT64 = struct.Struct(">Q")
+BOOL = struct.Struct("?")
+BYTE = struct.Struct("b")
+
 
 class SeratoRuleMatchingMixin:  # pylint: disable=too-few-public-methods
     """Mixin class for Serato smart rule matching functionality"""
@@ -138,28 +147,31 @@ class SeratoBaseReader:  # pylint: disable=too-few-public-methods
         }
 
         self.decode_func_first: dict[str, Callable[[bytes], t.Any]] = {
-            "b": lambda x: struct.unpack("?", x)[0],
+            "b": lambda x: BOOL.unpack(x)[0],
             "o": self._decode_struct_sync,
-            "p": lambda x: x.decode("utf-16-be", errors="replace").rstrip("\x00"),
+            "p": self._decode_unicode,
             "r": self._decode_struct_sync,
-            "s": lambda x: struct.unpack(">H", x)[0],
-            "t": lambda x: x.decode("utf-16-be", errors="replace").rstrip("\x00"),
+            "s": lambda x: UINT16.unpack(x)[0],
+            "t": self._decode_unicode,
             "u": self._decode_unsigned,  # Keep our error handling
         }
 
         self.filepath: pathlib.Path = pathlib.Path(filename)
         self.data: list[tuple[str, t.Any]] | None = None
 
-    def _decode_struct(self, data: bytes) -> list[tuple[str, t.Any]]:
-        """decode the structures of the file"""
+    def _decode_struct(self, data: bytes | memoryview) -> list[tuple[str, t.Any]]:
+        """decode the structures of the file
+
+        Values are handed to the decoders as memoryview slices of data, so
+        nothing is copied until a decoder turns it into a str/int/etc.
+        """
+        view = memoryview(data)
         ret: list[tuple[str, t.Any]] = []
         i = 0
-        while i < len(data):
-            tag = data[i : i + 4].decode("ascii")
-            length = struct.unpack(">I", data[i + 4 : i + 8])[0]
-            value = data[i + 8 : i + 8 + length]
-            value = self._datadecode(value, tag=tag)
-            ret.append((tag, value))
+        while i < len(view):
+            rawtag, length = HEADER.unpack_from(view, i)
+            tag = rawtag.decode("ascii")
+            ret.append((tag, self._datadecode(view[i + 8 : i + 8 + length], tag=tag)))
             i += 8 + length
         return ret
 
@@ -167,36 +179,37 @@ class SeratoBaseReader:  # pylint: disable=too-few-public-methods
     def _decode_timestamp(data: bytes) -> datetime.datetime:
         """decode timestamp from bytes"""
         try:
-            timestamp = struct.unpack(">I", data)[0]
+            timestamp = UINT32.unpack(data)[0]
         except struct.error:
-            timestamp = struct.unpack(">Q", data)[0]
+            timestamp = UINT64.unpack(data)[0]
         return datetime.datetime.fromtimestamp(timestamp)
 
     @staticmethod
-    def _decode_hex(data: bytes) -> str:
+    def _decode_hex(data: bytes | memoryview) -> str:
         """read a string, then encode as hex"""
         return data.hex()
 
     @staticmethod
     def _decode_bool(data: bytes) -> bool:
         """true/false handling"""
-        return bool(struct.unpack("b", data)[0])
+        return bool(BYTE.unpack(data)[0])
 
     @staticmethod
-    def _decode_unicode(data: bytes) -> str:
-        return data.decode("utf-16-be", errors="replace").rstrip("\x00")
+    def _decode_unicode(data: bytes | memoryview) -> str:
+        return str(data, "utf-16-be", "replace").rstrip("\x00")
 
     @staticmethod
     def _decode_unsigned(data: bytes) -> int:
         try:
-            field = struct.unpack(">I", data)[0]
+            field = UINT32.unpack(data)[0]
         except struct.error:
-            field = struct.unpack(">Q", data)[0]
+            field = UINT64.unpack(data)[0]
         return field
 
     @staticmethod
-    def _noop(data: bytes) -> bytes:
-        return data
+    def _noop(data: bytes | memoryview) -> bytes:
+        # copy out so the caller does not pin the whole file's buffer
+        return bytes(data)
 
     def _decode_struct_sync(self, data: bytes) -> tuple[tuple[str, t.Any], ...]:
         """Synchronous wrapper for struct decoding - fallback to old method"""
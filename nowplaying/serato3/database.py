@@ -11,17 +11,38 @@ import pathlib
 import struct
 import typing as t
 
-from .base import SeratoBaseReader, SeratoRuleMatchingMixin
+import aiofiles
+
+from .base import HEADER, SeratoBaseReader, SeratoRuleMatchingMixin
 
 
 class SeratoDatabaseV2Reader(SeratoRuleMatchingMixin, SeratoBaseReader):
     """read a Serato database V2 file containing all indexed tracks"""
 
+    # Mapping of Serato tag codes to field processors; only these otrk
+    # fields are ever decoded
+    TAG_PROCESSORS: dict[str, t.Callable[[t.Any], dict[str, t.Any]]] = {
+        "pfil": lambda v: {"filepath": v, "filename": pathlib.Path(v).name if v else None},
+        "tsng": lambda v: {"title": v},
+        "tart": lambda v: {"artist": v},
+        "talb": lambda v: {"album": v},
+        "tgen": lambda v: {"genre": v},
+        "tcom": lambda v: {"composer": v},
+        "tbpm": lambda v: {"bpm": v},
+        "tkey": lambda v: {"key": v},
+        "ttim": lambda v: {"length": struct.unpack(">I", v)[0] if len(v) >= 4 else None},
+        "tadded": lambda v: {"added": struct.unpack(">I", v)[0] if len(v) >= 4 else None},
+        "tgrp": lambda v: {"grouping": v},
+        "tlbl": lambda v: {"label": v},
+        "trmx": lambda v: {"remixer": v},
+        "tyea": lambda v: {"year": struct.unpack(">I", v)[0] if len(v) >= 4 else None},
+        "tcmt": lambda v: {"comments": v},
+    }
+
     def __init__(self, serato_lib_path: str | pathlib.Path) -> None:
         db_file = pathlib.Path(serato_lib_path).joinpath("database V2")
         super().__init__(db_file)
         self.serato_lib_path: pathlib.Path = pathlib.Path(serato_lib_path)
-        self.database: list[tuple[str, t.Any]] | None = None
         self.tracks: list[dict[str, t.Any]] = []
 
     async def loaddatabase(self) -> None:
@@ -30,24 +51,30 @@ class SeratoDatabaseV2Reader(SeratoRuleMatchingMixin, SeratoBaseReader):
             logging.error("Serato database V2 not found at %s", self.filepath)
             return
 
-        await self.loadfile()
-        self.database = self.data
-        self._parse_tracks()
+        async with aiofiles.open(self.filepath, "rb") as filefhin:
+            data = await filefhin.read()
+        self._parse_tracks(memoryview(data))
 
-    def _parse_tracks(self) -> None:
-        """Parse all tracks from database V2 format"""
-        if not self.database:
-            return
+    def _parse_tracks(self, data: memoryview) -> None:
+        """Parse all tracks from database V2 format
 
+        Walks the record headers in place and only decodes the otrk fields
+        in TAG_PROCESSORS; everything else in the file is skipped over
+        without being sliced or decoded.
+        """
         self.tracks = []
         track_count = 0
         parsed_count = 0
-        for tag, value in self.database:
-            if tag == "otrk":  # Track entry
+        i = 0
+        while i < len(data):
+            tag, length = HEADER.unpack_from(data, i)
+            if tag == b"otrk":  # Track entry
                 track_count += 1
-                if track := self._parse_track_data(value):
+                track_data = self._otrk_fields(data, i + 8, i + 8 + length)
+                if track := self._parse_track_data(track_data):
                     parsed_count += 1
                     self.tracks.append(track)
+            i += 8 + length
 
         logging.debug(
             "Serato database parsing: found %d otrk entries, successfully parsed %d tracks",
@@ -55,35 +82,27 @@ class SeratoDatabaseV2Reader(SeratoRuleMatchingMixin, SeratoBaseReader):
             parsed_count,
         )
 
-    @staticmethod
-    def _parse_track_data(track_data: list[tuple[str, t.Any]]) -> dict[str, t.Any] | None:
+    def _otrk_fields(self, data: memoryview, start: int, end: int) -> list[tuple[str, t.Any]]:
+        """Decode just the fields of the otrk at data[start:end] that become track data"""
+        fields = []
+        i = start
+        while i < end:
+            rawtag, length = HEADER.unpack_from(data, i)
+            if tag := _WANTED_TAGS.get(rawtag):
+                fields.append((tag, self._datadecode(data[i + 8 : i + 8 + length], tag=tag)))
+            i += 8 + length
+        return fields
+
+    @classmethod
+    def _parse_track_data(cls, track_data: list[tuple[str, t.Any]]) -> dict[str, t.Any] | None:
         """Parse individual track metadata from otrk section"""
         track = {}
 
-        # Mapping of Serato tag codes to field processors
-        tag_processors = {
-            "pfil": lambda v: {"filepath": v, "filename": pathlib.Path(v).name if v else None},
-            "tsng": lambda v: {"title": v},
-            "tart": lambda v: {"artist": v},
-            "talb": lambda v: {"album": v},
-            "tgen": lambda v: {"genre": v},
-            "tcom": lambda v: {"composer": v},
-            "tbpm": lambda v: {"bpm": v},
-            "tkey": lambda v: {"key": v},
-            "ttim": lambda v: {"length": struct.unpack(">I", v)[0] if len(v) >= 4 else None},
-            "tadded": lambda v: {"added": struct.unpack(">I", v)[0] if len(v) >= 4 else None},
-            "tgrp": lambda v: {"grouping": v},
-            "tlbl": lambda v: {"label": v},
-            "trmx": lambda v: {"remixer": v},
-            "tyea": lambda v: {"year": struct.unpack(">I", v)[0] if len(v) >= 4 else None},
-            "tcmt": lambda v: {"comments": v},
-        }
-
         for tag, value in track_data:
             if tag == "ttyp":  # Track type (usually ignored)
                 continue
 
-            if processor := tag_processors.get(tag):
+            if processor := cls.TAG_PROCESSORS.get(tag):
                 track |= processor(value)
 
         # Only return tracks with essential metadata
@@ -130,3 +149,7 @@ class SeratoDatabaseV2Reader(SeratoRuleMatchingMixin, SeratoBaseReader):
         if field_type == "date":
             return self._apply_date_operator(operator, track_value, value)
         return True
+
+
+# raw tag -> tag, so the otrk walk can skip fields without decoding their tags
+_WANTED_TAGS = {tag.encode("ascii"): tag for tag in SeratoDatabaseV2Reader.TAG_PROCESSORS}
@@ -8,7 +8,6 @@ developed and tested over time.
 """
 
 import asyncio
-import copy
 import datetime
 import logging
 import pathlib
@@ -23,7 +22,7 @@ from watchdog.observers.polling import PollingObserver
 from ..serato.remote import SeratoRemoteHandler
 
 # Import the base classes from the same module
-from .session import SeratoSessionReader
+from .session import SeratoSessionTailReader
 
 TIDAL_FORMAT = re.compile(r"^_(.*).tdl")
 
@@ -58,6 +57,8 @@ class SeratoHandler:  # pylint: disable=too-many-instance-attributes
         self.decks = {}
         self.playingadat: dict[str, t.Any] = {}
         self.parsed_sessions = []
+        # Kept across watchdog events so only what Serato appended gets decoded
+        self.sessionreader = SeratoSessionTailReader()
         self.last_processed = 0
         self.lastfetched = 0
         self.url: str | None = None  # Explicitly clear URL in local mode
@@ -145,27 +146,23 @@ class SeratoHandler:  # pylint: disable=too-many-instance-attributes
 
         sessionpath = self.seratodir.joinpath("History", "Sessions")
 
-        sessionlist = sorted(sessionpath.glob("*.session"), key=lambda path: int(path.stem))
-        # sessionlist = sorted(seratopath.glob('*.session'),
-        #                     key=lambda path: path.stat().st_mtime)
+        # Only the newest session is read, so there is no need to sort them all
+        sessionlist = list(sessionpath.glob("*.session"))
 
         if not sessionlist:
             logging.debug("no session files found")
             return
 
+        latest = max(sessionlist, key=lambda path: int(path.stem))
         if not self.testmode:
-            difftime = time.time() - sessionlist[-1].stat().st_mtime
+            difftime = time.time() - latest.stat().st_mtime
             if difftime > 600:
-                logging.debug("%s is too old", sessionlist[-1].name)
+                logging.debug("%s is too old", latest.name)
                 return
 
-        session = SeratoSessionReader()
-        await session.loadsessionfile(sessionlist[-1])
-        session.condense()
-
-        sessiondata = list(session.getadat())
+        sessiondata = await self.sessionreader.update(latest)
         self.last_processed = round(time.time())
-        self.parsed_sessions = copy.copy(sessiondata)
+        self.parsed_sessions = sessiondata
         # logging.debug(self.parsed_sessions)
         logging.debug("finished processing")
 
@@ -322,8 +319,23 @@ class SeratoHandler:  # pylint: disable=too-many-instance-attributes
             if coverimage := self._get_tidal_cover(self.playingadat["filename"]):
                 self.playingadat["coverimageraw"] = coverimage
 
+        return self._adat_to_metadata(self.playingadat)
+
+    def getupcomingtracks(self) -> list[dict]:
+        """tracks on the other decks, as of the last getplayingtrack"""
+        if self.mode == "remote":
+            return []
+        return [
+            self._adat_to_metadata(adat)
+            for adat in self.decks.values()
+            if adat is not self.playingadat
+        ]
+
+    @staticmethod
+    def _adat_to_metadata(adat: dict) -> dict:
+        """the parts of an adat record that get reported"""
         return {
-            key: self.playingadat[key]
+            key: adat[key]
             for key in [
                 "album",
                 "artist",
@@ -342,7 +354,7 @@ class SeratoHandler:  # pylint: disable=too-many-instance-attributes
                 "lang",
                 "title",
             ]
-            if self.playingadat.get(key)
+            if adat.get(key)
         }
 
     def stop(self):
@@ -350,6 +362,7 @@ class SeratoHandler:  # pylint: disable=too-many-instance-attributes
 
         self.decks = {}
         self.parsed_sessions = []
+        self.sessionreader.reset()
         self.playingadat = {}
         self.last_processed = 0
         self.lastfetched = 0
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Serato Library Index
+
+A SQLite side index over Serato database V2 files so that artist queries
+and smart crate lookups do not have to re-parse and scan the whole library
+every time one comes in.
+"""
+
+import asyncio
+import json
+import logging
+import pathlib
+import sqlite3
+import typing as t
+
+import aiosqlite
+from PySide6.QtCore import QStandardPaths  # pylint: disable=no-name-in-module
+
+import nowplaying.utils.sqlite
+
+from .database import SeratoDatabaseV2Reader
+
+SCHEMA_VERSION = 1
+
+# keep IN (...) lists well under SQLite's bound parameter limit
+_CHUNKSIZE = 500
+
+
+class SeratoLibraryIndex:
+    """
+    Artist and smart crate lookups for one or more Serato libraries.
+
+    Each library's tracks are copied out of its ``database V2`` along with
+    their lowercased artist, keyed on the file's size and mtime.  When
+    Serato rewrites the file, only the tracks that changed are written
+    back.  Smart crate memberships are evaluated once and kept until
+    either the crate or the library changes.
+    """
+
+    @staticmethod
+    def _get_database_path() -> pathlib.Path:
+        return pathlib.Path(
+            QStandardPaths.standardLocations(QStandardPaths.AppDataLocation)[0]
+        ).joinpath("serato3", "libraryindex.db")
+
+    def __init__(self, dbpath: pathlib.Path | None = None):
+        self.dbpath = dbpath or self._get_database_path()
+        # libpath -> (size, mtime_ns) of the database V2 that is indexed
+        self._signatures: dict[str, tuple[int, int]] = {}
+        self._lock = asyncio.Lock()
+        self._setup()
+
+    def _setup(self) -> None:
+        self.dbpath.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with nowplaying.utils.sqlite.sqlite_connection(str(self.dbpath), timeout=30) as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS libraries (
+                        libpath  TEXT PRIMARY KEY,
+                        size     INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS tracks (
+                        libpath  TEXT NOT NULL,
+                        filepath TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+                        artist   TEXT NOT NULL,
+                        track    TEXT NOT NULL,
+                        PRIMARY KEY (libpath, filepath)
+                    );
+                    CREATE INDEX IF NOT EXISTS tracks_artist ON tracks (libpath, artist);
+                    CREATE TABLE IF NOT EXISTS smartcrates (
+                        libpath     TEXT NOT NULL,
+                        cratefile   TEXT NOT NULL,
+                        signature   TEXT NOT NULL,
+                        PRIMARY KEY (libpath, cratefile)
+                    );
+                    CREATE TABLE IF NOT EXISTS smartcrate_tracks (
+                        libpath   TEXT NOT NULL,
+                        cratefile TEXT NOT NULL,
+                        position  INTEGER NOT NULL,
+                        filepath  TEXT NOT NULL,
+                        PRIMARY KEY (libpath, cratefile, position)
+                    );
+                """)
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM schema_version")
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute("INSERT INTO schema_version VALUES (?)", (SCHEMA_VERSION,))
+                conn.commit()
+        except sqlite3.Error as error:
+            logging.error("Failed to set up Serato library index: %s", error)
+
+    @staticmethod
+    def _signature(filepath: pathlib.Path) -> tuple[int, int] | None:
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    async def refresh(self, libpath: str | pathlib.Path) -> bool:
+        """Bring the index for libpath up to date; False if it has no database V2"""
+        libpath = str(libpath)
+        dbfile = pathlib.Path(libpath).joinpath("database V2")
+        if (signature := self._signature(dbfile)) is None:
+            logging.error("Serato database V2 not found at %s", dbfile)
+            return False
+        if self._signatures.get(libpath) == signature:
+            return True
+
+        async with self._lock:
+            if self._signatures.get(libpath) != signature:
+                if await self._stored_signature(libpath) != signature:
+                    await self._reindex(libpath, signature)
+                self._signatures[libpath] = signature
+        return True
+
+    async def _stored_signature(self, libpath: str) -> tuple[int, int] | None:
+        async def _do_stored() -> tuple[int, int] | None:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                cursor = await conn.execute(
+                    "SELECT size, mtime_ns FROM libraries WHERE libpath = ?", (libpath,)
+                )
+                row = await cursor.fetchone()
+                return (row[0], row[1]) if row else None
+
+        return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_stored)
+
+    async def _reindex(self, libpath: str, signature: tuple[int, int]) -> None:
+        """re-read database V2 and write back only what changed since the last read"""
+        reader = SeratoDatabaseV2Reader(libpath)
+        await reader.loaddatabase()
+        current: dict[str, tuple[int, str, str]] = {}
+        for position, track in enumerate(reader.tracks):
+            current.setdefault(
+                track["filepath"],
+                (
+                    position,
+                    (track.get("artist") or "").lower(),
+                    json.dumps(track, sort_keys=True),
+                ),
+            )
+
+        async def _do_reindex() -> tuple[int, int]:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                cursor = await conn.execute(
+                    "SELECT filepath, position, artist, track FROM tracks WHERE libpath = ?",
+                    (libpath,),
+                )
+                stored = {row[0]: tuple(row[1:]) for row in await cursor.fetchall()}
+                removed = [(libpath, filepath) for filepath in stored.keys() - current.keys()]
+                changed = [
+                    (libpath, filepath, *row)
+                    for filepath, row in current.items()
+                    if stored.get(filepath) != row
+                ]
+                await conn.executemany(
+                    "DELETE FROM tracks WHERE libpath = ? AND filepath = ?", removed
+                )
+                await conn.executemany(
+                    "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?)", changed
+                )
+                await conn.execute(
+                    "INSERT OR REPLACE INTO libraries VALUES (?, ?, ?)", (libpath, *signature)
+                )
+                await conn.commit()
+                return len(changed), len(removed)
+
+        changed, removed = await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_reindex)
+        logging.debug(
+            "Serato library index for %s: %d tracks, %d updated, %d removed",
+            libpath,
+            len(current),
+            changed,
+            removed,
+        )
+
+    async def has_artist(self, libpath: str | pathlib.Path, artist_name: str) -> bool:
+        """True if any track in libpath is by exactly artist_name (ignoring case)"""
+        if not await self.refresh(libpath):
+            return False
+
+        async def _do_has_artist() -> bool:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                cursor = await conn.execute(
+                    "SELECT 1 FROM tracks WHERE libpath = ? AND artist = ? LIMIT 1",
+                    (str(libpath), artist_name.lower()),
+                )
+                return await cursor.fetchone() is not None
+
+        return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_has_artist)
+
+    async def artist_in_files(
+        self, libpath: str | pathlib.Path, filelist: list[str], artist_name: str
+    ) -> bool:
+        """True if any of the crate files in filelist has artist_name in its artist"""
+        if not await self.refresh(libpath):
+            return False
+
+        # crate entries have a leading slash, database V2 paths do not
+        filepaths = list(dict.fromkeys(filename.lstrip("/") for filename in filelist))
+
+        async def _do_artist_in_files() -> bool:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                for start in range(0, len(filepaths), _CHUNKSIZE):
+                    chunk = filepaths[start : start + _CHUNKSIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = await conn.execute(
+                        "SELECT 1 FROM tracks WHERE libpath = ?"
+                        f" AND filepath IN ({placeholders})"
+                        " AND instr(artist, ?) > 0 LIMIT 1",
+                        (str(libpath), *chunk, artist_name.lower()),
+                    )
+                    if await cursor.fetchone():
+                        return True
+                return False
+
+        return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_artist_in_files)
+
+    async def smartcrate_files(
+        self,
+        libpath: str | pathlib.Path,
+        cratefile: str | pathlib.Path,
+        rules: list[dict[str, t.Any]],
+    ) -> list[str] | None:
+        """Files in libpath that cratefile's rules select; None if libpath has no tracks"""
+        if not await self.refresh(libpath):
+            return None
+        libpath = str(libpath)
+        cratefile = str(cratefile)
+        cratesig = self._signature(pathlib.Path(cratefile))
+        signature = json.dumps([cratesig, self._signatures.get(libpath)])
+
+        async def _do_cached() -> list[str] | None:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                cursor = await conn.execute(
+                    "SELECT signature FROM smartcrates WHERE libpath = ? AND cratefile = ?",
+                    (libpath, cratefile),
+                )
+                row = await cursor.fetchone()
+                if not row or row[0] != signature:
+                    return None
+                cursor = await conn.execute(
+                    "SELECT filepath FROM smartcrate_tracks"
+                    " WHERE libpath = ? AND cratefile = ? ORDER BY position",
+                    (libpath, cratefile),
+                )
+                return [row[0] for row in await cursor.fetchall()]
+
+        if (
+            cached := await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_cached)
+        ) is not None:
+            return cached
+
+        async def _do_evaluate() -> list[str] | None:
+            async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                cursor = await conn.execute(
+                    "SELECT track FROM tracks WHERE libpath = ? ORDER BY position", (libpath,)
+                )
+                reader = SeratoDatabaseV2Reader(libpath)
+                reader.tracks = [json.loads(row[0]) for row in await cursor.fetchall()]
+                if not reader.tracks:
+                    return None
+                matches = reader.apply_smart_crate_rules(rules)
+                await conn.execute(
+                    "DELETE FROM smartcrate_tracks WHERE libpath = ? AND cratefile = ?",
+                    (libpath, cratefile),
+                )
+                await conn.executemany(
+                    "INSERT INTO smartcrate_tracks VALUES (?, ?, ?, ?)",
+                    [
+                        (libpath, cratefile, position, filepath)
+                        for position, filepath in enumerate(matches)
+                    ],
+                )
+                await conn.execute(
+                    "INSERT OR REPLACE INTO smartcrates VALUES (?, ?, ?)",
+                    (libpath, cratefile, signature),
+                )
+                await conn.commit()
+                return matches
+
+        return await nowplaying.utils.sqlite.retry_sqlite_operation_async(_do_evaluate)
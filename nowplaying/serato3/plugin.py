@@ -30,10 +30,11 @@ import nowplaying.uihelp
 import nowplaying.wizard
 from nowplaying.exceptions import PluginVerifyError
 from nowplaying.inputs import InputPlugin
+from nowplaying.types import TrackMetadata
 
 from .crate import SeratoCrateReader
-from .database import SeratoDatabaseV2Reader
 from .handler import SeratoHandler
+from .index import SeratoLibraryIndex
 from .smart_crate import SeratoSmartCrateReader
 
 if TYPE_CHECKING:
@@ -139,12 +140,20 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
         self.last_extraction_method = None
         # Cache crate file counts to avoid re-parsing
         self._crate_count_cache: dict[str, int] = {}
+        self._libraryindex: SeratoLibraryIndex | None = None
 
     def clear_crate_cache(self) -> None:
         """Clear the crate count cache (useful if crates are modified)"""
         self._crate_count_cache.clear()
         logging.debug("Cleared crate count cache")
 
+    @property
+    def libraryindex(self) -> SeratoLibraryIndex:
+        """the artist/smart crate index, opened on first use"""
+        if not self._libraryindex:
+            self._libraryindex = SeratoLibraryIndex()
+        return self._libraryindex
+
     @classmethod
     def get_path_keys(cls) -> frozenset[str]:
         return frozenset({"serato/libpath"})
@@ -268,6 +277,12 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
             return await self.serato.getplayingtrack(deckskiplist=deckskip)
         return {}
 
+    async def getupcomingtracks(self):
+        """tracks on the decks that are not playing"""
+        if self.serato:
+            return self.serato.getupcomingtracks()
+        return []
+
     async def getrandomtrack(  # pylint: disable=too-many-return-statements
         self, playlist: str
     ) -> str | None:
@@ -316,7 +331,7 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
             playlistfile = smartcrate_path.joinpath(f"{playlist}.scrate")
             logging.debug("Using smart crate: %s", playlistfile)
 
-            smart_crate = SeratoSmartCrateReader(playlistfile, libpath)
+            smart_crate = SeratoSmartCrateReader(playlistfile, libpath, self.libraryindex)
             await smart_crate.loadsmartcrate()
             if filelist := await smart_crate.getfilenames():
                 return filelist[random.randrange(len(filelist))] if filelist else None
@@ -326,6 +341,30 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
 
         return None
 
+    async def getplaylisttracks(self, playlist: str) -> list[TrackMetadata]:
+        """Every file in a crate or smart crate"""
+        libpath = self.config.cparser.value("serato/libpath")
+        if not libpath:
+            return []
+
+        cratefile = pathlib.Path(libpath).joinpath("Subcrates", f"{playlist}.crate")
+        smartcratefile = pathlib.Path(libpath).joinpath("SmartCrates", f"{playlist}.scrate")
+        filelist: list[str] | None = None
+        try:
+            if cratefile.exists():
+                crate = SeratoCrateReader(cratefile)
+                await crate.loadcrate()
+                filelist = crate.getfilenames()
+            elif smartcratefile.exists():
+                smart_crate = SeratoSmartCrateReader(smartcratefile, libpath, self.libraryindex)
+                await smart_crate.loadsmartcrate()
+                filelist = await smart_crate.getfilenames()
+            else:
+                logging.error("Unknown crate: %s", playlist)
+        except (OSError, struct.error, UnicodeDecodeError) as err:
+            logging.error("Failed to load crate %s: %s", playlist, err)
+        return [{"filename": filename} for filename in filelist or []]
+
     def defaults(self, qsettings: "QSettings"):
         qsettings.setValue(
             "serato/libpath",
@@ -424,61 +463,19 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
             )
             return False
 
-    @staticmethod
     async def _find_artist_in_filelist(
-        filelist: list[str], artist_name: str, libpath: str
+        self, filelist: list[str], artist_name: str, libpath: str
     ) -> bool:
-        """Check if artist exists in any of the provided files by looking up metadata in database"""
-        artist_name_lower = artist_name.lower()
-
-        try:  # pylint: disable=too-many-nested-blocks
-            db_reader = SeratoDatabaseV2Reader(libpath)
-            await db_reader.loaddatabase()
-            logging.debug("Database %s loaded with %d tracks", libpath, len(db_reader.tracks))
-
-            for crate_filename in filelist:
-                logging.debug("Checking crate file: %s", crate_filename)
-
-                # Normalize paths - crate has leading slash, database doesn't
-                # Convert /washu/path -> washu/path for cross-platform compatibility
-                normalized_crate_path = crate_filename.lstrip("/")
-
-                # Find track in database by filepath (not just filename)
-                track_found = False
-                for track in db_reader.tracks:
-                    db_filepath = track.get("filepath", "")
-                    if db_filepath == normalized_crate_path:
-                        track_found = True
-                        track_artist = track.get("artist", "")
-                        logging.debug(
-                            "Found track in DB: %s, artist: '%s', searching for: '%s'",
-                            normalized_crate_path,
-                            track_artist,
-                            artist_name,
-                        )
-                        if artist_name_lower in track_artist.lower():
-                            logging.debug(
-                                "Found artist '%s' in file: %s", artist_name, crate_filename
-                            )
-                            return True
-                        break
-
-                if not track_found:
-                    logging.debug(
-                        "Track not found in database: %s (normalized: %s)",
-                        crate_filename,
-                        normalized_crate_path,
-                    )
-
+        """Check if artist exists in any of the provided files via the library index"""
+        try:
+            if await self.libraryindex.artist_in_files(libpath, filelist, artist_name):
+                logging.debug("Found artist '%s' in crate files in %s", artist_name, libpath)
+                return True
             return False
 
         except Exception as err:  # pylint: disable=broad-exception-caught
             logging.error("Failed to check database %s: %s", libpath, err)
             return False
-        finally:
-            # Clean up memory
-            if "db_reader" in locals():
-                del db_reader
 
     async def _check_regular_crate_in_path(
         self, playlist_name: str, artist_name: str, libpath: str
@@ -516,7 +513,7 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
 
         try:
             logging.debug("Loading smart crate: %s", smartcrate_path)
-            smart_crate = SeratoSmartCrateReader(smartcrate_path, libpath)
+            smart_crate = SeratoSmartCrateReader(smartcrate_path, libpath, self.libraryindex)
             await smart_crate.loadsmartcrate()
 
             # For smart crates, check across all configured library paths
@@ -578,32 +575,16 @@ class Plugin(InputPlugin):  # pylint: disable=too-many-instance-attributes,too-m
 
         return False
 
-    @staticmethod
-    async def _has_tracks_in_entire_library(artist_name: str, libpath: str) -> bool:
+    async def _has_tracks_in_entire_library(self, artist_name: str, libpath: str) -> bool:
         """Check for artist tracks in entire library"""
         logging.debug(
             "Serato artist query: searching for '%s' in libpath: %s", artist_name, libpath
         )
-        db_reader = SeratoDatabaseV2Reader(libpath)
-        await db_reader.loaddatabase()
-
-        logging.debug("Serato database loaded: %d tracks found", len(db_reader.tracks))
-        if len(db_reader.tracks) > 0:
-            # Log first few artists for debugging
-            sample_artists = [track.get("artist", "") for track in db_reader.tracks[:5]]
-            logging.debug("Sample artists in database: %s", sample_artists)
-
-        artist_name_lower = artist_name.lower()
-
-        # Check for exact matches and log some details
-        matches = [
-            track
-            for track in db_reader.tracks
-            if track.get("artist", "").lower() == artist_name_lower
-        ]
-        logging.debug("Found %d exact matches for artist '%s'", len(matches), artist_name)
-
-        return len(matches) > 0
+        found = await self.libraryindex.has_artist(libpath, artist_name)
+        logging.debug(
+            "Serato artist '%s' %sfound in %s", artist_name, "" if found else "not ", libpath
+        )
+        return found
 
     def on_serato_lib_button(self):
         """lib button clicked action"""
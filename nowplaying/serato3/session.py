@@ -10,10 +10,16 @@ developed and tested over time.
 import logging
 import pathlib
 import struct
+import threading
 import typing as t
 from collections.abc import Callable
 
-from .base import SeratoBaseReader
+import aiofiles
+
+from .base import UINT32, SeratoBaseReader
+
+# adat fields: numeric tag and length
+_ADATFIELD = struct.Struct(">II")
 
 
 class SeratoSessionReader(SeratoBaseReader):
@@ -68,16 +74,15 @@ class SeratoSessionReader(SeratoBaseReader):
 
         self.sessiondata: list[dict[str, t.Any]] = []
 
-    def _decode_adat(self, data: bytes) -> dict[str, t.Any]:
+    def _decode_adat(self, data: bytes | memoryview) -> dict[str, t.Any]:
         ret: dict[str, t.Any] = {}
+        view = memoryview(data)
         # i = 0
-        # tag = struct.unpack('>I', data[0:i + 4])[0]
-        # length = struct.unpack('>I', data[i + 4:i + 8])[0]
+        # tag, length = _ADATFIELD.unpack_from(view, 0)
         i = 8
-        while i < len(data) - 8:
-            tag = struct.unpack(">I", data[i + 4 : i + 8])[0]
-            length = struct.unpack(">I", data[i + 8 : i + 12])[0]
-            value = data[i + 12 : i + 12 + length]
+        while i < len(view) - 8:
+            tag, length = _ADATFIELD.unpack_from(view, i + 4)
+            value = view[i + 12 : i + 12 + length]
             try:
                 field = self._adat_func[tag][0]
                 value = self._adat_func[tag][1](value)
@@ -128,3 +133,70 @@ class SeratoSessionReader(SeratoBaseReader):
             logging.error("session has not been loaded")
             return
         yield from reversed(self.sessiondata)
+
+
+class SeratoSessionTailReader(SeratoSessionReader):
+    """read the live Serato session file, decoding only what has changed
+
+    Serato appends an oent record per deck load and updates earlier ones
+    in place (played, end time) as tracks go by.  The raw bytes of every
+    oent are kept along with the adats decoded from them, so each update
+    only walks the record headers and decodes the records that are new or
+    whose bytes differ from last time.  A different session file starts
+    from scratch.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sessionfile: pathlib.Path | None = None
+        self._records: list[tuple[bytes, list[dict[str, t.Any]]]] = []
+        # the handler can run updates from the watchdog thread's loop too
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """forget everything; the next update decodes the whole file"""
+        with self._lock:
+            self.sessionfile = None
+            self._records = []
+            self.sessiondata = []
+
+    async def update(self, filename: str | pathlib.Path) -> list[dict[str, t.Any]]:
+        """bring sessiondata up to date with filename and return a copy of it
+
+        sessiondata is kept condensed to just the adats.
+        """
+        path = pathlib.Path(filename)
+        async with aiofiles.open(path, "rb") as filefhin:
+            data = memoryview(await filefhin.read())
+
+        with self._lock:
+            if path != self.sessionfile:
+                self.sessionfile = path
+                self._records = []
+            records = []
+            decoded = 0
+            i = 0
+            while i + 8 <= len(data):
+                length = UINT32.unpack_from(data, i + 4)[0]
+                if i + 8 + length > len(data):
+                    # Serato is mid-write; pick this record up next time
+                    break
+                if data[i : i + 4] == b"oent":
+                    raw = data[i + 8 : i + 8 + length]
+                    if len(records) < len(self._records) and self._records[len(records)][0] == raw:
+                        records.append(self._records[len(records)])
+                    else:
+                        raw = bytes(raw)
+                        adats = [
+                            value
+                            for oenttag, value in self._decode_struct(raw)
+                            if oenttag == "adat"
+                        ]
+                        records.append((raw, adats))
+                        decoded += 1
+                i += 8 + length
+
+            logging.debug("%s: decoded %d of %d records", path.name, decoded, len(records))
+            self._records = records
+            self.sessiondata = [adat for _, adats in records for adat in adats]
+            return list(self.sessiondata)
@@ -15,6 +15,9 @@ import typing as t
 from .base import SeratoBaseReader, SeratoRuleMatchingMixin
 from .database import SeratoDatabaseV2Reader
 
+if t.TYPE_CHECKING:
+    from .index import SeratoLibraryIndex
+
 
 class SeratoSmartCrateReader(SeratoRuleMatchingMixin, SeratoBaseReader):
     """read a Serato smart crate (.scrate) file and execute its rules"""
@@ -34,7 +37,12 @@ class SeratoSmartCrateReader(SeratoRuleMatchingMixin, SeratoBaseReader):
         # 'label', 'remixer', 'plays', 'added', 'last_played'
     }
 
-    def __init__(self, filename: str | pathlib.Path, serato_lib_path: str | pathlib.Path) -> None:
+    def __init__(
+        self,
+        filename: str | pathlib.Path,
+        serato_lib_path: str | pathlib.Path,
+        index: "SeratoLibraryIndex | None" = None,
+    ) -> None:
         super().__init__(filename)
         # Add smart crate specific decoders
         self.decode_func_full.update(
@@ -48,15 +56,15 @@ class SeratoSmartCrateReader(SeratoRuleMatchingMixin, SeratoBaseReader):
         # Add handlers for null-byte prefixed data (UTF-16 strings in smart crates)
         self.decode_func_first.update(
             {
-                "\x00": lambda x: x.decode("utf-16-be", errors="replace").rstrip(
-                    "\x00"
-                ),  # UTF-16 string, strip null terminator
+                "\x00": self._decode_unicode,  # UTF-16 string, strip null terminator
             }
         )
 
         self.serato_lib_path: pathlib.Path = pathlib.Path(serato_lib_path)
         self.smart_crate: list[tuple[str, t.Any]] | None = None
         self.rules: list[dict[str, t.Any]] = []
+        # when set, memberships come from (and are kept in) the library index
+        self.index = index
 
     async def loadsmartcrate(self) -> None:
         """load/overwrite current smart crate"""
@@ -243,6 +251,18 @@ class SeratoSmartCrateReader(SeratoRuleMatchingMixin, SeratoBaseReader):
         )
         return None
 
+    async def _apply_rules(self, libpath: str | pathlib.Path) -> list[str] | None:
+        """Files in one library matching the rules; None if it has no tracks"""
+        if self.index:
+            return await self.index.smartcrate_files(libpath, self.filepath, self.rules)
+
+        db_reader = SeratoDatabaseV2Reader(libpath)
+        await db_reader.loaddatabase()
+        if not db_reader.tracks:
+            return None
+        logging.debug("Database %s loaded with %d tracks", libpath, len(db_reader.tracks))
+        return db_reader.apply_smart_crate_rules(self.rules)
+
     async def getfilenames(self) -> list[str] | None:
         """Get filenames by executing smart crate rules against Serato database"""
         if not self.smart_crate:
@@ -251,11 +271,8 @@ class SeratoSmartCrateReader(SeratoRuleMatchingMixin, SeratoBaseReader):
 
         # Use Serato database V2 for accurate filtering
         try:
-            db_reader = SeratoDatabaseV2Reader(self.serato_lib_path)
-            await db_reader.loaddatabase()
-
-            if db_reader.tracks:
-                return db_reader.apply_smart_crate_rules(self.rules)
+            if (matches := await self._apply_rules(self.serato_lib_path)) is not None:
+                return matches
             logging.error(
                 "No tracks loaded from Serato database - Serato DJ installation may be corrupted"
             )
@@ -283,23 +300,14 @@ class SeratoSmartCrateReader(SeratoRuleMatchingMixin, SeratoBaseReader):
         for libpath in all_libpaths:
             try:
                 logging.debug("Checking smart crate rules against database: %s", libpath)
-                db_reader = SeratoDatabaseV2Reader(libpath)
-                await db_reader.loaddatabase()
-
-                if db_reader.tracks:
-                    logging.debug(
-                        "Database %s loaded with %d tracks", libpath, len(db_reader.tracks)
-                    )
-                    if matches := db_reader.apply_smart_crate_rules(self.rules):
-                        logging.debug("Found %d matches in database %s", len(matches), libpath)
-                        all_matching_files.extend(matches)
-                    else:
-                        logging.debug("No matches found in database %s", libpath)
-                else:
+                matches = await self._apply_rules(libpath)
+                if matches is None:
                     logging.warning("No tracks found in database %s", libpath)
-
-                # Clear db_reader to free memory before next iteration
-                del db_reader
+                elif matches:
+                    logging.debug("Found %d matches in database %s", len(matches), libpath)
+                    all_matching_files.extend(matches)
+                else:
+                    logging.debug("No matches found in database %s", libpath)
 
             except Exception as err:  # pylint: disable=broad-exception-caught
                 logging.error("Failed to load Serato database %s: %s", libpath, err)
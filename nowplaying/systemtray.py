@@ -2,6 +2,8 @@
 """system tray"""
 
 import logging
+import multiprocessing
+import queue
 import socket
 import sqlite3
 
@@ -16,6 +18,7 @@ from PySide6.QtGui import QAction, QActionGroup, QDesktopServices, QGuiApplicati
 from PySide6.QtWidgets import (  # pylint: disable=no-name-in-module
     QApplication,
     QErrorMessage,
+    QInputDialog,
     QMenu,
     QMessageBox,
     QSystemTrayIcon,
@@ -35,6 +38,7 @@ import nowplaying.firstinstall
 import nowplaying.guessgame
 import nowplaying.notifications.charts
 import nowplaying.oauth2
+import nowplaying.processes.enrichment
 import nowplaying.settingsui
 import nowplaying.subprocesses
 import nowplaying.trackrequests
@@ -63,6 +67,55 @@ class _VacuumThread(QThread):  # pylint: disable=too-few-public-methods
         logging.debug("Background database vacuum complete")
 
 
+class _EnrichmentThread(QThread):  # pylint: disable=too-few-public-methods
+    """Background thread that watches the process warming the caches for one playlist."""
+
+    enriched = Signal(str, int, int)
+
+    # Spawned, not forked: this thread is not the main one, and forking a
+    # threaded Qt process is not safe
+    _mpcontext = multiprocessing.get_context("spawn")
+
+    def __init__(self, config: "nowplaying.config.ConfigFile", playlist: str, parent=None) -> None:
+        super().__init__(parent)
+        self._config = config
+        self.playlist = playlist
+        self.stopevent = self._mpcontext.Event()
+
+    def run(self) -> None:
+        """Enrich the playlist, resuming wherever an earlier run stopped."""
+        results = self._mpcontext.Queue()
+        process = self._mpcontext.Process(
+            target=nowplaying.processes.enrichment.start,
+            name="Enrichment",
+            args=(
+                self.stopevent,
+                str(self._config.getbundledir()),
+                self._config.testmode,
+                self.playlist,
+                results,
+            ),
+        )
+        process.start()
+        while process.is_alive():
+            process.join(1)
+            if self.stopevent.is_set():
+                # The job stops after the track it is on; give that a moment
+                process.join(8)
+                if process.is_alive():
+                    logging.info("Enrichment of %s did not stop; terminating", self.playlist)
+                    process.terminate()
+                    process.join()
+        try:
+            count, total = results.get(timeout=1)
+        except queue.Empty:
+            logging.error("Enrichment of %s failed", self.playlist)
+            return
+        finally:
+            results.close()
+        self.enriched.emit(self.playlist, count, total)
+
+
 class _WebserverPollThread(QThread):  # pylint: disable=too-few-public-methods
     """Polls the local webserver port until it accepts connections, then emits ready."""
 
@@ -101,6 +154,7 @@ class Tray:  # pylint: disable=too-many-instance-attributes
         self.link_thread = None  # QThread for Twitch account linking
         self.vacuum_thread = None  # QThread for background database vacuum
         self._prefetch_worker = None  # QThread for background update pre-fetch
+        self._enrich_thread: _EnrichmentThread | None = None
         self._oauth_poller: _WebserverPollThread | None = None
         self._obs_export_dialog = None
 
@@ -215,6 +269,35 @@ class Tray:  # pylint: disable=too-many-instance-attributes
             )
         nowplaying.utils.qt.focus_window(self._obs_export_dialog)
 
+    def _enrich_playlist(self) -> None:
+        """Start warming the caches for a playlist, or stop the one running."""
+        if self._enrich_thread and self._enrich_thread.isRunning():
+            self._enrich_thread.stopevent.set()
+            return
+
+        playlist, accepted = QInputDialog.getText(
+            None,
+            "Enrich Playlist",
+            "Playlist or crate to look up ahead of time:",
+        )
+        if not accepted or not playlist.strip():
+            return
+
+        self._enrich_thread = _EnrichmentThread(self.config, playlist.strip())
+        self._enrich_thread.enriched.connect(self._enrich_done)
+        self._enrich_thread.finished.connect(
+            lambda: self.enrich_action.setText("Enrich Playlist...")
+        )
+        self.enrich_action.setText("Stop Enriching")
+        self._enrich_thread.start()
+
+    def _enrich_done(self, playlist: str, count: int, total: int) -> None:
+        self.tray.showMessage(
+            "Enrich Playlist",
+            f"{playlist}: looked up {count} new of {total} tracks",
+            icon=QSystemTrayIcon.MessageIcon.NoIcon,
+        )
+
     def _show_setup_wizard(self) -> None:
         """Open the setup wizard, re-running it regardless of initialized state."""
         wizard = nowplaying.installwizard.InstallWizard(self.config)
@@ -256,6 +339,10 @@ class Tray:  # pylint: disable=too-many-instance-attributes
         self.obs_export_action.triggered.connect(self._show_obs_export)
         self.menu.addAction(self.obs_export_action)
 
+        self.enrich_action = QAction("Enrich Playlist...")
+        self.enrich_action.triggered.connect(self._enrich_playlist)
+        self.menu.addAction(self.enrich_action)
+
         self.request_action = QAction("Requests")
         self.request_action.triggered.connect(self._requestswindow)
         self.request_action.setEnabled(True)
@@ -736,6 +823,9 @@ class Tray:  # pylint: disable=too-many-instance-attributes
         self.action_oldestmode.setEnabled(False)
         self.settings_action.setEnabled(False)
 
+        if self._enrich_thread and self._enrich_thread.isRunning():
+            self._enrich_thread.stopevent.set()
+
         self.subprocesses.stop_all_processes()
 
         # Wait for background threads to finish before cleanup
@@ -745,6 +835,9 @@ class Tray:  # pylint: disable=too-many-instance-attributes
             if not self._prefetch_worker.wait(nowplaying.upgrades.background._SHUTDOWN_TIMEOUT_MS):  # pylint: disable=protected-access
                 self._prefetch_worker.terminate()
                 self._prefetch_worker.wait()
+        if self._enrich_thread:
+            self._enrich_thread.wait()
+            self._enrich_thread = None
 
         # Clean up any stray temporary OAuth2 credentials before shutdown
         nowplaying.oauth2.OAuth2Client.cleanup_stray_temp_credentials(self.config)
@@ -3,6 +3,7 @@
 
 import asyncio
 import base64
+import hashlib
 import io
 import logging
 import os
@@ -217,15 +218,32 @@ def image2avif(rawdata: bytes | None) -> bytes | None:
     return imgbuffer.getvalue()
 
 
-def songpathsubst(config: "nowplaying.config.ConfigFile", filename: str) -> str:
-    """if needed, change the pathing of a file"""
+def songpathsubst_settings(
+    config: "nowplaying.config.ConfigFile",
+) -> tuple[str | None, str | None, str] | None:
+    """the (slashmode, filesubstin, filesubstout) quirks songpathsubst applies, or None if off
+
+    Read these once and hand them to songpathsubst_apply to substitute paths
+    away from the thread that owns config.
+    """
+    if not config.cparser.value("quirks/filesubst", type=bool):
+        return None
+    return (
+        config.cparser.value("quirks/slashmode"),
+        config.cparser.value("quirks/filesubstin"),
+        config.cparser.value("quirks/filesubstout") or "",
+    )
+
+
+def songpathsubst_apply(settings: tuple[str | None, str | None, str] | None, filename: str) -> str:
+    """change the pathing of a file according to songpathsubst_settings()"""
 
     origfilename = filename
 
-    if not config.cparser.value("quirks/filesubst", type=bool):
+    if not settings:
         return filename
 
-    slashmode = config.cparser.value("quirks/slashmode")
+    slashmode, songin, songout = settings
 
     if slashmode == "toforward":
         newname = filename.replace("\\", "/")
@@ -236,9 +254,7 @@ def songpathsubst(config: "nowplaying.config.ConfigFile", filename: str) -> str:
     else:
         newname = filename
 
-    if songin := config.cparser.value("quirks/filesubstin"):
-        songout = config.cparser.value("quirks/filesubstout") or ""
-
+    if songin:
         try:
             newname = filename.replace(songin, songout)
         except Exception as error:  # pylint: disable=broad-exception-caught
@@ -255,6 +271,23 @@ def songpathsubst(config: "nowplaying.config.ConfigFile", filename: str) -> str:
     return newname
 
 
+def songpathsubst(config: "nowplaying.config.ConfigFile", filename: str) -> str:
+    """if needed, change the pathing of a file"""
+    return songpathsubst_apply(songpathsubst_settings(config), filename)
+
+
+def file_identity_key(filename: str) -> str | None:
+    """Key a file by path, size and mtime so per-file caches miss once it is edited.
+
+    Returns None when the file cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(filename)
+    except (OSError, ValueError):
+        return None
+    return hashlib.sha256(f"{filename}\0{stat.st_size}\0{stat.st_mtime_ns}".encode()).hexdigest()
+
+
 # normalize, normalize_text, unsmartquotes, generate_artist_variations,
 # ARTIST_VARIATIONS_RE, CUSTOM_TRANSLATE imported from wnpmb above.
 
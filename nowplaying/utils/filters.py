@@ -65,6 +65,53 @@ _cached_filter_manager: FilterManager | None = None  # pylint: disable=invalid-n
 _cache_last_load_date: int = 0  # pylint: disable=invalid-name
 
 
+class _TitleMatcher:  # pylint: disable=too-few-public-methods
+    """The selections of a FilterManager, compiled for stripping titles"""
+
+    def __init__(self, phrase_format_selections: dict[str, dict[str, bool]], patterns: list[str]):
+        # one pattern per dash/paren/bracket format, as get_compiled_regex_list returns them
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+        # the plain phrases in selection order plus one pattern that finds any of them
+        self.plain_phrases = [
+            phrase.lower()
+            for phrase, formats in phrase_format_selections.items()
+            if formats.get("plain", False)
+        ]
+        self.plain_regex = (
+            re.compile("|".join(re.escape(phrase) for phrase in self.plain_phrases))
+            if self.plain_phrases
+            else None
+        )
+
+        # Phrases may not contain brackets or parens, so matches of the three
+        # formats never overlap and one left-to-right pass over the alternation
+        # removes what running each format's pattern in turn did.  The one
+        # exception is a bracket that only closes once a paren inside it is
+        # gone ("[HD (Live)]"), which is now left alone.
+        alternatives = [f"(?:{pattern})" for pattern in patterns]
+        self.combined_regex = (
+            re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        )
+
+    def strip(self, title: str) -> str:
+        """title without the selected phrases"""
+        # Plain phrases remove their first occurrence, in selection order.
+        # Most titles contain none of them, so one search decides whether the
+        # per-phrase pass is needed at all.
+        title_lower = title.lower()
+        if self.plain_regex and self.plain_regex.search(title_lower):
+            for phrase in self.plain_phrases:
+                start_idx = title_lower.find(phrase)
+                if start_idx != -1:
+                    title = title[:start_idx] + title[start_idx + len(phrase) :]
+                    title_lower = title.lower()
+
+        if self.combined_regex:
+            title = self.combined_regex.sub("", title)
+        return title
+
+
 class FilterManager:
     """Manages simple filter phrase selection and regex generation"""
 
@@ -73,8 +120,8 @@ class FilterManager:
         self.phrase_format_selections: dict[str, dict[str, bool]] = {}
         # Set to track custom phrases added by user
         self.custom_phrases: set[str] = set()
-        # Cached compiled patterns for performance
-        self._compiled_patterns: list[re.Pattern] = []
+        # Selections compiled for apply_all_filters, rebuilt once they change
+        self._matcher: _TitleMatcher | None = None
         self._patterns_dirty = True
         # Complex regex patterns (from manual regex entries)
         self.regex_patterns: list[re.Pattern] = []
@@ -208,13 +255,17 @@ class FilterManager:
         joinlist = "|".join(escaped_phrases)
         patterns.append(f"{first}{joinlist}{last}")
 
+    def _get_matcher(self) -> _TitleMatcher:
+        if self._patterns_dirty or self._matcher is None:
+            self._matcher = _TitleMatcher(
+                self.phrase_format_selections, self.generate_regex_patterns()
+            )
+            self._patterns_dirty = False
+        return self._matcher
+
     def get_compiled_regex_list(self) -> list[re.Pattern]:
         """Get compiled regex patterns with caching for performance"""
-        if self._patterns_dirty or not self._compiled_patterns:
-            patterns = self.generate_regex_patterns()
-            self._compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
-            self._patterns_dirty = False
-        return self._compiled_patterns
+        return self._get_matcher().patterns
 
     def set_regex_patterns(self, patterns: list[re.Pattern]):
         """Set the complex regex patterns"""
@@ -229,20 +280,7 @@ class FilterManager:
         if not title:
             return None
 
-        # Apply per-phrase filtering based on format selections
-        for phrase, formats in self.phrase_format_selections.items():
-            # Apply plain string matching first (fastest)
-            if formats.get("plain", False):
-                title_lower = title.lower()
-                phrase_lower = phrase.lower()
-                if phrase_lower in title_lower:
-                    start_idx = title_lower.find(phrase_lower)
-                    if start_idx != -1:
-                        title = title[:start_idx] + title[start_idx + len(phrase) :]
-
-        # Apply formatted patterns using cached compiled regex
-        for pattern in self.get_compiled_regex_list():
-            title = pattern.sub("", title)
+        title = self._get_matcher().strip(title)
 
         # Apply complex regex patterns
         for pattern in self.regex_patterns:
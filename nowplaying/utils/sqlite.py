@@ -9,8 +9,11 @@ import random
 import sqlite3
 import time
 from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
 from typing import Any
 
+import aiosqlite
+
 
 def retry_sqlite_operation(
     operation_func: Callable[[], Any],
@@ -139,6 +142,60 @@ async def retry_sqlite_operation_async(
             raise
 
 
+class BackgroundWriter:
+    """
+    Rows queued in memory and written to a database off the caller's path.
+
+    add() returns straight away; the first call starts a task on the running
+    loop that hands everything queued so far to write(connection, rows) in one
+    transaction, and keeps going until nothing is left.  flush() waits for it.
+    """
+
+    def __init__(
+        self,
+        dbpath: str | Path,
+        write: Callable[[aiosqlite.Connection, list[tuple]], Awaitable[None]],
+        what: str,
+    ):
+        self.dbpath = dbpath
+        self._write = write
+        self._what = what
+        self._pending: list[tuple] = []
+        self._task: asyncio.Task | None = None
+
+    def add(self, row: tuple) -> None:
+        """Queue one row, starting the background write if none is running"""
+        self._pending.append(row)
+        if (
+            not self._task
+            or self._task.done()
+            or self._task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._pending:
+            rows, self._pending = self._pending, []
+            try:
+                async with aiosqlite.connect(str(self.dbpath), timeout=30) as conn:
+                    await self._write(conn, rows)
+                    await conn.commit()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logging.error("Error recording %s: %s", self._what, error)
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far is in the database"""
+        if (
+            self._task
+            and not self._task.done()
+            and self._task.get_loop() is asyncio.get_running_loop()
+        ):
+            await self._task
+        # rows left behind by a task on a loop that has since gone away
+        if self._pending:
+            await self._drain()
+
+
 @contextlib.contextmanager
 def sqlite_connection(
     database_path: str, timeout: int = 10, row_factory=None
@@ -168,3 +225,52 @@ def sqlite_connection(
             connection.row_factory = row_factory
         with connection:
             yield connection
+
+
+# Every playlist's entries numbered 0..n-1, rebuilt along with the playlists
+# table, so picking a random entry is two index lookups instead of an
+# ORDER BY random() over the whole playlist
+PLAYLIST_PICKS_SCHEMAS = [
+    "CREATE INDEX IF NOT EXISTS playlists_name ON playlists (name, id)",
+    "DROP TABLE IF EXISTS playlist_picks",
+    "CREATE TABLE playlist_picks"
+    " (name TEXT, position INTEGER, id INTEGER, PRIMARY KEY (name, position)) WITHOUT ROWID",
+    "INSERT INTO playlist_picks"
+    " SELECT name, ROW_NUMBER() OVER (PARTITION BY name ORDER BY id) - 1, id"
+    " FROM playlists WHERE name IS NOT NULL",
+]
+
+
+async def random_playlist_filename(cursor: Any, playlist: str) -> str | None:
+    """Filename of a random entry in playlist, using playlist_picks if it is there.
+
+    Args:
+        cursor: aiosqlite cursor on a database with a playlists table
+        playlist: playlist name
+
+    Returns:
+        The filename, or None if the playlist is empty or unknown.
+    """
+    try:
+        await cursor.execute(
+            "SELECT MAX(position) FROM playlist_picks WHERE name = ?", (playlist,)
+        )
+    except sqlite3.OperationalError:
+        # built before playlist_picks existed
+        await cursor.execute(
+            "SELECT filename FROM playlists WHERE name = ? ORDER BY random() LIMIT 1",
+            (playlist,),
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+    row = await cursor.fetchone()
+    if not row or row[0] is None:
+        return None
+    await cursor.execute(
+        "SELECT p.filename FROM playlist_picks k JOIN playlists p ON p.id = k.id"
+        " WHERE k.name = ? AND k.position = ?",
+        (playlist, random.randrange(row[0] + 1)),
+    )
+    row = await cursor.fetchone()
+    return row[0] if row else None
@@ -2,31 +2,219 @@
 """Generic XML background processing utilities for DJ software collections"""
 
 import asyncio
+import hashlib
 import logging
 import pathlib
+import re
 import sqlite3
 import time
 import xml.sax
 from collections.abc import Callable
-from typing import Protocol
+from typing import Any, Protocol
+from xml.parsers import expat
 
 import defusedxml.common
 import defusedxml.sax
+import lxml.etree
 
 import nowplaying.utils.sqlite
 
+# rows queued per statement before they are written with executemany
+BATCH_SIZE = 1000
+
+_INSERT_RE = re.compile(r"^INSERT INTO (\w+) \((.*)\) VALUES \((.*)\)$", re.DOTALL)
+
+# bytes read from the XML file and handed to the parser at a time
+CHUNK_SIZE = 1024 * 1024
+
 
 # pylint: disable=missing-function-docstring,invalid-name
 class XMLHandler(Protocol):
     """Protocol for XML SAX handlers"""
 
-    def __init__(self, sqlcursor: sqlite3.Cursor) -> None: ...
+    def __init__(self, sqlcursor: "sqlite3.Cursor | XMLRowWriter") -> None: ...
 
     def startElement(self, name: str, attrs: dict[str, str]) -> None: ...
 
     def endElement(self, name: str) -> None: ...
 
 
+class XMLRowWriter:  # pylint: disable=too-many-instance-attributes
+    """
+    Cursor stand-in handed to the SAX handlers.
+
+    INSERTs are queued and written in batches with executemany.  A batch
+    only ever holds consecutive rows for one statement, so rows land (and
+    get their ids) in document order.  Rows for the fingerprinted table are
+    hashed first: a row that is already in the database from the previous
+    import (``known`` maps fingerprints to their rowids) is left alone, and
+    whatever is not seen again gets deleted by finish().
+    """
+
+    def __init__(
+        self,
+        sqlcursor: sqlite3.Cursor,
+        fingerprint_table: str | None = None,
+        known: dict[str, list[int]] | None = None,
+    ) -> None:
+        self.sqlcursor = sqlcursor
+        self.fingerprint_table = fingerprint_table
+        self.known = known or {}
+        self.kept = 0
+        self.inserted = 0
+        self._pending_sql: str | None = None
+        self._pending: list[tuple[Any, ...]] = []
+        # handler SQL -> the same INSERT with the fingerprint column, or None
+        self._fingerprinted: dict[str, str | None] = {}
+
+    def _fingerprint_sql(self, sql: str) -> str | None:
+        if sql not in self._fingerprinted:
+            match = _INSERT_RE.match(sql.strip())
+            self._fingerprinted[sql] = (
+                f"INSERT INTO {match[1]} ({match[2]}, fingerprint) VALUES ({match[3]}, ?)"
+                if match and match[1] == self.fingerprint_table
+                else None
+            )
+        return self._fingerprinted[sql]
+
+    def execute(self, sql: str, parameters: tuple[Any, ...] = ()) -> None:
+        """queue an INSERT; anything else is run straight away"""
+        if fingerprint_sql := self._fingerprint_sql(sql):
+            fingerprint = hashlib.blake2b(
+                f"{sql}\0{parameters!r}".encode(), digest_size=16
+            ).hexdigest()
+            if rowids := self.known.get(fingerprint):
+                rowids.pop()
+                if not rowids:
+                    del self.known[fingerprint]
+                self.kept += 1
+                return
+            sql, parameters = fingerprint_sql, (*parameters, fingerprint)
+            self.inserted += 1
+        elif not sql.lstrip().upper().startswith("INSERT"):
+            self.flush()
+            self.sqlcursor.execute(sql, parameters)
+            return
+
+        if sql != self._pending_sql:
+            self.flush()
+            self._pending_sql = sql
+        self._pending.append(tuple(parameters))
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """write out everything still queued"""
+        if self._pending:
+            self.sqlcursor.executemany(self._pending_sql, self._pending)
+            self._pending = []
+
+    def finish(self, complete: bool = True) -> int:
+        """
+        flush, then drop the previous import's rows that were not seen again
+
+        After a parse that ended early (complete=False) nothing is dropped:
+        an entry that was not seen may just be past the point it stopped.
+        """
+        self.flush()
+        if not complete:
+            self.known = {}
+            return 0
+        stale = [(rowid,) for rowids in self.known.values() for rowid in rowids]
+        if stale:
+            self.sqlcursor.executemany(
+                f"DELETE FROM {self.fingerprint_table} WHERE rowid = ?", stale
+            )
+        self.known = {}
+        return len(stale)
+
+
+def _forbid_entity_decl(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    name, _is_parameter_entity, value, base, sysid, pubid, notation_name
+):
+    raise defusedxml.common.EntitiesForbidden(name, value, base, sysid, pubid, notation_name)
+
+
+def _forbid_unparsed_entity_decl(name, base, sysid, pubid, notation_name):
+    raise defusedxml.common.EntitiesForbidden(name, None, base, sysid, pubid, notation_name)
+
+
+def _forbid_external_entity_ref(context, base, sysid, pubid):
+    raise defusedxml.common.ExternalReferenceForbidden(context, base, sysid, pubid)
+
+
+def parse_sax(xml_file: pathlib.Path, handler: XMLHandler) -> None:
+    """feed xml_file to handler through defusedxml's SAX driver"""
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(handler)
+    with open(xml_file, "rb") as xmlfile:
+        parser.parse(xmlfile)
+
+
+def parse_expat(xml_file: pathlib.Path, handler: XMLHandler) -> None:
+    """
+    feed xml_file to handler straight from expat, skipping the SAX layer
+
+    Entity declarations and external references are refused the same way
+    defusedxml does.
+    """
+    parser = expat.ParserCreate()
+    parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+    parser.EntityDeclHandler = _forbid_entity_decl
+    parser.UnparsedEntityDeclHandler = _forbid_unparsed_entity_decl
+    parser.ExternalEntityRefHandler = _forbid_external_entity_ref
+    parser.StartElementHandler = handler.startElement
+    parser.EndElementHandler = handler.endElement
+    with open(xml_file, "rb") as xmlfile:
+        while chunk := xmlfile.read(CHUNK_SIZE):
+            parser.Parse(chunk, False)
+    parser.Parse(b"", True)
+
+
+class _LxmlTarget:
+    """lxml parser target that forwards to an XML handler instead of building a tree"""
+
+    def __init__(self, handler: XMLHandler):
+        self.start = handler.startElement
+        self.end = handler.endElement
+
+    @staticmethod
+    def doctype(name: str, pubid: str | None, system: str | None) -> None:
+        """lxml does not report entity declarations, so refuse any DTD at all"""
+        raise defusedxml.common.DTDForbidden(name, system, pubid)
+
+    def close(self) -> None:
+        """nothing to hand back; the handler has written the rows"""
+
+
+def parse_lxml(xml_file: pathlib.Path, handler: XMLHandler) -> None:
+    """feed xml_file to handler through an lxml target parser"""
+    parser = lxml.etree.XMLParser(  # pylint: disable=c-extension-no-member
+        target=_LxmlTarget(handler),
+        resolve_entities=False,
+        no_network=True,
+        load_dtd=False,
+    )
+    with open(xml_file, "rb") as xmlfile:
+        while chunk := xmlfile.read(CHUNK_SIZE):
+            parser.feed(chunk)
+    parser.close()
+
+
+PARSERS: dict[str, Callable[[pathlib.Path, XMLHandler], None]] = {
+    "expat": parse_expat,
+    "lxml": parse_lxml,
+    "sax": parse_sax,
+}
+
+# what each parser raises when the XML breaks off part way through
+PARSE_ERRORS = (
+    xml.sax.SAXParseException,
+    expat.ExpatError,
+    lxml.etree.XMLSyntaxError,  # pylint: disable=c-extension-no-member
+)
+
+
 class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
     """Generic background XML processor with temp database and atomic swap"""
 
@@ -38,7 +226,17 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
         table_schemas: list[str],
         config_key: str,
         config,
+        *,
+        fingerprint_table: str | None = None,
+        index_schemas: list[str] | None = None,
+        parser: str = "expat",
     ):
+        """
+        fingerprint_table is the table re-imported incrementally (only
+        changed entries are written); every other table is re-read in
+        full.  index_schemas are created once the data has been loaded.
+        parser names the entry in PARSERS that reads the XML.
+        """
         self.database_path = database_path
         self.temp_database_path = database_path.with_suffix(".db.tmp")
         self.backup_database_path = database_path.with_suffix(".db.backup")
@@ -47,6 +245,9 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
         self.table_schemas = table_schemas
         self.config_key = config_key
         self.config = config
+        self.fingerprint_table = fingerprint_table
+        self.index_schemas = index_schemas or []
+        self.parser = PARSERS[parser]
         self._shutdown_event = asyncio.Event()
 
     def db_age_days(self) -> float | None:
@@ -72,6 +273,9 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
             f"{self.config_key}/max_age_days", type=int, defaultValue=7
         )
 
+        # An explicit rebuild starts from scratch; an aged-out database only
+        # picks up what changed in the XML since it was imported
+        incremental = not rebuild_requested
         if self.needs_refresh(max_age_days):
             rebuild_requested = True
 
@@ -82,7 +286,9 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
         if not xml_file or not xml_file.exists():
             return
 
-        success = await self.background_refresh(xml_file, self.table_schemas)
+        success = await self.background_refresh(
+            xml_file, self.table_schemas, incremental=incremental
+        )
         if success:
             self.config.cparser.setValue(f"{self.config_key}/rebuild_db", False)
 
@@ -104,13 +310,21 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
             logging.info("Background refresh loop cancelled")
             raise  # Re-raise to properly handle cancellation
 
-    async def background_refresh(self, xml_file: pathlib.Path, table_schemas: list[str]) -> bool:
+    async def background_refresh(
+        self, xml_file: pathlib.Path, table_schemas: list[str], incremental: bool = False
+    ) -> bool:
         """Background refresh with temp database and atomic swap"""
         logging.info("Starting XML database refresh: %s", self.database_path)
         if not xml_file.exists():
             logging.error("XML file (%s) does not exist", xml_file)
             return False
 
+        if incremental and await asyncio.to_thread(self._xml_unchanged, xml_file):
+            logging.info("XML file unchanged since last import, keeping %s", self.database_path)
+            # restart the age clock
+            self.database_path.touch()
+            return True
+
         # Create temp database directory
         self.temp_database_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -120,7 +334,9 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
 
         try:
             # Build temp database using streaming parser
-            await asyncio.to_thread(self._build_temp_database, xml_file, table_schemas)
+            await asyncio.to_thread(
+                self._build_temp_database, xml_file, table_schemas, incremental
+            )
 
             # Atomic swap: rename temp to live
             if self.temp_database_path.exists():
@@ -157,26 +373,98 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
                 self.temp_database_path.unlink()
             raise  # Re-raise unexpected errors
 
-    def _build_temp_database(self, xml_file: pathlib.Path, table_schemas: list[str]) -> None:
-        """Build temporary database using streaming parser"""
-        with nowplaying.utils.sqlite.sqlite_connection(self.temp_database_path) as connection:
-            cursor = connection.cursor()
+    @staticmethod
+    def _xml_signature(xml_file: pathlib.Path) -> tuple[int, int]:
+        stat = xml_file.stat()
+        return stat.st_size, stat.st_mtime_ns
 
+    def _xml_unchanged(self, xml_file: pathlib.Path) -> bool:
+        """True if the live database was imported from this exact XML file"""
+        if not self.database_path.exists():
+            return False
+        try:
+            with nowplaying.utils.sqlite.sqlite_connection(self.database_path) as connection:
+                row = connection.execute("SELECT size, mtime_ns FROM xmlsource").fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None and tuple(row) == self._xml_signature(xml_file)
+
+    def _copy_live_database(self) -> dict[str, list[int]] | None:
+        """
+        Copy the live database to the temp one and return the fingerprints
+        of its entries, or None if it cannot be built on incrementally.
+        """
+        if not self.fingerprint_table or not self.database_path.exists():
+            return None
+        try:
+            with (
+                nowplaying.utils.sqlite.sqlite_connection(self.database_path) as live,
+                nowplaying.utils.sqlite.sqlite_connection(self.temp_database_path) as temp,
+            ):
+                live.backup(temp)
+                temp.execute("SELECT size, mtime_ns FROM xmlsource")
+                rows = temp.execute(
+                    f"SELECT fingerprint, rowid FROM {self.fingerprint_table}"
+                ).fetchall()
+        except sqlite3.Error as err:
+            logging.info("Cannot update %s in place, rebuilding: %s", self.database_path, err)
+            self.temp_database_path.unlink(missing_ok=True)
+            return None
+
+        known: dict[str, list[int]] = {}
+        for fingerprint, rowid in rows:
+            known.setdefault(fingerprint, []).append(rowid)
+        return known
+
+    def _prepare_tables(
+        self, cursor: sqlite3.Cursor, table_schemas: list[str], incremental: bool
+    ) -> None:
+        """create the tables, or for an incremental build empty the re-read ones"""
+        if not incremental:
             # Create tables from schemas (use provided schemas or instance schemas)
             schemas_to_use = table_schemas or self.table_schemas
             for schema in schemas_to_use:
                 cursor.execute(schema)
-            connection.commit()
+            if self.fingerprint_table:
+                columns = cursor.execute(f"PRAGMA table_info({self.fingerprint_table})").fetchall()
+                if "fingerprint" not in {column[1] for column in columns}:
+                    cursor.execute(
+                        f"ALTER TABLE {self.fingerprint_table} ADD COLUMN fingerprint TEXT"
+                    )
+        else:
+            # only the fingerprinted table carries over; the others are re-read
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+                " AND name NOT IN (?, 'xmlsource') AND name NOT LIKE 'sqlite_%'",
+                (self.fingerprint_table,),
+            )
+            for (table,) in cursor.fetchall():
+                cursor.execute(f"DELETE FROM {table}")
+        cursor.execute("CREATE TABLE IF NOT EXISTS xmlsource (size INTEGER, mtime_ns INTEGER)")
+
+    def _build_temp_database(
+        self, xml_file: pathlib.Path, table_schemas: list[str], incremental: bool = False
+    ) -> None:
+        """Build temporary database using streaming parser
+
+        An incremental build starts from a copy of the live database, so
+        only entries that are new or changed since it was imported are
+        written and only the ones that went away are deleted.
+        """
+        known = self._copy_live_database() if incremental else None
+        with nowplaying.utils.sqlite.sqlite_connection(self.temp_database_path) as connection:
+            cursor = connection.cursor()
 
-            # Use streaming SAX parser
-            handler = self.handler_class(cursor)
-            parser = defusedxml.sax.make_parser()
-            parser.setContentHandler(handler)
+            self._prepare_tables(cursor, table_schemas, incremental=known is not None)
+            connection.commit()
 
+            # Use streaming parser
+            writer = XMLRowWriter(cursor, self.fingerprint_table, known)
+            complete = True
             try:
-                with open(xml_file, "rb") as xmlfile:
-                    parser.parse(xmlfile)
-            except xml.sax.SAXParseException as exc:
+                self.parser(xml_file, self.handler_class(writer))
+            except PARSE_ERRORS as exc:
+                complete = False
                 # XML corruption after valid data (common when DJ software crashes)
                 # Parser has already extracted all valid entries before the corruption
                 logging.warning(
@@ -184,9 +472,24 @@ class BackgroundXMLProcessor:  # pylint: disable=too-many-instance-attributes
                 )
                 logging.info("Continuing with parsed data - check logs if entries seem incomplete")
 
-            # Commit whatever data was successfully parsed
+            # Write whatever data was successfully parsed
+            deleted = writer.finish(complete=complete)
+            # after the bulk load, so indexes are built once instead of kept up
+            # to date row by row; an incremental build already has them
+            for schema in self.index_schemas:
+                cursor.execute(schema)
+            cursor.execute("DELETE FROM xmlsource")
+            cursor.execute("INSERT INTO xmlsource VALUES (?, ?)", self._xml_signature(xml_file))
             connection.commit()
 
+        if known is not None:
+            logging.info(
+                "Incremental XML import: %d unchanged, %d new or changed, %d removed",
+                writer.kept,
+                writer.inserted,
+                deleted,
+            )
+
     def _atomic_swap_inner(self) -> None:
         """Inner atomic swap operation for retry logic"""
         # Check if swap already completed
@@ -10,6 +10,7 @@ with just the functionality needed by the nowplaying application.
 
 import asyncio
 import logging
+import re
 import ssl
 import time
 from datetime import datetime, timezone
@@ -22,6 +23,9 @@ import aiohttp
 import nowplaying
 import nowplaying.utils
 
+# What a Wikidata item ID looks like; anything else fails a whole wbgetentities call
+_ENTITY_RE = re.compile(r"^Q\d+$")
+
 
 class WikiRateLimitError(aiohttp.ClientError):
     """Raised when a Wikimedia endpoint returns HTTP 429.
@@ -67,6 +71,10 @@ class AsyncWikiClient:
     _concurrency_semaphore: asyncio.Semaphore = asyncio.Semaphore(3)
     # Used when a 429 arrives without a parseable Retry-After header.
     _DEFAULT_RETRY_AFTER_SECONDS = 60.0
+    # Most ids/titles the MediaWiki APIs take in one request (intro extracts
+    # are capped lower than everything else)
+    _WIKIDATA_BATCH = 50
+    _EXTRACT_BATCH = 20
 
     def __init__(self, timeout: int = 30):
         self.timeout = aiohttp.ClientTimeout(total=timeout)
@@ -193,6 +201,10 @@ class AsyncWikiClient:
         if include_sitelinks:
             props += "|sitelinks"
 
+        if not _ENTITY_RE.match(entity):
+            logging.debug("Not a Wikidata item ID: %r", entity)
+            return {}
+
         params = {"action": "wbgetentities", "ids": entity, "format": "json", "props": props}
 
         data = await self._get_json(url, params)
@@ -203,29 +215,25 @@ class AsyncWikiClient:
         entity_data = self._handle_redirect(data, entity)
         if not entity_data:
             return {}
+        return self._entity_result(entity_data, lang, include_sitelinks)
+
+    @staticmethod
+    def _entity_result(
+        entity_data: dict[str, Any], lang: str, include_sitelinks: bool
+    ) -> dict[str, Any]:
+        """Pull the claims, description and sitelinks we use out of one wbgetentities entity."""
         result = {"claims": {}}
 
         # Extract claims (P434 = MusicBrainz, P1953 = Discogs, P18 = Image)
         if "claims" in entity_data:
             claims = entity_data["claims"]
-            if "P434" in claims:  # MusicBrainz Artist ID
-                result["claims"]["P434"] = [
-                    claim["mainsnak"]["datavalue"]["value"]
-                    for claim in claims["P434"]
-                    if "datavalue" in claim["mainsnak"]
-                ]
-            if "P1953" in claims:  # Discogs Artist ID
-                result["claims"]["P1953"] = [
-                    claim["mainsnak"]["datavalue"]["value"]
-                    for claim in claims["P1953"]
-                    if "datavalue" in claim["mainsnak"]
-                ]
-            if "P18" in claims:  # Image
-                result["claims"]["P18"] = [
-                    claim["mainsnak"]["datavalue"]["value"]
-                    for claim in claims["P18"]
-                    if "datavalue" in claim["mainsnak"]
-                ]
+            for prop in ("P434", "P1953", "P18"):
+                if prop in claims:
+                    result["claims"][prop] = [
+                        claim["mainsnak"]["datavalue"]["value"]
+                        for claim in claims[prop]
+                        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]
+                    ]
 
         # Extract description
         if "descriptions" in entity_data and lang in entity_data["descriptions"]:
@@ -496,6 +504,204 @@ class AsyncWikiClient:
 
         return wiki_page
 
+    async def _get_wikidata_info_singly(
+        self, entities: list[str], lang: str, include_sitelinks: bool
+    ) -> dict[str, dict[str, Any]]:
+        """_get_wikidata_info for each entity in turn, leaving out the ones not found."""
+        results = {}
+        for entity in entities:
+            if info := await self._get_wikidata_info(entity, lang, include_sitelinks):
+                results[entity] = info
+        return results
+
+    async def _get_wikidata_info_batch(
+        self, entities: list[str], lang: str, include_sitelinks: bool
+    ) -> dict[str, dict[str, Any]]:
+        """wbgetentities for many entities, keyed by the ID that was asked for."""
+        url = "https://www.wikidata.org/w/api.php"
+        props = "claims|descriptions"
+        if include_sitelinks:
+            props += "|sitelinks"
+
+        results: dict[str, dict[str, Any]] = {}
+        valid = [entity for entity in entities if _ENTITY_RE.match(entity)]
+        if len(valid) < len(entities):
+            logging.debug(
+                "Not Wikidata item IDs: %s", [entity for entity in entities if entity not in valid]
+            )
+        for start in range(0, len(valid), self._WIKIDATA_BATCH):
+            chunk = valid[start : start + self._WIKIDATA_BATCH]
+            params = {
+                "action": "wbgetentities",
+                "ids": "|".join(chunk),
+                "format": "json",
+                "props": props,
+            }
+            data = await self._get_json(url, params)
+            if "entities" not in data:
+                if len(chunk) > 1:
+                    # One unknown ID fails the whole request; ask for each on its own
+                    # so the others still get their pages
+                    logging.debug("Wikidata rejected a batch of %d, retrying singly", len(chunk))
+                    results |= await self._get_wikidata_info_singly(chunk, lang, include_sitelinks)
+                continue
+            if len(chunk) == 1:
+                if entity_data := self._handle_redirect(data, chunk[0]):
+                    results[chunk[0]] = self._entity_result(entity_data, lang, include_sitelinks)
+                continue
+            for key, entity_data in data["entities"].items():
+                if "missing" in entity_data:
+                    continue
+                # Redirected IDs come back under their target, naming the source
+                asked = entity_data.get("redirects", {}).get("from", key)
+                results[asked] = self._entity_result(entity_data, lang, include_sitelinks)
+        return results
+
+    async def _query_titles_batch(
+        self, lang: str, titles: list[str], params: dict[str, Any], chunksize: int
+    ) -> dict[str, dict[str, Any]]:
+        """Run a Wikipedia prop query over many titles, keyed by the title asked for."""
+        wiki_url = f"https://{lang}.wikipedia.org/w/api.php"
+        results: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(titles), chunksize):
+            chunk = titles[start : start + chunksize]
+            data = await self._get_json(
+                wiki_url, params | {"action": "query", "format": "json", "titles": "|".join(chunk)}
+            )
+            if "query" not in data or "pages" not in data["query"]:
+                continue
+            query = data["query"]
+            # Follow the title through normalization and redirects to the page
+            renames = {
+                entry["from"]: entry["to"]
+                for entry in query.get("normalized", []) + query.get("redirects", [])
+            }
+            pages = {page["title"]: page for page in query["pages"].values() if "title" in page}
+            for title in chunk:
+                final = title
+                for _ in range(3):
+                    if final not in renames:
+                        break
+                    final = renames[final]
+                if final in pages:
+                    results[title] = pages[final]
+        return results
+
+    async def _get_wikipedia_extracts_batch(self, lang: str, titles: list[str]) -> dict[str, str]:
+        """Intro extracts for many Wikipedia pages, keyed by title."""
+        params = {
+            "prop": "extracts",
+            "exintro": "1",
+            "explaintext": "1",
+            "exsectionformat": "plain",
+            "exlimit": "max",
+        }
+        pages = await self._query_titles_batch(lang, titles, params, self._EXTRACT_BATCH)
+        return {title: page["extract"] for title, page in pages.items() if page.get("extract")}
+
+    async def _get_wikipedia_images_batch(
+        self, lang: str, titles: list[str]
+    ) -> dict[str, list[dict[str, str]]]:
+        """pageimages for many Wikipedia pages, keyed by title."""
+        params = {
+            "prop": "pageimages",
+            "piprop": "original|name",
+            "pithumbsize": 500,
+            "pilicense": "any",
+            "pilimit": "max",
+        }
+        pages = await self._query_titles_batch(lang, titles, params, self._WIKIDATA_BATCH)
+        results: dict[str, list[dict[str, str]]] = {}
+        for title, page_data in pages.items():
+            if "original" in page_data:
+                results[title] = [
+                    {"kind": "wikidata-image", "url": page_data["original"]["source"]}
+                ]
+            elif "thumbnail" in page_data:
+                results[title] = [
+                    {"kind": "query-thumbnail", "url": page_data["thumbnail"]["source"]}
+                ]
+        return results
+
+    async def get_pages(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        entities: list[str],
+        lang: str = "en",
+        fetch_bio: bool = True,
+        fetch_images: bool = True,
+        max_images: int = 10,
+    ) -> dict[str, WikiPage]:
+        """Get many Wikipedia pages at once, keyed by Wikidata entity ID.
+
+        Produces the same pages as calling get_page for each entity, but
+        with one request per stage for the whole set (wbgetentities, the
+        Wikipedia extracts, the Commons image URLs, the Wikipedia page
+        images) instead of one request per stage per entity.  Entities
+        Wikidata does not know come back as empty pages.
+
+        Failures follow get_page: the Wikidata lookup raises, the
+        best-effort stages log and leave their data out.
+        """
+        entities = list(dict.fromkeys(entities))
+        include_sitelinks = fetch_bio or fetch_images
+        infos = await self._get_wikidata_info_batch(entities, lang, include_sitelinks)
+
+        pages = {}
+        titles = {}
+        for entity in entities:
+            pages[entity] = WikiPage(entity, lang)
+            info = infos.get(entity, {})
+            pages[entity].data.update(info)
+            if sitelink := info.get("sitelinks", {}).get(f"{lang}wiki"):
+                titles[entity] = sitelink["title"]
+        if not include_sitelinks:
+            return pages
+
+        if fetch_bio and titles:
+            try:
+                extracts = await self._get_wikipedia_extracts_batch(
+                    lang, list(dict.fromkeys(titles.values()))
+                )
+                for entity, title in titles.items():
+                    if extract := extracts.get(title):
+                        pages[entity].data["extext"] = extract
+            except (aiohttp.ClientError, TimeoutError) as error:
+                logging.warning("Wikipedia extract batch fetch failed: %s", error)
+
+        if fetch_images:
+            try:
+                filenames = {
+                    entity: infos.get(entity, {}).get("claims", {}).get("P18", [])
+                    for entity in entities
+                }
+                allfiles = list(
+                    dict.fromkeys(name for names in filenames.values() for name in names)
+                )
+                fileurls: dict[str, str | None] = {}
+                for start in range(0, len(allfiles), self._WIKIDATA_BATCH):
+                    chunk = allfiles[start : start + self._WIKIDATA_BATCH]
+                    urls = await self._get_commons_image_urls_batch(chunk)
+                    fileurls.update(zip(chunk, urls, strict=False))
+                pageimages = (
+                    await self._get_wikipedia_images_batch(
+                        lang, list(dict.fromkeys(titles.values()))
+                    )
+                    if titles
+                    else {}
+                )
+                for entity, page in pages.items():
+                    images = [
+                        {"kind": "wikidata-image", "url": fileurls[name]}
+                        for name in filenames[entity]
+                        if fileurls.get(name)
+                    ]
+                    images += pageimages.get(titles.get(entity, ""), [])
+                    page._images = images[:max_images]  # pylint: disable=protected-access
+            except (aiohttp.ClientError, TimeoutError) as error:
+                logging.warning("Wikipedia image batch fetch failed: %s", error)
+
+        return pages
+
 
 async def get_page_async(  # pylint: disable=too-many-arguments
     entity: str,
@@ -521,3 +727,24 @@ async def get_page_async(  # pylint: disable=too-many-arguments
     """
     async with AsyncWikiClient(timeout=timeout) as client:
         return await client.get_page(entity, lang, need_bio, need_images, max_images)
+
+
+async def get_pages_async(  # pylint: disable=too-many-arguments
+    entities: list[str],
+    lang: str = "en",
+    timeout: int = 5,
+    need_bio: bool = True,
+    need_images: bool = True,
+    max_images: int = 5,
+) -> dict[str, WikiPage]:
+    """
+    Batched get_page_async for several artists at once.
+
+    All of the lookups share one session (and so its keep-alive
+    connections) and are batched per stage; see AsyncWikiClient.get_pages.
+
+    Returns:
+        WikiPage per requested entity ID
+    """
+    async with AsyncWikiClient(timeout=timeout) as client:
+        return await client.get_pages(entities, lang, need_bio, need_images, max_images)
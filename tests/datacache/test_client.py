@@ -5,6 +5,7 @@ Tests the high-level client interface, HTTP fetching,
 rate limiting, and integration with storage.
 """
 
+import asyncio
 import tempfile
 import unittest.mock
 from pathlib import Path
@@ -178,6 +179,46 @@ async def test_get_or_fetch_queues_for_background(temp_client):  # pylint: disab
     assert request["params"]["url"] == "https://example.com/queue.jpg"
 
 
+@pytest.mark.asyncio
+async def test_get_or_fetch_background_class_queues_images(temp_client):  # pylint: disable=redefined-outer-name
+    """background images are queued; background API lookups are still fetched in-line"""
+    with respx.mock(assert_all_called=False) as mock_responses:
+        image_route = mock_responses.get("https://example.com/background.jpg").mock(
+            return_value=httpx.Response(200, content=b"image")
+        )
+        api_route = mock_responses.get("https://api.example.com/artist.json").mock(
+            return_value=httpx.Response(200, json={"artist": "queue_artist"})
+        )
+        with nowplaying.datacache.schedule_as(nowplaying.datacache.CLASS_BACKGROUND):
+            image = await temp_client.get_or_fetch(
+                nowplaying.datacache.FetchRequest(
+                    url="https://example.com/background.jpg",
+                    identifier="queue_artist",
+                    data_type="artistthumbnail",
+                    provider="test",
+                )
+            )
+            lookup = await temp_client.get_or_fetch(
+                nowplaying.datacache.FetchRequest(
+                    url="https://api.example.com/artist.json",
+                    identifier="queue_artist",
+                    data_type="api_response",
+                    provider="test",
+                )
+            )
+
+    assert image is None
+    assert not image_route.called
+    request = await temp_client.queue.get_next_request()
+    assert request is not None
+    assert request["params"]["url"] == "https://example.com/background.jpg"
+
+    assert api_route.called
+    assert lookup is not None
+    assert orjson.loads(lookup.data) == {"artist": "queue_artist"}
+    assert temp_client.served == 2
+
+
 @pytest.mark.asyncio
 async def test_fetch_and_store_json_response(temp_client):  # pylint: disable=redefined-outer-name
     """Test fetching and storing JSON response"""
@@ -564,6 +605,87 @@ async def test_process_queue_all_failed_drains_queue(temp_client):  # pylint: di
     assert next_request is None
 
 
+def _fetch_params(url: str) -> dict:
+    return {"url": url, "identifier": "sched_artist", "data_type": "thumbnail", "retries": 0}
+
+
+@pytest.mark.asyncio
+async def test_process_queue_reserves_a_slot_for_now_playing(  # pylint: disable=redefined-outer-name
+    temp_client, monkeypatch
+):
+    """An on-air request queued mid-run starts while background fetches hold the others."""
+    started: list[str] = []
+    onair_started = asyncio.Event()
+
+    async def _fetch(url, **_kwargs):
+        started.append(url)
+        if "onair" in url:
+            onair_started.set()
+        else:
+            await onair_started.wait()
+        return object()
+
+    monkeypatch.setattr(temp_client, "_fetch_and_store", _fetch)
+    for index in range(3):
+        await temp_client.queue.queue_request(
+            provider=f"host{index}",
+            request_key="fetch_url",
+            params=_fetch_params(f"https://example.com/warm{index}.jpg"),
+            schedule_class=nowplaying.datacache.CLASS_BACKGROUND,
+        )
+
+    processing = asyncio.create_task(temp_client.process_queue(max_concurrent=3))
+    while len(started) < 2:
+        await asyncio.sleep(0.01)
+    await temp_client.queue.queue_request(
+        provider="cdn",
+        request_key="fetch_url",
+        params=_fetch_params("https://example.com/onair.jpg"),
+    )
+
+    stats = await asyncio.wait_for(processing, timeout=10.0)
+    assert started[2] == "https://example.com/onair.jpg"
+    assert stats["processed"] == 4
+    assert stats["succeeded"] == 4
+
+
+@pytest.mark.asyncio
+async def test_process_queue_caps_each_provider(temp_client, monkeypatch):  # pylint: disable=redefined-outer-name
+    """One provider never holds more than its share of the slots."""
+    cap = nowplaying.datacache.client._DEFAULT_PROVIDER_CONCURRENCY  # pylint: disable=protected-access
+    in_flight = 0
+    peak = 0
+    full = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _fetch(**_kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        if in_flight == cap:
+            full.set()
+        await release.wait()
+        in_flight -= 1
+        return object()
+
+    monkeypatch.setattr(temp_client, "_fetch_and_store", _fetch)
+    for index in range(6):
+        await temp_client.queue.queue_request(
+            provider="slowhost",
+            request_key="fetch_url",
+            params=_fetch_params(f"https://slow.example.com/{index}.jpg"),
+        )
+
+    processing = asyncio.create_task(temp_client.process_queue(max_concurrent=10))
+    await asyncio.wait_for(full.wait(), timeout=10.0)
+    assert peak == cap
+    release.set()
+
+    stats = await asyncio.wait_for(processing, timeout=10.0)
+    assert stats["processed"] == 6
+    assert peak == cap
+
+
 @pytest.mark.asyncio
 async def test_rate_limiter_integration(temp_client):  # pylint: disable=redefined-outer-name
     """Test rate limiter is applied during fetch"""
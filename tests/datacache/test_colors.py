@@ -1,5 +1,7 @@
 """Tests for cover art color palette extraction."""
 
+import asyncio
+import concurrent.futures
 import io
 import logging
 import re
@@ -110,10 +112,16 @@ async def test_extract_palettes_still_reports_real_failures(caplog):
     buf = io.BytesIO()
     img.save(buf, "PNG")
 
-    with unittest.mock.patch.object(
-        nowplaying.datacache.colors,
-        "_quantize_candidates",
-        side_effect=ValueError("boom"),
+    # A thread pool in place of the worker processes, so the patch is seen by the
+    # extraction and the failure is still logged on the caller's side.
+    with (
+        concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool,
+        unittest.mock.patch.object(nowplaying.datacache.colors, "_get_pool", return_value=pool),
+        unittest.mock.patch.object(
+            nowplaying.datacache.colors,
+            "_quantize_candidates",
+            side_effect=ValueError("boom"),
+        ),
     ):
         result = await nowplaying.datacache.colors.extract_palettes(buf.getvalue())
 
@@ -121,6 +129,38 @@ async def test_extract_palettes_still_reports_real_failures(caplog):
     assert [r for r in caplog.records if r.levelno >= logging.ERROR]
 
 
+@pytest.mark.asyncio
+async def test_extract_palettes_shares_work_for_identical_images():
+    """Concurrent and repeated requests for the same bytes run one extraction."""
+    data = _make_png((30, 90, 210), size=61)
+    real_run = nowplaying.datacache.colors._run_extraction  # pylint: disable=protected-access
+
+    with unittest.mock.patch.object(
+        nowplaying.datacache.colors, "_run_extraction", side_effect=real_run
+    ) as run:
+        results = await asyncio.gather(
+            *(nowplaying.datacache.colors.extract_palettes(data) for _ in range(3))
+        )
+        again = await nowplaying.datacache.colors.extract_palettes(data)
+
+    assert run.call_count == 1
+    assert results[0]["cover_palette_type"] == "vibrant"
+    assert all(result == results[0] for result in results)
+    assert again == results[0]
+
+
+@pytest.mark.asyncio
+async def test_extract_palettes_does_not_remember_failures():
+    """An image that yielded no palette is tried again on the next request."""
+    with unittest.mock.patch.object(
+        nowplaying.datacache.colors, "_run_extraction", return_value={}
+    ) as run:
+        for _ in range(2):
+            assert await nowplaying.datacache.colors.extract_palettes(b"never an image") == {}
+
+    assert run.call_count == 2
+
+
 def test_color_extract_types_includes_image_types():
     """COLOR_EXTRACT_TYPES covers the expected image data types."""
     expected = {"front_cover", "artistthumbnail", "artistfanart", "artistbanner"}
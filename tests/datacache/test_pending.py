@@ -4,6 +4,7 @@ Unit tests for datacache RequestQueue (pending request queue).
 Tests database-backed queuing, priority ordering, and request completion.
 """
 
+import asyncio
 import tempfile
 from pathlib import Path
 
@@ -144,3 +145,102 @@ async def test_completed_entry_is_not_requeued(temp_queue):  # pylint: disable=r
     assert not await temp_queue.queue_request(
         provider="cdn", request_key="fetch_url", params=params
     )
+
+
+@pytest.mark.asyncio
+async def test_schedule_class_outranks_priority(temp_queue):  # pylint: disable=redefined-outer-name
+    """Anything for the track on air is claimed before any background request."""
+    await temp_queue.queue_request(
+        provider="cdn",
+        request_key="fetch_url",
+        params={"url": "https://example.com/warm.jpg"},
+        priority=1,
+        schedule_class=nowplaying.datacache.pending.CLASS_BACKGROUND,
+    )
+    with nowplaying.datacache.pending.schedule_as(nowplaying.datacache.pending.CLASS_NEXT_UP):
+        await temp_queue.queue_request(
+            provider="cdn",
+            request_key="fetch_url",
+            params={"url": "https://example.com/next.jpg"},
+            priority=2,
+        )
+    await temp_queue.queue_request(
+        provider="cdn",
+        request_key="fetch_url",
+        params={"url": "https://example.com/onair.jpg"},
+        priority=4,
+    )
+
+    order = [(await temp_queue.get_next_request())["params"]["url"] for _ in range(3)]
+    assert order == [
+        "https://example.com/onair.jpg",
+        "https://example.com/next.jpg",
+        "https://example.com/warm.jpg",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_requeue_promotes_pending_request(temp_queue):  # pylint: disable=redefined-outer-name
+    """A prefetched request re-queued for the track on air moves up to its class."""
+    params = {"url": "https://example.com/prefetched.jpg"}
+    await temp_queue.queue_request(
+        provider="cdn",
+        request_key="fetch_url",
+        params=params,
+        schedule_class=nowplaying.datacache.pending.CLASS_NEXT_UP,
+    )
+    await temp_queue.queue_request(
+        provider="cdn",
+        request_key="fetch_url",
+        params={"url": "https://example.com/other-deck.jpg"},
+        schedule_class=nowplaying.datacache.pending.CLASS_NEXT_UP,
+    )
+
+    assert await temp_queue.queue_request(provider="cdn", request_key="fetch_url", params=params)
+    # Promotion only goes one way.
+    assert not await temp_queue.queue_request(
+        provider="cdn",
+        request_key="fetch_url",
+        params=params,
+        schedule_class=nowplaying.datacache.pending.CLASS_BACKGROUND,
+    )
+
+    request = await temp_queue.get_next_request()
+    assert request["params"] == params
+    assert request["schedule_class"] == nowplaying.datacache.pending.CLASS_NOW_PLAYING
+    assert request["deadline"] <= request["created_at"] + 60.0
+
+
+@pytest.mark.asyncio
+async def test_claim_next_filters(temp_queue):  # pylint: disable=redefined-outer-name
+    """claim_next skips excluded providers and classes less urgent than max_class."""
+    await temp_queue.queue_request(
+        provider="busy",
+        request_key="fetch_url",
+        params={"url": "https://busy.example.com/a.jpg"},
+    )
+    await temp_queue.queue_request(
+        provider="idle",
+        request_key="fetch_url",
+        params={"url": "https://idle.example.com/a.jpg"},
+        schedule_class=nowplaying.datacache.pending.CLASS_BACKGROUND,
+    )
+
+    assert not await temp_queue.claim_next(
+        exclude_providers=["busy"], max_class=nowplaying.datacache.pending.CLASS_NOW_PLAYING
+    )
+    request = await temp_queue.claim_next(exclude_providers=["busy"])
+    assert request["provider"] == "idle"
+
+
+@pytest.mark.asyncio
+async def test_queue_request_wakes_waiters(temp_queue):  # pylint: disable=redefined-outer-name
+    """A worker waiting for work wakes as soon as something is queued."""
+    assert not await temp_queue.wait_for_work(timeout=0.01)
+
+    waiter = asyncio.create_task(temp_queue.wait_for_work(timeout=5.0))
+    await asyncio.sleep(0)
+    await temp_queue.queue_request(
+        provider="cdn", request_key="fetch_url", params={"url": "https://example.com/wake.jpg"}
+    )
+    assert await asyncio.wait_for(waiter, timeout=1.0)
@@ -235,3 +235,33 @@ async def test_rate_limiter_different_providers_independent():
     # Should be able to acquire from Discogs
     success = await discogs_limiter.acquire(timeout=0.1)
     assert success is True
+
+
+@pytest.mark.asyncio
+async def test_shared_rate_limiter_paces_across_instances(tmp_path):
+    """limiters in different processes share one budget through the database"""
+    first = nowplaying.datacache.queue.SharedRateLimiter("shared", 10.0, cache_dir=tmp_path)
+    second = nowplaying.datacache.queue.SharedRateLimiter("shared", 10.0, cache_dir=tmp_path)
+    other = nowplaying.datacache.queue.SharedRateLimiter("other", 10.0, cache_dir=tmp_path)
+
+    start_time = time.monotonic()
+    for limiter in (first, second, first, second):
+        assert await limiter.acquire(timeout=1.0)
+    elapsed = time.monotonic() - start_time
+
+    # four requests at 10/sec: the last may not go out before 0.3s
+    assert elapsed >= 0.25
+    other_start = time.monotonic()
+    assert await other.acquire(timeout=1.0)
+    assert time.monotonic() - other_start < 0.1
+
+
+@pytest.mark.asyncio
+async def test_shared_rate_limiter_timeout(tmp_path):
+    """a slot further away than the timeout is not reserved"""
+    limiter = nowplaying.datacache.queue.SharedRateLimiter("slow", 1.0, cache_dir=tmp_path)
+
+    assert await limiter.acquire(timeout=0.1)
+    start_time = time.monotonic()
+    assert await limiter.acquire(timeout=0.1) is False
+    assert time.monotonic() - start_time < 0.5
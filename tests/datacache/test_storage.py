@@ -5,13 +5,19 @@ Tests the core URL-based storage functionality, database schema,
 and randomimage support.
 """
 
+# pylint: disable=too-many-lines
+
 import asyncio
+import io
+import os
 import tempfile
 import time
 import unittest.mock
 from pathlib import Path
 
+import aiosqlite
 import orjson
+import PIL.Image
 import pytest
 import pytest_asyncio
 
@@ -342,6 +348,117 @@ async def test_retrieve_by_identifier_random(temp_storage):  # pylint: disable=r
     assert random_result.url in urls
 
 
+@pytest.mark.asyncio
+async def test_random_shuffle_shows_every_image_before_repeating(temp_storage):  # pylint: disable=redefined-outer-name
+    """shuffle=True walks all candidates once per pass, never the same one twice in a row"""
+    urls = [f"https://example.com/shuffle{i}.jpg" for i in range(4)]
+    for i, url in enumerate(urls):
+        await temp_storage.store(
+            url=url,
+            identifier="shuffle_artist",
+            data_type="thumbnail",
+            provider="test",
+            data_value=f"shuffle_data_{i}".encode(),
+            ttl_seconds=3600,
+        )
+
+    picks = []
+    for _ in range(3 * len(urls)):
+        result = await temp_storage.retrieve_by_identifier(
+            identifier="shuffle_artist", data_type="thumbnail", random=True, shuffle=True
+        )
+        assert result is not None
+        picks.append(result.url)
+
+    for start in range(0, len(picks), len(urls)):
+        assert sorted(picks[start : start + len(urls)]) == sorted(urls)
+    assert all(first != second for first, second in zip(picks, picks[1:]))
+
+
+@pytest.mark.asyncio
+async def test_random_candidates_follow_stores_and_deletes(temp_storage):  # pylint: disable=redefined-outer-name
+    """The cached candidate list picks up new rows and drops removed ones"""
+    await temp_storage.store(
+        url="https://example.com/first.jpg",
+        identifier="changing_artist",
+        data_type="thumbnail",
+        provider="test",
+        data_value=b"first",
+        ttl_seconds=3600,
+    )
+    result = await temp_storage.retrieve_by_identifier(
+        identifier="changing_artist", data_type="thumbnail", random=True
+    )
+    assert result is not None and result.data == b"first"
+
+    # Written through another connection, as the datacache worker process would
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        conn.execute("DELETE FROM cached_data WHERE url = ?", ("https://example.com/first.jpg",))
+    await temp_storage.store(
+        url="https://example.com/second.jpg",
+        identifier="changing_artist",
+        data_type="thumbnail",
+        provider="test",
+        data_value=b"second",
+        ttl_seconds=3600,
+    )
+
+    for _ in range(5):
+        result = await temp_storage.retrieve_by_identifier(
+            identifier="changing_artist", data_type="thumbnail", random=True
+        )
+        assert result is not None and result.data == b"second"
+
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        conn.execute("DELETE FROM cached_data")
+    assert (
+        await temp_storage.retrieve_by_identifier(
+            identifier="changing_artist", data_type="thumbnail", random=True
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_random_skips_rows_that_expired_in_place(temp_storage):  # pylint: disable=redefined-outer-name
+    """A cached rowid whose row has since expired is never returned"""
+    for name in ("stale", "fresh"):
+        await temp_storage.store(
+            url=f"https://example.com/{name}.jpg",
+            identifier="expiring_artist",
+            data_type="thumbnail",
+            provider="test",
+            data_value=name.encode(),
+            ttl_seconds=3600,
+        )
+    assert await temp_storage.retrieve_by_identifier(
+        identifier="expiring_artist", data_type="thumbnail", random=True
+    )
+
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        expiry = conn.execute(
+            "SELECT expires_at FROM cached_data WHERE url = ?",
+            ("https://example.com/stale.jpg",),
+        ).fetchone()[0]
+        conn.execute(
+            "UPDATE cached_data SET expires_at = expires_at + 7200 WHERE url = ?",
+            ("https://example.com/fresh.jpg",),
+        )
+    # The UPDATE above bumped the generation; pick once so the list is reloaded,
+    # then move the clock past the stale row's expiry without touching the table.
+    assert await temp_storage.retrieve_by_identifier(
+        identifier="expiring_artist", data_type="thumbnail", random=True
+    )
+    with unittest.mock.patch.object(
+        nowplaying.datacache.storage.time, "time", return_value=expiry + 1
+    ):
+        for _ in range(5):
+            result = await temp_storage.retrieve_by_identifier(
+                identifier="expiring_artist", data_type="thumbnail", random=True
+            )
+            assert result is not None and result.data == b"fresh"
+
+
 @pytest.mark.asyncio
 async def test_retrieve_by_identifier_with_provider_filter(temp_storage):  # pylint: disable=redefined-outer-name
     """Test identifier retrieval with provider filtering"""
@@ -489,6 +606,239 @@ async def test_inline_vs_file_threshold(temp_storage):  # pylint: disable=redefi
     assert large_result is not None and large_result.data == large_data
 
 
+def _blob_files(storage) -> list[Path]:
+    """Every blob file on disk under the storage's cache directory."""
+    return sorted((storage.database_path.parent / "blobs").rglob("*.bin"))
+
+
+def _noisy_png() -> bytes:
+    """A real PNG that does not compress below the inline threshold."""
+    buffer = io.BytesIO()
+    PIL.Image.frombytes("RGB", (120, 120), os.urandom(120 * 120 * 3)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_identical_content_shares_one_blob(temp_storage):  # pylint: disable=redefined-outer-name
+    """The same bytes under two URLs are written once and kept until both rows go"""
+    large_data = b"y" * (16 * 1024 + 1)
+    for url in ("https://mirror-a.example.com/img", "https://mirror-b.example.com/img"):
+        await temp_storage.store(
+            url=url,
+            identifier="test",
+            data_type="image",
+            provider="test",
+            data_value=large_data,
+            ttl_seconds=3600,
+        )
+
+    assert len(_blob_files(temp_storage)) == 1
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        assert conn.execute("SELECT refcount FROM blob_files").fetchall() == [(2,)]
+
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        conn.execute(
+            "UPDATE cached_data SET expires_at = 0 WHERE url = ?",
+            ("https://mirror-a.example.com/img",),
+        )
+    assert await temp_storage.cleanup_expired() == 1
+
+    # The surviving row still owns the shared file
+    assert len(_blob_files(temp_storage)) == 1
+    result = await temp_storage.retrieve_by_url("https://mirror-b.example.com/img")
+    assert result is not None and result.data == large_data
+
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        conn.execute("UPDATE cached_data SET expires_at = 0")
+    assert await temp_storage.cleanup_expired() == 1
+    assert not _blob_files(temp_storage)
+
+
+@pytest.mark.asyncio
+async def test_restore_with_new_content_releases_old_blob(temp_storage):  # pylint: disable=redefined-outer-name
+    """Re-storing a URL with different bytes drops the reference to the old file"""
+    url = "https://example.com/changing"
+    await temp_storage.store(
+        url=url,
+        identifier="test",
+        data_type="image",
+        provider="test",
+        data_value=b"a" * (16 * 1024 + 1),
+        ttl_seconds=3600,
+    )
+    await temp_storage.store(
+        url=url,
+        identifier="test",
+        data_type="image",
+        provider="test",
+        data_value=b"b" * (16 * 1024 + 1),
+        ttl_seconds=3600,
+    )
+
+    assert await temp_storage.sweep_blobs() == 1
+    assert len(_blob_files(temp_storage)) == 1
+    result = await temp_storage.retrieve_by_url(url)
+    assert result is not None and result.data == b"b" * (16 * 1024 + 1)
+
+
+@pytest.mark.asyncio
+async def test_evict_lfu_counts_shared_blobs_once(temp_storage):  # pylint: disable=redefined-outer-name
+    """Duplicate images count once toward the size limit and evict as one file"""
+    image = _noisy_png()
+    assert len(image) > 16 * 1024
+    for url in ("https://a.example.com/fanart.png", "https://b.example.com/fanart.png"):
+        await temp_storage.store(
+            url=url,
+            identifier="test",
+            data_type="artistfanart",
+            provider="test",
+            data_value=image,
+            ttl_seconds=3600,
+        )
+
+    # Real disk use is one copy, so a limit between one and two copies evicts nothing
+    assert await temp_storage.evict_lfu(size_limit_bytes=len(image) + 1) == 0
+    assert len(_blob_files(temp_storage)) == 1
+
+    # Getting under a smaller limit needs both references gone, and only then the file
+    assert await temp_storage.evict_lfu(size_limit_bytes=len(image) - 1) == 2
+    assert not _blob_files(temp_storage)
+
+
+@pytest.mark.asyncio
+async def test_cache_size_counters_follow_stores_and_deletes(temp_storage):  # pylint: disable=redefined-outer-name
+    """cache_sizes tracks inline and blob bytes per type through upserts and deletes"""
+    await temp_storage.store(
+        url="https://example.com/api",
+        identifier="test",
+        data_type="api_response",
+        provider="test",
+        data_value=b"x" * 100,
+        ttl_seconds=3600,
+    )
+    image = _noisy_png()
+    await temp_storage.store(
+        url="https://example.com/fanart.png",
+        identifier="test",
+        data_type="artistfanart",
+        provider="test",
+        data_value=image,
+        ttl_seconds=3600,
+    )
+    assert await temp_storage.get_cache_size(["api_response"]) == 100
+    assert await temp_storage.get_cache_size(["artistfanart"]) == len(image)
+    assert await temp_storage.get_cache_size() == 100 + len(image)
+
+    # Re-storing a URL replaces its bytes in the count rather than adding to them
+    await temp_storage.store(
+        url="https://example.com/api",
+        identifier="test",
+        data_type="api_response",
+        provider="test",
+        data_value=b"x" * 40,
+        ttl_seconds=3600,
+    )
+    assert await temp_storage.get_cache_size(["api_response"]) == 40
+
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        conn.execute("UPDATE cached_data SET expires_at = 0")
+    await temp_storage.cleanup_expired()
+    assert await temp_storage.get_cache_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_evict_lfu_walks_in_batches(temp_storage):  # pylint: disable=redefined-outer-name
+    """Eviction spans several small batches and removes the least used entries first"""
+    images = [_noisy_png() for _ in range(5)]
+    for index, image in enumerate(images):
+        await temp_storage.store(
+            url=f"https://example.com/fanart{index}.png",
+            identifier="test",
+            data_type="artistfanart",
+            provider="test",
+            data_value=image,
+            ttl_seconds=3600,
+        )
+    with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+        for index in range(5):
+            conn.execute(
+                "UPDATE cached_data SET access_count = ? WHERE url = ?",
+                (10 - index, f"https://example.com/fanart{index}.png"),
+            )
+
+    limit = len(images[0]) + len(images[1])
+    with unittest.mock.patch.object(nowplaying.datacache.storage, "_EVICT_BATCH", 2):
+        assert await temp_storage.evict_lfu(size_limit_bytes=limit) == 3
+
+    assert await temp_storage.get_cache_size(["artistfanart"]) <= limit
+    for index in range(5):
+        result = await temp_storage.retrieve_by_url(f"https://example.com/fanart{index}.png")
+        assert (result is not None) == (index < 2)
+    assert len(_blob_files(temp_storage)) == 2
+
+
+@pytest.mark.asyncio
+async def test_palette_write_waits_for_write_lock(temp_storage):  # pylint: disable=redefined-outer-name
+    """a palette that arrives while another writer holds the lock is stored once it lets go"""
+    url = "https://example.com/fanart.png"
+    with unittest.mock.patch.object(temp_storage, "_extract_and_store_colors"):
+        entry = await temp_storage.store(
+            url=url,
+            identifier="test",
+            data_type="artistfanart",
+            provider="test",
+            data_value=_noisy_png(),
+            ttl_seconds=3600,
+        )
+    palette = {"cover_palette": ["#000000"]}
+
+    async with aiosqlite.connect(str(temp_storage.database_path)) as blocker:
+        await blocker.execute("BEGIN IMMEDIATE")
+        with unittest.mock.patch.object(
+            nowplaying.datacache.storage,
+            "extract_palettes",
+            unittest.mock.AsyncMock(return_value=palette),
+        ):
+            colors = asyncio.create_task(
+                temp_storage._extract_and_store_colors(url, entry.data, entry.checksum)  # pylint: disable=protected-access
+            )
+            await asyncio.sleep(0.3)
+            assert not colors.done()
+        await blocker.commit()
+        await colors
+
+    result = await temp_storage.retrieve_by_url(url)
+    assert result.color_palette == palette
+
+
+def test_schema_backfills_blob_references_for_existing_rows():
+    """A cache written before blob_files existed gets its references and sizes counted"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "datacache.sqlite"
+        nowplaying.datacache.utils.ensure_datacache_schema(db_path)
+        with nowplaying.utils.sqlite.sqlite_connection(str(db_path)) as conn:
+            conn.execute("DROP TRIGGER blob_ref_insert")
+            conn.execute("DROP TRIGGER cache_size_insert")
+            conn.execute("DROP TABLE blob_files")
+            conn.execute(
+                """
+                INSERT INTO cached_data
+                (url, identifier, data_type, provider, file_path,
+                 created_at, expires_at, last_accessed, data_size)
+                VALUES ('https://example.com/legacy.jpg', 'test', 'thumbnail', 'test',
+                        'blobs/ab/cd/legacy.bin', 0, 0, 0, 42)
+                """
+            )
+
+        nowplaying.datacache.utils.ensure_datacache_schema(db_path)
+
+        with nowplaying.utils.sqlite.sqlite_connection(str(db_path)) as conn:
+            rows = conn.execute("SELECT file_path, refcount, data_size FROM blob_files").fetchall()
+            sizes = conn.execute("SELECT data_type, total_size FROM cache_sizes").fetchall()
+        assert rows == [("blobs/ab/cd/legacy.bin", 1, 42)]
+        assert sizes == [("thumbnail", 42)]
+
+
 @pytest.mark.asyncio
 async def test_cleanup_expired(temp_storage):  # pylint: disable=redefined-outer-name
     """Test cleanup of expired entries"""
@@ -902,7 +1252,7 @@ async def test_negative_cache_skips_color_extraction(temp_storage):  # pylint: d
     every provider miss.
 
     Asserts on the call rather than on log output: extraction runs in a task that
-    hands off to asyncio.to_thread, so nothing a test can await reliably reaches its
+    hands off to a worker process, so nothing a test can await reliably reaches its
     logging, and the failure message does not contain the word this once matched on.
     """
     with unittest.mock.patch.object(
@@ -938,3 +1288,75 @@ async def test_real_content_does_get_color_extraction(temp_storage):  # pylint:
         )
         await asyncio.sleep(0)
         extract.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_color_palette_reused_for_identical_content(temp_storage):  # pylint: disable=redefined-outer-name
+    """Bytes already analysed under another URL get that palette, not a new extraction."""
+    palette = {
+        "cover_palette": "#c82832",
+        "cover_palette_lighting": "#c82832",
+        "cover_palette_type": "vibrant",
+    }
+    urls = ("https://a.example.com/cover.png", "https://b.example.com/cover.png")
+    with (
+        unittest.mock.patch.object(
+            temp_storage, "_extract_and_store_colors", unittest.mock.AsyncMock()
+        ),
+        unittest.mock.patch(
+            "nowplaying.datacache.storage.extract_palettes",
+            unittest.mock.AsyncMock(return_value=palette),
+        ) as extract,
+    ):
+        entries = [
+            await temp_storage.store(
+                url=url,
+                identifier="wnpmockartist",
+                data_type="front_cover",
+                provider="test",
+                data_value=COVER_PNG,
+                ttl_seconds=3600,
+            )
+            for url in urls
+        ]
+        unpatched = type(temp_storage)._extract_and_store_colors  # pylint: disable=protected-access
+        for url, entry in zip(urls, entries):
+            await unpatched(temp_storage, url, COVER_PNG, entry.checksum)
+
+    extract.assert_awaited_once()
+    for url in urls:
+        assert (await temp_storage.retrieve_by_url(url)).color_palette == palette
+
+
+@pytest.mark.asyncio
+async def test_restore_with_new_content_drops_color_palette(temp_storage):  # pylint: disable=redefined-outer-name
+    """A palette describes the bytes, so it survives a re-store only if they are unchanged."""
+    url = "https://example.com/cover.png"
+    palette = {"cover_palette": "#c82832", "cover_palette_type": "vibrant"}
+
+    async def _store(data_value: bytes) -> None:
+        await temp_storage.store(
+            url=url,
+            identifier="wnpmockartist",
+            data_type="front_cover",
+            provider="test",
+            data_value=data_value,
+            ttl_seconds=3600,
+        )
+
+    with unittest.mock.patch.object(
+        temp_storage, "_extract_and_store_colors", unittest.mock.AsyncMock()
+    ):
+        await _store(COVER_PNG)
+        with nowplaying.utils.sqlite.sqlite_connection(str(temp_storage.database_path)) as conn:
+            conn.execute(
+                "UPDATE cached_data SET color_palette = ? WHERE url = ?",
+                (orjson.dumps(palette).decode(), url),
+            )
+            conn.commit()
+
+        await _store(COVER_PNG)
+        assert (await temp_storage.retrieve_by_url(url)).color_palette == palette
+
+        await _store(COVER_JPEG)
+        assert (await temp_storage.retrieve_by_url(url)).color_palette is None
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""test acoustid fingerprint and lookup caching (no network)"""
+
+# pylint: disable=protected-access
+import json
+import os
+import pathlib
+import sys
+import unittest.mock
+
+import pytest
+
+import nowplaying.recognition.acoustid  # pylint: disable=import-error
+
+FINGERPRINT = {"fingerprint": "AQADtEmUaEkSRZEGAAAAAA", "duration": 215.0}
+LOOKUP_REPLY = {
+    "status": "ok",
+    "results": [
+        {
+            "id": "4ba8faaf-cc17-4a38-8e35-9b21889e4001",
+            "score": 0.95,
+            "recordings": [
+                {
+                    "id": "b366689f-4b81-4f1f-974b-3dff361d45a1",
+                    "releases": [
+                        {
+                            "id": "b79afe7c-7f2c-4516-a8bf-e34efa290c54",
+                            "title": "1 Giant Leap",
+                            "mediums": [
+                                {
+                                    "tracks": [
+                                        {
+                                            "title": "My Culture",
+                                            "artists": ["1 Giant Leap"],
+                                        }
+                                    ]
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+    ],
+}
+
+
+@pytest.fixture
+def acoustidplugin(bootstrap):
+    """plugin with acoustid on and musicbrainz off"""
+    config = bootstrap
+    config.cparser.setValue("acoustidmb/enabled", True)
+    config.cparser.setValue("acoustidmb/acoustidapikey", "testkey")
+    config.cparser.setValue("musicbrainz/enabled", False)
+    plugin = nowplaying.recognition.acoustid.Plugin(config=config)
+    with unittest.mock.patch.object(plugin, "_configure_fpcalc", return_value=True):
+        yield plugin
+
+
+@pytest.fixture
+def trackfile(tmp_path):
+    """a file for recognize() to stat"""
+    filename = tmp_path / "track.mp3"
+    filename.write_bytes(b"\x00" * 1024)
+    return filename
+
+
+@pytest.mark.asyncio
+async def test_repeat_recognize_uses_cache(
+    acoustidplugin,  # pylint: disable=redefined-outer-name
+    trackfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """an unchanged file is neither re-fingerprinted nor looked up again"""
+    with (
+        unittest.mock.patch.object(acoustidplugin, "_fpcalc", return_value=FINGERPRINT) as fpcalc,
+        unittest.mock.patch.object(acoustidplugin, "_lookup", return_value=LOOKUP_REPLY) as lookup,
+    ):
+        first = await acoustidplugin.recognize({"filename": str(trackfile)})
+        second = await acoustidplugin.recognize({"filename": str(trackfile)})
+
+    assert fpcalc.await_count == 1
+    assert lookup.await_count == 1
+    assert first["title"] == "My Culture"
+    assert second["title"] == "My Culture"
+    assert second["musicbrainzrecordingid"] == "b366689f-4b81-4f1f-974b-3dff361d45a1"
+
+
+@pytest.mark.asyncio
+async def test_modified_file_is_fingerprinted_again(
+    acoustidplugin,  # pylint: disable=redefined-outer-name
+    trackfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """a new mtime means a new cache key"""
+    with (
+        unittest.mock.patch.object(acoustidplugin, "_fpcalc", return_value=FINGERPRINT) as fpcalc,
+        unittest.mock.patch.object(acoustidplugin, "_lookup", return_value=LOOKUP_REPLY),
+    ):
+        await acoustidplugin.recognize({"filename": str(trackfile)})
+        stat = trackfile.stat()
+        os.utime(trackfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        await acoustidplugin.recognize({"filename": str(trackfile)})
+
+    assert fpcalc.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_no_match_is_negatively_cached(
+    acoustidplugin,  # pylint: disable=redefined-outer-name
+    trackfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """an empty AcoustID answer is remembered; a failed request is not"""
+    with (
+        unittest.mock.patch.object(acoustidplugin, "_fpcalc", return_value=FINGERPRINT),
+        unittest.mock.patch.object(
+            acoustidplugin, "_lookup", return_value={"status": "ok", "results": []}
+        ) as lookup,
+    ):
+        await acoustidplugin.recognize({"filename": str(trackfile)})
+        metadata = await acoustidplugin.recognize({"filename": str(trackfile)})
+
+    assert lookup.await_count == 1
+    assert not metadata.get("musicbrainzrecordingid")
+
+    otherfile = trackfile.with_name("other.mp3")
+    otherfile.write_bytes(b"\x01" * 1024)
+    with (
+        unittest.mock.patch.object(acoustidplugin, "_fpcalc", return_value=FINGERPRINT),
+        unittest.mock.patch.object(acoustidplugin, "_lookup", return_value=None) as lookup,
+    ):
+        await acoustidplugin.recognize({"filename": str(otherfile)})
+        await acoustidplugin.recognize({"filename": str(otherfile)})
+
+    assert lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as fpcalc")
+async def test_fpcalc_runs_as_subprocess(
+    acoustidplugin,  # pylint: disable=redefined-outer-name
+    trackfile,  # pylint: disable=redefined-outer-name
+    tmp_path,
+    monkeypatch,
+):
+    """_fpcalc reads fpcalc's JSON without blocking the loop"""
+    fakefpcalc = tmp_path / "fpcalc"
+    fakefpcalc.write_text(f"#!/bin/sh\necho '{json.dumps(FINGERPRINT)}'\n", encoding="utf-8")
+    fakefpcalc.chmod(0o755)
+    monkeypatch.setenv("FPCALC", str(fakefpcalc))
+
+    assert await acoustidplugin._fpcalc(str(trackfile)) == FINGERPRINT
+
+    failing = tmp_path / "fpcalc-fail"
+    failing.write_text("#!/bin/sh\necho nope >&2\nexit 3\n", encoding="utf-8")
+    failing.chmod(0o755)
+    monkeypatch.setenv("FPCALC", str(failing))
+
+    assert await acoustidplugin._fpcalc(str(pathlib.Path(trackfile))) is None
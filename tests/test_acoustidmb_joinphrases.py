@@ -42,12 +42,14 @@ async def test_join_phrases_multiartist(getacoustidplugin):  # pylint: disable=r
     with open(joinphrases_file, encoding="utf-8") as json_file:
         mock_acoustid_response = json.load(json_file)
 
-    # Mock both fpcalc and acoustid.lookup to return our test data
+    # Mock both fpcalc and the AcoustID lookup to return our test data
     with (
         unittest.mock.patch(
             "nowplaying.recognition.acoustid.Plugin._fpcalc", return_value=mock_fingerprint
         ),
-        unittest.mock.patch("acoustid.lookup", return_value=mock_acoustid_response),
+        unittest.mock.patch(
+            "nowplaying.recognition.acoustid.Plugin._lookup", return_value=mock_acoustid_response
+        ),
     ):
         metadata = await plugin.recognize({"filename": "test_multiartist.m4a"})
 
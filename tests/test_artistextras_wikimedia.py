@@ -910,3 +910,58 @@ async def test_wikimedia_failure_cache(bootstrap):  # pylint: disable=redefined-
 
     finally:
         nowplaying.wikiclient.get_page_async = original_get_page
+
+
+@pytest.mark.asyncio
+async def test_wikimedia_multi_artist_batch(bootstrap):  # pylint: disable=redefined-outer-name
+    """test that every artist on a track is fetched in one batch and cached"""
+
+    config = bootstrap
+    configuresettings("wikimedia", config.cparser)
+    plugins = configureplugins(config)
+
+    plugin = plugins["wikimedia"]
+
+    metadata = {
+        "artist": "WNP Mock Artist & WNP Other Mock",
+        "imagecacheartist": "wnpmockartistwnpothermock",
+        "artistwebsites": [
+            "https://www.wikidata.org/wiki/Q00000002",
+            "https://www.wikidata.org/wiki/Q00000003",
+        ],
+    }
+
+    original_get_page = nowplaying.wikiclient.get_page_async
+    original_get_pages = nowplaying.wikiclient.get_pages_async
+    batches = []
+
+    async def mock_get_page_async(*args, **kwargs):  # pylint: disable=unused-argument
+        raise AssertionError("multi-artist tracks should not fetch entities one at a time")
+
+    async def mock_get_pages_async(entities, **kwargs):  # pylint: disable=unused-argument
+        batches.append(list(entities))
+        pages = {}
+        for entity in entities:
+            pages[entity] = nowplaying.wikiclient.WikiPage(entity=entity, lang="en")
+            pages[entity].data = {
+                "claims": {"P434": [f"mbid-{entity}"]},
+                "extext": f"{entity} is a fictional band used for unit testing",
+            }
+        return pages
+
+    nowplaying.wikiclient.get_page_async = mock_get_page_async
+    nowplaying.wikiclient.get_pages_async = mock_get_pages_async
+
+    try:
+        result1 = await plugin.download_async(metadata.copy())
+        assert batches == [["Q00000002", "Q00000003"]]
+        assert result1["musicbrainzartistid"] == ["mbid-Q00000003"]
+        assert result1["artistlongbio"] == "Q00000003 is a fictional band used for unit testing"
+
+        # Both entities were cached from the one batch
+        result2 = await plugin.download_async(metadata.copy())
+        assert len(batches) == 1
+        assert result1 == result2
+    finally:
+        nowplaying.wikiclient.get_page_async = original_get_page
+        nowplaying.wikiclient.get_pages_async = original_get_pages
@@ -106,6 +106,43 @@ async def test_idempotent_record(tmpbiohistory):  # pylint: disable=redefined-ou
     assert await tmpbiohistory.has_been_shown("Madonna") is True
 
 
+@pytest.mark.asyncio
+async def test_lookups_stay_in_memory(tmpbiohistory):  # pylint: disable=redefined-outer-name
+    """has_been_shown never opens the database."""
+    await tmpbiohistory.record_shown("Madonna", "mbid-madonna", "bio", track=("Madonna", "Vogue"))
+    await tmpbiohistory.flush()
+    with unittest.mock.patch.object(
+        nowplaying.metadata.biohistory.aiosqlite, "connect", side_effect=AssertionError
+    ):
+        assert await tmpbiohistory.has_been_shown("madonna") is True
+        assert await tmpbiohistory.has_been_shown("Someone", "mbid-madonna") is True
+        assert await tmpbiohistory.has_been_shown("Madonna", None, ("Madonna", "Vogue")) is False
+        assert await tmpbiohistory.has_been_shown("Prince") is False
+
+
+@pytest.mark.asyncio
+async def test_history_written_back_and_reloaded(bootstrap, tmp_path):  # pylint: disable=redefined-outer-name,unused-argument
+    """Background writes land in the database and a new instance loads them."""
+    db_path = tmp_path / "artistbio" / "artistbio.db"
+    with unittest.mock.patch.object(
+        nowplaying.metadata.biohistory.ArtistBioHistory,
+        "_get_database_path",
+        return_value=db_path,
+    ):
+        history = nowplaying.metadata.biohistory.ArtistBioHistory("session-a")
+        await history.record_shown("Madonna", "mbid-madonna", "bio", track=("Madonna", "Vogue"))
+        await history.record_shown("Prince", None, "bio", track=("Prince", "Kiss"))
+        await history.flush()
+
+        reloaded = nowplaying.metadata.biohistory.ArtistBioHistory("session-a")
+        other = nowplaying.metadata.biohistory.ArtistBioHistory("session-b")
+
+    assert await reloaded.has_been_shown("Someone", "mbid-madonna") is True
+    assert await reloaded.has_been_shown("PRINCE") is True
+    assert await reloaded.has_been_shown("Prince", None, ("Prince", "Kiss")) is False
+    assert await other.has_been_shown("Madonna") is False
+
+
 # ── MetadataProcessors bio dedup integration tests ───────────────────────────
 
 
@@ -253,6 +253,29 @@ async def test_data_previoustrack(bootstrap):
     assert readdata["previoustrack"][1] == {"artist": "a2", "title": "t2"}
 
 
+@pytest.mark.asyncio
+async def test_update_last_meta(bootstrap):
+    """late details land on the newest record without adding a track"""
+    metadb = nowplaying.db.MetadataDB(databasefile=bootstrap.dbtestfile, initialize=True)
+    await metadb.write_to_metadb(metadata={"artist": "a0", "title": "t0"})
+    await metadb.write_to_metadb(metadata={"artist": "a1", "title": "t1"})
+
+    await metadb.update_last_meta_async(
+        {"artist": "a1", "title": "t1", "artistlongbio": "late bio"}
+    )
+    # a straggler for a track that is no longer the newest changes nothing
+    await metadb.update_last_meta_async(
+        {"artist": "a0", "title": "t0", "artistlongbio": "too late"}
+    )
+
+    readdata = await metadb.read_last_meta_async()
+    assert readdata["artistlongbio"] == "late bio"
+    assert readdata["previoustrack"] == [
+        {"artist": "a1", "title": "t1"},
+        {"artist": "a0", "title": "t0"},
+    ]
+
+
 ## NOTE: these don't check content, just make sure
 ## there are no crashes
 
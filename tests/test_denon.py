@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Tests for Denon DJ StagelinQ input plugin"""
-# pylint: disable=protected-access,redefined-outer-name
+# pylint: disable=protected-access,redefined-outer-name,too-many-lines
 
 import asyncio
 import struct
@@ -482,6 +482,35 @@ async def test_get_all_decks_includes_paused(denon_plugin):
     assert track["artist"] == "Playing Artist"
 
 
+@pytest.mark.asyncio
+async def test_getupcomingtracks_lists_cued_decks(denon_plugin):
+    """Test cued decks are offered for prefetch, minus the audible one and skipped decks"""
+    processor = denon_plugin.metadata_processor
+    processor.register_device(_make_test_device(DEVICE_TOKEN_1))
+    _feed_states(
+        processor,
+        DEVICE_TOKEN_1,
+        {
+            "/Engine/Deck1/Play": {"state": True},
+            "/Engine/Deck1/Track/ArtistName": {"string": "Playing Artist"},
+            "/Engine/Deck1/Track/SongName": {"string": "Playing Song"},
+            "/Engine/Deck2/Play": {"state": False},
+            "/Engine/Deck2/Track/ArtistName": {"string": "Cued Artist"},
+            "/Engine/Deck2/Track/SongName": {"string": "Cued Song"},
+            "/Engine/Deck2/Track/AlbumName": {"string": "Cued Album"},
+            "/Engine/Deck3/Play": {"state": False},
+            "/Engine/Deck3/Track/ArtistName": {"string": "Skipped Artist"},
+            "/Engine/Deck3/Track/SongName": {"string": "Skipped Song"},
+        },
+    )
+    denon_plugin.config.cparser.setValue("denon/deckskip", ["3"])
+
+    upcoming = await denon_plugin.getupcomingtracks()
+    assert upcoming == [
+        {"artist": "Cued Artist", "title": "Cued Song", "deck": "2", "album": "Cued Album"}
+    ]
+
+
 @pytest.mark.asyncio
 async def test_stop_clears_metadata_state(denon_plugin):
     """Test plugin stop drops device state so a restart cannot see stale decks"""
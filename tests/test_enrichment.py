@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""test playlist pre-enrichment"""
+
+import threading
+import unittest.mock
+
+import httpx
+import pytest
+import respx
+from utils_artistextras import configuresettings, datacache_pending_urls
+
+import nowplaying.datacache.pending
+import nowplaying.metadata
+import nowplaying.metadata.enrichment
+from nowplaying.artistextras.theaudiodb import DEFAULT_THEAUDIODB_API_KEY
+from nowplaying.metadata.enrichment import EnrichmentProgress
+
+TADB_BASE_URL = f"https://theaudiodb.com/api/v1/json/{DEFAULT_THEAUDIODB_API_KEY}"
+
+
+class _FakeInput:  # pylint: disable=too-few-public-methods
+    """stand-in for an input plugin with one playlist"""
+
+    def __init__(self, tracks):
+        self.tracks = tracks
+
+    async def getplaylisttracks(self, playlist):
+        """return the playlist"""
+        return list(self.tracks) if playlist == "gig" else []
+
+
+@pytest.mark.asyncio
+async def test_enrich_playlist_resumes(bootstrap, isolated_datacache_client, tmp_path):
+    """a stopped run picks up where it left off, at background priority"""
+    config = bootstrap
+    config.cparser.setValue("settings/input", "fakeinput")
+    tracks = [
+        {"filename": "/music/one.mp3"},
+        {"artist": "Two", "title": "Second"},
+        {"filename": "/music/three.mp3"},
+    ]
+    progress = EnrichmentProgress(dbpath=tmp_path / "enrichment.db")
+    stopevent = threading.Event()
+    seen = []
+
+    async def _getmoremetadata(self, metadata=None, **kwargs):  # pylint: disable=unused-argument
+        seen.append(
+            (
+                metadata.get("filename") or metadata.get("title"),
+                nowplaying.datacache.pending.current_schedule_class(),
+            )
+        )
+        if len(seen) == 2:
+            stopevent.set()
+        isolated_datacache_client.served += 1
+        return metadata
+
+    with (
+        unittest.mock.patch.dict(
+            config.pluginobjs["inputs"], {"nowplaying.inputs.fakeinput": _FakeInput(tracks)}
+        ),
+        unittest.mock.patch.object(
+            nowplaying.metadata.MetadataProcessors, "getmoremetadata", _getmoremetadata
+        ),
+    ):
+        first = await nowplaying.metadata.enrichment.enrich_playlist(
+            config, "gig", progress=progress, stopevent=stopevent
+        )
+        second = await nowplaying.metadata.enrichment.enrich_playlist(
+            config, "gig", progress=progress
+        )
+        third = await nowplaying.metadata.enrichment.enrich_playlist(
+            config, "gig", progress=progress
+        )
+        missing = await nowplaying.metadata.enrichment.enrich_playlist(
+            config, "nope", progress=progress
+        )
+
+    assert first == (2, 3)
+    assert second == (1, 3)
+    assert third == (0, 3)
+    assert missing == (0, 0)
+    assert [name for name, _ in seen] == ["/music/one.mp3", "Second", "/music/three.mp3"]
+    assert {schedclass for _, schedclass in seen} == {nowplaying.datacache.CLASS_BACKGROUND}
+
+    await progress.reset("gig")
+    assert not await progress.done("gig")
+
+
+@pytest.mark.asyncio
+async def test_enrich_playlist_queues_extras(bootstrap, isolated_datacache_client, tmp_path):
+    """API lookups run in-line so their images get queued; a track that got nothing is redone"""
+    config = bootstrap
+    config.cparser.setValue("settings/input", "fakeinput")
+    configuresettings("theaudiodb", config.cparser)
+    config.cparser.setValue("theaudiodb/apikey", DEFAULT_THEAUDIODB_API_KEY)
+    tracks = [
+        {"artist": "WNP Mock Artist", "title": "Found"},
+        {"artist": "WNP Missing Artist", "title": "Lost"},
+    ]
+    artist_url = f"{TADB_BASE_URL}/search.php?s=wnp%20mock%20artist"
+    progress = EnrichmentProgress(dbpath=tmp_path / "enrichment.db")
+
+    with (
+        unittest.mock.patch.dict(
+            config.pluginobjs["inputs"], {"nowplaying.inputs.fakeinput": _FakeInput(tracks)}
+        ),
+        respx.mock(assert_all_called=False) as mock_http,
+    ):
+        mock_http.get(artist_url).mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    "artists": [
+                        {
+                            "idArtist": "999999",
+                            "strArtist": "WNP Mock Artist",
+                            "strBiography": "WNP Mock Artist is a fictional band.",
+                            "strArtistThumb": "https://cdn.theaudiodb.com/mock.jpg",
+                        }
+                    ]
+                },
+            )
+        )
+        mock_http.get(f"{TADB_BASE_URL}/search.php?s=wnp%20missing%20artist").mock(
+            return_value=httpx.Response(404)
+        )
+        result = await nowplaying.metadata.enrichment.enrich_playlist(
+            config, "gig", progress=progress
+        )
+
+    assert result == (1, 2)
+    assert await datacache_pending_urls(isolated_datacache_client) == [
+        "https://cdn.theaudiodb.com/mock.jpg"
+    ]
+    cached = await isolated_datacache_client.storage.retrieve_by_url(artist_url)
+    assert b"fictional band" in cached.data
+    assert await progress.done("gig") == {"wnp mock artist - found"}
+
+
+@pytest.mark.asyncio
+async def test_run_job_releases_datacache_client(bootstrap, isolated_datacache_client):
+    """a job closes the process-wide client so no session outlives its loop"""
+    config = bootstrap
+    config.cparser.setValue("settings/input", "nosuchinput")
+
+    with unittest.mock.patch("nowplaying.datacache.reset_client") as reset_client:
+        result = await nowplaying.metadata.enrichment.run_job(config, "gig")
+
+    assert result == (0, 0)
+    assert isolated_datacache_client._session is None  # pylint: disable=protected-access
+    reset_client.assert_called_once()
@@ -3,6 +3,7 @@
 
 # pylint: disable=redefined-outer-name
 
+import struct
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -29,7 +30,7 @@ def test_protocol_init():
     """test protocol initialization"""
     protocol = nowplaying.inputs.icecast.IcecastProtocol()
     assert not protocol.streaming
-    assert protocol.previous_page == b""
+    assert not protocol.oggparser.buffered
     assert protocol.metadata_callback is None  # pylint: disable=no-member
     assert not protocol._current_metadata  # pylint: disable=protected-access,no-member
 
@@ -407,3 +408,73 @@ def test_thread_safety_multiple_calls():
     final_metadata = plugin._current_metadata  # pylint: disable=protected-access,no-member
     assert final_metadata["artist"] == "Artist99"
     assert final_metadata["title"] == "Title99"
+
+
+def _ogg_stream(packets):
+    """an Ogg stream carrying packets, with a page per packet unless it needs more"""
+    pages = []
+    lacing = []
+    body = bytearray()
+    continued = False
+
+    def _flush():
+        header = nowplaying.inputs.icecast.OGG_PAGE_HEADER.pack(
+            b"OggS", 0, 1 if continued else 0, 0, 1, len(pages), 0, len(lacing)
+        )
+        pages.append(header + bytes(lacing) + body)
+        lacing.clear()
+        body.clear()
+
+    for packet in packets:
+        continued = False
+        offset = 0
+        for length in [255] * (len(packet) // 255) + [len(packet) % 255]:
+            if len(lacing) == 255:
+                _flush()
+                continued = True
+            lacing.append(length)
+            body.extend(packet[offset : offset + length])
+            offset += length
+        _flush()
+    return b"".join(pages)
+
+
+def _comment(vendor, **tags):
+    """a Vorbis comment block"""
+    fields = [f"{key}={value}".encode() for key, value in tags.items()]
+    return (
+        struct.pack("<I", len(vendor))
+        + vendor
+        + struct.pack("<I", len(fields))
+        + b"".join(struct.pack("<I", len(field)) + field for field in fields)
+    )
+
+
+@pytest.mark.parametrize("chunksize", [7, 1000, 4096, 1 << 20])
+def test_ogg_comment_headers(chunksize):
+    """comment headers are found however the stream is split up"""
+    audio = [bytes(range(256)) * 16 + b"OpusTags vorbis" for _ in range(20)]
+    stream = b"junk" + _ogg_stream(
+        [
+            b"\x01vorbis" + bytes(23),
+            # big enough to span several pages
+            b"\x03vorbis" + _comment(b"x" * 70000, ARTIST="Divine", TITLE="Shoot Your Shot"),
+            b"\x05vorbis" + bytes(3000),
+            *audio,
+            b"OpusHead" + bytes(11),
+            b"OpusTags" + _comment(b"libopus", title="Nick Cave - Hollywood"),
+            *audio,
+        ]
+    )
+    callback = MagicMock()
+    protocol = nowplaying.inputs.icecast.IcecastProtocol(metadata_callback=callback)  # pylint: disable=unexpected-keyword-arg
+    protocol.connection_made(MagicMock())
+    protocol.data_received(b"PUT /stream HTTP/1.1\r\n\r\n")
+    for start in range(0, len(stream), chunksize):
+        protocol.data_received(stream[start : start + chunksize])
+
+    assert [call.args[0] for call in callback.call_args_list] == [
+        {"artist": "Divine", "title": "Shoot Your Shot"},
+        {"artist": "Nick Cave", "title": "Hollywood"},
+    ]
+    assert not protocol.oggparser.buffered
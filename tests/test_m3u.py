@@ -8,6 +8,7 @@ import pathlib
 import sys
 
 import pytest
+import watchdog.events
 import watchdog.observers.polling  # pylint: disable=import-error
 
 import nowplaying.inputs.m3u  # pylint: disable=import-error
@@ -447,3 +448,43 @@ async def test_m3umixmode(m3u_bootstrap):  # pylint: disable=redefined-outer-nam
     assert plugin.getmixmode() == "newest"
     await plugin.stop()
     await asyncio.sleep(5)
+
+
+def test_m3u_reads_only_appended_lines(m3u_bootstrap):  # pylint: disable=redefined-outer-name
+    """history appends are read from where the last event stopped"""
+    plugin = nowplaying.inputs.m3u.Plugin(config=m3u_bootstrap)
+    m3ufile = pathlib.Path(m3u_bootstrap.cparser.value("m3u/directory")).joinpath("history.m3u")
+    event = watchdog.events.FileModifiedEvent(str(m3ufile))
+
+    def _entry(artist, title, track):
+        return f"#EXTVDJ:<artist>{artist}</artist><title>{title}</title>\nnetsearch://{track}\n"
+
+    write_extvdj_m3u8(m3ufile)
+    plugin._read_track(event)  # pylint: disable=protected-access
+    assert plugin.metadata["artist"] == "Lords Of The Underground"
+    tail = plugin._tails[str(m3ufile)]  # pylint: disable=protected-access
+    assert tail.offset == m3ufile.stat().st_size
+
+    # the next entry shows up half written, then in full
+    entry = _entry("Divine", "Shoot Your Shot", "dz1")
+    with open(m3ufile, "a", encoding="utf-8") as m3ufn:
+        m3ufn.write(entry[:-10])
+    plugin._read_track(event)  # pylint: disable=protected-access
+    assert plugin.metadata["artist"] == "Divine"
+    with open(m3ufile, "a", encoding="utf-8") as m3ufn:
+        m3ufn.write(entry[-10:])
+    plugin._read_track(event)  # pylint: disable=protected-access
+    assert plugin.metadata["artist"] == "Divine"
+    assert plugin._tails[str(m3ufile)] is tail  # pylint: disable=protected-access
+    assert tail.offset == m3ufile.stat().st_size
+    assert tail.trackfile == b"netsearch://dz1"
+
+    # truncated and started over
+    m3ufile.write_text(_entry("Nick Cave", "Hollywood", "dz2"), encoding="utf-8")
+    plugin._read_track(event)  # pylint: disable=protected-access
+    assert plugin.metadata["artist"] == "Nick Cave"
+
+    # rewritten in place without getting shorter
+    m3ufile.write_text(_entry("Nick Cave", "Hollywood", "dz3"), encoding="utf-8")
+    plugin._read_track(event)  # pylint: disable=protected-access
+    assert plugin._tails[str(m3ufile)].trackfile == b"netsearch://dz3"  # pylint: disable=protected-access
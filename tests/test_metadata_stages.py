@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""test the metadata stage scheduler"""
+
+import asyncio
+import unittest.mock
+
+import pytest
+
+import nowplaying.metadata
+from nowplaying.metadata.stages import Stage, dependencies, run_stages
+
+
+def _stage(name, func=None, reads=(), writes=(), snapshot=False):
+    return Stage(
+        name,
+        func or (lambda: None),
+        reads=frozenset(reads),
+        writes=frozenset(writes),
+        snapshot=snapshot,
+    )
+
+
+def test_dependencies_follow_reads_and_writes():
+    """edges appear only where reordering could change the result"""
+    graph = dependencies(
+        [
+            _stage("tags", reads={"tags"}, writes={"tags"}),
+            _stage("host", writes={"host"}),
+            _stage("colors", reads={"cover"}, writes={"palette"}, snapshot=True),
+            _stage("lookup", reads={"tags"}, writes={"tags", "cover"}),
+            _stage("palette2", reads={"palette"}, writes={"palette"}),
+        ]
+    )
+    assert graph["host"] == (set(), set())
+    assert graph["colors"] == (set(), set())
+    # overwrites what colors read, but colors takes its copy as it starts
+    assert graph["lookup"] == ({"tags"}, {"colors"})
+    assert graph["palette2"] == ({"colors"}, set())
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap():
+    """two independent waits take about as long as one"""
+
+    async def _nap():
+        await asyncio.sleep(0.2)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    unfinished = await run_stages(
+        [_stage("one", _nap, writes={"a"}), _stage("two", _nap, writes={"b"})], deadline=5
+    )
+    assert not unfinished
+    assert loop.time() - start < 0.35
+
+
+@pytest.mark.asyncio
+async def test_dependent_stages_keep_their_order():
+    """a reader waits for the writer listed before it"""
+    order = []
+
+    async def _writer():
+        await asyncio.sleep(0.05)
+        order.append("writer")
+
+    def _reader():
+        order.append("reader")
+
+    await run_stages(
+        [_stage("writer", _writer, writes={"a"}), _stage("reader", _reader, reads={"a"})],
+        deadline=5,
+    )
+    assert order == ["writer", "reader"]
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_does_not_stop_the_rest():
+    """an exception is logged and its dependents still run"""
+    ran = []
+
+    def _boom():
+        raise RuntimeError("boom")
+
+    unfinished = await run_stages(
+        [
+            _stage("boom", _boom, writes={"a"}),
+            _stage("after", lambda: ran.append("after"), reads={"a"}),
+        ],
+        deadline=5,
+    )
+    assert not unfinished
+    assert ran == ["after"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_and_skips():
+    """a stage past the deadline is cancelled and whatever waits on it never starts"""
+    cancelled = asyncio.Event()
+    ran = []
+
+    async def _slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    unfinished = await run_stages(
+        [
+            _stage("slow", _slow, writes={"a"}),
+            _stage("after", lambda: ran.append("after"), reads={"a"}),
+            _stage("quick", lambda: ran.append("quick"), writes={"b"}),
+        ],
+        deadline=0.1,
+    )
+    assert unfinished == ["slow", "after"]
+    assert ran == ["quick"]
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_cover_colors_overlap_musicbrainz(bootstrap):
+    """palette extraction does not hold up the network lookups"""
+    config = bootstrap
+    config.cparser.setValue("acoustidmb/enabled", False)
+    config.cparser.setValue("musicbrainz/enabled", False)
+    lookup_started = asyncio.Event()
+
+    async def _colors(self):  # pylint: disable=unused-argument
+        # Would hit the deadline if MusicBrainz waited for colours to finish
+        await asyncio.wait_for(lookup_started.wait(), timeout=5)
+
+    async def _musicbrainz(self):  # pylint: disable=unused-argument
+        lookup_started.set()
+
+    with (
+        unittest.mock.patch.object(
+            nowplaying.metadata.MetadataProcessors, "_process_cover_colors", _colors
+        ),
+        unittest.mock.patch.object(
+            nowplaying.metadata.MetadataProcessors, "_musicbrainz", _musicbrainz
+        ),
+        unittest.mock.patch("nowplaying.metadata.stages.logging.exception") as logexc,
+    ):
+        metadataout = await nowplaying.metadata.MetadataProcessors(config=config).getmoremetadata(
+            metadata={"artist": "WNP Mock Artist", "title": "WNP Mock Song"}, skipplugins=True
+        )
+
+    assert lookup_started.is_set()
+    assert not logexc.called
+    assert metadataout["artist"] == "WNP Mock Artist"
+
+
+class _FakeRecognition:
+    """stand-in for a recognition plugin"""
+
+    def __init__(self, provides, addmeta, started, waitfor=None):
+        self.provides = provides
+        self.addmeta = addmeta
+        self.started = started
+        self.waitfor = waitfor
+        self.calls = 0
+
+    def providerinfo(self):
+        """what this plugin fills in"""
+        return self.provides
+
+    async def recognize(self, metadata=None):  # pylint: disable=unused-argument
+        """pretend to look the track up"""
+        self.calls += 1
+        self.started.set()
+        if self.waitfor:
+            await asyncio.wait_for(self.waitfor.wait(), timeout=5)
+        return self.addmeta
+
+
+@pytest.mark.asyncio
+async def test_recognition_plugins_overlap(bootstrap):
+    """recognition plugins run together; the higher priority answer still wins"""
+    config = bootstrap
+    first_started = asyncio.Event()
+    second_started = asyncio.Event()
+    # the first plugin only answers once the second has started
+    plugins = {
+        "first": _FakeRecognition(
+            ["title", "album"],
+            {"title": "From First", "album": "First Album"},
+            first_started,
+            waitfor=second_started,
+        ),
+        "second": _FakeRecognition(
+            ["album", "label"], {"album": "Second Album", "label": "Second Label"}, second_started
+        ),
+        # starts, but second has filled in everything it provides by the time it merges
+        "redundant": _FakeRecognition(
+            ["label"], {"label": "Other Label", "isrc": ["XX0000000000"]}, asyncio.Event()
+        ),
+        "covered": _FakeRecognition(["artist"], {"artist": "Someone Else"}, asyncio.Event()),
+    }
+    processors = nowplaying.metadata.MetadataProcessors(config=config)
+    processors.metadata = {"artist": "WNP Mock Artist"}
+    with (
+        unittest.mock.patch.dict(config.plugins, {"recognition": list(plugins)}),
+        unittest.mock.patch.dict(config.pluginobjs["recognition"], plugins),
+    ):
+        await processors._process_recognition()  # pylint: disable=protected-access
+
+    assert processors.metadata == {
+        "artist": "WNP Mock Artist",
+        "title": "From First",
+        "album": "First Album",
+        "label": "Second Label",
+    }
+    assert plugins["redundant"].calls == 1
+    assert not plugins["covered"].calls
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""test musicbrainz resolution caching (no network)"""
+
+# pylint: disable=protected-access
+import unittest.mock
+
+import pytest
+
+import nowplaying.musicbrainz  # pylint: disable=import-error
+from nowplaying.musicbrainz.helper import MusicBrainzError  # pylint: disable=import-error
+
+RECORDINGID = "2d7f08e1-be1c-4b86-b725-6e675b7b6de0"
+ARTISTID = "b7ffd2af-418f-4be2-bdd1-22f8b48613da"
+
+
+@pytest.fixture
+def mbhelper(bootstrap):
+    """helper with a fake MB client"""
+    config = bootstrap
+    config.cparser.setValue("musicbrainz/enabled", True)
+    config.cparser.setValue("musicbrainz/coverart", False)
+    config.cparser.setValue("musicbrainz/bandcamp", True)
+    helper = nowplaying.musicbrainz.MusicBrainzHelper(config=config, test_mode=False)
+    helper.mb_client = unittest.mock.MagicMock()
+    helper.mb_client.find_recording = unittest.mock.AsyncMock(return_value=(RECORDINGID, None))
+    helper.mb_client.get_artist_by_id = unittest.mock.AsyncMock(return_value={"id": ARTISTID})
+    helper._recordingid_uncached = unittest.mock.AsyncMock(
+        return_value={
+            "musicbrainzrecordingid": RECORDINGID,
+            "title": "15 Ghosts II",
+            "artist": "Nine Inch Nails",
+        }
+    )
+    return helper
+
+
+@pytest.mark.asyncio
+async def test_repeat_track_is_resolved_from_cache(
+    mbhelper,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """the same track, spelled slightly differently, does not search MB again"""
+    first = await mbhelper.lastditcheffort({"artist": "Nine Inch Nails", "title": "15 Ghosts II"})
+    second = await mbhelper.lastditcheffort(
+        {"artist": "nine inch  nails", "title": "15 GHOSTS II"}
+    )
+
+    assert first["musicbrainzrecordingid"] == RECORDINGID
+    assert second["musicbrainzrecordingid"] == RECORDINGID
+    mbhelper.mb_client.find_recording.assert_awaited_once()
+    mbhelper._recordingid_uncached.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_miss_is_negatively_cached(
+    mbhelper,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """MB not knowing a track is remembered; an MB error is not"""
+    metadata = {"artist": "Nobody", "title": "Unreleased Dubplate"}
+
+    mbhelper.mb_client.find_recording.side_effect = MusicBrainzError("boom")
+    assert not await mbhelper.lastditcheffort(metadata)
+    mbhelper.mb_client.find_recording.side_effect = None
+    mbhelper.mb_client.find_recording.return_value = (None, None)
+    assert not await mbhelper.lastditcheffort(metadata)
+    assert not await mbhelper.lastditcheffort(metadata)
+
+    assert mbhelper.mb_client.find_recording.await_count == 2
+    mbhelper._recordingid_uncached.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_artist_urls_cached_per_artist(
+    mbhelper,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """artist url relations are fetched once; settings still apply on every call"""
+    urls = {"bandcamp": "https://nin.bandcamp.com", "last.fm": "https://last.fm/music/nin"}
+    with unittest.mock.patch(
+        "nowplaying.musicbrainz.helper.extract_artist_urls", return_value=urls
+    ):
+        assert await mbhelper._websites([ARTISTID]) == ["https://nin.bandcamp.com"]
+        mbhelper.config.cparser.setValue("musicbrainz/lastfm", True)
+        assert await mbhelper._websites([ARTISTID]) == [
+            "https://nin.bandcamp.com",
+            "https://last.fm/music/nin",
+        ]
+
+    mbhelper.mb_client.get_artist_by_id.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_isrc_resolution_cached(
+    mbhelper,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """an isrc list resolves to a recording once, whatever order it arrives in"""
+    mbhelper.mb_client.resolve_recording_by_isrc = unittest.mock.AsyncMock(
+        return_value=RECORDINGID
+    )
+    first = await mbhelper.isrc(["USTC10800002", "ustc10800001"])
+    second = await mbhelper.isrc(["USTC10800001", "USTC10800002"])
+
+    assert first["musicbrainzrecordingid"] == second["musicbrainzrecordingid"] == RECORDINGID
+    mbhelper.mb_client.resolve_recording_by_isrc.assert_awaited_once()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Tests for per-provider latency tracking and the artist extras deadlines it drives"""
+
+import asyncio
+import time
+import unittest.mock
+
+import pytest
+
+import nowplaying.metadata.processors
+import nowplaying.metadata.providerstats
+from nowplaying.metadata.providerstats import (
+    BREAKER_COOLDOWN,
+    FAILURE_STREAK,
+    MIN_TIMEOUT,
+    ProviderStats,
+)
+
+
+@pytest.fixture
+def statsdb(tmp_path):
+    """path for a throwaway stats database"""
+    return tmp_path / "providerstats" / "providerstats.db"
+
+
+@pytest.mark.asyncio
+async def test_timeout_follows_p95(statsdb):  # pylint: disable=redefined-outer-name
+    """no history gets the cap; with history the deadline tracks p95 within floor and cap"""
+    stats = ProviderStats(dbpath=statsdb)
+    assert stats.timeout_for("fast", cap=15.0) == 15.0
+
+    for _ in range(10):
+        await stats.record("fast", 0.2, ok=True)
+        await stats.record("slow", 8.0, ok=True)
+    assert stats.percentiles("fast") == pytest.approx((0.2, 0.2))
+    assert stats.timeout_for("fast", cap=15.0) == MIN_TIMEOUT
+    assert stats.timeout_for("slow", cap=15.0) == 12.0
+    assert stats.timeout_for("slow", cap=5.0) == 5.0
+
+
+@pytest.mark.asyncio
+async def test_timeouts_widen_deadline(statsdb):  # pylint: disable=redefined-outer-name
+    """calls that hit the deadline count at the deadline, so it can grow back"""
+    stats = ProviderStats(dbpath=statsdb)
+    for _ in range(10):
+        await stats.record("theaudiodb", 0.5, ok=True)
+    deadline = stats.timeout_for("theaudiodb", cap=15.0)
+    assert deadline == MIN_TIMEOUT
+
+    for _ in range(3):
+        await stats.record("theaudiodb", deadline, ok=False, timedout=True)
+        await stats.record("theaudiodb", 0.1, ok=False)
+    assert stats.timeout_for("theaudiodb", cap=15.0) == deadline * 1.5
+    await stats.flush()
+    assert ProviderStats(dbpath=statsdb).percentiles("theaudiodb") == stats.percentiles(
+        "theaudiodb"
+    )
+
+
+@pytest.mark.asyncio
+async def test_history_survives_restart(statsdb):  # pylint: disable=redefined-outer-name
+    """a new instance picks up what an earlier one recorded, trimmed to the window"""
+    stats = ProviderStats(dbpath=statsdb)
+    for count in range(nowplaying.metadata.providerstats.WINDOW + 10):
+        await stats.record("lastfm", float(count), ok=True)
+    await stats.flush()
+
+    reloaded = ProviderStats(dbpath=statsdb)
+    assert reloaded.percentiles("lastfm") == stats.percentiles("lastfm")
+    assert len(reloaded._samples["lastfm"]) == nowplaying.metadata.providerstats.WINDOW  # pylint: disable=protected-access
+
+
+def test_shared_per_database(statsdb):  # pylint: disable=redefined-outer-name
+    """every pipeline in a process gets the same breakers"""
+    with unittest.mock.patch.object(ProviderStats, "_get_database_path", return_value=statsdb):
+        assert ProviderStats.shared() is ProviderStats.shared()
+
+
+@pytest.mark.asyncio
+async def test_processors_close_writes_pending_stats(bootstrap, statsdb):  # pylint: disable=redefined-outer-name
+    """samples still queued when the pipeline shuts down are not lost"""
+    with unittest.mock.patch.object(ProviderStats, "_get_database_path", return_value=statsdb):
+        processors = nowplaying.metadata.processors.MetadataProcessors(config=bootstrap)
+    for _ in range(3):
+        await processors._providerstats.record("lastfm", 0.5, ok=True)  # pylint: disable=protected-access
+
+    await processors.close()
+
+    assert len(ProviderStats(dbpath=statsdb)._samples["lastfm"]) == 3  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_half_opens(statsdb):  # pylint: disable=redefined-outer-name
+    """a losing streak stops calls until the cooldown passes; one success resets it"""
+    stats = ProviderStats(dbpath=statsdb)
+    for _ in range(FAILURE_STREAK):
+        assert stats.allow("discogs")
+        await stats.record("discogs", 5.0, ok=False)
+    assert not stats.allow("discogs")
+
+    later = time.time() + BREAKER_COOLDOWN + 1
+    with unittest.mock.patch("nowplaying.metadata.providerstats.time.time", return_value=later):
+        # one probe at a time
+        assert stats.allow("discogs")
+        assert not stats.allow("discogs")
+        await stats.record("discogs", 5.0, ok=False)
+        assert not stats.allow("discogs")
+
+    # a probe that never reports back does not keep the breaker shut for good
+    later += BREAKER_COOLDOWN + 1
+    with unittest.mock.patch("nowplaying.metadata.providerstats.time.time", return_value=later):
+        assert stats.allow("discogs")
+    later += BREAKER_COOLDOWN + 1
+    with unittest.mock.patch("nowplaying.metadata.providerstats.time.time", return_value=later):
+        assert stats.allow("discogs")
+
+    await stats.record("discogs", 1.0, ok=True)
+    assert stats.failure_streak("discogs") == 0
+    assert stats.allow("discogs")
+
+
+class _FakeExtras:  # pylint: disable=too-few-public-methods
+    """stand-in for an artistextras plugin"""
+
+    def __init__(self, delay, addmeta, started=None):
+        self.delay = delay
+        self.addmeta = addmeta
+        self.started = started
+
+    async def download_async(self, metadata=None):  # pylint: disable=unused-argument
+        """pretend to fetch"""
+        if self.started:
+            self.started.set()
+        await asyncio.sleep(self.delay)
+        return self.addmeta
+
+
+@pytest.mark.asyncio
+async def test_artist_extras_deadlines_and_breaker(bootstrap, statsdb):  # pylint: disable=redefined-outer-name
+    """a slow provider is cut at its own deadline, a failing one is skipped"""
+    config = bootstrap
+    plugins = {
+        "slowbio": _FakeExtras(10.0, {"artistlongbio": "late"}),
+        "quickimages": _FakeExtras(0.0, {"artistwebsites": ["https://example.com"]}),
+        "broken": _FakeExtras(0.0, {"artistshortbio": "never"}),
+    }
+    with unittest.mock.patch.object(ProviderStats, "_get_database_path", return_value=statsdb):
+        processors = nowplaying.metadata.processors.MetadataProcessors(config=config)
+    processors.extraslist = {10: ["slowbio"], 5: ["quickimages", "broken"]}
+    processors.metadata = {"artist": "Test Artist"}
+
+    for _ in range(10):
+        await processors._providerstats.record("slowbio", 0.1, ok=True)  # pylint: disable=protected-access
+    for _ in range(FAILURE_STREAK):
+        await processors._providerstats.record("broken", 5.0, ok=False)  # pylint: disable=protected-access
+
+    with unittest.mock.patch.dict(config.pluginobjs["artistextras"], plugins):
+        start = time.monotonic()
+        await processors._artist_extras()  # pylint: disable=protected-access
+        elapsed = time.monotonic() - start
+
+    # slowbio normally answers in 0.1s, so it gets the floor rather than the 5-15s cap
+    assert elapsed < MIN_TIMEOUT + 1.0
+    assert processors.metadata["artistwebsites"] == ["https://example.com"]
+    assert "artistlongbio" not in processors.metadata
+    assert "artistshortbio" not in processors.metadata
+    assert processors._providerstats.failure_streak("slowbio") == 1  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_artist_extras_merge_in_priority_order(bootstrap, statsdb):  # pylint: disable=redefined-outer-name
+    """a lower priority plugin that finishes first does not win over a higher one"""
+    config = bootstrap
+    plugins = {
+        "first": _FakeExtras(0.2, {"artistlongbio": "from first"}),
+        "second": _FakeExtras(0.0, {"artistlongbio": "from second", "artistfanarturls": ["x"]}),
+    }
+    with unittest.mock.patch.object(ProviderStats, "_get_database_path", return_value=statsdb):
+        processors = nowplaying.metadata.processors.MetadataProcessors(config=config)
+    processors.extraslist = {10: ["first"], 5: ["second"]}
+    processors.metadata = {"artist": "Test Artist"}
+
+    with unittest.mock.patch.dict(config.pluginobjs["artistextras"], plugins):
+        await processors._artist_extras()  # pylint: disable=protected-access
+
+    assert processors.metadata["artistlongbio"] == "from first"
+    assert processors.metadata["artistfanarturls"] == ["x"]
+
+
+@pytest.mark.asyncio
+async def test_artist_extras_early_return(bootstrap, statsdb):  # pylint: disable=redefined-outer-name
+    """with early extras the first provider to deliver is enough; the rest come later"""
+    config = bootstrap
+    plugins = {
+        "slowbio": _FakeExtras(0.5, {"artistlongbio": "A late bio. It has two sentences."}),
+        "quickweb": _FakeExtras(0.0, {"artistwebsites": ["https://example.com/"]}),
+    }
+    with unittest.mock.patch.object(ProviderStats, "_get_database_path", return_value=statsdb):
+        processors = nowplaying.metadata.processors.MetadataProcessors(config=config)
+    processors.extraslist = {10: ["slowbio"], 5: ["quickweb"]}
+    processors.metadata = {"artist": "Test Artist", "title": "Test Title"}
+    processors._early_extras = True  # pylint: disable=protected-access
+
+    with unittest.mock.patch.dict(config.pluginobjs["artistextras"], plugins):
+        start = time.monotonic()
+        await processors._artist_extras()  # pylint: disable=protected-access
+        assert time.monotonic() - start < 0.4
+        published = processors.metadata
+        assert published["artistwebsites"] == ["https://example.com/"]
+        assert "artistlongbio" not in published
+
+        assert not await processors.merge_late_extras(published)
+        assert await processors.merge_late_extras(published, wait=True)
+
+    assert published["artistlongbio"] == "A late bio. It has two sentences."
+    assert published["artistshortbio"]
+    assert published["artistwebsites"] == ["https://example.com/"]
+    assert not await processors.merge_late_extras(published, wait=True)
+
+
+@pytest.mark.asyncio
+async def test_artist_extras_late_dropped_with_next_track(bootstrap, statsdb):  # pylint: disable=redefined-outer-name
+    """extras still running for a track that never went out are cancelled"""
+    config = bootstrap
+    plugins = {
+        "slowbio": _FakeExtras(10.0, {"artistlongbio": "never"}),
+        "quickweb": _FakeExtras(0.0, {"artistwebsites": ["https://example.com"]}),
+    }
+    with unittest.mock.patch.object(ProviderStats, "_get_database_path", return_value=statsdb):
+        processors = nowplaying.metadata.processors.MetadataProcessors(config=config)
+    processors.extraslist = {10: ["slowbio"], 5: ["quickweb"]}
+    processors.metadata = {"artist": "Test Artist"}
+    processors._early_extras = True  # pylint: disable=protected-access
+
+    with unittest.mock.patch.dict(config.pluginobjs["artistextras"], plugins):
+        await processors._artist_extras()  # pylint: disable=protected-access
+    ((_, slowtask),) = processors._late_extras.tasks  # pylint: disable=protected-access
+
+    await processors.close()
+    assert slowtask.cancelled()
+    assert not await processors.merge_late_extras(processors.metadata, wait=True)
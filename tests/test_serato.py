@@ -12,6 +12,7 @@ import unittest.mock
 import pytest
 
 import nowplaying.inputs.serato
+import nowplaying.serato.reader
 import nowplaying.utils.sqlite
 
 
@@ -357,6 +358,31 @@ async def test_deckskip_functionality(bootstrap, serato_master_db):  # pylint: d
             await plugin.stop()
 
 
+@pytest.mark.asyncio
+async def test_getupcomingtracks(bootstrap, serato_master_db):  # pylint: disable=redefined-outer-name
+    """Test the decks that are not playing are offered for prefetch"""
+    plugin = nowplaying.inputs.serato.Plugin(config=bootstrap)
+
+    with unittest.mock.patch.object(
+        plugin, "_find_serato_library", return_value=serato_master_db["library_path"]
+    ):
+        plugin.configure()
+        plugin.setmixmode("oldest")
+
+        await plugin.start()
+
+        try:
+            track = await plugin.getplayingtrack()
+            upcoming = await plugin.getupcomingtracks()
+
+            assert upcoming
+            assert track["deck"] not in [cued["deck"] for cued in upcoming]
+            assert serato_master_db["expected_newest"] in [cued["artist"] for cued in upcoming]
+
+        finally:
+            await plugin.stop()
+
+
 @pytest.mark.asyncio
 async def test_getplayingtrack_without_handler(bootstrap):
     """Test getplayingtrack returns None when handler not started"""
@@ -611,3 +637,33 @@ async def test_streaming_track_is_video(bootstrap, serato_master_db, aiointercep
 
         finally:
             await plugin.stop()
+
+
+@pytest.mark.asyncio
+async def test_reader_requeries_only_after_changes(serato_master_db):  # pylint: disable=redefined-outer-name
+    """polls reuse the last results until another connection commits"""
+    reader = nowplaying.serato.reader.Serato4SQLiteReader(serato_master_db["db_path"])
+    try:
+        tracks = await reader.get_latest_tracks_per_deck()
+        locations = await reader.get_location_mappings()
+        assert tracks
+        assert await reader.get_latest_tracks_per_deck() is tracks
+        assert await reader.get_location_mappings() is locations
+
+        with nowplaying.utils.sqlite.sqlite_connection(serato_master_db["db_path"]) as conn:
+            conn.execute(
+                """
+                INSERT INTO history_entry
+                (id, session_id, file_name, artist, name, start_time, played, deck)
+                VALUES (100, 1, '/music/new.mp3', 'New Artist', 'New Track', ?, 1, '1')
+            """,
+                (max(track["start_time"] for track in tracks) + 60,),
+            )
+            conn.commit()
+
+        newtracks = await reader.get_latest_tracks_per_deck()
+        assert newtracks is not tracks
+        assert "New Artist" in {track["artist"] for track in newtracks}
+        assert await reader.get_location_mappings() == locations
+    finally:
+        await reader.close()
@@ -5,6 +5,7 @@
 import logging
 import os
 import pathlib
+import struct
 from datetime import datetime
 
 import lxml.html
@@ -14,6 +15,9 @@ import pytest_asyncio  # pylint: disable=import-error
 import nowplaying.inputs.serato3  # pylint: disable=import-error
 import nowplaying.serato.remote
 import nowplaying.serato3.base
+import nowplaying.serato3.database
+import nowplaying.serato3.index
+import nowplaying.serato3.session
 
 MONEYSTRING = "Money Thats What I Want"  # codespell:ignore
 
@@ -432,3 +436,148 @@ def test_t_handler_no_double_strip():
     decode_t = handler.decode_func_first["t"]
     result = decode_t(raw)
     assert result == text
+
+
+async def _full_session(path):
+    """decode a session file the whole-file way"""
+    session = nowplaying.serato3.session.SeratoSessionReader()
+    await session.loadsessionfile(path)
+    session.condense()
+    return session.sessiondata
+
+
+@pytest.mark.asyncio
+async def test_session_tail_reader_follows_appends(getroot, tmp_path):  # pylint: disable=redefined-outer-name
+    """tail reading agrees with a full decode as the session grows and gets rewritten"""
+    sessions = pathlib.Path(getroot, "tests", "serato-2.4-mac", "History", "Sessions")
+    data = sessions.joinpath("12.session").read_bytes()
+    recordends = []
+    offset = 0
+    while offset < len(data):
+        offset += 8 + struct.unpack(">I", data[offset + 4 : offset + 8])[0]
+        recordends.append(offset)
+
+    livefile = tmp_path.joinpath("12.session")
+    complete = tmp_path.joinpath("complete.session")
+    reader = nowplaying.serato3.session.SeratoSessionTailReader()
+
+    # Grow the file a chunk at a time, usually ending mid-record
+    for size in [*range(200, len(data), 3001), len(data)]:
+        livefile.write_bytes(data[:size])
+        complete.write_bytes(data[: max(end for end in recordends if end <= size)])
+        assert await reader.update(livefile) == await _full_session(complete)
+
+    # Serato updating an earlier record in place gets that record decoded again
+    before = reader._records
+    rewritten = bytearray(data)
+    rewritten[recordends[-3] - 40] ^= 0xFF
+    livefile.write_bytes(bytes(rewritten))
+    assert await reader.update(livefile) == await _full_session(livefile)
+    changed = [new is not old for new, old in zip(reader._records, before, strict=True)]
+    assert changed.count(True) == 1
+
+    # A new session starts over
+    other = sessions.joinpath("80.session")
+    assert await reader.update(other) == await _full_session(other)
+
+
+def _serato_record(tag, value):
+    return tag.encode("ascii") + struct.pack(">I", len(value)) + value
+
+
+@pytest.mark.asyncio
+async def test_database_v2_decodes_track_fields(tmp_path):
+    """only mapped otrk fields are decoded; tracks without a path are dropped"""
+    track = b"".join(
+        [
+            _serato_record("ttyp", "mp3".encode("utf-16-be")),
+            _serato_record("pfil", "Music/Björk/Jóga.mp3\x00".encode("utf-16-be")),
+            _serato_record("tsng", "Jóga".encode("utf-16-be")),
+            _serato_record("tart", "Björk".encode("utf-16-be")),
+            _serato_record("uadd", struct.pack(">I", 1612600000)),
+            # a tag no decoder knows about must not stop the read
+            _serato_record("zzzz", b"\x00\x01"),
+        ]
+    )
+    nopath = _serato_record("tsng", "Orphan".encode("utf-16-be"))
+    tmp_path.joinpath("database V2").write_bytes(
+        _serato_record("vrsn", "2.0/Serato Scratch LIVE Database".encode("utf-16-be"))
+        + _serato_record("otrk", track)
+        + _serato_record("otrk", nopath)
+    )
+
+    reader = nowplaying.serato3.database.SeratoDatabaseV2Reader(tmp_path)
+    await reader.loaddatabase()
+
+    assert reader.tracks == [
+        {
+            "filepath": "Music/Björk/Jóga.mp3",
+            "filename": "Jóga.mp3",
+            "title": "Jóga",
+            "artist": "Björk",
+        }
+    ]
+
+
+def _write_database_v2(libpath, tracks):
+    """write a database V2 holding (filepath, artist, title) tracks"""
+    records = [_serato_record("vrsn", "2.0/Serato Scratch LIVE Database".encode("utf-16-be"))]
+    for filepath, artist, title in tracks:
+        fields = [
+            _serato_record("pfil", filepath.encode("utf-16-be")),
+            _serato_record("tart", artist.encode("utf-16-be")),
+            _serato_record("tsng", title.encode("utf-16-be")),
+        ]
+        records.append(_serato_record("otrk", b"".join(fields)))
+    dbfile = pathlib.Path(libpath).joinpath("database V2")
+    dbfile.write_bytes(b"".join(records))
+    # a rewrite within the same mtime tick must still be noticed
+    stat = dbfile.stat()
+    os.utime(dbfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.asyncio
+async def test_library_index_follows_database_changes(tmp_path):
+    """artist and smart crate lookups are answered from the index and follow rewrites"""
+    libpath = tmp_path.joinpath("_Serato_")
+    libpath.mkdir()
+    cratefile = tmp_path.joinpath("Loud.scrate")
+    cratefile.write_bytes(b"")
+    rules = [{"field": "title", "operator": "contains", "value": "loud", "field_type": "text"}]
+    _write_database_v2(
+        libpath,
+        [
+            ("Music/one.mp3", "Björk", "Loud One"),
+            ("Music/two.mp3", "Massive Attack", "Quiet Two"),
+            ("Music/three.mp3", "Björk feat. Someone", "Loud Three"),
+        ],
+    )
+
+    index = nowplaying.serato3.index.SeratoLibraryIndex(dbpath=tmp_path / "index.db")
+    assert await index.has_artist(libpath, "BJÖRK")
+    assert not await index.has_artist(libpath, "Portishead")
+    assert await index.artist_in_files(libpath, ["/Music/three.mp3"], "someone")
+    assert not await index.artist_in_files(libpath, ["/Music/two.mp3"], "björk")
+    assert await index.smartcrate_files(libpath, cratefile, rules) == [
+        "Music/one.mp3",
+        "Music/three.mp3",
+    ]
+
+    _write_database_v2(
+        libpath,
+        [
+            ("Music/one.mp3", "Björk", "Loud One"),
+            ("Music/two.mp3", "Portishead", "Loud Two"),
+        ],
+    )
+
+    # a fresh instance starts from what is on disk and only applies the changes
+    index = nowplaying.serato3.index.SeratoLibraryIndex(dbpath=tmp_path / "index.db")
+    assert await index.has_artist(libpath, "portishead")
+    assert not await index.has_artist(libpath, "massive attack")
+    assert not await index.artist_in_files(libpath, ["/Music/three.mp3"], "someone")
+    assert await index.smartcrate_files(libpath, cratefile, rules) == [
+        "Music/one.mp3",
+        "Music/two.mp3",
+    ]
+    assert not await index.has_artist(tmp_path / "missing", "Björk")
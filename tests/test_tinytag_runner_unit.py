@@ -3,12 +3,15 @@
 
 import base64
 import json
+import os
 import pathlib
+import shutil
 import unittest.mock
 
 import puremagic
 import pytest
 
+import nowplaying.metadata.tinytag_runner
 from nowplaying.metadata.tinytag_runner import TinyTagRunner, _date_calc
 from nowplaying.vendor import tinytag  # pylint: disable=no-name-in-module
 
@@ -724,3 +727,97 @@ def test_process_extra_key_field():
     runner.metadata = {}
     runner._process_extra({"key": "Dm"})  # pylint: disable=protected-access
     assert runner.metadata["key"] == "Dm"
+
+
+# ---------------------------------------------------------------------------
+# read()/apply() and the persistent tag cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def taggedfile(getroot, tmp_path):
+    """a private copy of a file with two embedded covers"""
+    source = pathlib.Path(getroot) / "tests" / "audio" / "15_Ghosts_II_64kb_füllytâgged.mp3"
+    target = tmp_path / "tagged.mp3"
+    shutil.copyfile(source, target)
+    return target
+
+
+def test_read_apply_matches_process(taggedfile):  # pylint: disable=redefined-outer-name
+    """process() is read() then apply(), so cached and uncached reads agree"""
+    metadata_in = {"filename": str(taggedfile), "artist": "Someone Else"}
+    expected = TinyTagRunner().process(dict(metadata_in))
+    filetags = TinyTagRunner.read(str(taggedfile))
+    assert TinyTagRunner().apply(dict(metadata_in), filetags) == expected
+    assert expected["artist"] == "Someone Else"
+    assert expected["coverimageraw"]
+    assert len(expected["_embedded_extra_covers"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_file_tags_cache_hit_skips_file(
+    taggedfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """a second load of an unchanged file is answered without reading it"""
+    filename = str(taggedfile)
+    expected = TinyTagRunner().process({"filename": filename})
+
+    with unittest.mock.patch.object(TinyTagRunner, "read", wraps=TinyTagRunner.read) as reader:
+        first = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+        second = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+
+    assert reader.call_count == 1
+    assert first == second
+    assert TinyTagRunner().apply({"filename": filename}, second) == expected
+
+
+@pytest.mark.asyncio
+async def test_load_file_tags_rereads_modified_file(
+    taggedfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """a new mtime is a new cache key"""
+    filename = str(taggedfile)
+    with unittest.mock.patch.object(TinyTagRunner, "read", wraps=TinyTagRunner.read) as reader:
+        await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+        stat = taggedfile.stat()
+        os.utime(taggedfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+
+    assert reader.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_file_tags_rereads_when_cover_evicted(
+    taggedfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,
+):
+    """a cached record whose cover art is gone falls back to the file"""
+    filename = str(taggedfile)
+    first = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+
+    assert await isolated_datacache_client.storage.evict_lfu(size_limit_bytes=0)
+
+    with unittest.mock.patch.object(TinyTagRunner, "read", wraps=TinyTagRunner.read) as reader:
+        second = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+        third = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+
+    assert reader.call_count == 1
+    assert first == second == third
+
+
+@pytest.mark.asyncio
+async def test_load_file_tags_does_not_cache_failed_read(
+    taggedfile,  # pylint: disable=redefined-outer-name
+    isolated_datacache_client,  # pylint: disable=unused-argument
+):
+    """a read that failed is retried next time rather than cached as untagged"""
+    filename = str(taggedfile)
+    with unittest.mock.patch.object(tinytag.TinyTag, "get", side_effect=OSError("gone")):
+        failed = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+    assert failed and not failed.tagged
+
+    recovered = await nowplaying.metadata.tinytag_runner.load_file_tags(filename)
+    assert recovered.tagged
+    assert recovered.front_cover
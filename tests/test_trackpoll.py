@@ -12,6 +12,9 @@ import unittest.mock
 import pytest  # pylint: disable=import-error
 import pytest_asyncio  # pylint: disable=import-error
 
+import nowplaying.datacache.pending
+import nowplaying.db
+import nowplaying.metadata
 import nowplaying.processes.trackpoll  # pylint: disable=import-error
 from tests.utils_images import jpeg_bytes, png_bytes
 
@@ -745,3 +748,67 @@ async def test_check_earshot_override_ignores_same_as_main(trackpoll_testmode):
     assert result == main_meta
     # earshot_last_meta updated so next poll does not recheck
     assert tptest.earshot_last_meta == earshot_meta  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_prefetch_cued_track_is_cache_warmed(trackpoll_testmode):  # pylint: disable=redefined-outer-name
+    """a track warmed while cued on another deck is flagged cache_warmed once it goes live"""
+    tptest = trackpoll_testmode
+    calls = []
+
+    async def _getmoremetadata(self, metadata=None, skipplugins=False, early_extras=False):  # pylint: disable=unused-argument
+        calls.append(
+            (
+                metadata.get("title"),
+                self is tptest.prefetchprocessors,
+                nowplaying.datacache.pending.current_schedule_class(),
+            )
+        )
+        return metadata
+
+    tptest.input = unittest.mock.AsyncMock()
+    tptest.input.getupcomingtracks.return_value = [{"artist": "Cued Artist", "title": "Cued Song"}]
+
+    with unittest.mock.patch.object(
+        nowplaying.metadata.MetadataProcessors, "getmoremetadata", _getmoremetadata
+    ):
+        for _ in range(2):
+            tptest._start_prefetch()  # pylint: disable=protected-access
+            await tptest._prefetch_task  # pylint: disable=protected-access
+        live = await tptest._fill_inmetadata({"artist": "Cued Artist ", "title": "Cued Song"})  # pylint: disable=protected-access
+        other = await tptest._fill_inmetadata({"artist": "Other Artist", "title": "Other Song"})  # pylint: disable=protected-access
+
+    # warmed once as next-up, then looked up again for real once live
+    assert calls == [
+        ("Cued Song", True, nowplaying.datacache.CLASS_NEXT_UP),
+        ("Cued Song", False, nowplaying.datacache.CLASS_NOW_PLAYING),
+        ("Other Song", False, nowplaying.datacache.CLASS_NOW_PLAYING),
+    ]
+    assert live["cache_warmed"] is True
+    assert "cache_warmed" not in other
+
+
+@pytest.mark.asyncio
+async def test_late_extras_follow_the_published_track(trackpoll_testmode):  # pylint: disable=redefined-outer-name
+    """extras that land after publishing update the record, or the deferred copy"""
+    tptest = trackpoll_testmode
+
+    async def _merge_late_extras(metadata, wait=False):  # pylint: disable=unused-argument
+        metadata["artistlongbio"] = "late bio"
+        return True
+
+    tptest.metadataprocessors.merge_late_extras = _merge_late_extras
+    tptest.currentmeta = {"artist": "a", "title": "t", "track_received": "now"}
+    tptest._pending_meta = tptest.currentmeta.copy()  # pylint: disable=protected-access
+    await tptest._publish_late_extras(tptest.currentmeta)  # pylint: disable=protected-access
+    assert tptest._pending_meta["artistlongbio"] == "late bio"  # pylint: disable=protected-access
+
+    # a track that is no longer current is left alone
+    stale = {"artist": "b", "title": "u", "track_received": "earlier"}
+    tptest._pending_meta = None  # pylint: disable=protected-access
+    with unittest.mock.patch.object(nowplaying.db.MetadataDB, "update_last_meta_async") as update:
+        tptest.testmode = False
+        await tptest._publish_late_extras(stale)  # pylint: disable=protected-access
+        update.assert_not_called()
+        await tptest._publish_late_extras(tptest.currentmeta)  # pylint: disable=protected-access
+        update.assert_called_once_with(tptest.currentmeta)
@@ -4,10 +4,13 @@
 import asyncio
 import os
 
+import aiosqlite
 import pytest
 
 import nowplaying.inputs.traktor  # pylint: disable=import-error
 import nowplaying.utils  # pylint: disable=import-error
+import nowplaying.utils.sqlite  # pylint: disable=import-error
+import nowplaying.utils.xml  # pylint: disable=import-error
 
 
 def results(expected, metadata):
@@ -52,6 +55,9 @@ async def test_read_collections(bootstrap, getroot):
 
     track = await plugin.getrandomtrack(playlist="videos")
     assert track
+    tracks = await plugin.getplaylisttracks(playlist="videos")
+    assert {"filename": track} in tracks
+    assert await plugin.getplaylisttracks(playlist="no such playlist") == []
 
     data = await plugin.lookup(artist="Divine", title="Shoot Your Shot")
     assert data
@@ -62,6 +68,97 @@ async def test_read_collections(bootstrap, getroot):
     await plugin.stop()
 
 
+def _traktor_nml(entries):
+    """a minimal collection.nml with (artist, title, file) entries in a playlist"""
+    collection = "".join(
+        f'<ENTRY ARTIST="{artist}" TITLE="{title}">'
+        f'<LOCATION DIR="/:music/:" FILE="{filename}" VOLUME="disk"></LOCATION></ENTRY>'
+        for artist, title, filename in entries
+    )
+    keys = "".join(
+        f'<ENTRY><PRIMARYKEY TYPE="TRACK" KEY="disk/:music/:{filename}"></PRIMARYKEY></ENTRY>'
+        for _, _, filename in entries
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="no" ?><NML VERSION="19">'
+        f"<COLLECTION>{collection}</COLLECTION><PLAYLISTS>"
+        f'<NODE TYPE="PLAYLIST" NAME="gig">{keys}</NODE></PLAYLISTS></NML>'
+    )
+
+
+@pytest.mark.asyncio
+async def test_incremental_import(bootstrap, tmp_path):
+    """an incremental refresh keeps unchanged rows and only rewrites what changed"""
+    collection = tmp_path.joinpath("collection.nml")
+    collection.write_text(
+        _traktor_nml([("One", "First", "1.mp3"), ("Two", "Second", "2.mp3")]), encoding="utf-8"
+    )
+    processor = nowplaying.utils.xml.BackgroundXMLProcessor(
+        tmp_path.joinpath("traktor.db"),
+        nowplaying.inputs.traktor.TraktorSAXHandler,
+        lambda: collection,
+        [
+            "CREATE TABLE IF NOT EXISTS songs (artist TEXT, title TEXT, album TEXT,"
+            " filename TEXT, id INTEGER PRIMARY KEY AUTOINCREMENT)",
+            "CREATE TABLE IF NOT EXISTS playlists (name TEXT, filename TEXT,"
+            " id INTEGER PRIMARY KEY AUTOINCREMENT)",
+        ],
+        "traktor",
+        bootstrap,
+        fingerprint_table="songs",
+        index_schemas=nowplaying.inputs.traktor.SONGS_INDEXES
+        + nowplaying.utils.sqlite.PLAYLIST_PICKS_SCHEMAS,
+    )
+
+    def _songs():
+        with nowplaying.utils.sqlite.sqlite_connection(processor.database_path) as conn:
+            return {
+                row[1]: (row[0], row[2])
+                for row in conn.execute("SELECT id, artist, title FROM songs")
+            }
+
+    def _playlist():
+        with nowplaying.utils.sqlite.sqlite_connection(processor.database_path) as conn:
+            return [row[0] for row in conn.execute("SELECT filename FROM playlists ORDER BY id")]
+
+    assert await processor.background_refresh(collection, processor.table_schemas)
+    before = _songs()
+    assert set(before) == {"One", "Two"}
+
+    collection.write_text(
+        _traktor_nml([("One", "First", "1.mp3"), ("Three", "Third", "3.mp3")]), encoding="utf-8"
+    )
+    assert await processor.background_refresh(
+        collection, processor.table_schemas, incremental=True
+    )
+    after = _songs()
+    assert set(after) == {"One", "Three"}
+    assert after["One"] == before["One"]
+    assert len(_playlist()) == 2
+
+    # random picks come from the rebuilt playlist_picks table
+    async with aiosqlite.connect(processor.database_path) as connection:
+        cursor = await connection.cursor()
+        picks = {
+            await nowplaying.utils.sqlite.random_playlist_filename(cursor, "gig")
+            for _ in range(50)
+        }
+        assert picks == set(_playlist())
+        assert await nowplaying.utils.sqlite.random_playlist_filename(cursor, "nope") is None
+        await cursor.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM songs WHERE LOWER(artist) = LOWER(?)", ("one",)
+        )
+        assert "songs_artist_lower" in str(await cursor.fetchall())
+
+    # nothing changed: the database is left alone
+    dbstat = processor.database_path.stat()
+    assert await processor.background_refresh(
+        collection, processor.table_schemas, incremental=True
+    )
+    assert processor.database_path.stat().st_ino == dbstat.st_ino
+    assert _songs() == after
+
+
 # @pytest.mark.asyncio
 # async def test_playlist_read(virtualdj_bootstrap, getroot):  # pylint: disable=redefined-outer-name
 #     ''' test getting random tracks '''
@@ -78,3 +175,103 @@ async def test_read_collections(bootstrap, getroot):
 #     assert filename
 #     filename = await plugin.getrandomtrack('testplaylist')
 #     assert filename
+
+
+def _xml_processor(config, tmp_path, collection, parser):
+    return nowplaying.utils.xml.BackgroundXMLProcessor(
+        tmp_path.joinpath(f"{parser}.db"),
+        nowplaying.inputs.traktor.TraktorSAXHandler,
+        lambda: collection,
+        [
+            "CREATE TABLE IF NOT EXISTS songs (artist TEXT, title TEXT, album TEXT,"
+            " filename TEXT, id INTEGER PRIMARY KEY AUTOINCREMENT)",
+            "CREATE TABLE IF NOT EXISTS playlists (name TEXT, filename TEXT,"
+            " id INTEGER PRIMARY KEY AUTOINCREMENT)",
+        ],
+        "traktor",
+        config,
+        fingerprint_table="songs",
+        parser=parser,
+    )
+
+
+def _dump(processor):
+    with nowplaying.utils.sqlite.sqlite_connection(processor.database_path) as conn:
+        return (
+            conn.execute("SELECT * FROM songs ORDER BY id").fetchall(),
+            conn.execute("SELECT * FROM playlists ORDER BY id").fetchall(),
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parser", sorted(nowplaying.utils.xml.PARSERS))
+async def test_parsers_agree(bootstrap, getroot, tmp_path, parser):
+    """every parser backend imports the same rows, even from a truncated file"""
+    cml = getroot.joinpath("tests", "playlists", "traktor", "collection.nml")
+    expected = _xml_processor(bootstrap, tmp_path, cml, "sax")
+    processor = _xml_processor(bootstrap, tmp_path, cml, parser)
+    assert await expected.background_refresh(cml, expected.table_schemas)
+    assert await processor.background_refresh(cml, processor.table_schemas)
+    assert _dump(processor) == _dump(expected)
+    assert _dump(processor)[0]
+
+    truncated = tmp_path.joinpath("truncated.nml")
+    truncated.write_text(
+        _traktor_nml([("One", "First", "1.mp3"), ("Two", "Second", "2.mp3")])[:-60],
+        encoding="utf-8",
+    )
+    assert await processor.background_refresh(truncated, processor.table_schemas)
+    assert [row[:2] for row in _dump(processor)[0]] == [("One", "First"), ("Two", "Second")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parser", sorted(nowplaying.utils.xml.PARSERS))
+async def test_parsers_refuse_entities(bootstrap, tmp_path, parser):
+    """no parser backend expands entities or reads external ones"""
+    secret = tmp_path.joinpath("secret.txt")
+    secret.write_text("secret", encoding="utf-8")
+    collection = tmp_path.joinpath("collection.nml")
+    collection.write_text(
+        f'<?xml version="1.0"?><!DOCTYPE NML [<!ENTITY xxe SYSTEM "{secret.as_uri()}">]>'
+        '<NML><COLLECTION><ENTRY ARTIST="&xxe;" TITLE="Title">'
+        "</ENTRY></COLLECTION></NML>",
+        encoding="utf-8",
+    )
+    processor = _xml_processor(bootstrap, tmp_path, collection, parser)
+    assert not await processor.background_refresh(collection, processor.table_schemas)
+    assert not processor.database_path.exists()
+
+
+def test_row_writer_keeps_document_order():
+    """rows for different statements are written in the order they were queued"""
+    with nowplaying.utils.sqlite.sqlite_connection(":memory:") as conn:
+        cursor = conn.cursor()
+        cursor.execute("CREATE TABLE songs (artist TEXT, title TEXT, id INTEGER PRIMARY KEY)")
+        writer = nowplaying.utils.xml.XMLRowWriter(cursor)
+        writer.execute("INSERT INTO songs (artist, title) VALUES (?, ?)", ("One", "First"))
+        writer.execute("INSERT INTO songs (artist) VALUES (?)", ("Two",))
+        writer.execute("INSERT INTO songs (artist, title) VALUES (?, ?)", ("Three", "Third"))
+        writer.finish()
+        assert [row[0] for row in cursor.execute("SELECT artist FROM songs ORDER BY id")] == [
+            "One",
+            "Two",
+            "Three",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_incremental_import_keeps_rows_after_truncation(bootstrap, tmp_path):
+    """entries past the point a broken file stops are not deleted"""
+    collection = tmp_path.joinpath("collection.nml")
+    entries = [("One", "First", "1.mp3"), ("Two", "Second", "2.mp3")]
+    collection.write_text(_traktor_nml(entries), encoding="utf-8")
+    processor = _xml_processor(bootstrap, tmp_path, collection, "expat")
+    assert await processor.background_refresh(collection, processor.table_schemas)
+
+    # cut off in the middle of the second entry
+    full = _traktor_nml(entries)
+    collection.write_text(full[: full.index('<ENTRY ARTIST="Two"') + 10], encoding="utf-8")
+    assert await processor.background_refresh(
+        collection, processor.table_schemas, incremental=True
+    )
+    assert [row[:2] for row in _dump(processor)[0]] == [("One", "First"), ("Two", "Second")]
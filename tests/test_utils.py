@@ -477,6 +477,27 @@ def test_regex_compilation_caching():
     assert manager._patterns_dirty is True
 
 
+def test_combined_matcher_follows_selections():
+    """the combined matcher strips every format in one pass and rebuilds on change"""
+    manager = nowplaying.utils.filters.FilterManager()
+    manager.reset_to_defaults()
+
+    assert (
+        manager.apply_all_filters("Sandstorm (Official Music Video) [HD] - Remastered")
+        == "Sandstorm"
+    )
+    assert manager.apply_all_filters("Clean Bandit - Rather Be") == "Clean Bandit - Rather Be"
+
+    manager.set_phrase_format("radio edit", "paren", True)
+    manager.set_phrase_format("explicit", "plain", True)
+    manager.set_phrase_format("hd", "plain", True)
+    assert manager.apply_all_filters("One More Time (Radio Edit)") == "One More Time"
+    assert manager.apply_all_filters("Explicit Content HD") == " Content "
+
+    manager.set_phrase_format("radio edit", "paren", False)
+    assert manager.apply_all_filters("One More Time (Radio Edit)") == "One More Time (Radio Edit)"
+
+
 def test_reset_to_defaults():
     """Test that reset_to_defaults works correctly"""
     manager = nowplaying.utils.filters.FilterManager()
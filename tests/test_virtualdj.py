@@ -491,6 +491,126 @@ async def test_playlist_read(virtualdj_bootstrap, getroot):  # pylint: disable=r
     assert filename
     filename = await plugin.getrandomtrack("testplaylist")
     assert filename
+    assert {"filename": filename} in await plugin.getplaylisttracks("testplaylist")
+
+
+def _write_vdjfolder(filepath, songs):
+    """a .vdjfolder with (path, artist, title) songs"""
+    filepath.write_text(
+        "<VirtualFolder>"
+        + "".join(
+            f'<song path="{path}" artist="{artist}" title="{title}" />'
+            for path, artist, title in songs
+        )
+        + "</VirtualFolder>",
+        encoding="utf-8",
+    )
+
+
+def test_playlists_rescan_is_incremental(virtualdj_bootstrap, tmp_path, monkeypatch):  # pylint: disable=redefined-outer-name
+    """only new and changed playlist files are re-read; the rest keep their rows"""
+    tmp_path.joinpath("Playlists").mkdir()
+    mylists = tmp_path.joinpath("MyLists")
+    mylists.mkdir()
+    _write_vdjfolder(mylists.joinpath("warmup.vdjfolder"), [("/a.mp3", "A", "Aa")])
+    _write_vdjfolder(mylists.joinpath("peak.vdjfolder"), [("/b.mp3", "B", "Bb")])
+    _write_vdjfolder(mylists.joinpath("closing.vdjfolder"), [("/c.mp3", "C", "Cc")])
+    dbfile = tmp_path.joinpath("playlists.db")
+    plugin = nowplaying.inputs.virtualdj.Plugin(config=virtualdj_bootstrap)
+    plugin.rewrite_db(tmp_path.joinpath("Playlists"), dbfile)
+
+    def _rows():
+        with nowplaying.utils.sqlite.sqlite_connection(dbfile) as connection:
+            return {
+                row[0]: row[1:]
+                for row in connection.execute("SELECT filename, name, id FROM playlists")
+            }
+
+    before = _rows()
+    assert {row[0] for row in before.values()} == {"warmup", "peak", "closing"}
+
+    reread = []
+    original = plugin._read_vdjfolder_file  # pylint: disable=protected-access
+
+    def _counting(filepath, subst=None):
+        reread.append(filepath.name)
+        return original(filepath, subst)
+
+    monkeypatch.setattr(plugin, "_read_vdjfolder_file", _counting)
+    _write_vdjfolder(
+        mylists.joinpath("peak.vdjfolder"), [("/b.mp3", "B", "Bb"), ("/d.mp3", "D", "Dd")]
+    )
+    mylists.joinpath("closing.vdjfolder").unlink()
+    _write_vdjfolder(mylists.joinpath("encore.vdjfolder"), [("/e.mp3", "E", "Ee")])
+    plugin.rewrite_db(tmp_path.joinpath("Playlists"), dbfile, incremental=True)
+
+    after = _rows()
+    assert sorted(reread) == ["encore.vdjfolder", "peak.vdjfolder"]
+    assert after["/a.mp3"] == before["/a.mp3"]
+    assert {filename: row[0] for filename, row in after.items()} == {
+        "/a.mp3": "warmup",
+        "/b.mp3": "peak",
+        "/d.mp3": "peak",
+        "/e.mp3": "encore",
+    }
+    with nowplaying.utils.sqlite.sqlite_connection(dbfile) as connection:
+        picks = connection.execute("SELECT id FROM playlist_picks WHERE name = 'peak'").fetchall()
+    assert sorted(row[0] for row in picks) == sorted([after["/b.mp3"][1], after["/d.mp3"][1]])
+
+    # nothing changed: nothing is read
+    reread.clear()
+    plugin.rewrite_db(tmp_path.joinpath("Playlists"), dbfile, incremental=True)
+    assert not reread
+    assert _rows() == after
+
+
+def test_playlists_rescan_follows_path_substitution(virtualdj_bootstrap, tmp_path):  # pylint: disable=redefined-outer-name
+    """changing the path substitution quirks re-reads playlists that did not change"""
+    tmp_path.joinpath("Playlists").mkdir()
+    mylists = tmp_path.joinpath("MyLists")
+    mylists.mkdir()
+    _write_vdjfolder(mylists.joinpath("warmup.vdjfolder"), [("/old/a.mp3", "A", "Aa")])
+    dbfile = tmp_path.joinpath("playlists.db")
+    plugin = nowplaying.inputs.virtualdj.Plugin(config=virtualdj_bootstrap)
+    plugin.rewrite_db(tmp_path.joinpath("Playlists"), dbfile)
+
+    virtualdj_bootstrap.cparser.setValue("quirks/filesubst", True)
+    virtualdj_bootstrap.cparser.setValue("quirks/filesubstin", "/old/")
+    virtualdj_bootstrap.cparser.setValue("quirks/filesubstout", "/new/")
+    plugin.rewrite_db(tmp_path.joinpath("Playlists"), dbfile, incremental=True)
+
+    with nowplaying.utils.sqlite.sqlite_connection(dbfile) as connection:
+        rows = connection.execute("SELECT filename FROM playlists").fetchall()
+    assert rows == [("/new/a.mp3",)]
+
+
+def test_playlists_rescan_reverifies_m3u(virtualdj_bootstrap, tmp_path):  # pylint: disable=redefined-outer-name
+    """an unchanged .m3u picks up songs that appeared and keeps its rows otherwise"""
+    playlistdir = tmp_path.joinpath("Playlists")
+    playlistdir.mkdir()
+    music = tmp_path.joinpath("music")
+    music.mkdir()
+    music.joinpath("a.mp3").write_bytes(b"")
+    playlistdir.joinpath("set.m3u").write_text(
+        f"{music / 'a.mp3'}\n{music / 'b.mp3'}\n", encoding="utf-8"
+    )
+    dbfile = tmp_path.joinpath("playlists.db")
+    plugin = nowplaying.inputs.virtualdj.Plugin(config=virtualdj_bootstrap)
+    plugin.rewrite_db(playlistdir, dbfile)
+
+    def _rows():
+        with nowplaying.utils.sqlite.sqlite_connection(dbfile) as connection:
+            return connection.execute("SELECT filename, id FROM playlists ORDER BY id").fetchall()
+
+    before = _rows()
+    assert [row[0] for row in before] == [str(music / "a.mp3")]
+
+    plugin.rewrite_db(playlistdir, dbfile, incremental=True)
+    assert _rows() == before
+
+    music.joinpath("b.mp3").write_bytes(b"")
+    plugin.rewrite_db(playlistdir, dbfile, incremental=True)
+    assert [row[0] for row in _rows()] == [str(music / "a.mp3"), str(music / "b.mp3")]
 
 
 def test_sax_handler_expanded_metadata():
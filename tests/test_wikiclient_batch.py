@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""test batched wikiclient lookups against canned Wikimedia responses"""
+
+# pylint: disable=protected-access
+
+import pytest
+
+import nowplaying.wikiclient
+
+ENTITIES = {
+    "Q1": {
+        "id": "Q1",
+        "claims": {
+            "P434": [{"mainsnak": {"datavalue": {"value": "mbid-one"}}}],
+            "P18": [{"mainsnak": {"datavalue": {"value": "One.jpg"}}}],
+        },
+        "descriptions": {"en": {"value": "first band"}},
+        "sitelinks": {"enwiki": {"title": "One (band)"}},
+    },
+    # Q2 was merged into Q20; Wikidata answers under the new ID
+    "Q20": {
+        "id": "Q20",
+        "redirects": {"from": "Q2", "to": "Q20"},
+        "claims": {"P1953": [{"mainsnak": {"datavalue": {"value": "12345"}}}]},
+        "descriptions": {"en": {"value": "second band"}},
+        "sitelinks": {"enwiki": {"title": "Two_(band)"}},
+    },
+    "Q3": {"id": "Q3", "missing": ""},
+}
+
+
+class _FakeWikimedia:  # pylint: disable=too-few-public-methods
+    """answers _get_json calls and records every request made"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_json(self, url, params):
+        """route by endpoint"""
+        self.calls.append((url, params))
+        if "wikidata" in url:
+            wanted = params["ids"].split("|")
+            return {
+                "entities": {
+                    key: value
+                    for key, value in ENTITIES.items()
+                    if key in wanted or value.get("redirects", {}).get("from") in wanted
+                }
+            }
+        if "commons" in url:
+            return {
+                "query": {
+                    "pages": {
+                        "-1": {
+                            "title": "File:One.jpg",
+                            "imageinfo": [{"url": "https://upload/One.jpg"}],
+                        }
+                    }
+                }
+            }
+        query = {
+            "normalized": [{"from": "Two_(band)", "to": "Two (band)"}],
+            "pages": {
+                "1": {"pageid": 1, "title": "One (band)"},
+                "2": {"pageid": 2, "title": "Two (band)"},
+            },
+        }
+        if params["prop"] == "extracts":
+            query["pages"]["1"]["extract"] = "One is a band."
+            query["pages"]["2"]["extract"] = "Two is a band."
+        else:
+            query["pages"]["2"]["thumbnail"] = {"source": "https://upload/two-thumb.jpg"}
+        return {"query": query}
+
+
+@pytest.mark.asyncio
+async def test_get_pages_batches_every_stage(monkeypatch):
+    """one request per stage for all entities, same page shape as get_page"""
+    fake = _FakeWikimedia()
+    async with nowplaying.wikiclient.AsyncWikiClient() as client:
+        monkeypatch.setattr(client, "_get_json", fake.get_json)
+        pages = await client.get_pages(["Q1", "Q2", "Q3", "Q1"])
+
+    assert len(fake.calls) == 4
+    assert set(pages) == {"Q1", "Q2", "Q3"}
+
+    assert pages["Q1"].data["claims"] == {"P434": ["mbid-one"], "P18": ["One.jpg"]}
+    assert pages["Q1"].data["extext"] == "One is a band."
+    assert pages["Q1"].images() == [{"kind": "wikidata-image", "url": "https://upload/One.jpg"}]
+
+    assert pages["Q2"].data["claims"] == {"P1953": ["12345"]}
+    assert pages["Q2"].data["description"] == "second band"
+    assert pages["Q2"].data["extext"] == "Two is a band."
+    assert pages["Q2"].images() == [
+        {"kind": "query-thumbnail", "url": "https://upload/two-thumb.jpg"}
+    ]
+
+    assert not pages["Q3"].data
+    assert not pages["Q3"].images()
+
+
+@pytest.mark.asyncio
+async def test_get_pages_skips_unwanted_stages(monkeypatch):
+    """no bio and no images means only the Wikidata lookup"""
+    fake = _FakeWikimedia()
+    async with nowplaying.wikiclient.AsyncWikiClient() as client:
+        monkeypatch.setattr(client, "_get_json", fake.get_json)
+        pages = await client.get_pages(["Q1", "Q2"], fetch_bio=False, fetch_images=False)
+
+    assert len(fake.calls) == 1
+    assert "sitelinks" not in fake.calls[0][1]["props"]
+    assert pages["Q1"].data["description"] == "first band"
+    assert "extext" not in pages["Q1"].data
+
+
+@pytest.mark.asyncio
+async def test_get_pages_secondary_failures_are_partial(monkeypatch):
+    """a failed extract or image stage still returns the Wikidata data"""
+    fake = _FakeWikimedia()
+
+    async def _flaky(url, params):
+        if "wikidata" not in url:
+            raise nowplaying.wikiclient.WikiRateLimitError("429")
+        return await fake.get_json(url, params)
+
+    async with nowplaying.wikiclient.AsyncWikiClient() as client:
+        monkeypatch.setattr(client, "_get_json", _flaky)
+        pages = await client.get_pages(["Q1", "Q2"])
+
+    assert pages["Q1"].data["claims"]["P434"] == ["mbid-one"]
+    assert "extext" not in pages["Q1"].data
+    assert not pages["Q2"].images()
+
+
+@pytest.mark.asyncio
+async def test_get_pages_bad_ids_do_not_sink_the_batch(monkeypatch):
+    """malformed IDs are never sent, and a rejected batch is retried one by one"""
+    fake = _FakeWikimedia()
+    sent = []
+
+    async def _strict(url, params):
+        sent.append(params["ids"].split("|"))
+        if "wikidata" in url and "Q404" in params["ids"].split("|"):
+            return {"error": {"code": "no-such-entity", "info": "Could not find Q404"}}
+        return await fake.get_json(url, params)
+
+    async with nowplaying.wikiclient.AsyncWikiClient() as client:
+        monkeypatch.setattr(client, "_get_json", _strict)
+        pages = await client.get_pages(
+            ["Q1", "Q404", "not-an-id", "Q2"], fetch_bio=False, fetch_images=False
+        )
+
+    assert all("not-an-id" not in ids for ids in sent)
+    assert pages["Q1"].data["claims"]["P434"] == ["mbid-one"]
+    assert pages["Q2"].data["claims"]["P1953"] == ["12345"]
+    assert not pages["Q404"].data
+    assert not pages["not-an-id"].data
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Icecast Ogg stream parser.
+
+Pushes an Ogg stream through IcecastProtocol.data_received, once with the
+bytearray/memoryview OggCommentParser and once with the previous
+BytesIO-based page parser.  The stream is a recorded one (--stream, e.g.
+captured from Traktor or Mixxx with a netcat listener) or a synthetic
+Vorbis stream with a new chained logical stream and comment header per
+track, like the DJ software sends.  Both parsers must report the same
+metadata before anything is timed.
+
+The previous parser could only cope with data that arrived one page at a
+time, so the comparison feeds whole pages; the new parser is also timed on
+TCP-sized chunks.
+
+Usage:
+    python tools/bench_icecast_ogg.py
+    python tools/bench_icecast_ogg.py --stream capture.ogg --rounds 5
+"""
+
+import argparse
+import io
+import os
+import random
+import struct
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position,protected-access
+from nowplaying.inputs.icecast import OGG_PAGE_HEADER, IcecastProtocol
+
+
+class LegacyIcecastProtocol(IcecastProtocol):
+    """IcecastProtocol with the previous BytesIO page parser"""
+
+    def __init__(self, metadata_callback=None) -> None:
+        super().__init__(metadata_callback=metadata_callback)
+        self.previous_page = b""
+
+    def data_received(self, data: bytes) -> None:
+        dataio = io.BytesIO(data)
+        for page in self._parse_page(dataio):
+            pageio = io.BytesIO(page)
+            if page[:7] == b"\x03vorbis":
+                pageio.seek(7, os.SEEK_CUR)
+                self._parse_vorbis_comment(pageio.read())
+            elif page[:8] == b"OpusTags":
+                pageio.seek(8, os.SEEK_CUR)
+                self._parse_vorbis_comment(pageio.read())
+
+    def _parse_page(self, dataio: io.BytesIO):
+        header_data = dataio.read(27)
+        while len(header_data) != 0:
+            segments = struct.unpack("<4sBBqIIiB", header_data)[-1]
+            segsizes = struct.unpack("B" * segments, dataio.read(segments))
+            total = 0
+            for segsize in segsizes:
+                total += segsize
+                if total < 255:
+                    yield self.previous_page + dataio.read(total)
+                    self.previous_page = b""
+                    total = 0
+            if total != 0:
+                if total % 255 == 0:
+                    self.previous_page += dataio.read(total)
+                else:
+                    yield self.previous_page + dataio.read(total)
+                    self.previous_page = b""
+            header_data = dataio.read(27)
+
+
+def _pages(serial: int, packets: list[bytes], pagesize: int = 4096) -> list[bytes]:
+    """packets laid out in pages of about pagesize bytes, as libogg does"""
+    pages: list[bytes] = []
+    lacing: list[int] = []
+    body = bytearray()
+    flags = 0x02  # beginning of stream
+
+    def _flush(nextflags: int) -> int:
+        header = OGG_PAGE_HEADER.pack(b"OggS", 0, flags, 0, serial, len(pages), 0, len(lacing))
+        pages.append(header + bytes(lacing) + body)
+        lacing.clear()
+        body.clear()
+        return nextflags
+
+    for number, packet in enumerate(packets):
+        offset = 0
+        for length in [255] * (len(packet) // 255) + [len(packet) % 255]:
+            if len(lacing) == 255 or len(body) >= pagesize:
+                flags = _flush(0x01 if offset else 0)
+            lacing.append(length)
+            body.extend(packet[offset : offset + length])
+            offset += length
+        # the headers each get their own page
+        if number < 3 or len(body) >= pagesize:
+            flags = _flush(0)
+    if lacing:
+        flags |= 0x04  # end of stream
+        _flush(0)
+    return pages
+
+
+def _comment(vendor: bytes, **tags: str) -> bytes:
+    fields = [f"{key}={value}".encode() for key, value in tags.items()]
+    return (
+        struct.pack("<I", len(vendor))
+        + vendor
+        + struct.pack("<I", len(fields))
+        + b"".join(struct.pack("<I", len(field)) + field for field in fields)
+    )
+
+
+def synthetic_stream(tracks: int, seconds: int) -> list[bytes]:
+    """the pages of tracks chained Vorbis streams of seconds each at ~320 kbps"""
+    rng = random.Random(0)
+    pages = []
+    for track in range(tracks):
+        packets = [
+            b"\x01vorbis" + bytes(23),
+            b"\x03vorbis"
+            + _comment(
+                b"Xiph.Org libVorbis I 20200704", ARTIST=f"Artist {track}", TITLE=f"T{track}"
+            ),
+            b"\x05vorbis" + rng.randbytes(3000),
+        ]
+        # ~40 packets/second of ~1 KB each
+        packets.extend(rng.randbytes(1000) for _ in range(seconds * 40))
+        pages.extend(_pages(track + 1, packets))
+    return pages
+
+
+def split_pages(stream: bytes) -> list[bytes]:
+    """a recorded stream cut at its page boundaries"""
+    pages = []
+    pos = 0
+    while pos + OGG_PAGE_HEADER.size <= len(stream):
+        segments = stream[pos + 26]
+        end = pos + OGG_PAGE_HEADER.size + segments
+        end += sum(stream[pos + OGG_PAGE_HEADER.size : end])
+        pages.append(stream[pos:end])
+        pos = end
+    return pages
+
+
+def run(protocol_class, chunks: list[bytes]) -> list[dict]:
+    """feed chunks to a streaming protocol; return every metadata update"""
+    updates: list[dict] = []
+    protocol = protocol_class(metadata_callback=updates.append)
+    protocol.streaming = True
+    for chunk in chunks:
+        protocol.data_received(chunk)
+    return updates
+
+
+def _time(func, rounds: int) -> float:
+    return min(timeit.Timer(func).repeat(repeat=3, number=rounds)) / rounds
+
+
+def main() -> None:
+    """run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stream", type=Path, help="recorded Ogg stream to use")
+    parser.add_argument("--tracks", type=int, default=10, help="synthetic tracks")
+    parser.add_argument("--seconds", type=int, default=300, help="length of each track")
+    parser.add_argument("--chunk", type=int, default=1460, help="TCP chunk size")
+    parser.add_argument("--rounds", type=int, default=3, help="passes per timing")
+    args = parser.parse_args()
+
+    if args.stream:
+        pages = split_pages(args.stream.read_bytes())
+    else:
+        pages = synthetic_stream(args.tracks, args.seconds)
+    stream = b"".join(pages)
+    chunks = [stream[start : start + args.chunk] for start in range(0, len(stream), args.chunk)]
+
+    current = run(IcecastProtocol, pages)
+    if current != run(LegacyIcecastProtocol, pages) or current != run(IcecastProtocol, chunks):
+        print("parsers disagree")
+        sys.exit(1)
+
+    before = _time(lambda: run(LegacyIcecastProtocol, pages), args.rounds)
+    after = _time(lambda: run(IcecastProtocol, pages), args.rounds)
+    tcp = _time(lambda: run(IcecastProtocol, chunks), args.rounds)
+
+    megabytes = len(stream) / 1e6
+    print(f"stream: {len(pages)} pages, {megabytes:.1f} MB, {len(current)} metadata updates")
+    print(f"  previous, per page:   {before * 1e3:8.1f} ms  {megabytes / before:8.1f} MB/s")
+    print(f"  current, per page:    {after * 1e3:8.1f} ms  {megabytes / after:8.1f} MB/s")
+    print(f"  current, {args.chunk:5d} B:     {tcp * 1e3:8.1f} ms  {megabytes / tcp:8.1f} MB/s")
+    print(f"  speed-up:             {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Serato 3 binary decoders.
+
+Compares the memoryview/precompiled-struct decoders against the previous
+bytes-slicing ones on the session files bundled with the tests, and on a
+"database V2" built from the tracks in those sessions (the tests do not
+ship one; real libraries are far bigger, see --tracks).  Both decoders must
+produce the same result before anything is timed.
+
+Usage:
+    python tools/bench_serato_decode.py
+    python tools/bench_serato_decode.py --tracks 50000 --rounds 3
+"""
+
+import argparse
+import asyncio
+import struct
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position,protected-access
+from nowplaying.serato3.database import SeratoDatabaseV2Reader
+from nowplaying.serato3.session import SeratoSessionReader
+
+TESTS = Path(__file__).parent.parent / "tests"
+
+
+def legacy_decode_struct(reader, data: bytes) -> list:
+    """The previous SeratoBaseReader._decode_struct: slice bytes per field"""
+    ret = []
+    i = 0
+    while i < len(data):
+        tag = data[i : i + 4].decode("ascii")
+        length = struct.unpack(">I", data[i + 4 : i + 8])[0]
+        value = data[i + 8 : i + 8 + length]
+        value = reader._datadecode(value, tag=tag)
+        ret.append((tag, value))
+        i += 8 + length
+    return ret
+
+
+def legacy_decode_adat(reader, data: bytes) -> dict:
+    """The previous SeratoSessionReader._decode_adat"""
+    ret = {}
+    i = 8
+    while i < len(data) - 8:
+        tag = struct.unpack(">I", data[i + 4 : i + 8])[0]
+        length = struct.unpack(">I", data[i + 8 : i + 12])[0]
+        value = data[i + 12 : i + 12 + length]
+        try:
+            field = reader._adat_func[tag][0]
+            value = reader._adat_func[tag][1](value)
+        except KeyError:
+            field = f"unknown{tag}"
+            value = bytes(value)
+        ret[field] = value
+        i += 8 + length
+    if not ret.get("filename"):
+        ret["filename"] = ret.get("pathstr")
+    return ret
+
+
+class LegacySessionReader(SeratoSessionReader):
+    """SeratoSessionReader wired to the previous decoders"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.decode_func_full.update(
+            {
+                None: self._decode_struct,
+                "adat": lambda data: legacy_decode_adat(self, data),
+                "oent": self._decode_struct,
+            }
+        )
+        self.decode_func_first.update({"o": self._decode_struct, "r": self._decode_struct})
+
+    def _decode_struct(self, data):
+        return legacy_decode_struct(self, bytes(data))
+
+
+def legacy_database_tracks(reader: SeratoDatabaseV2Reader, data: bytes) -> list:
+    """The previous loaddatabase: decode the whole file, then pick fields"""
+    reader._decode_struct = lambda raw: legacy_decode_struct(reader, bytes(raw))
+    reader.decode_func_full[None] = reader._decode_struct
+    reader.decode_func_first.update({"o": reader._decode_struct, "r": reader._decode_struct})
+    tracks = []
+    for tag, value in reader._datadecode(data):
+        if tag == "otrk" and (track := reader._parse_track_data(value)):
+            tracks.append(track)
+    return tracks
+
+
+def _record(tag: str, value: bytes) -> bytes:
+    return tag.encode("ascii") + struct.pack(">I", len(value)) + value
+
+
+def _text(value: str) -> bytes:
+    return value.encode("utf-16-be")
+
+
+def build_database(adats: list[dict], count: int) -> bytes:
+    """a database V2 with count tracks, cycling through adats"""
+    records = [_record("vrsn", _text("2.0/Serato Scratch LIVE Database"))]
+    for number in range(count):
+        adat = adats[number % len(adats)]
+        fields = [
+            _record("ttyp", _text("mp3")),
+            _record("pfil", _text(f"{number}/{adat.get('filename') or 'track.mp3'}")),
+            _record("tsng", _text(adat.get("title") or "")),
+            _record("tart", _text(adat.get("artist") or "")),
+            _record("talb", _text(adat.get("album") or "")),
+            _record("tgen", _text(adat.get("genre") or "")),
+            _record("tlen", _text(adat.get("duration") or "")),
+            _record("tbit", _text(adat.get("bitrate") or "")),
+            _record("tsmp", _text(adat.get("frequency") or "")),
+            _record("tbpm", _text(str(adat.get("bpm") or ""))),
+            _record("tadd", _text("1612600000")),
+            _record("tkey", _text(adat.get("key") or "")),
+            _record("uadd", struct.pack(">I", 1612600000 + number)),
+            _record("utkn", struct.pack(">I", number)),
+            _record("ulbl", struct.pack(">I", 0)),
+            _record("sbav", b"\x00\x00"),
+            _record("bhrt", b"\x01"),
+            _record("bmis", b"\x00"),
+            _record("bply", b"\x01"),
+            _record("blop", b"\x00"),
+            _record("bitu", b"\x00"),
+            _record("bovc", b"\x00"),
+            _record("bcrt", b"\x00"),
+            _record("biro", b"\x00"),
+            _record("bwlb", b"\x00"),
+            _record("bwll", b"\x00"),
+            _record("buns", b"\x00"),
+            _record("bbgl", b"\x00"),
+            _record("bkrk", b"\x00"),
+        ]
+        records.append(_record("otrk", b"".join(fields)))
+    return b"".join(records)
+
+
+def session_adats(sessions: list[bytes], reader_class) -> list:
+    """decode and condense already-read session files"""
+    adats = []
+    for data in sessions:
+        session = reader_class()
+        session.sessiondata = session._datadecode(data)
+        session.condense()
+        adats.extend(session.sessiondata)
+    return adats
+
+
+def _time(func, rounds: int) -> float:
+    return min(timeit.Timer(func).repeat(repeat=3, number=rounds)) / rounds
+
+
+def main() -> None:
+    """run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tracks", type=int, default=20000, help="tracks in the database")
+    parser.add_argument("--rounds", type=int, default=5, help="passes per timing")
+    args = parser.parse_args()
+
+    sessionfiles = sorted(TESTS.glob("serato*/History/Sessions/*.session"))
+    if not sessionfiles:
+        print(f"no session fixtures under {TESTS}")
+        sys.exit(1)
+
+    sessions = [sessionfile.read_bytes() for sessionfile in sessionfiles]
+    current = session_adats(sessions, SeratoSessionReader)
+    legacy = session_adats(sessions, LegacySessionReader)
+    if current != legacy:
+        print("session decoders disagree")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as libdir:
+        database = build_database(current, args.tracks)
+        Path(libdir, "database V2").write_bytes(database)
+
+        reader = SeratoDatabaseV2Reader(libdir)
+        asyncio.run(reader.loaddatabase())
+        if reader.tracks != legacy_database_tracks(SeratoDatabaseV2Reader(libdir), database):
+            print("database decoders disagree")
+            sys.exit(1)
+
+        session_before = _time(
+            lambda: session_adats(sessions, LegacySessionReader), args.rounds * 20
+        )
+        session_after = _time(
+            lambda: session_adats(sessions, SeratoSessionReader), args.rounds * 20
+        )
+        db_before = _time(
+            lambda: legacy_database_tracks(SeratoDatabaseV2Reader(libdir), database), args.rounds
+        )
+        db_after = _time(
+            lambda: SeratoDatabaseV2Reader(libdir)._parse_tracks(memoryview(database)),
+            args.rounds,
+        )
+
+    print(f"sessions: {len(sessionfiles)} files, {len(current)} adats")
+    print(f"  previous: {session_before * 1e3:8.2f} ms")
+    print(f"  current:  {session_after * 1e3:8.2f} ms")
+    print(f"  speed-up: {session_before / session_after:8.2f}x")
+    print(f"database V2: {args.tracks} tracks, {len(database) / 1e6:.1f} MB")
+    print(f"  previous: {db_before * 1e3:8.2f} ms")
+    print(f"  current:  {db_after * 1e3:8.2f} ms")
+    print(f"  speed-up: {db_before / db_after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
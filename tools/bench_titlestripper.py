@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the titlestripper filters.
+
+Compares FilterManager.apply_all_filters (one combined pattern for the
+dash/paren/bracket formats, one gate search for plain phrases) against
+applying each compiled per-format pattern and plain phrase in turn, which
+is how titles were stripped before.  Both are run over the same corpus of
+messy titles and must agree on every one.
+
+Usage:
+    python tools/bench_titlestripper.py
+    python tools/bench_titlestripper.py --custom 200 --rounds 50
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nowplaying.utils.filters import (  # pylint: disable=wrong-import-position
+    SIMPLE_FILTER_DEFAULT_OFF,
+    SIMPLE_FILTER_DEFAULT_ON,
+    FilterManager,
+)
+
+# Titles as they show up from YouTube rips, promo pools and streaming exports
+CORPUS = [
+    "Blue Monday",
+    "Blue Monday '88 - 2015 Remaster",
+    "Around the World (Official Music Video)",
+    "Around the World [Official Video] [HD]",
+    "One More Time (Radio Edit)",
+    "One More Time - Radio Edit",
+    "Strobe (Club Mix) [Extended Mix]",
+    "Levels (Original Mix)",
+    "Titanium (feat. Sia) [Official Audio]",
+    "Titanium (feat. Sia) - Explicit",
+    "Get Lucky (Official Audio) ft. Pharrell Williams, Nile Rodgers",
+    "Midnight City (Lyric Video) [4K]",
+    "Smalltown Boy [Remastered] (HQ)",
+    "Sandstorm (Official Music Video) [1080p]",
+    "Sandstorm (Official Music Video) [1080p HD]",
+    "Music Sounds Better With You (Clean Version)",
+    "Music Sounds Better With You (Dirty)",
+    "Show Me Love - Live at Glastonbury 2019",
+    "Show Me Love (Live) [High Quality]",
+    "Finally (Acoustic Version)",
+    "Finally (Deluxe Edition) [Bonus Track]",
+    "Blinding Lights (Instrumental)",
+    "Blinding Lights - Instrumental",
+    "Insomnia (Anniversary Edition) (Remastered 2021)",
+    "Insomnia 2.0 (Special Edition)",
+    "Children (Dream Version) [Official Video HD]",
+    "Born Slippy .NUXX (Official Video) [HD]",
+    "Praise You (Official Video) [480p] [CS]",
+    "Unfinished Sympathy (2012 Mix/Master) - HD",
+    "Ready Steady Go (Studio Version) [Unreleased]",
+    "Losing It (Extended Version) [CE]",
+    "Windowlicker [HQ] [Official Trailer]",
+    "Xtal (Demo)",
+    "Xtal - Demo Version",
+    "Can't Get You Out of My Head (Radio Version) (Official Video)",
+    "Groove Is in the Heart (Lyrics Video)",
+    "Porcelain (Remix) [Explicit Version]",
+    "Le Chant des Sirènes (Version Originale)",
+    "Ça plane pour moi (Clip Officiel)",
+    "99 Luftballons (Official Video) ",
+]
+
+
+def build_manager(custom: int) -> FilterManager:
+    """Defaults plus every available phrase plus custom phrases, all formats on."""
+    manager = FilterManager()
+    manager.reset_to_defaults()
+    for phrase in SIMPLE_FILTER_DEFAULT_OFF:
+        for fmt in ("dash", "paren", "bracket"):
+            manager.set_phrase_format(phrase, fmt, True)
+    for count in range(custom):
+        phrase = f"promo cut {count}"
+        manager.add_custom_phrase(phrase)
+        for fmt in ("dash", "paren", "bracket"):
+            manager.set_phrase_format(phrase, fmt, True)
+        if count % 4 == 0:
+            manager.set_phrase_format(phrase, "plain", True)
+    for phrase in SIMPLE_FILTER_DEFAULT_ON[:3]:
+        manager.set_phrase_format(phrase, "plain", True)
+    return manager
+
+
+def sequential_filters(manager: FilterManager, title: str) -> str:
+    """The previous apply_all_filters: every phrase and pattern in turn."""
+    for phrase, formats in manager.phrase_format_selections.items():
+        if formats.get("plain", False):
+            title_lower = title.lower()
+            phrase_lower = phrase.lower()
+            if phrase_lower in title_lower:
+                start_idx = title_lower.find(phrase_lower)
+                if start_idx != -1:
+                    title = title[:start_idx] + title[start_idx + len(phrase) :]
+    for pattern in manager.get_compiled_regex_list():
+        title = pattern.sub("", title)
+    for pattern in manager.regex_patterns:
+        title = pattern.sub("", title)
+    return title
+
+
+def main() -> None:
+    """run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--custom", type=int, default=60, help="custom phrases to add")
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the corpus")
+    args = parser.parse_args()
+
+    manager = build_manager(args.custom)
+    mismatches = [
+        title
+        for title in CORPUS
+        if manager.apply_all_filters(title) != sequential_filters(manager, title)
+    ]
+    if mismatches:
+        print("combined and sequential disagree on:")
+        for title in mismatches:
+            print(f"  {title!r}")
+        sys.exit(1)
+
+    def _run(func) -> float:
+        timer = timeit.Timer(lambda: [func(manager, title) for title in CORPUS])
+        return min(timer.repeat(repeat=5, number=args.rounds)) / (args.rounds * len(CORPUS))
+
+    before = _run(sequential_filters)
+    after = _run(FilterManager.apply_all_filters)
+    phrases = len(manager.phrase_format_selections)
+    print(f"{len(CORPUS)} titles, {phrases} phrases")
+    print(f"sequential: {before * 1e6:8.2f} us/title")
+    print(f"combined:   {after * 1e6:8.2f} us/title")
+    print(f"speed-up:   {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the collection XML parser backends.
+
+Imports the Traktor collection bundled with the tests and synthetic Traktor
+and VirtualDJ collections (see --entries) with every parser in
+nowplaying.utils.xml.PARSERS.  Each backend must produce exactly the same
+songs and playlists rows as the SAX one before anything is timed.
+
+Usage:
+    python tools/bench_xml_import.py
+    python tools/bench_xml_import.py --entries 100000 --rounds 3
+"""
+
+import argparse
+import functools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position,protected-access
+import nowplaying.utils.sqlite
+from nowplaying.inputs import traktor, virtualdj
+from nowplaying.utils.xml import PARSERS, BackgroundXMLProcessor
+
+TESTS = Path(__file__).parent.parent / "tests"
+
+
+def _schema(table: str, fields: list[str]) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table} "
+        f"({', '.join(f'{field} TEXT' for field in fields)},"
+        " id INTEGER PRIMARY KEY AUTOINCREMENT)"
+    )
+
+
+IMPORTERS = {
+    "traktor": (
+        traktor.TraktorSAXHandler,
+        [_schema("songs", traktor.METADATALIST), _schema("playlists", traktor.PLAYLIST)],
+    ),
+    "virtualdj": (virtualdj.VirtualDJSAXHandler, [_schema("songs", virtualdj.METADATALIST)]),
+}
+
+
+def traktor_collection(count: int) -> str:
+    """a collection.nml shaped like a real one, with count entries in one playlist"""
+    entries = "".join(
+        f'<ENTRY MODIFIED_DATE="2024/5/1" AUDIO_ID="AQAAAAAAAAA" TITLE="Title {number}"'
+        f' ARTIST="Artist {number % 5000}">'
+        f'<LOCATION DIR="/:Users/:dj/:Music/:{number % 300}/:" FILE="{number}.mp3"'
+        ' VOLUME="Macintosh HD" VOLUMEID="Macintosh HD"></LOCATION>'
+        f'<ALBUM TRACK="{number % 12 + 1}" TITLE="Album {number % 9000}"></ALBUM>'
+        '<MODIFICATION_INFO AUTHOR_TYPE="user"></MODIFICATION_INFO>'
+        '<INFO BITRATE="320000" GENRE="House" PLAYTIME="312" IMPORT_DATE="2024/5/1"'
+        ' KEY="8m" FLAGS="12" FILESIZE="12000"></INFO>'
+        '<TEMPO BPM="124.000000" BPM_QUALITY="100.000000"></TEMPO>'
+        '<LOUDNESS PEAK_DB="-0.5" PERCEIVED_DB="0.1" ANALYZED_DB="0.1"></LOUDNESS>'
+        '<MUSICAL_KEY VALUE="21"></MUSICAL_KEY>'
+        '<CUE_V2 NAME="AutoGrid" DISPL_ORDER="0" TYPE="4" START="45.2" LEN="0"'
+        ' REPEATS="-1" HOTCUE="0"></CUE_V2></ENTRY>\n'
+        for number in range(count)
+    )
+    keys = "".join(
+        '<ENTRY><PRIMARYKEY TYPE="TRACK"'
+        f' KEY="Macintosh HD/:Users/:dj/:Music/:{number % 300}/:{number}.mp3"></PRIMARYKEY>'
+        "</ENTRY>\n"
+        for number in range(0, count, 10)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="no" ?>\n<NML VERSION="19">'
+        f'<COLLECTION ENTRIES="{count}">\n{entries}</COLLECTION>\n<PLAYLISTS>'
+        f'<NODE TYPE="PLAYLIST" NAME="bench">{keys}</NODE></PLAYLISTS></NML>\n'
+    )
+
+
+def virtualdj_collection(count: int) -> str:
+    """a database.xml shaped like a real one, with count songs"""
+    songs = "".join(
+        f' <Song FilePath="C:\\Music\\{number % 300}\\{number}.mp3" FileSize="12000">\n'
+        f'  <Tags Author="Artist {number % 5000}" Title="Title {number}"'
+        f' Album="Album {number % 9000}" Genre="House" Year="2024"'
+        f' TrackNumber="{number % 12 + 1}" Flag="1" />\n'
+        '  <Infos SongLength="312.0" FirstSeen="1714521600" Bitrate="320" Cover="1" />\n'
+        '  <Scan Version="801" Bpm="0.483871" AltBpm="0.241935" Volume="1.0" Key="Am"'
+        ' Flag="32768" />\n'
+        '  <Poi Pos="0.05" Type="beatgrid" />\n'
+        " </Song>\n"
+        for number in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<VirtualDJ_Database Version="2024">\n{songs}</VirtualDJ_Database>\n'
+    )
+
+
+def build(workdir: Path, importer: str, xml_file: Path, parser: str) -> BackgroundXMLProcessor:
+    """import xml_file into a fresh database with parser"""
+    handler_class, schemas = IMPORTERS[importer]
+    processor = BackgroundXMLProcessor(
+        workdir / f"{importer}-{parser}.db",
+        handler_class,
+        lambda: xml_file,
+        schemas,
+        importer,
+        None,
+        fingerprint_table="songs",
+        parser=parser,
+    )
+    processor.temp_database_path.unlink(missing_ok=True)
+    processor._build_temp_database(xml_file, schemas)
+    return processor
+
+
+def dump(processor: BackgroundXMLProcessor) -> list:
+    """every row of every table the import wrote"""
+    with nowplaying.utils.sqlite.sqlite_connection(processor.temp_database_path) as conn:
+        tables = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+            " AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+        return [
+            conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall() for (table,) in tables
+        ]
+
+
+def _time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100000, help="synthetic collection size")
+    parser.add_argument("--rounds", type=int, default=3, help="imports per timing")
+    args = parser.parse_args()
+
+    fixture = TESTS / "playlists" / "traktor" / "collection.nml"
+    if not fixture.exists():
+        print(f"no Traktor collection fixture at {fixture}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        traktorfile = workdir / "collection.nml"
+        traktorfile.write_text(traktor_collection(args.entries), encoding="utf-8")
+        vdjfile = workdir / "database.xml"
+        vdjfile.write_text(virtualdj_collection(args.entries), encoding="utf-8")
+        collections = [
+            ("traktor", "bundled collection.nml", fixture),
+            ("traktor", f"synthetic, {args.entries} entries", traktorfile),
+            ("virtualdj", f"synthetic, {args.entries} songs", vdjfile),
+        ]
+
+        for importer, label, xml_file in collections:
+            expected = dump(build(workdir, importer, xml_file, "sax"))
+            for backend in PARSERS:
+                if dump(build(workdir, importer, xml_file, backend)) != expected:
+                    print(f"{backend} disagrees with sax on {importer} {label}")
+                    sys.exit(1)
+
+            timings = {
+                backend: _time(
+                    functools.partial(build, workdir, importer, xml_file, backend), args.rounds
+                )
+                for backend in PARSERS
+            }
+            print(f"{importer} ({label}, {xml_file.stat().st_size / 1e6:.1f} MB):")
+            for backend, elapsed in timings.items():
+                print(
+                    f"  {backend:6} {elapsed * 1e3:10.1f} ms"
+                    f"  {timings['sax'] / elapsed:5.2f}x vs sax"
+                )
+
+
+if __name__ == "__main__":
+    main()